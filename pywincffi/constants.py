@@ -0,0 +1,63 @@
+"""
+Constants
+=========
+
+Provides the constants defined in ``constants.h`` as plain Python integers:
+
+    >>> from pywincffi.constants import MAX_PATH, FILE_FLAG_OVERLAPPED
+
+Importing this module never loads the library so the constants are
+available on any platform.  When pywincffi is built on Windows the values
+are read from the library and written to a Python module, elsewhere, and
+in a source checkout, the values from :mod:`pywincffi.core.values` are
+used instead.
+
+Where :mod:`enum` provides :class:`enum.IntFlag` some of the constants are
+also grouped together as enums:
+
+    >>> from pywincffi.constants import WaitResult
+    >>> WaitResult(0)
+    <WaitResult.OBJECT_0: 0>
+"""
+
+from pywincffi.core import dist
+
+try:
+    from enum import IntEnum, IntFlag
+except ImportError:  # pragma: no cover
+    IntEnum = IntFlag = None  # pylint: disable=invalid-name
+
+# The enums to produce from the constants.  Each entry contains the name
+# of the enum, the prefix of the constants which are its members and the
+# base class.  The prefix is removed from the name of each member.
+GROUPS = (
+    ("FileFlag", "FILE_FLAG_", IntFlag),
+    ("ProcessAccess", "PROCESS_", IntFlag),
+    ("WaitResult", "WAIT_", IntEnum)
+)
+
+
+def _groups(constants):
+    """
+    Returns a dictionary of the enums described by :data:`GROUPS`
+    produced from ``constants``.  The dictionary will be empty
+    if :class:`enum.IntFlag` is not available.
+    """
+    groups = {}
+    if IntFlag is None:  # pragma: no cover
+        return groups
+
+    for name, prefix, base in GROUPS:
+        members = [
+            (constant[len(prefix):], value)
+            for constant, value in sorted(constants.items())
+            if constant.startswith(prefix)]
+        groups[name] = base(name, members, module=__name__)
+    return groups
+
+
+_CONSTANTS = dist._constants()  # pylint: disable=protected-access
+_GROUPS = _groups(_CONSTANTS)
+globals().update(_CONSTANTS)
+globals().update(_GROUPS)
+__all__ = tuple(sorted(_CONSTANTS)) + tuple(sorted(_GROUPS))
@@ -0,0 +1,312 @@
+"""
+ABI Mode
+========
+
+Support for loading pywincffi using cffi's out-of-line ABI mode.  In ABI
+mode the functions are called using :meth:`cffi.FFI.dlopen` so nothing has
+to be compiled which is useful when a C compiler is not available.
+
+ABI mode has no access to the Windows headers so anything in the cdefs which
+cffi would normally ask the compiler for, the value of a constant declared
+with ``...`` for example, has to be known ahead of time.  These values are
+stored in a type table which is produced by :func:`resolve` at build time
+using the compiled modules.  The type table is then used by
+:func:`abi_cdef` to produce a cdef which can be used in ABI mode.
+"""
+
+import ctypes
+import re
+from collections import namedtuple
+
+from pywincffi.exceptions import InternalError
+
+try:
+    import msvcrt
+except ImportError:  # pragma: no cover
+    msvcrt = None  # pylint: disable=invalid-name
+
+TYPE_TABLE_VERSION = 1
+
+# These match the lines produced by :func:`pywincffi.core.dist._normalize`
+# which contain a value that needs to be resolved before the cdef can be
+# used in ABI mode.
+REGEX_CONSTANT = re.compile(r"^#define (\w+) \.\.\.$")
+REGEX_TYPEDEF = re.compile(r"^typedef int\.\.\. (\w+);$")
+REGEX_STRUCT = re.compile(r"^typedef struct (\w+) \{$")
+REGEX_ARRAY = re.compile(r"^(.*\b(\w+))\[\.\.\.\];$")
+REGEX_FUNCTION = re.compile(r"^(?!typedef\b)(?:[\w*]+ )+\**(\w+)\(")
+
+AbiModule = namedtuple("AbiModule", ("ffi", "lib"))
+
+
+def new_type_table():
+    """Returns a new, empty, type table"""
+    return {
+        "version": TYPE_TABLE_VERSION,
+        "constants": {},
+        "typedefs": {},
+        "arrays": {},
+        "functions": {}
+    }
+
+
+def _arrays(cdef):
+    """
+    Generator which produces a tuple of struct name, field name and
+    line number for each array in ``cdef`` with an unknown length.
+    """
+    struct = None
+    for number, line in enumerate(cdef.splitlines()):
+        match = REGEX_STRUCT.match(line)
+        if match:
+            struct = match.group(1)
+            continue
+
+        match = REGEX_ARRAY.match(line)
+        if match:
+            if struct is None:
+                raise InternalError(
+                    "Array %r is not inside of a struct" % match.group(2))
+            yield struct, match.group(2), number
+
+
+def functions(cdef):
+    """Returns a list of the names of the functions declared in ``cdef``"""
+    names = []
+    for line in cdef.splitlines():
+        match = REGEX_FUNCTION.match(line)
+        if match:
+            names.append(match.group(1))
+    return names
+
+
+def exported(library, name):
+    """
+    Returns True if the function ``name`` is exported by the dll
+    named ``library``.
+    """
+    try:
+        getattr(ctypes.WinDLL(library), name)
+    except AttributeError:
+        return False
+    return True
+
+
+def resolve(ffi, library, cdef, exports=None, table=None):
+    """
+    Resolves the values in ``cdef`` which cffi would normally ask the
+    compiler for and stores them in ``table``.
+
+    :param cffi.FFI ffi:
+        The ffi instance for the compiled module ``cdef`` belongs to.
+
+    :param library:
+        The library for the compiled module ``cdef`` belongs to.  This
+        is where the values of constants are retrieved from.
+
+    :param str cdef:
+        A normalized cdef, see :func:`pywincffi.core.dist._normalize`.
+
+    :keyword exports:
+        A function which takes the name of a function and returns True if it's
+        exported by the dll.  If a function is not exported but a function
+        with the same name ending in ``W`` is, the wide character version of
+        the function will be used.  Windows normally handles this in the
+        headers using a macro.
+
+    :keyword dict table:
+        The type table to update.  A new one will be created if
+        not provided.
+
+    :returns:
+        Returns the type table.
+    """
+    if table is None:
+        table = new_type_table()
+
+    for line in cdef.splitlines():
+        match = REGEX_CONSTANT.match(line)
+        if match:
+            name = match.group(1)
+            table["constants"][name] = getattr(library, name)
+            continue
+
+        match = REGEX_TYPEDEF.match(line)
+        if match:
+            name = match.group(1)
+            table["typedefs"][name] = ffi.getctype(name)
+
+    for struct, field, _ in _arrays(cdef):
+        value = ffi.new("struct %s *" % struct)
+        table["arrays"]["%s.%s" % (struct, field)] = len(getattr(value, field))
+
+    if exports is not None:
+        for name in functions(cdef):
+            if not exports(name) and exports(name + "W"):
+                table["functions"][name] = name + "W"
+
+    return table
+
+
+def abi_cdef(cdef, table):
+    """
+    Returns a copy of ``cdef`` which can be used in ABI mode.  The
+    values which are unknown in ``cdef`` are replaced with those from
+    the type table produced by :func:`resolve`.
+
+    :raises pywincffi.exceptions.InternalError:
+        Raised if ``table`` is missing a value for ``cdef``.
+    """
+    lines = cdef.splitlines()
+
+    for struct, field, number in _arrays(cdef):
+        key = "%s.%s" % (struct, field)
+        try:
+            length = table["arrays"][key]
+        except KeyError:
+            raise InternalError("No length for %s in the type table" % key)
+        lines[number] = REGEX_ARRAY.sub(r"\1[%d];" % length, lines[number])
+
+    for number, line in enumerate(lines):
+        match = REGEX_CONSTANT.match(line)
+        if match:
+            name = match.group(1)
+            try:
+                value = table["constants"][name]
+            except KeyError:
+                raise InternalError(
+                    "No value for the constant %s in the type table" % name)
+            lines[number] = "#define %s %d" % (name, value)
+            continue
+
+        match = REGEX_TYPEDEF.match(line)
+        if match:
+            name = match.group(1)
+            try:
+                ctype = table["typedefs"][name]
+            except KeyError:
+                raise InternalError(
+                    "No type for the typedef %s in the type table" % name)
+            lines[number] = "typedef %s %s;" % (ctype, name)
+            continue
+
+        match = REGEX_FUNCTION.match(line)
+        if match and match.group(1) in table["functions"]:
+            name = match.group(1)
+            lines[number] = line.replace(
+                name + "(", table["functions"][name] + "(", 1)
+
+    return "\n".join(lines) + "\n"
+
+
+class AbiLibrary(object):
+    """
+    Wraps a library returned by :meth:`cffi.FFI.dlopen` so it can be used
+    in place of a library compiled in API mode.  Functions are exposed
+    using the names in the headers, ``CreateFile`` rather than
+    ``CreateFileW`` for example, and the utility functions which are
+    normally implemented in ``main.c`` are implemented in Python.
+
+    :param cffi.FFI ffi:
+        The ffi instance ``library`` was opened with.
+
+    :param library:
+        The library returned by :meth:`cffi.FFI.dlopen`.
+
+    :keyword dict aliases:
+        A dictionary mapping function names from the headers to
+        the names exported by the dll.
+    """
+    def __init__(self, ffi, library, aliases=None):
+        self._ffi = ffi
+        self._library = library
+        self._aliases = aliases or {}
+        self._names = dict(
+            (exported_name, name) for name, exported_name
+            in self._aliases.items())
+
+        # Function pointers created by _kernel32_function(), keyed by name.
+        self._functions = {}
+
+    def __dir__(self):
+        return [self._names.get(name, name) for name in dir(self._library)]
+
+    def __getattr__(self, item):
+        return getattr(self._library, self._aliases.get(item, item))
+
+    def __getattribute__(self, item):
+        if item == "__dict__":
+            attributes = {}
+            for name in dir(self):
+                try:
+                    attributes[name] = getattr(self, name)
+
+                # Functions which are declared in the cdefs but are not
+                # exported by the dll can't be retrieved.
+                except AttributeError:
+                    pass
+            return attributes
+
+        return object.__getattribute__(self, item)
+
+    def _kernel32_function(self, name, cdecl):
+        """
+        Returns the function ``name`` exported by kernel32 cast to the
+        function pointer type ``cdecl``.  The function is only looked up
+        the first time it's requested, later calls return the same
+        function pointer.
+        """
+        try:
+            return self._functions[name]
+        except KeyError:
+            address = ctypes.cast(
+                getattr(ctypes.WinDLL("kernel32"), name), ctypes.c_void_p)
+            function = self._functions[name] = self._ffi.cast(
+                cdecl, address.value)
+            return function
+
+    def handle_from_fd(self, fd):
+        """
+        Python implementation of ``handle_from_fd`` from ``main.c``.  Like
+        ``_get_osfhandle`` this returns ``INVALID_HANDLE_VALUE`` if ``fd``
+        is not a valid file descriptor.
+        """
+        try:
+            handle = msvcrt.get_osfhandle(fd)
+        except (OSError, IOError):
+            handle = -1
+        return self._ffi.cast("HANDLE", handle)
+
+    def wsa_invalid_event(self, event):
+        """
+        Python implementation of ``wsa_invalid_event`` from ``main.c``.
+        ``WSA_INVALID_EVENT`` is defined as ``NULL``.
+        """
+        return self._ffi.cast("WSAEVENT", event) == self._ffi.NULL
+
+    def set_file_pointer_ex(
+            self, hFile, liDistanceToMove, lpNewFilePointer, dwMoveMethod):
+        """
+        Python implementation of ``set_file_pointer_ex`` from ``main.c``.
+        A ``LARGE_INTEGER`` is passed by value the same way a ``LONGLONG``
+        is so ``SetFilePointerEx`` is called through a function pointer
+        which takes a ``LONGLONG`` instead.
+        """
+        function = self._kernel32_function(
+            "SetFilePointerEx",
+            "BOOL (__stdcall *)(HANDLE, LONGLONG, PLONGLONG, DWORD)")
+        return function(
+            hFile, liDistanceToMove, lpNewFilePointer, dwMoveMethod)
+
+    def get_file_size_ex(self, hFile, lpFileSize):
+        """
+        Python implementation of ``get_file_size_ex`` from ``main.c``.
+        ``GetFileSizeEx`` is called through a function pointer which takes
+        a ``PLONGLONG`` rather than a ``PLARGE_INTEGER``.
+        """
+        function = self._kernel32_function(
+            "GetFileSizeEx", "BOOL (__stdcall *)(HANDLE, PLONGLONG)")
+        return function(hFile, lpFileSize)
+
+    def __repr__(self):  # pragma: no cover
+        return "%s(%r)" % (self.__class__.__name__, self._library)
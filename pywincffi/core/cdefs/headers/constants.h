@@ -121,8 +121,12 @@
 #define OPEN_EXISTING ...
 #define TRUNCATE_EXISTING ...
 
+// Flags for SetFilePointerEx
+#define FILE_BEGIN ...
+#define FILE_CURRENT ...
+#define FILE_END ...
+
 // Flags for pywincffi.kernel32.pipe (may be shared with other modules too)
-#define PIPE_TYPE_MESSAGE ...
 #define PIPE_READMODE_BYTE ...
 #define PIPE_READMODE_MESSAGE ...
 #define PIPE_WAIT ...
@@ -191,6 +195,20 @@
 #define TIMER_MODIFY_STATE ...
 #define TIMER_QUERY_STATE ...
 
+// File mappings
+// https://msdn.microsoft.com/en-us/library/aa366537
+#define PAGE_READONLY ...
+#define PAGE_READWRITE ...
+#define PAGE_WRITECOPY ...
+#define PAGE_EXECUTE_READ ...
+#define PAGE_EXECUTE_READWRITE ...
+#define PAGE_EXECUTE_WRITECOPY ...
+#define FILE_MAP_ALL_ACCESS ...
+#define FILE_MAP_COPY ...
+#define FILE_MAP_EXECUTE ...
+#define FILE_MAP_READ ...
+#define FILE_MAP_WRITE ...
+
 // STARTUPINFO
 // https://msdn.microsoft.com/en-us/library/ms686331
 #define STARTF_FORCEONFEEDBACK ...
@@ -0,0 +1,18 @@
+//
+// This file contains the functions pywincffi uses from user32.dll.  It's
+// compiled into its own module so only the libraries a program
+// uses need to be loaded, see MODULES in pywincffi/core/dist.py.
+//
+
+///////////////////////
+// Synchronization
+///////////////////////
+
+// https://msdn.microsoft.com/en-us/ms684242
+DWORD WINAPI MsgWaitForMultipleObjects(
+  _In_       DWORD  nCount,
+  _In_ const HANDLE *pHandles,
+  _In_       BOOL   bWaitAll,
+  _In_       DWORD  dwMilliseconds,
+  _In_       DWORD  dwWakeMask
+);
@@ -0,0 +1,34 @@
+//
+// This file contains the functions pywincffi uses from Ws2_32.dll.  It's
+// compiled into its own module so only the libraries a program
+// uses need to be loaded, see MODULES in pywincffi/core/dist.py.
+//
+
+///////////////////////
+// Communications
+///////////////////////
+
+// https://msdn.microsoft.com/en-us/ms737582
+int closesocket(
+  _In_ SOCKET s
+);
+
+// https://msdn.microsoft.com/en-us/ms741576
+int WSAEventSelect(
+  _In_ SOCKET   s,
+  _In_ WSAEVENT hEventObject,
+  _In_ long     lNetworkEvents
+);
+
+// https://msdn.microsoft.com/en-us/ms741580
+int WSAGetLastError(void);
+
+// https://msdn.microsoft.com/en-us/ms741561
+WSAEVENT WSACreateEvent(void);
+
+// https://msdn.microsoft.com/en-us/ms741572
+int WSAEnumNetworkEvents(
+  _In_  SOCKET             s,
+  _In_  WSAEVENT           hEventObject,
+  _Out_ LPWSANETWORKEVENTS lpNetworkEvents
+);
@@ -0,0 +1,9 @@
+// The source used by the per-library modules, _pywincffi_kernel32 for
+// example.  These modules include the types and constants from the core
+// _pywincffi module so they only need the system headers which declare
+// their functions.  Constants, utility functions and the fallbacks for
+// older SDKs belong in main.c instead.
+#include <winsock2.h>
+#include <winerror.h>
+#include <TlHelp32.h>
+#include <windows.h>
@@ -49,3 +49,34 @@ HANDLE handle_from_fd(int fd) {
 BOOL wsa_invalid_event(WSAEVENT event) {
     return event == WSA_INVALID_EVENT;
 }
+
+// Calls SetFilePointerEx() using LONGLONG instead of LARGE_INTEGER.  The
+// distance is passed to SetFilePointerEx() by value and cffi can't pass
+// unions by value in ABI mode or from the simulated library's callbacks.
+BOOL set_file_pointer_ex(
+        HANDLE hFile, LONGLONG liDistanceToMove, PLONGLONG lpNewFilePointer,
+        DWORD dwMoveMethod) {
+    LARGE_INTEGER distance;
+    LARGE_INTEGER position;
+    BOOL result;
+
+    distance.QuadPart = liDistanceToMove;
+    result = SetFilePointerEx(hFile, distance, &position, dwMoveMethod);
+    if (result && lpNewFilePointer != NULL) {
+        *lpNewFilePointer = position.QuadPart;
+    }
+    return result;
+}
+
+// Calls GetFileSizeEx() using LONGLONG instead of LARGE_INTEGER so, like
+// set_file_pointer_ex(), LARGE_INTEGER does not need to be defined.
+BOOL get_file_size_ex(HANDLE hFile, PLONGLONG lpFileSize) {
+    LARGE_INTEGER size;
+    BOOL result;
+
+    result = GetFileSizeEx(hFile, &size);
+    if (result) {
+        *lpFileSize = size.QuadPart;
+    }
+    return result;
+}
@@ -3,8 +3,25 @@ Checks
 ======
 
 Provides functions that are responsible for internal type checks.
+
+Functions which check several inputs on every call can declare them once
+using a :class:`Schema`.  The schema is compiled into a single validator
+which checks every input in one expression and only falls back on
+:func:`input_check`, to produce the same error, when that expression
+fails:
+
+    >>> _CREATE_FILE = Schema("CreateFile", (
+    ...     Argument("lpFileName", text_type),
+    ...     Argument("dwCreationDisposition", allowed_values=Constants(
+    ...         "CREATE_ALWAYS", "OPEN_EXISTING")),
+    ...     Argument("hTemplateFile", HANDLE, optional=True)))
+    >>> _CREATE_FILE.validate(lpFileName, dwCreationDisposition, None)
 """
 
+from collections import namedtuple
+
+import six
+
 from pywincffi.core import dist
 from pywincffi.exceptions import WindowsAPIError, InputError
 
@@ -12,12 +29,16 @@ NoneType = type(None)
 
 NON_ZERO = "NON_ZERO"
 
+_Argument = namedtuple(
+    "Argument", ("name", "allowed_types", "allowed_values", "optional"))
+
 
 def error_check(function, code=None, expected=None):
     """
     Checks the results of a return code against an expected result.  If
     a code is not provided we'll use :func:`ffi.getwinerror` to retrieve
-    the code.
+    the code.  When a code is provided the error number and message are
+    only retrieved if an exception is going to be raised.
 
     :param str function:
         The Windows API function being called.
@@ -33,20 +54,20 @@ def error_check(function, code=None, expected=None):
     :raises pywincffi.exceptions.WindowsAPIError:
         Raised if we receive an unexpected result from a Windows API call
     """
-    ffi, _ = dist.load()
+    # Only a NON_ZERO check can fail when a code is provided so
+    # on success this is the only work we need to do.
+    if code is not None and (code != 0 or expected != NON_ZERO):
+        return
+
+    ffi, _ = dist.load("core")
     errno, error_message = ffi.getwinerror()
 
-    if code is not None:
-        if expected == NON_ZERO and code == 0:
-            raise WindowsAPIError(
-                function, error_message, errno,
-                return_code=code, expected_return_code=expected)
+    if code is None and errno == 0:
         return
 
-    if errno != 0:
-        raise WindowsAPIError(
-            function, error_message, errno, return_code=code,
-            expected_return_code=expected)
+    raise WindowsAPIError(
+        function, error_message, errno, return_code=code,
+        expected_return_code=expected)
 
 
 def input_check(name, value, allowed_types=None, allowed_values=None):
@@ -83,11 +104,130 @@ def input_check(name, value, allowed_types=None, allowed_values=None):
         raise TypeError("`allowed_values` must be a tuple")
 
     if allowed_types is not None and not isinstance(value, allowed_types):
-        ffi, _ = dist.load()
+        ffi, _ = dist.load("core")
         raise InputError(
             name, value, ffi=ffi, allowed_types=allowed_types)
 
     if allowed_values is not None and value not in allowed_values:
-        ffi, _ = dist.load()
+        ffi, _ = dist.load("core")
         raise InputError(
             name, value, None, ffi=ffi, allowed_values=allowed_values)
+
+
+class Argument(_Argument):
+    """
+    Describes one input to a function checked by a :class:`Schema`.  The
+    ``name``, ``allowed_types`` and ``allowed_values`` have the same meaning
+    as they do for :func:`input_check`.  When ``optional`` is True a value
+    of ``None`` is accepted without being checked.
+    """
+    __slots__ = ()
+
+    def __new__(  # pylint: disable=too-many-arguments
+            cls, name, allowed_types=None, allowed_values=None,
+            optional=False):
+        if allowed_values is not None and \
+                not isinstance(allowed_values, tuple):
+            raise TypeError("`allowed_values` must be a tuple")
+        return super(Argument, cls).__new__(
+            cls, name, allowed_types, allowed_values, optional)
+
+
+class Constants(tuple):
+    """
+    A tuple of constant names which can be used as the ``allowed_values``
+    of an :class:`Argument`.  The names are resolved using the library
+    when the :class:`Schema` is compiled.
+    """
+    def __new__(cls, *names):
+        return super(Constants, cls).__new__(cls, names)
+
+
+class Schema(object):
+    """
+    Declares the inputs a function accepts so they can be checked by a
+    single validator rather than one call to :func:`input_check` per
+    input.
+
+    :param str function:
+        The name of the function the inputs belong to.
+
+    :param tuple arguments:
+        A tuple of :class:`Argument` instances.  The validator accepts
+        the values of the inputs positionally in the same order.
+    """
+    def __init__(self, function, arguments):
+        self.function = function
+        self.arguments = tuple(arguments)
+        self._allowed_values = [
+            argument.allowed_values for argument in self.arguments]
+
+    def validate(self, *values):
+        """
+        Checks ``values``, the compiled validator replaces this
+        method on the first call.
+
+        :raises pywincffi.exceptions.InputError:
+            Raised for the first value which does not match
+            its :class:`Argument`.
+        """
+        self.validate = self.compile()
+        self.validate(*values)
+
+    def fail(self, *values):
+        """
+        Called by the compiled validator when one of ``values`` is invalid
+        to raise the same error :func:`input_check` would have.
+        """
+        for argument, allowed_values, value in zip(
+                self.arguments, self._allowed_values, values):
+            if argument.optional and value is None:
+                continue
+            input_check(
+                argument.name, value, allowed_types=argument.allowed_types,
+                allowed_values=allowed_values)
+
+    def compile(self):
+        """
+        Returns a function which checks every input in a single
+        expression and calls :meth:`fail` if any of them are invalid.
+        """
+        _, library = dist.load("core")
+        names = ["_%d" % index for index in range(len(self.arguments))]
+        namespace = {"_fail": self.fail}
+        conditions = []
+
+        for index, argument in enumerate(self.arguments):
+            name = names[index]
+            checks = []
+            if argument.allowed_types is not None:
+                namespace[name + "_types"] = argument.allowed_types
+                checks.append("isinstance(%s, %s_types)" % (name, name))
+
+            if argument.allowed_values is not None:
+                values = argument.allowed_values
+                if isinstance(values, Constants):
+                    values = tuple(getattr(library, value) for value in values)
+                    self._allowed_values[index] = values
+                namespace[name + "_values"] = values
+                checks.append("%s in %s_values" % (name, name))
+
+            if not checks:
+                continue
+
+            condition = " and ".join(checks)
+            if argument.optional:
+                condition = "%s is None or %s" % (name, condition)
+            conditions.append("(%s)" % condition)
+
+        arguments = ", ".join(names)
+        source = "def validate(%s):\n" % arguments
+        if conditions:
+            source += "    if not (%s):\n" % " and ".join(conditions)
+            source += "        _fail(%s)\n" % arguments
+        else:
+            source += "    pass\n"
+
+        six.exec_(
+            compile(source, "<schema %s>" % self.function, "exec"), namespace)
+        return namespace["validate"]
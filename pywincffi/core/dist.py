@@ -16,24 +16,39 @@ process to build and install pywincffi as well as a wheel
 for distribution.
 """
 
+import hashlib
+import importlib
+import json
+import os
+import platform
 import re
 import shutil
+import struct
+import sys
 import tempfile
-from errno import ENOENT
-from os.path import join, isfile
-
-# pylint: disable=no-name-in-module
-from pkg_resources import resource_filename
-
+import time
+from collections import namedtuple
+from errno import ENOENT, EEXIST, EACCES
+from functools import partial
+from os.path import (
+    join, isfile, isdir, expanduser, getmtime, basename, dirname, abspath)
+
+import cffi
 from cffi import FFI
 
-from pywincffi.exceptions import ResourceNotFoundError, InternalError
+from pywincffi.core import abi, values
+from pywincffi.core.logger import get_logger
+from pywincffi.exceptions import (
+    InputError, ResourceNotFoundError, InternalError, ConfigurationError)
 
 imp = None  # pylint: disable=invalid-name
 ExtensionFileLoader = None  # pylint: disable=invalid-name
+SourceFileLoader = None  # pylint: disable=invalid-name
+EXTENSION_SUFFIXES = None  # pylint: disable=invalid-name
 try:
     # pylint: disable=wrong-import-order,wrong-import-position,import-error
-    from importlib.machinery import ExtensionFileLoader
+    from importlib.machinery import (
+        ExtensionFileLoader, SourceFileLoader, EXTENSION_SUFFIXES)
 except ImportError:  # pragma: no cover
     import imp  # pylint: disable=wrong-import-position,wrong-import-order
 
@@ -43,24 +58,89 @@ try:
 except NameError:  # pragma: no cover
     WindowsError = OSError  # pylint: disable=redefined-builtin
 
+logger = get_logger("core.dist")
+
 __all__ = ("load", )
 
 MODULE_NAME = "_pywincffi"
+
+# The cdefs are located using this module's path rather than with
+# pkg_resources which can be slow to import.
+CDEFS_DIRECTORY = join(dirname(abspath(__file__)), "cdefs")
+HEADERS_DIRECTORY = join(CDEFS_DIRECTORY, "headers")
+SOURCES_DIRECTORY = join(CDEFS_DIRECTORY, "sources")
 HEADER_FILES = (
-    resource_filename(
-        "pywincffi", join("core", "cdefs", "headers", "typedefs.h")),
-    resource_filename(
-        "pywincffi", join("core", "cdefs", "headers", "constants.h")),
-    resource_filename(
-        "pywincffi", join("core", "cdefs", "headers", "structs.h")),
-    resource_filename(
-        "pywincffi", join("core", "cdefs", "headers", "functions.h")))
-SOURCE_FILES = (
-    resource_filename(
-        "pywincffi", join("core", "cdefs", "sources", "main.c")), )
-LIBRARIES = ("kernel32", "user32", "Ws2_32")
+    join(HEADERS_DIRECTORY, "typedefs.h"),
+    join(HEADERS_DIRECTORY, "constants.h"),
+    join(HEADERS_DIRECTORY, "structs.h"),
+    join(HEADERS_DIRECTORY, "functions.h"))
+SOURCE_FILES = (join(SOURCES_DIRECTORY, "main.c"), )
+LIBRARIES = ()
+
+# The modules which make up pywincffi's compiled library.  The core module
+# contains the types, constants and utility functions.  Each Windows
+# library then gets its own module which includes the core module so
+# a program only pays for loading the libraries it actually uses.
+ModuleDefinition = namedtuple(
+    "ModuleDefinition",
+    ("module_name", "headers", "sources", "libraries", "includes"))
+MODULES = {
+    "core": ModuleDefinition(
+        MODULE_NAME, HEADER_FILES, SOURCE_FILES, LIBRARIES, ()),
+    "kernel32": ModuleDefinition(
+        MODULE_NAME + "_kernel32",
+        (join(HEADERS_DIRECTORY, "kernel32.h"), ),
+        (join(SOURCES_DIRECTORY, "library.c"), ),
+        ("kernel32", ), ("core", )),
+    "user32": ModuleDefinition(
+        MODULE_NAME + "_user32",
+        (join(HEADERS_DIRECTORY, "user32.h"), ),
+        (join(SOURCES_DIRECTORY, "library.c"), ),
+        ("user32", ), ("core", )),
+    "ws2_32": ModuleDefinition(
+        MODULE_NAME + "_ws2_32",
+        (join(HEADERS_DIRECTORY, "ws2_32.h"), ),
+        (join(SOURCES_DIRECTORY, "library.c"), ),
+        ("Ws2_32", ), ("core", ))
+}
+
+# The order libraries are searched in when :func:`load` is called
+# without naming a library.
+LIBRARY_ORDER = ("core", "kernel32", "user32", "ws2_32")
 REGEX_SAL_ANNOTATION = re.compile(
     r"\b(_In_|_Inout_|_Out_|_Outptr_|_Reserved_)(opt_)?\b")
+REGEX_COMMENT = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+# The directory which the normalized cdefs produced by :func:`_write_cdefs`
+# are written to when pywincffi is built.  A source checkout won't have this
+# directory so the headers are read and normalized at runtime instead.
+GENERATED_DIRECTORY = join(CDEFS_DIRECTORY, "generated")
+GENERATED_MANIFEST = "manifest.json"
+GENERATED_MANIFEST_VERSION = 1
+
+# The ABI mode modules, and the type table they are produced from, are
+# written to ``GENERATED_DIRECTORY`` as well.  See :mod:`pywincffi.core.abi`.
+ABI_MODULE_NAME = MODULE_NAME + "_abi"
+ABI_TYPE_TABLE = "abi.json"
+
+# The constants, resolved to integers, are written to ``GENERATED_DIRECTORY``
+# as a Python module so they can be used without loading the library.  See
+# :func:`_write_constants` and :mod:`pywincffi.constants`.
+CONSTANTS_MODULE_NAME = MODULE_NAME + "_constants"
+
+# The environment variable which may be used to select the mode pywincffi is
+# loaded in.  See :func:`_select_mode` for more information.
+MODE_ENVIRONMENT_VARIABLE = "PYWINCFFI_MODE"
+MODES = ("auto", "api", "abi", "simulated")
+
+# The environment variable which may be used to override the directory
+# returned by :func:`_cache_directory`.
+CACHE_DIRECTORY_ENVIRONMENT_VARIABLE = "PYWINCFFI_CACHE_DIR"
+
+# How long, in seconds, a process will wait on another process which
+# is building the same module before building the module itself.  Lock
+# files older than this are considered to have been abandoned.
+CACHE_LOCK_TIMEOUT = 300
 
 
 class LibraryWrapper(object):  # pylint: disable=too-few-public-methods
@@ -96,87 +176,195 @@ class LibraryWrapper(object):  # pylint: disable=too-few-public-methods
         MAX_COMMAND_LINE=32768
     )
 
-    def __init__(self, library):
+    __slots__ = ("_library", "_libraries", "__dict__")
+
+    def __init__(self, library, *libraries):
         self._library = library
+        self._libraries = (library, ) + libraries
+
+        # Every attribute is resolved once, up front, and stored in the
+        # instance's __dict__.  This way looking up a function or constant
+        # costs the same as looking up an attribute on a module rather
+        # than going through __getattr__ on every call.
+        namespace = self._RUNTIME_CONSTANTS.copy()
+        for wrapped in reversed(self._libraries):
+            for name, value in wrapped.__dict__.items():
+                if not name.startswith("__"):
+                    namespace[name] = value
+        self.__dict__.update(namespace)
 
     def __dir__(self):
         """
         Overrides the default ``__dir__`` function so functions such as
-        :func:`dir` return the attributes of the underlying library plus
+        :func:`dir` return the attributes of the underlying libraries plus
         the runtime constants.
         """
-        return dir(self._library) + list(self._RUNTIME_CONSTANTS.keys())
-
-    def __getattribute__(self, item):
-        """
-        Overrides the default ``__getattribute__`` function so that we
-        can provide more useful results for certain attributes.
-        """
-        if item == "__dict__":
-            library_dict = self._library.__dict__.copy()
-            library_dict.update(self._RUNTIME_CONSTANTS)
-            return library_dict
-
-        return object.__getattribute__(self, item)
-
-    def __getattr__(self, item):
-        """
-        Attempts to retrieve the requested attribute.  This will first look
-        for the attribute on the library we're wrapping then try to look
-        for a runtime constant defined on this class.
-        """
-        # Most likely we're looking for an attribute on the
-        # compiled library.
-        try:
-            return getattr(self._library, item)
-        except AttributeError as initial_exception:
-            # Maybe it's a predefined constant?
-            try:
-                return self._RUNTIME_CONSTANTS[item]
-            except KeyError:
-                pass
-
-            # It's not an attribute in either the library or the
-            # runtime constants so it shouldn't exist.
-            raise initial_exception
+        return list(self.__dict__)
 
     def __repr__(self):  # pragma: no cover
-        return "%s(%r)" % (self.__class__.__name__, self._library)
+        return "%s(%s)" % (
+            self.__class__.__name__, ", ".join(map(repr, self._libraries)))
 
 
 class Loader(object):
     """
-    A class which provides a cache for :func:`load`.
+    A class which provides a cache for :func:`load`.  Each entry
+    in the cache is keyed by the name of the library it was
+    loaded for, ``kernel32`` for example.
     """
-    cache = None
+    cache = {}
 
     @classmethod
-    def set(cls, ffi, library):
+    def set(cls, ffi, library, name=None):
         """
-        Establishes the cache.
+        Establishes the cache for ``name``.
 
         :raises pywincffi.exceptions.InternalError:
             Raised if the cache was already setup once.
         """
-        if cls.cache is not None:
+        if name in cls.cache:
             # Setting up the cache multiple times is an indication of a
             # possible bug.
-            raise InternalError("The cache has already been established")
+            raise InternalError(
+                "The cache for %r has already been established" % name)
 
-        cls.cache = (ffi, library)
+        cls.cache[name] = (ffi, library)
 
     @classmethod
-    def get(cls):
+    def get(cls, name=None):
         """
-        Retrieves the current cache.
+        Retrieves the current cache for ``name``.
 
         :raises pywincffi.exceptions.InternalError:
             Raised if an attempt is made to retrieve the cache when it
             has not been setup yet.
         """
-        if cls.cache is None:
-            raise InternalError("The cache has not been established yet")
-        return cls.cache
+        try:
+            return cls.cache[name]
+        except KeyError:
+            raise InternalError(
+                "The cache for %r has not been established yet" % name)
+
+
+class CacheLock(object):
+    """
+    A simple, cross process, lock which is used by :func:`_compile_cached`
+    so only one process at a time will build a given module.  The lock
+    is a file created with ``O_EXCL`` so this works the same way on all
+    platforms and does not require any additional dependencies.
+
+    :param str path:
+        The path to the lock file.
+
+    :keyword int timeout:
+        The age, in seconds, after which an existing lock file is
+        considered to have been abandoned by another process.
+    """
+    def __init__(self, path, timeout=CACHE_LOCK_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self.acquired = False
+
+    def _stale(self):
+        """
+        Returns the modification time of the lock file if it exists but
+        has been abandoned, None otherwise.
+        """
+        try:
+            mtime = getmtime(self.path)
+        except (OSError, IOError, WindowsError):
+            return None
+        if time.time() - mtime > self.timeout:
+            return mtime
+        return None
+
+    def _remove_stale(self, mtime):
+        """
+        Removes the lock file if it's still the abandoned file which
+        was last modified at ``mtime``.  Several processes may decide the
+        same lock is stale so the file is renamed first, which only one of
+        them can do, and then checked.  Otherwise a process could remove
+        the lock another process created after the stale one was removed.
+        """
+        claimed = "%s.%d-%d.stale" % (self.path, os.getpid(), id(self))
+        try:
+            os.rename(self.path, claimed)
+        except (OSError, IOError, WindowsError) as error:
+            # Another process already claimed the stale lock.  EACCES
+            # can be raised on Windows while it's being removed.
+            if error.errno not in (ENOENT, EACCES):  # pragma: no cover
+                raise
+            return
+
+        if getmtime(claimed) == mtime:
+            logger.warning("Removed stale lock %s", self.path)
+            os.remove(claimed)
+            return
+
+        # The file was replaced by a new lock after we decided it was
+        # stale so it has to be put back without replacing a newer lock,
+        # rename() does not replace files on Windows but link() is
+        # required elsewhere.
+        try:
+            if os.name == "nt":
+                os.rename(claimed, self.path)
+            else:
+                os.link(claimed, self.path)
+        except (OSError, IOError, WindowsError) as error:  # pragma: no cover
+            if error.errno != EEXIST:
+                raise
+            logger.warning(
+                "Failed to restore lock %s, it was replaced", self.path)
+        finally:
+            if isfile(claimed):
+                os.remove(claimed)
+
+    def acquire(self):
+        """
+        Acquires the lock, waiting for another process to release it
+        if necessary.  If the lock file is older than ``timeout`` it's
+        considered to have been abandoned and will be replaced.
+        """
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except (OSError, IOError, WindowsError) as error:
+                # EACCES can be raised on Windows if the lock file is in
+                # the process of being removed by another process.
+                if error.errno not in (EEXIST, EACCES):
+                    raise
+
+                mtime = self._stale()
+                if mtime is not None:
+                    self._remove_stale(mtime)
+                else:
+                    time.sleep(0.1)
+            else:
+                os.write(fd, str(os.getpid()).encode("ascii"))
+                os.close(fd)
+                self.acquired = True
+                return
+
+    def release(self):
+        """
+        Releases the lock if this instance acquired it.
+        """
+        if not self.acquired:
+            return
+
+        try:
+            os.remove(self.path)
+        except (OSError, IOError, WindowsError) as error:
+            if error.errno != ENOENT:  # pragma: no cover
+                raise
+        self.acquired = False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *_):
+        self.release()
 
 
 def _import_path(path, module_name=MODULE_NAME):
@@ -211,6 +399,27 @@ def _import_path(path, module_name=MODULE_NAME):
             "Neither `imp` or `ExtensionFileLoader` were imported")
 
 
+def _import_source(path, module_name):
+    """
+    Imports the Python source file at ``path`` and returns it as a
+    module.  This is used to import the ABI mode modules written by
+    :func:`_write_abi_modules`.
+
+    :raises ResourceNotFoundError:
+        Raised if ``path`` does not exist.
+    """
+    if not isfile(path):
+        raise ResourceNotFoundError("Module path %r does not exist" % path)
+
+    elif SourceFileLoader is not None:
+        loader = SourceFileLoader(module_name, path)
+        # pylint: disable=deprecated-method
+        return loader.load_module(module_name)
+
+    else:  # pragma: no cover
+        return imp.load_source(module_name, path)
+
+
 def _read(*paths):
     """
     Iterates over ``files`` and produces string which combines all inputs
@@ -232,9 +441,144 @@ def _read(*paths):
     return output
 
 
+def _normalize(header):
+    """
+    Returns a normalized copy of ``header`` which is ready to be passed
+    into :meth:`FFI.cdef`.  Comments, blank lines and redundant whitespace
+    are removed along with any SAL annotations.
+    """
+    # Windows uses SAL annotations which can provide some helpful information
+    # about the inputs and outputs to a function.  Rather than require these
+    # to be stripped out manually we should strip them out programmatically.
+    header = REGEX_SAL_ANNOTATION.sub(" ", REGEX_COMMENT.sub(" ", header))
+
+    lines = []
+    for line in header.splitlines():
+        line = " ".join(line.split())
+        if line:
+            lines.append(line)
+
+    return "\n".join(lines) + "\n"
+
+
+def _write_cdefs(directory=None):
+    """
+    Writes the normalized cdef for each module in :data:`MODULES` into
+    ``directory`` along with a manifest containing a hash of each
+    cdef.  This is called by the setup.py when pywincffi is built so
+    :func:`_cdef` doesn't have to parse the headers at runtime.
+
+    :keyword str directory:
+        The directory to write to.  Defaults to ``GENERATED_DIRECTORY``.
+
+    :returns:
+        Returns the path to the manifest.
+    """
+    if directory is None:
+        directory = GENERATED_DIRECTORY
+
+    if not isdir(directory):
+        os.makedirs(directory)
+
+    manifest = {
+        "version": GENERATED_MANIFEST_VERSION,
+        "modules": {}
+    }
+    for name, definition in MODULES.items():
+        cdef = _normalize(_read(*definition.headers))
+        filename = name + ".h"
+        with open(join(directory, filename), "w") as file_:
+            file_.write(cdef)
+
+        manifest["modules"][name] = {
+            "cdef": filename,
+            "headers": [basename(path) for path in definition.headers],
+            "sha256": hashlib.sha256(cdef.encode("utf-8")).hexdigest()
+        }
+
+    # The manifest is written last, and its mtime is what :func:`_cdef`
+    # compares the headers against, so a partially written directory
+    # is never considered to be up to date.
+    path = join(directory, GENERATED_MANIFEST)
+    with open(path, "w") as file_:
+        json.dump(manifest, file_, indent=2, sort_keys=True)
+
+    return path
+
+
+def _generated_cdef(headers, directory=None):
+    """
+    Returns the normalized cdef produced by :func:`_write_cdefs` for
+    ``headers`` or None if there's not one or it's out of date.  A cdef
+    is considered out of date if any of the headers have been modified
+    since the manifest was written.
+
+    :keyword str directory:
+        The directory to read from.  Defaults to ``GENERATED_DIRECTORY``.
+    """
+    if directory is None:
+        directory = GENERATED_DIRECTORY
+
+    manifest_path = join(directory, GENERATED_MANIFEST)
+    try:
+        manifest_mtime = getmtime(manifest_path)
+        with open(manifest_path, "r") as file_:
+            manifest = json.load(file_)
+    except (OSError, IOError, WindowsError, ValueError):
+        return None
+
+    if manifest.get("version") != GENERATED_MANIFEST_VERSION:
+        return None
+
+    # The manifest only describes pywincffi's own headers.
+    for path in headers:
+        if dirname(abspath(path)) != abspath(HEADERS_DIRECTORY):
+            return None
+
+    names = [basename(path) for path in headers]
+    for entry in manifest["modules"].values():
+        if entry["headers"] == names:
+            break
+    else:
+        return None
+
+    try:
+        for path in headers:
+            if getmtime(path) > manifest_mtime:
+                logger.debug("%s is newer than %s", path, manifest_path)
+                return None
+
+        with open(join(directory, entry["cdef"]), "r") as file_:
+            cdef = file_.read()
+    except (OSError, IOError, WindowsError):
+        return None
+
+    if hashlib.sha256(cdef.encode("utf-8")).hexdigest() != entry["sha256"]:
+        logger.warning("%s does not match %s", entry["cdef"], manifest_path)
+        return None
+
+    return cdef
+
+
+def _cdef(*headers):
+    """
+    Returns the normalized cdef for ``headers``.  The cdef generated
+    by :func:`_write_cdefs` at build time is preferred but if that's
+    not present, or it's out of date, the headers are read and
+    normalized instead.
+
+    :raises ResourceNotFoundError:
+        Raised if one of the headers is missing.
+    """
+    cdef = _generated_cdef(headers)
+    if cdef is None:
+        cdef = _normalize(_read(*headers))
+    return cdef
+
+
 def _ffi(
         module_name=MODULE_NAME, headers=HEADER_FILES, sources=SOURCE_FILES,
-        libraries=LIBRARIES):
+        libraries=LIBRARIES, includes=()):
     """
     Returns an instance of :class:`FFI` without compiling
     the module.  This function is used internally but also
@@ -248,22 +592,59 @@ def _ffi(
 
     :keyword tuple sources:
         Optional path(s) to the source files.
+
+    :keyword tuple libraries:
+        Optional name(s) of the libraries to link against.
+
+    :keyword tuple includes:
+        Optional instance(s) of :class:`FFI` whose types, constants
+        and functions should be included in this one.
     """
-    header = _read(*headers)
+    header = _cdef(*headers)
     source = _read(*sources)
 
     ffi = FFI()
-    ffi.set_unicode(True)
-    ffi.set_source(module_name, source, libraries=libraries)
+    for included in includes:
+        ffi.include(included)
 
-    # Windows uses SAL annotations which can provide some helpful information
-    # about the inputs and outputs to a function.  Rather than require these
-    # to be stripped out manually we should strip them out programmatically.
-    ffi.cdef(REGEX_SAL_ANNOTATION.sub(" ", header))
+    # The unicode typedefs, such as LPTSTR, are inherited from
+    # the included modules so they can only be defined once.
+    if not includes:
+        ffi.set_unicode(True)
+    ffi.set_source(module_name, source, libraries=libraries)
+    ffi.cdef(header)
 
     return ffi
 
 
+def _module_ffi(name="core"):
+    """
+    Returns an instance of :class:`FFI` for the module named ``name``
+    in :data:`MODULES`, including any modules it depends on.
+    """
+    definition = MODULES[name]
+    includes = tuple(_module_ffi(include) for include in definition.includes)
+    return _ffi(
+        module_name=definition.module_name, headers=definition.headers,
+        sources=definition.sources, libraries=definition.libraries,
+        includes=includes)
+
+
+def _kernel32_ffi():
+    """Entrypoint in the setup.py for the kernel32 module."""
+    return _module_ffi("kernel32")
+
+
+def _user32_ffi():
+    """Entrypoint in the setup.py for the user32 module."""
+    return _module_ffi("user32")
+
+
+def _ws2_32_ffi():
+    """Entrypoint in the setup.py for the ws2_32 module."""
+    return _module_ffi("ws2_32")
+
+
 def _compile(ffi, tmpdir=None, module_name=MODULE_NAME):
     """
     Performs the compile step, loads the resulting module and then
@@ -297,20 +678,510 @@ def _compile(ffi, tmpdir=None, module_name=MODULE_NAME):
     return module
 
 
-def load():
+def _extension_suffix():
+    """
+    Returns the file suffix the running interpreter uses for C extension
+    modules, ``.cp36-win_amd64.pyd`` for example.
+    """
+    if EXTENSION_SUFFIXES is not None:
+        return EXTENSION_SUFFIXES[0]
+
+    for suffix, _, module_type in imp.get_suffixes():  # pragma: no cover
+        if module_type == imp.C_EXTENSION:
+            return suffix
+
+    raise InternalError(  # pragma: no cover
+        "Failed to determine the suffix for C extensions")
+
+
+def _interpreter_abi():
+    """
+    Returns a string which identifies the binary interface of the running
+    interpreter.  A module compiled for one interpreter cannot be imported
+    by another interpreter unless this value matches.
+    """
+    return "{implementation}-{version}-{bits}{suffix}".format(
+        implementation=platform.python_implementation(),
+        version=".".join(map(str, sys.version_info[0:2])),
+        bits=struct.calcsize("P") * 8,
+        suffix=_extension_suffix())
+
+
+def _cache_key(
+        module_name=MODULE_NAME, headers=HEADER_FILES, sources=SOURCE_FILES,
+        libraries=LIBRARIES):
+    """
+    Returns a hash which uniquely identifies the module that would be built
+    from the given inputs.  The content of the headers and sources, the
+    libraries, the version of cffi and the interpreter's ABI are all
+    included so a change to any of them produces a different key.
+
+    :raises ResourceNotFoundError:
+        Raised if one of the headers or sources is missing.
+    """
+    sha = hashlib.sha256()
+    parts = [module_name, cffi.__version__, _interpreter_abi()]
+    parts.extend(libraries)
+    parts.extend(_read(path) for path in tuple(headers) + tuple(sources))
+
+    for part in parts:
+        sha.update(part.encode("utf-8"))
+        sha.update(b"\0")
+
+    return sha.hexdigest()
+
+
+def _cache_directory():
+    """
+    Returns the per-user directory which compiled modules are cached in.  The
+    ``PYWINCFFI_CACHE_DIR`` environment variable may be used to override the
+    default location which is ``%LOCALAPPDATA%\\pywincffi\\cache`` on Windows
+    and ``$XDG_CACHE_HOME/pywincffi`` elsewhere.
+    """
+    path = os.environ.get(CACHE_DIRECTORY_ENVIRONMENT_VARIABLE)
+    if path:
+        return path
+
+    if os.name == "nt":  # pragma: no cover
+        root = os.environ.get(
+            "LOCALAPPDATA", join(expanduser("~"), "AppData", "Local"))
+        return join(root, "pywincffi", "cache")
+
+    root = os.environ.get("XDG_CACHE_HOME", join(expanduser("~"), ".cache"))
+    return join(root, "pywincffi")
+
+
+def _compile_cached(ffi, cache_key, module_name=MODULE_NAME, cache_dir=None):
+    """
+    Loads the module for ``ffi`` from the cache, compiling it first if
+    the cache does not contain a module for ``cache_key`` yet.
+
+    Modules are compiled in a temporary directory and then renamed into
+    ``cache_dir/cache_key``.  Because the rename is atomic other processes
+    will either see the complete module or nothing at all.  A
+    :class:`CacheLock` is also held while compiling so concurrent processes
+    wait for the module rather than all compiling it at once.
+
+    :param cffi.FFI ffi:
+        An instance of :class:`FFI` which you wish to compile and load
+        the resulting module for.
+
+    :param str cache_key:
+        The key to store the module under, see :func:`_cache_key`.
+
+    :keyword str module_name:
+        Optional name of the module to be imported.
+
+    :keyword str cache_dir:
+        The directory containing the cache.  By default the value
+        returned by :func:`_cache_directory` will be used.
+
+    :returns:
+        Returns the module built by compiling the ``ffi`` object.
+    """
+    if cache_dir is None:
+        cache_dir = _cache_directory()
+
+    module_directory = join(cache_dir, cache_key)
+    path = join(module_directory, module_name + _extension_suffix())
+
+    if not isfile(path):
+        if not isdir(cache_dir):
+            try:
+                os.makedirs(cache_dir)
+            except (OSError, IOError, WindowsError) as error:
+                if error.errno != EEXIST:  # pragma: no cover
+                    raise
+
+        with CacheLock(module_directory + ".lock"):
+            # Another process may have built the module while
+            # we were waiting on the lock.
+            if not isfile(path):
+                logger.debug("Compiling %s into %s", module_name, path)
+                tmpdir = tempfile.mkdtemp(prefix="build-", dir=cache_dir)
+                try:
+                    built = ffi.compile(tmpdir=tmpdir)
+                    staging = tempfile.mkdtemp(prefix="stage-", dir=cache_dir)
+                    shutil.move(
+                        built, join(staging, os.path.basename(path)))
+
+                    try:
+                        os.rename(staging, module_directory)
+                    except (OSError, IOError, WindowsError):
+                        # Someone else managed to publish first, which
+                        # is fine because the results are identical.
+                        shutil.rmtree(staging, ignore_errors=True)
+                        if not isfile(path):  # pragma: no cover
+                            raise
+                finally:
+                    shutil.rmtree(tmpdir, ignore_errors=True)
+
+    return _import_path(path, module_name=module_name)
+
+
+def _module_inputs(name):
+    """
+    Returns a tuple of the headers and sources which are used to build
+    the module named ``name``, including those of the modules it includes.
+    Changing any of these files should produce a new module.
+    """
+    definition = MODULES[name]
+    headers, sources = (), ()
+    for include in definition.includes:
+        included_headers, included_sources = _module_inputs(include)
+        headers += included_headers
+        sources += included_sources
+
+    return headers + definition.headers, sources + definition.sources
+
+
+def _load_cached(name="core"):
+    """
+    Compiles and loads the module for ``name`` using the per-user cache. If
+    the cache directory can't be written to the module is compiled into a
+    temporary directory instead, see :func:`_compile`.
+    """
+    definition = MODULES[name]
+    module_name = definition.module_name
+    headers, sources = _module_inputs(name)
+    ffi = _module_ffi(name)
+    try:
+        return _compile_cached(
+            ffi, _cache_key(
+                module_name=module_name, headers=headers, sources=sources,
+                libraries=definition.libraries),
+            module_name=module_name)
+    except (OSError, IOError, WindowsError) as error:
+        logger.warning(
+            "Failed to use the module cache (error: %s), compiling %s into "
+            "a temporary directory instead", error, module_name)
+        return _compile(ffi, module_name=module_name)
+
+
+def _abi_module_name(name):
+    """
+    Returns the name of the ABI mode module for ``name``,
+    ``_pywincffi_abi_kernel32`` for example.
+    """
+    return MODULES[name].module_name.replace(MODULE_NAME, ABI_MODULE_NAME, 1)
+
+
+def _abi_ffi(name, table):
+    """
+    Returns an instance of :class:`FFI` for the ABI mode module of ``name``
+    in :data:`MODULES`, including any modules it depends on.
+
+    :param str name:
+        The name of the module in :data:`MODULES`.
+
+    :param dict table:
+        The type table produced by :func:`_resolve_abi_table`.
+    """
+    definition = MODULES[name]
+
+    ffi = FFI()
+    for include in definition.includes:
+        ffi.include(_abi_ffi(include, table))
+
+    if not definition.includes:
+        ffi.set_unicode(True)
+
+    ffi.set_source(_abi_module_name(name), None)
+    ffi.cdef(abi.abi_cdef(_cdef(*definition.headers), table))
+    return ffi
+
+
+def _resolve_abi_table():  # pragma: no cover
+    """
+    Produces the type table used by the ABI mode modules.  This requires
+    the API mode modules, and therefore a compiler, so it's only called when
+    pywincffi is being built.  See :func:`pywincffi.core.abi.resolve`.
+
+    :raises pywincffi.exceptions.InternalError:
+        Raised if pywincffi is not being loaded in API mode.
+    """
+    if _select_mode() != "api":
+        raise InternalError(
+            "The type table can only be produced in API mode, set "
+            "%s=api" % MODE_ENVIRONMENT_VARIABLE)
+
+    table = abi.new_type_table()
+    for name in LIBRARY_ORDER:
+        definition = MODULES[name]
+        ffi, library = load(name)
+        abi.resolve(
+            ffi, library, _cdef(*definition.headers), table=table,
+            exports=partial(
+                abi.exported, (definition.libraries or ("kernel32", ))[0]))
+    return table
+
+
+def _write_abi_modules(table, directory=None):
+    """
+    Writes the ABI mode module for each module in :data:`MODULES` into
+    ``directory`` along with the type table they were produced from.  This
+    is called by the setup.py when pywincffi is built so nothing has to be
+    compiled in order to use ABI mode.
+
+    :param dict table:
+        The type table produced by :func:`_resolve_abi_table`.
+
+    :keyword str directory:
+        The directory to write to.  Defaults to ``GENERATED_DIRECTORY``.
+
+    :returns:
+        Returns the path to the type table.
+    """
+    if directory is None:
+        directory = GENERATED_DIRECTORY
+
+    if not isdir(directory):
+        os.makedirs(directory)
+
+    for name in MODULES:
+        _abi_ffi(name, table).emit_python_code(
+            join(directory, _abi_module_name(name) + ".py"))
+
+    path = join(directory, ABI_TYPE_TABLE)
+    with open(path, "w") as file_:
+        json.dump(table, file_, indent=2, sort_keys=True)
+
+    return path
+
+
+def _abi_type_table(directory=None):
+    """
+    Returns the type table written by :func:`_write_abi_modules`.
+
+    :raises ResourceNotFoundError:
+        Raised if the type table does not exist or was produced by
+        a different version of :mod:`pywincffi.core.abi`.
+    """
+    if directory is None:
+        directory = GENERATED_DIRECTORY
+
+    path = join(directory, ABI_TYPE_TABLE)
+    try:
+        with open(path, "r") as file_:
+            table = json.load(file_)
+    except (OSError, IOError, WindowsError, ValueError):
+        raise ResourceNotFoundError("Failed to load %s" % path)
+
+    if table.get("version") != abi.TYPE_TABLE_VERSION:
+        raise ResourceNotFoundError(
+            "%s was produced by a different version of pywincffi" % path)
+
+    return table
+
+
+def _import_abi_module(name, directory):
+    """
+    Imports and returns the ABI mode module for ``name`` from ``directory``
+    along with any modules it includes.
+    """
+    # Modules which include another module import it when they're loaded
+    # so it must be imported first.
+    for include in MODULES[name].includes:
+        _import_abi_module(include, directory)
+
+    module_name = _abi_module_name(name)
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = _import_source(
+            join(directory, module_name + ".py"), module_name=module_name)
+    return module
+
+
+def _load_abi(name, directory=None):
+    """
+    Loads and returns the ABI mode module for ``name``.  The returned
+    object has the same ``ffi`` and ``lib`` attributes as a module
+    compiled in API mode.
+
+    :raises ResourceNotFoundError:
+        Raised if the ABI mode modules have not been generated.
+    """
+    if directory is None:
+        directory = GENERATED_DIRECTORY
+
+    table = _abi_type_table(directory=directory)
+    module = _import_abi_module(name, directory)
+
+    # The core module does not have a library of its own but any library
+    # provides access to the constants.  kernel32 is always loaded.
+    library = (MODULES[name].libraries or ("kernel32", ))[0]
+    return abi.AbiModule(
+        module.ffi, abi.AbiLibrary(
+            module.ffi, module.ffi.dlopen(library), table["functions"]))
+
+
+def _write_constants(constants, directory=None):
+    """
+    Writes ``constants`` into ``directory`` as a Python module containing
+    one integer per constant.  This is called by the setup.py when pywincffi
+    is built so :mod:`pywincffi.constants` does not have to load the library.
+
+    :param dict constants:
+        A dictionary mapping the name of each constant to its value, the
+        ``constants`` key of the type table from :func:`_resolve_abi_table`
+        for example.
+
+    :keyword str directory:
+        The directory to write to.  Defaults to ``GENERATED_DIRECTORY``.
+
+    :returns:
+        Returns the path to the module.
+    """
+    if directory is None:
+        directory = GENERATED_DIRECTORY
+
+    if not isdir(directory):
+        os.makedirs(directory)
+
+    names = sorted(constants)
+    lines = [
+        '"""',
+        "Generated by pywincffi.core.dist._write_constants, do not edit.",
+        '"""',
+        "",
+        "__all__ = (",
+    ]
+    lines.extend("    %r," % str(name) for name in names)
+    lines.extend([")", ""])
+    lines.extend("%s = %d" % (name, constants[name]) for name in names)
+
+    path = join(directory, CONSTANTS_MODULE_NAME + ".py")
+    with open(path, "w") as file_:
+        file_.write("\n".join(lines) + "\n")
+
+    return path
+
+
+def _constants(directory=None):
+    """
+    Returns a dictionary mapping the name of each constant in the
+    headers to its value.  The values are read from the module written
+    by :func:`_write_constants` if it exists, otherwise they are the
+    values in :mod:`pywincffi.core.values` so the library does not have
+    to be loaded, or even be loadable, on any platform.
+    """
+    if directory is None:
+        directory = GENERATED_DIRECTORY
+
+    path = join(directory, CONSTANTS_MODULE_NAME + ".py")
+    if isfile(path):
+        module = sys.modules.get(CONSTANTS_MODULE_NAME)
+        if module is None or module.__file__ != path:
+            module = _import_source(path, module_name=CONSTANTS_MODULE_NAME)
+        return dict((name, getattr(module, name)) for name in module.__all__)
+
+    logger.debug(
+        "%s does not exist, using pywincffi.core.values instead", path)
+    return dict(values.CONSTANTS)
+
+
+def _select_mode():
+    """
+    Returns the mode, ``api``, ``abi`` or ``simulated``, which should be
+    used to load pywincffi.  This is controlled by the ``PYWINCFFI_MODE``
+    environment variable.  The default, ``auto``, uses the prebuilt API mode
+    modules if they can be imported then the ABI mode modules if they have
+    been generated.  If neither is available the API mode modules are
+    compiled.  The ``simulated`` mode, see :mod:`pywincffi.core.simulated`,
+    is never selected automatically.
+
+    :raises pywincffi.exceptions.ConfigurationError:
+        Raised if ``PYWINCFFI_MODE`` is set to an unknown mode.
+    """
+    mode = os.environ.get(MODE_ENVIRONMENT_VARIABLE) or "auto"
+    if mode not in MODES:
+        raise ConfigurationError(
+            "%s must be one of %s, got %r" % (
+                MODE_ENVIRONMENT_VARIABLE, ", ".join(MODES), mode))
+
+    if mode != "auto":
+        return mode
+
+    # Make sure every module is loaded in the same mode,
+    # types can't be shared between modes.
+    if ABI_MODULE_NAME in sys.modules:
+        return "abi"
+
+    try:
+        importlib.import_module(MODULE_NAME)
+    except ImportError:
+        if isfile(join(GENERATED_DIRECTORY, ABI_TYPE_TABLE)):
+            return "abi"
+
+    return "api"
+
+
+def _load_module(name):
+    """
+    Imports and returns the module for ``name`` using the mode returned by
+    :func:`_select_mode`.  In API mode prebuilt modules, such as those
+    installed by the setup.py, are preferred otherwise the module will be
+    compiled and loaded by :func:`_load_cached`.
+    """
+    mode = _select_mode()
+    if mode == "abi":
+        return _load_abi(name)
+
+    if mode == "simulated":
+        # Imported here because the simulation imports this module.
+        from pywincffi.core import simulated
+        return simulated.load(name)
+
+    definition = MODULES[name]
+
+    # Modules which include another module import it when they're loaded
+    # so it must be loaded first.
+    for include in definition.includes:
+        _load_module(include)
+
+    try:
+        return importlib.import_module(definition.module_name)
+    except ImportError:
+        return _load_cached(name)
+
+
+def load(library=None):
     """
     The main function used by pywincffi to load an instance of
     :class:`FFI` and the underlying library.
+
+    >>> from pywincffi.core import dist
+    >>> ffi, kernel32 = dist.load("kernel32")
+
+    :keyword str library:
+        The name of the library to load, ``kernel32`` for example.  Only
+        the module for this library and the core module, which contains
+        the types, constants and utility functions, will be loaded.  Use
+        ``core`` if you don't need any functions from a Windows library.
+        By default every library will be loaded.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``library`` is not a known library.
     """
+    # Fast path, after the first call this is the only work
+    # that needs to be done.
     try:
-        return Loader.get()
-    except InternalError:
-        try:
-            import _pywincffi as pywincffi
-        except ImportError:
-            pywincffi = _compile(_ffi())
+        return Loader.cache[library]
+    except KeyError:
+        if library is None:
+            modules = [_load_module(name) for name in LIBRARY_ORDER]
+        elif library in MODULES:
+            modules = [_load_module(library)]
+            if library != "core":
+                modules.append(_load_module("core"))
+        else:
+            raise InputError(
+                "library", library, allowed_values=sorted(MODULES))
 
         # pylint: disable=no-member
-        Loader.set(pywincffi.ffi, LibraryWrapper(pywincffi.lib))
+        Loader.set(
+            modules[0].ffi,
+            LibraryWrapper(*[module.lib for module in modules]),
+            name=library)
 
-    return Loader.get()
+    return Loader.get(library)
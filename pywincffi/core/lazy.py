@@ -0,0 +1,67 @@
+"""
+Lazy Exports
+============
+
+Provides :func:`lazy_exports` which the sub-packages, such as
+:mod:`pywincffi.kernel32`, use to expose the functions in their submodules
+without importing every submodule when the sub-package is imported.
+"""
+
+import sys
+
+
+def lazy_exports(module_name, exports):
+    """
+    Sets up the lazy exports for the module named ``module_name`` using
+    a module level ``__getattr__`` function as described in :pep:`562`.
+    A submodule is only imported the first time one of its exports is
+    accessed, after that the export is a normal module attribute.  On
+    Python versions before 3.7, which don't support :pep:`562`, every
+    submodule is imported immediately instead.
+
+    >>> __all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    ...     "pywincffi.kernel32.file": ("CreateFile", "ReadFile")
+    ... })
+
+    :param str module_name:
+        The name of the module to setup the exports for, normally
+        ``__name__``.
+
+    :param dict exports:
+        A dictionary mapping the name of each submodule to
+        the names it exports.
+
+    :returns:
+        Returns a tuple containing the value of ``__all__`` followed
+        by the ``__getattr__`` and ``__dir__`` functions for the module.
+    """
+    module = sys.modules[module_name]
+    submodules = {}
+    for submodule, names in exports.items():
+        for name in names:
+            submodules[name] = submodule
+
+    def __getattr__(name):  # pylint: disable=invalid-name
+        try:
+            submodule = submodules[name]
+        except KeyError:
+            raise AttributeError(
+                "module %r has no attribute %r" % (module_name, name))
+
+        # __import__ is used rather than importlib.import_module so
+        # the import shows up in the output of ``python -X importtime``.
+        value = getattr(__import__(submodule, fromlist=(name, )), name)
+
+        # Store the value on the module so the next lookup
+        # does not need to go through this function.
+        setattr(module, name, value)
+        return value
+
+    def __dir__():  # pylint: disable=invalid-name
+        return sorted(set(vars(module)) | set(submodules))
+
+    if sys.version_info[0:2] < (3, 7):  # pragma: no cover
+        for name in submodules:
+            __getattr__(name)
+
+    return tuple(sorted(submodules)), __getattr__, __dir__
@@ -0,0 +1,1585 @@
+"""
+Simulated Mode
+==============
+
+A simulated implementation of the functions declared in the headers which
+can be used on any platform.  It's selected by setting ``PYWINCFFI_MODE``
+to ``simulated`` and exists so pywincffi's Python layer can be tested and
+benchmarked without Windows:
+
+    $ PYWINCFFI_MODE=simulated python -c "from pywincffi.kernel32 import ..."
+
+Each function is implemented in Python, on :class:`Simulation`, and exposed
+through :meth:`cffi.FFI.callback` so the arguments are converted by cffi
+exactly as they would be when calling the compiled library.  The state the
+functions operate on is kept in memory:
+
+    * Handles refer to entries in a handle table.  Closing the last handle
+      to an object releases the object.
+    * Events, pipes, console screen buffers and processes are Python
+      objects.  Creating a process records it in the process table but
+      does not run anything.  It exits with an exit code of 0 after
+      ``process_lifetime`` seconds, or when
+      :meth:`Simulation.exit_process` is called.
+    * Files are real files.  ``GetTempPath`` returns a temporary
+      directory, :attr:`Simulation.directory`, to create them in.
+    * The last error is stored per thread.  Every call, other than
+      ``SetLastError`` and ``WSAGetLastError``, resets it so the wrappers
+      which check the last error rather than a return code behave as they
+      do against the library.
+
+All I/O completes before the function returns, including overlapped I/O,
+and pipes are not limited to the size passed to ``CreatePipe``.
+"""
+
+import atexit
+import errno
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+from cffi import FFI
+
+from pywincffi.core import abi, dist
+from pywincffi.core.logger import get_logger
+from pywincffi.core.values import CONSTANTS
+
+logger = get_logger("core.simulated")
+
+# The default number of seconds a process created by
+# CreateProcess runs for before exiting.
+PROCESS_LIFETIME = 1.0
+
+# A type table, in the same format :func:`pywincffi.core.abi.resolve`
+# produces, so the cdef can be made concrete with
+# :func:`pywincffi.core.abi.abi_cdef`.
+TYPE_TABLE = {
+    "version": abi.TYPE_TABLE_VERSION,
+    "constants": CONSTANTS,
+    "typedefs": {"SOCKET": "uintptr_t"},
+    "arrays": {"_WSANETWORKEVENTS.iErrorCode": CONSTANTS["FD_MAX_EVENTS"]},
+    "functions": {}
+}
+
+# The types cffi provides on Windows, which the headers depend on, sized
+# as they are on Windows.
+BASE_TYPES = """
+typedef int BOOL;
+typedef unsigned char BYTE;
+typedef BYTE *LPBYTE;
+typedef char CHAR;
+typedef wchar_t WCHAR;
+typedef short SHORT;
+typedef unsigned short WORD;
+typedef WORD ATOM;
+typedef unsigned int UINT;
+typedef unsigned int DWORD;
+typedef DWORD *LPDWORD;
+typedef long long LONGLONG;
+typedef LONGLONG *PLONGLONG;
+typedef uintptr_t ULONG_PTR;
+typedef ULONG_PTR SIZE_T;
+typedef void *PVOID;
+typedef void *LPVOID;
+typedef const void *LPCVOID;
+typedef void *HANDLE;
+typedef HANDLE *PHANDLE;
+typedef HANDLE *LPHANDLE;
+"""
+
+# Error codes which are used by the simulation but are not in constants.h.
+ERROR_SUCCESS = 0
+ERROR_INVALID_FUNCTION = 1
+ERROR_HANDLE_EOF = 38
+ERROR_LOCK_VIOLATION = 33
+ERROR_BROKEN_PIPE = 109
+ERROR_INSUFFICIENT_BUFFER = 122
+ERROR_NEGATIVE_SEEK = 131
+ERROR_NOT_LOCKED = 158
+ERROR_NO_DATA = 232
+ERROR_INVALID_ADDRESS = 487
+ERROR_FILE_INVALID = 1006
+ERROR_MAPPED_ALIGNMENT = 1132
+ERROR_INTERNAL_ERROR = 1359
+
+# The messages ``getwinerror`` returns, as FormatMessage would.
+ERROR_MESSAGES = {
+    ERROR_SUCCESS: "The operation completed successfully.",
+    ERROR_INVALID_FUNCTION: "Incorrect function.",
+    2: "The system cannot find the file specified.",
+    3: "The system cannot find the path specified.",
+    5: "Access is denied.",
+    6: "The handle is invalid.",
+    17: "The system cannot move the file to a different disk drive.",
+    32: "The process cannot access the file because it is being used by "
+        "another process.",
+    ERROR_LOCK_VIOLATION:
+        "The process cannot access the file because another process has "
+        "locked a portion of the file.",
+    ERROR_HANDLE_EOF: "Reached the end of the file.",
+    80: "The file exists.",
+    87: "The parameter is incorrect.",
+    ERROR_BROKEN_PIPE: "The pipe has been ended.",
+    ERROR_INSUFFICIENT_BUFFER:
+        "The data area passed to a system call is too small.",
+    ERROR_NEGATIVE_SEEK:
+        "An attempt was made to move the file pointer before the beginning "
+        "of the file.",
+    ERROR_NOT_LOCKED: "The segment is already unlocked.",
+    183: "Cannot create a file when that file already exists.",
+    ERROR_NO_DATA: "The pipe is being closed.",
+    996: "Overlapped I/O event is not in a signaled state.",
+    ERROR_INVALID_ADDRESS: "Attempt to access invalid address.",
+    997: "Overlapped I/O operation is in progress.",
+    ERROR_FILE_INVALID:
+        "The volume for a file has been externally altered so that the "
+        "opened file is no longer valid.",
+    ERROR_MAPPED_ALIGNMENT:
+        "The base address or the file offset specified does not have the "
+        "proper alignment.",
+    ERROR_INTERNAL_ERROR: "An internal error occurred."
+}
+
+# GetCurrentProcess() returns a pseudo handle which
+# has the same value as INVALID_HANDLE_VALUE.
+CURRENT_PROCESS = -1
+INVALID_HANDLE_VALUE = -1
+
+# Converts function declarations from the normalized cdef into typedefs
+# of function pointers.  The function pointers are then gathered into the
+# struct FUNCTIONS_STRUCT so the type of every callback can be retrieved
+# from the cdef with a single call to :meth:`cffi.FFI.typeof`.
+REGEX_DECLARATION = re.compile(
+    r"^(?!typedef\b)((?:[\w*]+ )+?)(WINAPI )?(\w+)\(")
+FUNCTIONS_STRUCT = "SIMULATED_FUNCTIONS"
+
+# The functions which don't reset the last error when called.
+LAST_ERROR_FUNCTIONS = ("SetLastError", "WSAGetLastError")
+
+Lock = namedtuple("Lock", ("owner", "offset", "length", "exclusive"))
+
+
+def _cdef():
+    """
+    Returns the cdef for the simulation.  Each function is declared as a
+    function pointer type, ``PFN_CreateFile`` for example, and as a member
+    of :data:`FUNCTIONS_STRUCT`.
+    """
+    headers = []
+    for name in dist.LIBRARY_ORDER:
+        headers.extend(dist.MODULES[name].headers)
+
+    cdef = abi.abi_cdef(dist._cdef(*headers), TYPE_TABLE)
+    lines = cdef.splitlines()
+    for number, line in enumerate(lines):
+        lines[number] = REGEX_DECLARATION.sub(
+            r"typedef \1(\2*PFN_\3)(", line)
+
+    lines.append("typedef struct {")
+    lines.extend(
+        "PFN_%s %s;" % (name, name) for name in abi.functions(cdef))
+    lines.append("} %s;" % FUNCTIONS_STRUCT)
+    return BASE_TYPES + "\n".join(lines) + "\n"
+
+
+def new_ffi():
+    """
+    Returns a new instance of :class:`FFI` containing the types and
+    constants from the headers.  The ffi instance has no library so
+    ``getwinerror`` must be provided by :class:`Simulation`.
+    """
+    ffi = FFI()
+    ffi.set_unicode(True)
+    ffi.cdef(_cdef())
+    return ffi
+
+
+class _Object(object):  # pylint: disable=too-few-public-methods
+    """
+    The base class for objects which handles refer to.  Objects are
+    signaled by default and are released when their last handle
+    is closed.
+    """
+    signaled = True
+    references = 0
+
+    def acquire(self):
+        """Called when a wait on this object is satisfied"""
+
+    def release(self):
+        """Called when the last handle to this object is closed"""
+
+
+class _Event(_Object):
+    """An event created by CreateEvent or WSACreateEvent"""
+    def __init__(self, manual_reset, signaled, name=None):
+        self.manual_reset = manual_reset
+        self.signaled = signaled
+        self.name = name
+
+    def acquire(self):
+        if not self.manual_reset:
+            self.signaled = False
+
+
+class _Process(_Object):
+    """
+    An entry in the process table.  A process is signaled
+    once it has exited.
+    """
+    def __init__(self, pid, command_line=None, flags=0, thread_id=0):
+        self.pid = pid
+        self.command_line = command_line
+        self.flags = flags
+        self.thread_id = thread_id
+        self.exit_code = None
+
+    @property
+    def signaled(self):
+        return self.exit_code is not None
+
+
+class _Thread(_Object):  # pylint: disable=too-few-public-methods
+    """The main thread of a :class:`_Process`"""
+    def __init__(self, process):
+        self.process = process
+
+    @property
+    def signaled(self):
+        return self.process.signaled
+
+
+class _Snapshot(_Object):  # pylint: disable=too-few-public-methods
+    """The result of CreateToolhelp32Snapshot"""
+    def __init__(self, pids):
+        self.pids = pids
+
+
+class _Console(_Object):  # pylint: disable=too-few-public-methods
+    """A console screen buffer"""
+    def __init__(self):
+        self.attributes = \
+            CONSTANTS["FOREGROUND_RED"] | CONSTANTS["FOREGROUND_GREEN"] | \
+            CONSTANTS["FOREGROUND_BLUE"]
+
+
+class _Descriptor(_Object):
+    """
+    Wraps a file descriptor which the simulation does not own, the
+    standard streams for example.  Standard output and error can
+    also be used as console screen buffers.
+    """
+    overlapped = False
+    readable = writable = True
+
+    def __init__(self, fd, console=None):
+        self.fd = fd
+        self.console = console
+
+    def read(self, size, offset=None):  # pylint: disable=unused-argument
+        """Reads up to ``size`` bytes"""
+        return os.read(self.fd, size)
+
+    def write(self, data, offset=None):  # pylint: disable=unused-argument
+        """Writes ``data`` and returns the number of bytes written"""
+        return os.write(self.fd, data)
+
+
+class _File(_Descriptor):
+    """A file opened by CreateFile"""
+    def __init__(  # pylint: disable=too-many-arguments
+            self, fd, path, readable, writable, share, overlapped,
+            delete_on_close):
+        super(_File, self).__init__(fd)
+        self.path = path
+        self.readable = readable
+        self.writable = writable
+        self.share = share
+        self.overlapped = overlapped
+        self.delete_on_close = delete_on_close
+
+    def read(self, size, offset=None):
+        if offset is not None:
+            os.lseek(self.fd, offset, os.SEEK_SET)
+        return os.read(self.fd, size)
+
+    def write(self, data, offset=None):
+        if offset is not None:
+            os.lseek(self.fd, offset, os.SEEK_SET)
+        return os.write(self.fd, data)
+
+    def release(self):
+        os.close(self.fd)
+        if self.delete_on_close:
+            try:
+                os.remove(self.path)
+            except OSError:  # pragma: no cover
+                pass
+
+
+class _Mapping(_Object):
+    """
+    A file mapping created by CreateFileMapping.  Mappings keep their
+    own copy of the file descriptor, mappings backed by the paging file
+    use an unlinked temporary file so each view can be mapped separately.
+    """
+    def __init__(self, fd, size, writable, name):
+        self.fd = fd
+        self.size = size
+        self.writable = writable
+        self.name = name
+
+    def release(self):
+        os.close(self.fd)
+
+
+class _View(object):  # pylint: disable=too-few-public-methods
+    """
+    A view mapped by MapViewOfFile.  ``memory`` is the :class:`mmap.mmap`
+    of the view and ``data`` is the cdata which exposes it, which has to
+    be released before ``memory`` can be closed.
+    """
+    def __init__(self, memory, data, address, size):
+        self.memory = memory
+        self.data = data
+        self.address = address
+        self.size = size
+
+
+class _Pipe(object):  # pylint: disable=too-few-public-methods
+    """The buffer shared by both ends of an anonymous pipe"""
+    def __init__(self):
+        self.data = bytearray()
+        self.read_closed = False
+        self.write_closed = False
+
+
+class _PipeEnd(_Object):
+    """One end of a :class:`_Pipe`"""
+    overlapped = False
+
+    def __init__(self, pipe, readable):
+        self.pipe = pipe
+        self.readable = readable
+        self.writable = not readable
+        self.mode = 0
+
+    def release(self):
+        if self.readable:
+            self.pipe.read_closed = True
+        else:
+            self.pipe.write_closed = True
+
+
+class _Socket(object):  # pylint: disable=too-few-public-methods
+    """The network events selected for a socket by WSAEventSelect"""
+    def __init__(self):
+        self.event = None
+        self.mask = 0
+        self.events = 0
+        self.errors = {}
+
+
+class Simulation(object):  # pylint: disable=too-many-public-methods
+    """
+    Contains the state of a simulated Windows process and implements
+    the functions declared in the headers.  The functions are exposed
+    through :meth:`library` rather than being called directly.
+
+    :keyword cffi.FFI ffi:
+        The ffi instance to use, defaults to a new instance returned by
+        :func:`new_ffi`.  Its ``getwinerror`` attribute is replaced.
+
+    :keyword str directory:
+        The directory ``GetTempPath`` returns.  Defaults to a new
+        temporary directory which is removed by :meth:`close`.
+
+    :keyword float process_lifetime:
+        The number of seconds after which processes created by
+        ``CreateProcess`` exit, so waiting for them can't block forever.
+        If None they run until they're terminated or :meth:`exit_process`
+        is called.
+    """
+    def __init__(
+            self, ffi=None, directory=None,
+            process_lifetime=PROCESS_LIFETIME):
+        if ffi is None:
+            ffi = new_ffi()
+
+        self.ffi = ffi
+        self.ffi.getwinerror = self.getwinerror
+        self._owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(
+            prefix="pywincffi-simulated-")
+
+        # The condition is notified whenever an object which can
+        # be waited on changes state.
+        self._condition = threading.Condition(threading.RLock())
+        self._local = threading.local()
+        self._next_handle = 0
+        self._next_pid = 0x1000
+        self._process_lifetime = process_lifetime
+        self._timers = []
+        self._handles = {}
+        self._descriptors = {}
+        self._events = {}
+        self._mappings = {}
+        self._views = {}
+        self._files = []
+        self._locks = []
+        self._sockets = {}
+        self._libraries = {}
+        self._function_types = dict(
+            (name, field.type) for name, field
+            in self.ffi.typeof(FUNCTIONS_STRUCT).fields)
+
+        self.process = _Process(os.getpid())
+        self.processes = {self.process.pid: self.process}
+        self._std_handles = {}
+        for name, fd in (
+                ("STD_INPUT_HANDLE", 0),
+                ("STD_OUTPUT_HANDLE", 1),
+                ("STD_ERROR_HANDLE", 2)):
+            console = _Console() if fd else None
+            self._std_handles[CONSTANTS[name]] = self._new_handle(
+                _Descriptor(fd, console=console))
+
+    def library(self, name):
+        """
+        Returns an object with the same attributes as the library compiled
+        for ``name`` in :data:`pywincffi.core.dist.MODULES`.  The core
+        library also provides the constants.
+        """
+        try:
+            return self._libraries[name]
+        except KeyError:
+            pass
+
+        library = SimulatedLibrary()
+        if name == "core":
+            library.__dict__.update(CONSTANTS)
+
+        definition = dist.MODULES[name]
+        for function in abi.functions(dist._cdef(*definition.headers)):
+            setattr(library, function, self._callback(function))
+
+        self._libraries[name] = library
+        return library
+
+    def loader_cache(self):
+        """
+        Returns a dictionary which can replace
+        :attr:`pywincffi.core.dist.Loader.cache` so :func:`dist.load`
+        returns this simulation for every library.
+        """
+        cache = {}
+        for name in dist.MODULES:
+            libraries = [self.library(name)]
+            if name != "core":
+                libraries.append(self.library("core"))
+            cache[name] = (self.ffi, dist.LibraryWrapper(*libraries))
+
+        cache[None] = (self.ffi, dist.LibraryWrapper(
+            *[self.library(name) for name in dist.LIBRARY_ORDER]))
+        return cache
+
+    def close(self):
+        """
+        Closes every handle, stops the timers which exit processes and
+        removes the temporary directory
+        """
+        with self._condition:
+            for timer in self._timers:
+                timer.cancel()
+            del self._timers[:]
+            for handle in list(self._handles):
+                self._close(handle)
+            for address in list(self._views):
+                self._unmap(address)
+
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def getwinerror(self, code=-1):
+        """
+        Replaces :meth:`cffi.FFI.getwinerror`, returns a tuple of the
+        error code and message for ``code`` or the last error.
+        """
+        if code == -1:
+            code = self.last_error
+        return code, ERROR_MESSAGES.get(code, "Unknown error %d." % code)
+
+    @property
+    def last_error(self):
+        """The last error for the calling thread"""
+        return getattr(self._local, "error", ERROR_SUCCESS)
+
+    @last_error.setter
+    def last_error(self, code):
+        self._local.error = code
+
+    def exit_process(self, pid, exit_code=0):
+        """
+        Marks the simulated process ``pid`` as having exited.  Processes
+        created by ``CreateProcess`` run until they're terminated, this is
+        called or ``process_lifetime`` seconds have passed.
+        """
+        with self._condition:
+            process = self.processes[pid]
+            if process.exit_code is None:
+                process.exit_code = exit_code
+            self._condition.notify_all()
+
+    def network_event(self, socket, event, error=0):
+        """
+        Records the network event ``event``, ``FD_READ`` for example,
+        for ``socket`` and signals the event selected for it if ``event``
+        was included in the call to ``WSAEventSelect``.
+        """
+        with self._condition:
+            state = self._sockets.setdefault(socket, _Socket())
+            state.events |= event
+            state.errors[event] = error
+            if state.event is not None and state.mask & event:
+                state.event.signaled = True
+                self._condition.notify_all()
+
+    def _callback(self, name):
+        """
+        Returns the implementation of the function ``name`` as a cdata
+        function pointer with the signature from the headers.
+        """
+        implementation = getattr(self, name)
+        if name not in LAST_ERROR_FUNCTIONS:
+            local = self._local
+
+            def function(*args):
+                local.error = ERROR_SUCCESS
+                return implementation(*args)
+        else:
+            function = implementation
+
+        return self.ffi.callback(
+            self._function_types[name], function, onerror=self._onerror)
+
+    def _onerror(self, exception, value, traceback):
+        """
+        Called by cffi when a function raises an exception, the
+        function will return zero.
+        """
+        logger.error(
+            "Unhandled exception in simulated function",
+            exc_info=(exception, value, traceback))
+        self.last_error = ERROR_INTERNAL_ERROR
+
+    def _fail(self, code, result=0):
+        """Sets the last error to ``code`` and returns ``result``"""
+        self.last_error = code
+        return result
+
+    def _oserror(self, error, result=0):
+        """Converts ``error``, an :class:`OSError`, to a Windows error"""
+        if error.errno == errno.ENOENT:
+            parent = os.path.dirname(error.filename or "")
+            code = CONSTANTS["ERROR_FILE_NOT_FOUND"]
+            if parent and not os.path.isdir(parent):
+                code = CONSTANTS["ERROR_PATH_NOT_FOUND"]
+        elif error.errno == errno.EEXIST:
+            code = CONSTANTS["ERROR_FILE_EXISTS"]
+        elif error.errno in (errno.EACCES, errno.EPERM, errno.EISDIR):
+            code = CONSTANTS["ERROR_ACCESS_DENIED"]
+        elif error.errno == errno.EXDEV:
+            code = CONSTANTS["ERROR_NOT_SAME_DEVICE"]
+        else:
+            code = CONSTANTS["ERROR_INVALID_PARAMETER"]
+        return self._fail(code, result)
+
+    def _handle(self, value):
+        """Converts the handle ``value`` to cdata"""
+        return self.ffi.cast("HANDLE", value)
+
+    def _new_handle(self, obj, inherit=False):
+        """Adds ``obj`` to the handle table and returns the handle"""
+        with self._condition:
+            self._next_handle += 4
+            handle = self._next_handle
+            self._handles[handle] = [
+                obj, CONSTANTS["HANDLE_FLAG_INHERIT"] if inherit else 0]
+            obj.references += 1
+        return handle
+
+    def _object(self, handle, types=None):
+        """
+        Returns the object ``handle``, a cdata HANDLE, refers to.  None
+        is returned if the handle is invalid or the object is not an
+        instance of ``types``.
+        """
+        value = int(self.ffi.cast("intptr_t", handle))
+        if value == CURRENT_PROCESS:
+            obj = self.process
+        else:
+            try:
+                obj = self._handles[value][0]
+            except KeyError:
+                return None
+
+        if types is not None and not isinstance(obj, types):
+            return None
+        return obj
+
+    def _close(self, handle):
+        """Removes ``handle`` from the handle table"""
+        obj, _ = self._handles.pop(handle)
+        obj.references -= 1
+        if obj.references:
+            return
+
+        obj.release()
+        if isinstance(obj, _Event) and self._events.get(obj.name) is obj:
+            del self._events[obj.name]
+        elif (isinstance(obj, _Mapping) and
+              self._mappings.get(obj.name) is obj):
+            del self._mappings[obj.name]
+        elif isinstance(obj, _File):
+            self._files.remove(obj)
+            self._locks = [
+                lock for lock in self._locks if lock.owner is not obj]
+        elif isinstance(obj, _Descriptor):
+            self._descriptors.pop(obj.fd, None)
+        self._condition.notify_all()
+
+    def _unmap(self, address):
+        """Removes the view at ``address`` and closes its memory"""
+        view = self._views.pop(address)
+        view.data = None
+        view.memory.close()
+
+    def _string(self, value):
+        """Converts an LPCTSTR to a string, NULL is converted to None"""
+        if value == self.ffi.NULL:
+            return None
+        return self.ffi.string(value)
+
+    def _inherit(self, attributes):
+        """True if ``attributes``, an LPSECURITY_ATTRIBUTES, inherits"""
+        return attributes != self.ffi.NULL and bool(attributes.bInheritHandle)
+
+    def _wait(self, objects, wait_all, milliseconds):
+        """
+        Waits for one or all of ``objects`` to be signaled and returns
+        the result WaitForMultipleObjects would.
+        """
+        deadline = None
+        if milliseconds != CONSTANTS["INFINITE"]:
+            deadline = time.time() + milliseconds / 1000.0
+
+        with self._condition:
+            while True:
+                ready = [
+                    index for index, obj in enumerate(objects)
+                    if obj.signaled]
+                if wait_all and len(ready) == len(objects):
+                    for obj in objects:
+                        obj.acquire()
+                    return CONSTANTS["WAIT_OBJECT_0"]
+                if not wait_all and ready:
+                    objects[ready[0]].acquire()
+                    return CONSTANTS["WAIT_OBJECT_0"] + ready[0]
+
+                if deadline is None:
+                    self._condition.wait()
+                    continue
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return CONSTANTS["WAIT_TIMEOUT"]
+                self._condition.wait(remaining)
+
+    def _complete(self, overlapped, transferred):
+        """Marks the operation using ``overlapped`` as complete"""
+        if overlapped == self.ffi.NULL:
+            return
+
+        overlapped.Internal = 0
+        overlapped.InternalHigh = transferred
+        event = self._object(overlapped.hEvent, _Event)
+        if event is not None:
+            with self._condition:
+                event.signaled = True
+                self._condition.notify_all()
+
+    # pylint: disable=invalid-name,too-many-arguments,unused-argument
+    # The methods below implement the functions from the headers.  They
+    # take and return cdata and are named after the function.
+
+    def handle_from_fd(self, fd):
+        """Returns the handle for the file descriptor ``fd``"""
+        with self._condition:
+            handle = self._descriptors.get(fd)
+            if handle is None:
+                try:
+                    os.fstat(fd)
+                except OSError:
+                    return self._handle(INVALID_HANDLE_VALUE)
+
+                handle = self._new_handle(_Descriptor(fd))
+                self._descriptors[fd] = handle
+        return self._handle(handle)
+
+    def wsa_invalid_event(self, event):
+        """True if ``event`` is WSA_INVALID_EVENT"""
+        return event == self.ffi.NULL
+
+    def set_file_pointer_ex(
+            self, hFile, liDistanceToMove, lpNewFilePointer, dwMoveMethod):
+        """Moves the file pointer of ``hFile``"""
+        obj = self._object(hFile, (_Descriptor, _PipeEnd))
+        if obj is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if isinstance(obj, _PipeEnd):
+            return self._fail(ERROR_INVALID_FUNCTION)
+
+        whence = {
+            CONSTANTS["FILE_BEGIN"]: os.SEEK_SET,
+            CONSTANTS["FILE_CURRENT"]: os.SEEK_CUR,
+            CONSTANTS["FILE_END"]: os.SEEK_END}.get(dwMoveMethod)
+        if whence is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_PARAMETER"])
+
+        try:
+            if whence != os.SEEK_SET:
+                start = os.lseek(obj.fd, 0, whence)
+            else:
+                start = 0
+            if start + liDistanceToMove < 0:
+                return self._fail(ERROR_NEGATIVE_SEEK)
+            position = os.lseek(obj.fd, start + liDistanceToMove, os.SEEK_SET)
+        except OSError as error:
+            return self._oserror(error)
+
+        if lpNewFilePointer != self.ffi.NULL:
+            lpNewFilePointer[0] = position
+        return 1
+
+    def get_file_size_ex(self, hFile, lpFileSize):
+        """Returns the size of ``hFile``"""
+        obj = self._object(hFile, (_Descriptor, _PipeEnd))
+        if obj is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if isinstance(obj, _PipeEnd):
+            return self._fail(ERROR_INVALID_FUNCTION)
+
+        try:
+            lpFileSize[0] = os.fstat(obj.fd).st_size
+        except OSError as error:
+            return self._oserror(error)
+        return 1
+
+    def OpenProcess(self, dwDesiredAccess, bInheritHandle, dwProcessId):
+        process = self.processes.get(dwProcessId)
+        if process is None:
+            return self._fail(
+                CONSTANTS["ERROR_INVALID_PARAMETER"], self.ffi.NULL)
+        return self._handle(self._new_handle(process, bInheritHandle))
+
+    def GetExitCodeProcess(self, hProcess, lpExitCode):
+        process = self._object(hProcess, _Process)
+        if process is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+
+        if process.exit_code is None:
+            lpExitCode[0] = CONSTANTS["STILL_ACTIVE"]
+        else:
+            lpExitCode[0] = process.exit_code
+        return 1
+
+    def GetCurrentProcess(self):
+        return self._handle(CURRENT_PROCESS)
+
+    def GetProcessId(self, Process):
+        process = self._object(Process, _Process)
+        if process is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        return process.pid
+
+    def TerminateProcess(self, hProcess, uExitCode):
+        process = self._object(hProcess, _Process)
+        if process is None or process is self.process:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if process.exit_code is not None:
+            return self._fail(CONSTANTS["ERROR_ACCESS_DENIED"])
+
+        self.exit_process(process.pid, uExitCode)
+        return 1
+
+    def CreateToolhelp32Snapshot(self, dwFlags, th32ProcessID):
+        pids = sorted(
+            pid for pid, process in self.processes.items()
+            if process.exit_code is None)
+        return self._handle(self._new_handle(_Snapshot(pids)))
+
+    def CreatePipe(self, hReadPipe, hWritePipe, lpPipeAttributes, nSize):
+        pipe = _Pipe()
+        inherit = self._inherit(lpPipeAttributes)
+        hReadPipe[0] = self._handle(
+            self._new_handle(_PipeEnd(pipe, True), inherit))
+        hWritePipe[0] = self._handle(
+            self._new_handle(_PipeEnd(pipe, False), inherit))
+        return 1
+
+    def PeekNamedPipe(
+            self, hNamedPipe, lpBuffer, nBufferSize, lpBytesRead,
+            lpTotalBytesAvail, lpBytesLeftThisMessage):
+        end = self._object(hNamedPipe, _PipeEnd)
+        if end is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if not end.readable:
+            return self._fail(CONSTANTS["ERROR_ACCESS_DENIED"])
+
+        with self._condition:
+            data = bytes(end.pipe.data[:nBufferSize])
+            available = len(end.pipe.data)
+            if not available and end.pipe.write_closed:
+                return self._fail(ERROR_BROKEN_PIPE)
+
+        if lpBuffer != self.ffi.NULL:
+            self.ffi.memmove(lpBuffer, data, len(data))
+        if lpBytesRead != self.ffi.NULL:
+            lpBytesRead[0] = len(data) if lpBuffer != self.ffi.NULL else 0
+        if lpTotalBytesAvail != self.ffi.NULL:
+            lpTotalBytesAvail[0] = available
+        if lpBytesLeftThisMessage != self.ffi.NULL:
+            lpBytesLeftThisMessage[0] = 0
+        return 1
+
+    def SetNamedPipeHandleState(
+            self, hNamedPipe, lpMode, lpMaxCollectionCount,
+            lpCollectDataTimeout):
+        end = self._object(hNamedPipe, _PipeEnd)
+        if end is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        # Anonymous pipes are always byte pipes and collection
+        # only applies to named pipes between two computers.
+        if lpMaxCollectionCount != self.ffi.NULL or \
+                lpCollectDataTimeout != self.ffi.NULL:
+            return self._fail(CONSTANTS["ERROR_INVALID_PARAMETER"])
+        if lpMode != self.ffi.NULL:
+            if lpMode[0] & CONSTANTS["PIPE_READMODE_MESSAGE"]:
+                return self._fail(CONSTANTS["ERROR_INVALID_PARAMETER"])
+            end.mode = lpMode[0]
+        return 1
+
+    def CreateFile(  # pylint: disable=too-many-locals,too-many-branches
+            self, lpFileName, dwDesiredAccess, dwShareMode,
+            lpSecurityAttributes, dwCreationDisposition,
+            dwFlagsAndAttributes, hTemplateFile):
+        path = os.path.abspath(self.ffi.string(lpFileName))
+        readable = bool(dwDesiredAccess & (
+            CONSTANTS["GENERIC_READ"] | CONSTANTS["GENERIC_ALL"] |
+            CONSTANTS["FILE_READ_DATA"]))
+        writable = bool(dwDesiredAccess & (
+            CONSTANTS["GENERIC_WRITE"] | CONSTANTS["GENERIC_ALL"] |
+            CONSTANTS["FILE_WRITE_DATA"] | CONSTANTS["FILE_APPEND_DATA"]))
+
+        dispositions = {
+            CONSTANTS["CREATE_NEW"]: os.O_CREAT | os.O_EXCL,
+            CONSTANTS["CREATE_ALWAYS"]: os.O_CREAT | os.O_TRUNC,
+            CONSTANTS["OPEN_EXISTING"]: 0,
+            CONSTANTS["OPEN_ALWAYS"]: os.O_CREAT,
+            CONSTANTS["TRUNCATE_EXISTING"]: os.O_TRUNC}
+        try:
+            flags = dispositions[dwCreationDisposition]
+        except KeyError:
+            return self._fail(
+                CONSTANTS["ERROR_INVALID_PARAMETER"],
+                self._handle(INVALID_HANDLE_VALUE))
+
+        invalid = self._handle(INVALID_HANDLE_VALUE)
+        with self._condition:
+            # Every open of the file has to share the access the
+            # others need, and the other way around.
+            for other in self._files:
+                if other.path != path:
+                    continue
+                if (readable and not other.share & CONSTANTS["FILE_SHARE_READ"]
+                        or writable and
+                        not other.share & CONSTANTS["FILE_SHARE_WRITE"]
+                        or other.readable and
+                        not dwShareMode & CONSTANTS["FILE_SHARE_READ"]
+                        or other.writable and
+                        not dwShareMode & CONSTANTS["FILE_SHARE_WRITE"]):
+                    return self._fail(
+                        CONSTANTS["ERROR_SHARING_VIOLATION"], invalid)
+
+            existed = os.path.exists(path)
+            try:
+                fd = os.open(path, flags | os.O_RDWR | getattr(
+                    os, "O_BINARY", 0))
+            except OSError as error:
+                if error.errno != errno.EACCES or writable:
+                    error.filename = path
+                    return self._oserror(error, invalid)
+                try:
+                    fd = os.open(path, flags | os.O_RDONLY)
+                except OSError as error:  # pragma: no cover
+                    error.filename = path
+                    return self._oserror(error, invalid)
+
+            file_ = _File(
+                fd, path, readable, writable, dwShareMode,
+                bool(dwFlagsAndAttributes &
+                     CONSTANTS["FILE_FLAG_OVERLAPPED"]),
+                bool(dwFlagsAndAttributes &
+                     CONSTANTS["FILE_FLAG_DELETE_ON_CLOSE"]))
+            self._files.append(file_)
+            handle = self._new_handle(
+                file_, self._inherit(lpSecurityAttributes))
+
+        if existed and dwCreationDisposition in (
+                CONSTANTS["CREATE_ALWAYS"], CONSTANTS["OPEN_ALWAYS"]):
+            self.last_error = CONSTANTS["ERROR_ALREADY_EXISTS"]
+        return self._handle(handle)
+
+    def _io_offset(self, obj, lpOverlapped):
+        """
+        Returns the offset for I/O on ``obj`` using ``lpOverlapped``,
+        or raises ValueError if the combination is not valid.
+        """
+        if lpOverlapped == self.ffi.NULL:
+            if obj.overlapped:
+                raise ValueError("overlapped I/O requires an OVERLAPPED")
+            return None
+        if not isinstance(obj, _File):
+            return None
+        return lpOverlapped.Offset | lpOverlapped.OffsetHigh << 32
+
+    def WriteFile(
+            self, hFile, lpBuffer, nNumberOfBytesToWrite,
+            lpNumberOfBytesWritten, lpOverlapped):
+        obj = self._object(hFile, (_Descriptor, _PipeEnd))
+        if obj is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if not obj.writable:
+            return self._fail(CONSTANTS["ERROR_ACCESS_DENIED"])
+        try:
+            offset = self._io_offset(obj, lpOverlapped)
+        except ValueError:
+            return self._fail(CONSTANTS["ERROR_INVALID_PARAMETER"])
+
+        data = self.ffi.buffer(lpBuffer, nNumberOfBytesToWrite)[:]
+        with self._condition:
+            if isinstance(obj, _PipeEnd):
+                if obj.pipe.read_closed:
+                    return self._fail(ERROR_NO_DATA)
+                obj.pipe.data.extend(data)
+                written = len(data)
+                self._condition.notify_all()
+            else:
+                try:
+                    written = obj.write(data, offset)
+                except OSError as error:
+                    return self._oserror(error)
+
+        if lpNumberOfBytesWritten != self.ffi.NULL:
+            lpNumberOfBytesWritten[0] = written
+        self._complete(lpOverlapped, written)
+        return 1
+
+    def SetEndOfFile(self, hFile):
+        obj = self._object(hFile, _File)
+        if obj is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if not obj.writable:
+            return self._fail(CONSTANTS["ERROR_ACCESS_DENIED"])
+        try:
+            os.ftruncate(obj.fd, os.lseek(obj.fd, 0, os.SEEK_CUR))
+        except OSError as error:
+            return self._oserror(error)
+        return 1
+
+    def FlushFileBuffers(self, hFile):
+        obj = self._object(hFile, (_Descriptor, _PipeEnd))
+        if obj is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if not obj.writable:
+            return self._fail(CONSTANTS["ERROR_ACCESS_DENIED"])
+        return 1
+
+    def ReadFile(  # pylint: disable=too-many-branches
+            self, hFile, lpBuffer, nNumberOfBytesToRead, lpNumberOfBytesRead,
+            lpOverlapped):
+        obj = self._object(hFile, (_Descriptor, _PipeEnd))
+        if obj is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if not obj.readable:
+            return self._fail(CONSTANTS["ERROR_ACCESS_DENIED"])
+        try:
+            offset = self._io_offset(obj, lpOverlapped)
+        except ValueError:
+            return self._fail(CONSTANTS["ERROR_INVALID_PARAMETER"])
+
+        with self._condition:
+            if isinstance(obj, _PipeEnd):
+                pipe = obj.pipe
+                while not pipe.data and not pipe.write_closed:
+                    if obj.mode & CONSTANTS["PIPE_NOWAIT"]:
+                        return self._fail(ERROR_NO_DATA)
+                    self._condition.wait()
+                if not pipe.data:
+                    return self._fail(ERROR_BROKEN_PIPE)
+                data = bytes(pipe.data[:nNumberOfBytesToRead])
+                del pipe.data[:nNumberOfBytesToRead]
+            else:
+                try:
+                    data = obj.read(nNumberOfBytesToRead, offset)
+                except OSError as error:
+                    return self._oserror(error)
+
+        if not data and offset is not None and nNumberOfBytesToRead:
+            return self._fail(ERROR_HANDLE_EOF)
+
+        self.ffi.memmove(lpBuffer, data, len(data))
+        if lpNumberOfBytesRead != self.ffi.NULL:
+            lpNumberOfBytesRead[0] = len(data)
+        self._complete(lpOverlapped, len(data))
+        return 1
+
+    def MoveFileEx(self, lpExistingFileName, lpNewFileName, dwFlags):
+        source = os.path.abspath(self.ffi.string(lpExistingFileName))
+        destination = self._string(lpNewFileName)
+
+        with self._condition:
+            for other in self._files:
+                if other.path == source and \
+                        not other.share & CONSTANTS["FILE_SHARE_DELETE"]:
+                    return self._fail(CONSTANTS["ERROR_SHARING_VIOLATION"])
+
+            try:
+                if destination is None:
+                    os.remove(source)
+                    return 1
+
+                destination = os.path.abspath(destination)
+                if os.path.exists(destination) and not \
+                        dwFlags & CONSTANTS["MOVEFILE_REPLACE_EXISTING"]:
+                    return self._fail(CONSTANTS["ERROR_ALREADY_EXISTS"])
+
+                try:
+                    os.rename(source, destination)
+                except OSError as error:
+                    if error.errno != errno.EXDEV or not \
+                            dwFlags & CONSTANTS["MOVEFILE_COPY_ALLOWED"]:
+                        raise
+                    shutil.move(source, destination)
+            except OSError as error:
+                if error.filename is None:  # pragma: no cover
+                    error.filename = source
+                return self._oserror(error)
+        return 1
+
+    def LockFileEx(
+            self, hFile, dwFlags, dwReserved, nNumberOfBytesToLockLow,
+            nNumberOfBytesToLockHigh, lpOverlapped):
+        file_ = self._object(hFile, _File)
+        if file_ is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if lpOverlapped == self.ffi.NULL or dwReserved:
+            return self._fail(CONSTANTS["ERROR_INVALID_PARAMETER"])
+
+        exclusive = bool(dwFlags & CONSTANTS["LOCKFILE_EXCLUSIVE_LOCK"])
+        lock = Lock(
+            file_, lpOverlapped.Offset | lpOverlapped.OffsetHigh << 32,
+            nNumberOfBytesToLockLow | nNumberOfBytesToLockHigh << 32,
+            exclusive)
+
+        with self._condition:
+            while any(
+                    other.owner.path == file_.path and
+                    (exclusive or other.exclusive) and
+                    other.offset < lock.offset + lock.length and
+                    lock.offset < other.offset + other.length
+                    for other in self._locks):
+                if dwFlags & CONSTANTS["LOCKFILE_FAIL_IMMEDIATELY"]:
+                    return self._fail(ERROR_LOCK_VIOLATION)
+                self._condition.wait()
+            self._locks.append(lock)
+
+        self._complete(lpOverlapped, 0)
+        return 1
+
+    def UnlockFileEx(
+            self, hFile, dwReserved, nNumberOfBytesToUnlockLow,
+            nNumberOfBytesToUnlockHigh, lpOverlapped):
+        file_ = self._object(hFile, _File)
+        if file_ is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        if lpOverlapped == self.ffi.NULL or dwReserved:
+            return self._fail(CONSTANTS["ERROR_INVALID_PARAMETER"])
+
+        offset = lpOverlapped.Offset | lpOverlapped.OffsetHigh << 32
+        length = nNumberOfBytesToUnlockLow | nNumberOfBytesToUnlockHigh << 32
+        with self._condition:
+            for lock in self._locks:
+                if (lock.owner is file_ and lock.offset == offset and
+                        lock.length == length):
+                    self._locks.remove(lock)
+                    self._condition.notify_all()
+                    break
+            else:
+                return self._fail(ERROR_NOT_LOCKED)
+
+        self._complete(lpOverlapped, 0)
+        return 1
+
+    def CloseHandle(self, hObject):
+        value = int(self.ffi.cast("intptr_t", hObject))
+        with self._condition:
+            try:
+                _, flags = self._handles[value]
+            except KeyError:
+                return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+            if flags & CONSTANTS["HANDLE_FLAG_PROTECT_FROM_CLOSE"]:
+                return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+            self._close(value)
+        return 1
+
+    def GetStdHandle(self, nStdHandle):
+        try:
+            return self._handle(self._std_handles[nStdHandle])
+        except KeyError:
+            return self._fail(
+                CONSTANTS["ERROR_INVALID_HANDLE"],
+                self._handle(INVALID_HANDLE_VALUE))
+
+    def WaitForSingleObject(self, hHandle, dwMilliseconds):
+        obj = self._object(hHandle)
+        if obj is None:
+            return self._fail(
+                CONSTANTS["ERROR_INVALID_HANDLE"], CONSTANTS["WAIT_FAILED"])
+        return self._wait([obj], False, dwMilliseconds)
+
+    def GetHandleInformation(self, hObject, lpdwFlags):
+        value = int(self.ffi.cast("intptr_t", hObject))
+        try:
+            lpdwFlags[0] = self._handles[value][1]
+        except KeyError:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        return 1
+
+    def SetHandleInformation(self, hObject, dwMask, dwFlags):
+        value = int(self.ffi.cast("intptr_t", hObject))
+        with self._condition:
+            try:
+                entry = self._handles[value]
+            except KeyError:
+                return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+            entry[1] = entry[1] & ~dwMask | dwFlags & dwMask
+        return 1
+
+    def GetTempPath(self, nBufferLength, lpBuffer):
+        path = os.path.join(self.directory, "")
+        if len(path) + 1 > nBufferLength:
+            return len(path) + 1
+
+        for index, character in enumerate(path):
+            lpBuffer[index] = character
+        lpBuffer[len(path)] = u"\0"
+        return len(path)
+
+    def DuplicateHandle(
+            self, hSourceProcessHandle, hSourceHandle, hTargetProcessHandle,
+            lpTargetHandle, dwDesiredAccess, bInheritHandle, dwOptions):
+        if (self._object(hSourceProcessHandle, _Process) is None or
+                self._object(hTargetProcessHandle, _Process) is None):
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+
+        with self._condition:
+            obj = self._object(hSourceHandle)
+            if obj is None:
+                return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+
+            if lpTargetHandle != self.ffi.NULL:
+                lpTargetHandle[0] = self._handle(
+                    self._new_handle(obj, bInheritHandle))
+
+            if dwOptions & CONSTANTS["DUPLICATE_CLOSE_SOURCE"]:
+                self._close(int(self.ffi.cast("intptr_t", hSourceHandle)))
+        return 1
+
+    def CreateEvent(
+            self, lpEventAttributes, bManualReset, bInitialState, lpName):
+        name = self._string(lpName)
+        inherit = self._inherit(lpEventAttributes)
+        with self._condition:
+            event = self._events.get(name) if name is not None else None
+            if event is not None:
+                handle = self._new_handle(event, inherit)
+                self.last_error = CONSTANTS["ERROR_ALREADY_EXISTS"]
+                return self._handle(handle)
+
+            event = _Event(bool(bManualReset), bool(bInitialState), name)
+            if name is not None:
+                self._events[name] = event
+            return self._handle(self._new_handle(event, inherit))
+
+    def OpenEvent(self, dwDesiredAccess, bInheritHandle, lpName):
+        with self._condition:
+            event = self._events.get(self._string(lpName))
+            if event is None:
+                return self._fail(
+                    CONSTANTS["ERROR_FILE_NOT_FOUND"], self.ffi.NULL)
+            return self._handle(self._new_handle(event, bInheritHandle))
+
+    def ResetEvent(self, hEvent):
+        event = self._object(hEvent, _Event)
+        if event is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        event.signaled = False
+        return 1
+
+    def SetEvent(self, hEvent):
+        event = self._object(hEvent, _Event)
+        if event is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        with self._condition:
+            event.signaled = True
+            self._condition.notify_all()
+        return 1
+
+    def CreateFileMapping(
+            self, hFile, lpAttributes, flProtect, dwMaximumSizeHigh,
+            dwMaximumSizeLow, lpName):
+        name = self._string(lpName)
+        inherit = self._inherit(lpAttributes)
+        writable = {
+            CONSTANTS["PAGE_READONLY"]: False,
+            CONSTANTS["PAGE_READWRITE"]: True,
+            CONSTANTS["PAGE_WRITECOPY"]: False,
+            CONSTANTS["PAGE_EXECUTE_READ"]: False,
+            CONSTANTS["PAGE_EXECUTE_READWRITE"]: True,
+            CONSTANTS["PAGE_EXECUTE_WRITECOPY"]: False}.get(flProtect)
+        if writable is None:
+            return self._fail(
+                CONSTANTS["ERROR_INVALID_PARAMETER"], self.ffi.NULL)
+
+        size = dwMaximumSizeHigh << 32 | dwMaximumSizeLow
+        with self._condition:
+            mapping = self._mappings.get(name) if name is not None else None
+            if mapping is not None:
+                handle = self._new_handle(mapping, inherit)
+                self.last_error = CONSTANTS["ERROR_ALREADY_EXISTS"]
+                return self._handle(handle)
+
+            if int(self.ffi.cast("intptr_t", hFile)) == INVALID_HANDLE_VALUE:
+                if not size:
+                    return self._fail(
+                        CONSTANTS["ERROR_INVALID_PARAMETER"], self.ffi.NULL)
+                with tempfile.TemporaryFile(dir=self.directory) as file_:
+                    file_.truncate(size)
+                    fd = os.dup(file_.fileno())
+            else:
+                obj = self._object(hFile, _File)
+                if obj is None:
+                    return self._fail(
+                        CONSTANTS["ERROR_INVALID_HANDLE"], self.ffi.NULL)
+                if not obj.readable or writable and not obj.writable:
+                    return self._fail(
+                        CONSTANTS["ERROR_ACCESS_DENIED"], self.ffi.NULL)
+
+                try:
+                    file_size = os.fstat(obj.fd).st_size
+                    if not size and not file_size:
+                        return self._fail(ERROR_FILE_INVALID, self.ffi.NULL)
+                    if size > file_size:
+                        if not writable:
+                            return self._fail(
+                                CONSTANTS["ERROR_ACCESS_DENIED"],
+                                self.ffi.NULL)
+                        os.ftruncate(obj.fd, size)
+                    fd = os.dup(obj.fd)
+                except OSError as error:
+                    return self._oserror(error, self.ffi.NULL)
+                size = size or file_size
+
+            mapping = _Mapping(fd, size, writable, name)
+            if name is not None:
+                self._mappings[name] = mapping
+            return self._handle(self._new_handle(mapping, inherit))
+
+    def OpenFileMapping(self, dwDesiredAccess, bInheritHandle, lpName):
+        with self._condition:
+            mapping = self._mappings.get(self._string(lpName))
+            if mapping is None:
+                return self._fail(
+                    CONSTANTS["ERROR_FILE_NOT_FOUND"], self.ffi.NULL)
+            return self._handle(self._new_handle(mapping, bInheritHandle))
+
+    def MapViewOfFile(
+            self, hFileMappingObject, dwDesiredAccess, dwFileOffsetHigh,
+            dwFileOffsetLow, dwNumberOfBytesToMap):
+        return self.MapViewOfFileEx(
+            hFileMappingObject, dwDesiredAccess, dwFileOffsetHigh,
+            dwFileOffsetLow, dwNumberOfBytesToMap, self.ffi.NULL)
+
+    def MapViewOfFileEx(  # pylint: disable=too-many-return-statements
+            self, hFileMappingObject, dwDesiredAccess, dwFileOffsetHigh,
+            dwFileOffsetLow, dwNumberOfBytesToMap, lpBaseAddress):
+        mapping = self._object(hFileMappingObject, _Mapping)
+        if mapping is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"], self.ffi.NULL)
+        if lpBaseAddress != self.ffi.NULL:
+            return self._fail(ERROR_INVALID_ADDRESS, self.ffi.NULL)
+
+        offset = dwFileOffsetHigh << 32 | dwFileOffsetLow
+        if offset % mmap.ALLOCATIONGRANULARITY:
+            return self._fail(ERROR_MAPPED_ALIGNMENT, self.ffi.NULL)
+
+        size = dwNumberOfBytesToMap or mapping.size - offset
+        if size <= 0 or offset + size > mapping.size:
+            return self._fail(
+                CONSTANTS["ERROR_INVALID_PARAMETER"], self.ffi.NULL)
+
+        write = dwDesiredAccess & CONSTANTS["FILE_MAP_WRITE"]
+        if write and not mapping.writable:
+            return self._fail(CONSTANTS["ERROR_ACCESS_DENIED"], self.ffi.NULL)
+
+        if write:
+            access = mmap.ACCESS_WRITE
+        elif dwDesiredAccess & CONSTANTS["FILE_MAP_COPY"]:
+            access = mmap.ACCESS_COPY
+        else:
+            access = mmap.ACCESS_READ
+
+        with self._condition:
+            try:
+                memory = mmap.mmap(
+                    mapping.fd, size, access=access, offset=offset)
+            except (OSError, mmap.error) as error:
+                return self._oserror(error, self.ffi.NULL)
+
+            data = self.ffi.from_buffer(memory)
+            address = int(self.ffi.cast("uintptr_t", data))
+            self._views[address] = _View(memory, data, address, size)
+        return self.ffi.cast("LPVOID", data)
+
+    def FlushViewOfFile(self, lpBaseAddress, dwNumberOfBytesToFlush):
+        address = int(self.ffi.cast("uintptr_t", lpBaseAddress))
+        with self._condition:
+            for view in self._views.values():
+                if view.address <= address < view.address + view.size:
+                    break
+            else:
+                return self._fail(ERROR_INVALID_ADDRESS)
+
+            view.memory.flush()
+        return 1
+
+    def UnmapViewOfFile(self, lpBaseAddress):
+        address = int(self.ffi.cast("uintptr_t", lpBaseAddress))
+        with self._condition:
+            if address not in self._views:
+                return self._fail(ERROR_INVALID_ADDRESS)
+            self._unmap(address)
+        return 1
+
+    def ClearCommError(self, hFile, lpErrors, lpStat):
+        obj = self._object(hFile)
+        if obj is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+
+        if lpErrors != self.ffi.NULL:
+            lpErrors[0] = 0
+        if lpStat != self.ffi.NULL:
+            lpStat.cbOutQue = 0
+            lpStat.cbInQue = 0
+            if isinstance(obj, _PipeEnd) and obj.readable:
+                lpStat.cbInQue = len(obj.pipe.data)
+        return 1
+
+    def CreateProcess(
+            self, lpApplicationName, lpCommandLine, lpProcessAttributes,
+            lpThreadAttributes, bInheritHandles, dwCreationFlags,
+            lpEnvironment, lpCurrentDirectory, lpStartupInfo,
+            lpProcessInformation):
+        command_line = self._string(lpCommandLine)
+        if command_line is None:
+            command_line = self._string(lpApplicationName)
+        if not command_line:
+            return self._fail(CONSTANTS["ERROR_INVALID_PARAMETER"])
+
+        with self._condition:
+            while self._next_pid in self.processes:
+                self._next_pid += 4
+            pid = self._next_pid
+            process = _Process(
+                pid, command_line=command_line, flags=dwCreationFlags,
+                thread_id=pid + 4)
+            self.processes[pid] = process
+            self._next_pid += 8
+
+            lpProcessInformation.hProcess = self._handle(self._new_handle(
+                process, self._inherit(lpProcessAttributes)))
+            lpProcessInformation.hThread = self._handle(self._new_handle(
+                _Thread(process), self._inherit(lpThreadAttributes)))
+            lpProcessInformation.dwProcessId = pid
+            lpProcessInformation.dwThreadId = process.thread_id
+
+            if self._process_lifetime is not None:
+                timer = threading.Timer(
+                    self._process_lifetime, self.exit_process, args=(pid, ))
+                timer.daemon = True
+                timer.start()
+                self._timers.append(timer)
+        return 1
+
+    def GetOverlappedResult(
+            self, hFile, lpOverlapped, lpNumberOfBytesTransferred, bWait):
+        if self._object(hFile) is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+
+        # Overlapped operations complete before returning
+        # so the result is always available.
+        lpNumberOfBytesTransferred[0] = lpOverlapped.InternalHigh
+        return 1
+
+    def _console(self, handle):
+        """Returns the console screen buffer ``handle`` refers to"""
+        obj = self._object(handle, (_Console, _Descriptor))
+        if isinstance(obj, _Descriptor):
+            return obj.console
+        return obj
+
+    def SetConsoleTextAttribute(self, hConsoleOutput, wAttributes):
+        console = self._console(hConsoleOutput)
+        if console is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+        console.attributes = wAttributes
+        return 1
+
+    def GetConsoleScreenBufferInfo(
+            self, hConsoleOutput, lpConsoleScreenBufferInfo):
+        console = self._console(hConsoleOutput)
+        if console is None:
+            return self._fail(CONSTANTS["ERROR_INVALID_HANDLE"])
+
+        info = lpConsoleScreenBufferInfo
+        info.dwSize.X, info.dwSize.Y = 80, 300
+        info.dwCursorPosition.X, info.dwCursorPosition.Y = 0, 0
+        info.wAttributes = console.attributes
+        info.srWindow.Left, info.srWindow.Top = 0, 0
+        info.srWindow.Right, info.srWindow.Bottom = 79, 24
+        info.dwMaximumWindowSize.X, info.dwMaximumWindowSize.Y = 80, 25
+        return 1
+
+    def CreateConsoleScreenBuffer(
+            self, dwDesiredAccess, dwShareMode, lpSecurityAttributes,
+            dwFlags, lpScreenBufferData):
+        if dwFlags != CONSTANTS["CONSOLE_TEXTMODE_BUFFER"]:
+            return self._fail(
+                CONSTANTS["ERROR_INVALID_PARAMETER"],
+                self._handle(INVALID_HANDLE_VALUE))
+        return self._handle(self._new_handle(
+            _Console(), self._inherit(lpSecurityAttributes)))
+
+    def SetLastError(self, dwErrCode):
+        self.last_error = dwErrCode
+
+    def MsgWaitForMultipleObjects(
+            self, nCount, pHandles, bWaitAll, dwMilliseconds, dwWakeMask):
+        if nCount >= CONSTANTS["MAXIMUM_WAIT_OBJECTS"]:
+            return self._fail(
+                CONSTANTS["ERROR_INVALID_PARAMETER"], CONSTANTS["WAIT_FAILED"])
+
+        objects = [self._object(pHandles[index]) for index in range(nCount)]
+        if None in objects:
+            return self._fail(
+                CONSTANTS["ERROR_INVALID_HANDLE"], CONSTANTS["WAIT_FAILED"])
+
+        # There's no message queue, only the objects can be signaled.
+        return self._wait(objects, bool(bWaitAll), dwMilliseconds)
+
+    def closesocket(self, s):
+        with self._condition:
+            self._sockets.pop(s, None)
+        return 0
+
+    def WSAEventSelect(self, s, hEventObject, lNetworkEvents):
+        event = None
+        if lNetworkEvents:
+            event = self._object(hEventObject, _Event)
+            if event is None:
+                return self._fail(
+                    CONSTANTS["WSA_INVALID_HANDLE"], CONSTANTS["SOCKET_ERROR"])
+
+        with self._condition:
+            state = self._sockets.setdefault(s, _Socket())
+            state.event = event
+            state.mask = lNetworkEvents
+            if event is not None and state.events & lNetworkEvents:
+                event.signaled = True
+                self._condition.notify_all()
+        return 0
+
+    def WSAGetLastError(self):
+        return self.last_error
+
+    def WSACreateEvent(self):
+        return self._handle(self._new_handle(_Event(True, False)))
+
+    def WSAEnumNetworkEvents(self, s, hEventObject, lpNetworkEvents):
+        event = None
+        if hEventObject != self.ffi.NULL:
+            event = self._object(hEventObject, _Event)
+            if event is None:
+                return self._fail(
+                    CONSTANTS["WSA_INVALID_HANDLE"], CONSTANTS["SOCKET_ERROR"])
+
+        with self._condition:
+            state = self._sockets.setdefault(s, _Socket())
+            lpNetworkEvents.lNetworkEvents = state.events & state.mask
+            for bit in range(CONSTANTS["FD_MAX_EVENTS"]):
+                lpNetworkEvents.iErrorCode[bit] = state.errors.get(1 << bit, 0)
+            state.events &= ~state.mask
+            if event is not None:
+                event.signaled = False
+        return 0
+
+
+class SimulatedLibrary(object):  # pylint: disable=too-few-public-methods
+    """
+    The library returned by :meth:`Simulation.library`.  The functions
+    and constants are stored in the instance's ``__dict__`` so it can be
+    wrapped by :class:`pywincffi.core.dist.LibraryWrapper`.
+    """
+
+
+_SIMULATION = None
+_SIMULATION_LOCK = threading.Lock()
+
+
+def simulation():
+    """
+    Returns the :class:`Simulation` used by :func:`load`,
+    creating it on first use.
+    """
+    global _SIMULATION  # pylint: disable=global-statement
+    with _SIMULATION_LOCK:
+        if _SIMULATION is None:
+            _SIMULATION = Simulation()
+            atexit.register(_SIMULATION.close)
+        return _SIMULATION
+
+
+def load(name):
+    """
+    Returns the simulated module for ``name`` in
+    :data:`pywincffi.core.dist.MODULES`, this has the same
+    ``ffi`` and ``lib`` attributes as a compiled module.
+    """
+    instance = simulation()
+    return abi.AbiModule(instance.ffi, instance.library(name))
@@ -5,8 +5,62 @@ Types Base
 Provides the base types on top of which user visible types will be built.
 """
 
+from operator import attrgetter
+
+import six
+
+
+class _Field(property):
+    """
+    A read only property for a field of the wrapped struct.  The getter is
+    an :func:`operator.attrgetter` so reading a field doesn't involve any
+    Python level calls.  Fields are set by
+    :meth:`CFFICDataWrapper.__setattr__` instead.
+    """
+    def __init__(self, name):
+        super(_Field, self).__init__(attrgetter("_cdata." + name))
+
+
+class CFFICDataWrapperType(type):
+    """
+    Metaclass for :class:`CFFICDataWrapper`.  Work which only depends on
+    the class, such as finding the descriptors attribute assignment should
+    use, is done once here rather than on every assignment.  Classes in
+    pywincffi which don't define ``__slots__`` are given an empty one since
+    all of their data lives in the wrapped cdata object.  Sub-classes
+    defined elsewhere keep their ``__dict__`` unless they define
+    ``__slots__`` themselves.
+    """
+    def __new__(mcs, name, bases, namespace):
+        module = namespace.get("__module__", "")
+        if module == "pywincffi" or module.startswith("pywincffi."):
+            namespace.setdefault("__slots__", ())
+        return super(CFFICDataWrapperType, mcs).__new__(
+            mcs, name, bases, namespace)
+
+    def __init__(cls, name, bases, namespace):
+        super(CFFICDataWrapperType, cls).__init__(name, bases, namespace)
+
+        # Maps attribute names to the descriptors used to set them, later
+        # classes in the MRO override earlier ones.  Anything which can't
+        # be set, including read only properties, is set on the cdata.
+        setters = {}
+        for klass in reversed(cls.__mro__):
+            for attribute, value in vars(klass).items():
+                if isinstance(value, property) and value.fset is None:
+                    setters.pop(attribute, None)
+                elif hasattr(type(value), "__set__"):
+                    setters[attribute] = value
+                else:
+                    setters.pop(attribute, None)
+
+        cls._setters = setters
+        cls._cdecls = set()
+        cls._view_type = None
+
 
 # pylint: disable=too-few-public-methods
+@six.add_metaclass(CFFICDataWrapperType)
 class CFFICDataWrapper(object):
     """
     Base class for exposing Python types and interfaces to pywincffi users:
@@ -19,42 +73,108 @@ class CFFICDataWrapper(object):
     itself contains such an attribute and that attribute is a descriptor; this
     is in place to support @property in sub-classes.
 
+    The fields of a wrapped struct are added to the class as descriptors
+    the first time an instance is created so reading them goes straight
+    to the cdata.
+
+    ``_as_parameter_`` is the cdata object which should be passed to the
+    library, it's used by :func:`pywincffi.wintypes.wintype_to_cdata`.
+    Sub-classes which wrap something other than a pointer to a struct
+    should override it.
+
     :param str cdecl:
         C type specification as used in ff.new(cdecl)
 
     :param cffi.api.FFI ffi:
         FFI instance used to create wrapped cdata object.
     """
+    __slots__ = ("_cdata", )
+    _as_parameter_ = property(attrgetter("_cdata"))
 
     def __init__(self, cdecl, ffi):
         self._cdata = ffi.new(cdecl)
 
+        cls = self.__class__
+        if cdecl not in cls._cdecls:
+            cls._cdecls.add(cdecl)
+            _install_fields(cls, ffi.typeof(self._cdata))
+
+    @classmethod
+    def from_cdata(cls, cdata, owner=None):
+        """
+        Returns an instance of this class which wraps ``cdata`` instead of
+        allocating its own.  ``__init__`` is not called so this is only
+        suitable for classes, such as structures, where all the state is in
+        ``_cdata``.
+
+        :param cdata:
+            The cdata object to wrap, for a struct this should be a pointer.
+
+        :keyword owner:
+            An object which will be kept alive for as long as the instance.
+            This should be the object which owns the memory ``cdata``
+            points to if ``cdata`` doesn't keep it alive itself.
+        """
+        if owner is None:
+            wrapper = cls.__new__(cls)
+        else:
+            # Instances of this class don't have anywhere to store `owner`
+            # so use a sub-class which does.
+            if cls._view_type is None:
+                view_type = type(cls)(
+                    cls.__name__, (cls, ), {
+                        "__slots__": ("_owner", ),
+                        "__module__": cls.__module__,
+                        "__doc__": cls.__doc__})
+                cls._view_type = (
+                    view_type, vars(view_type)["_owner"].__set__)
+
+            view_type, set_owner = cls._view_type
+            wrapper = view_type.__new__(view_type)
+            set_owner(wrapper, owner)
+
+        # Set the slots directly, going through __setattr__ would
+        # double the time this takes.
+        _set_cdata(wrapper, cdata)
+        return wrapper
+
     def __getattr__(self, name):
         return getattr(self._cdata, name)
 
     def __setattr__(self, name, value):
-        # avoid self-recursion setting own attribute: use parent's __setattr__
-        if name == "_cdata":
-            super(CFFICDataWrapper, self).__setattr__(name, value)
+        setter = self._setters.get(name)
+        if setter is None:
+            setattr(self._cdata, name, value)
             return
 
-        # support descriptor attributes in child classes
-        if hasattr(self.__class__, name):
-            try:
-                # getattr on class, otherwise descriptor's __get__ is called
-                attr = getattr(self.__class__, name)
-                # use descriptor protocol to set
-                attr.__set__(self, value)
-                return
-            except AttributeError:
-                # attr.__set__ raised this: attr is not a descriptor
-                pass
-
-        # fallback case: delegate to self._cdata
-        setattr(self._cdata, name, value)
+        try:
+            setter.__set__(self, value)
+        except AttributeError:
+            # setter.__set__ raised this: it can't set the attribute
+            setattr(self._cdata, name, value)
 
     def __getitem__(self, key):
         return self._cdata.__getitem__(key)
 
     def __setitem__(self, key, value):
         return self._cdata.__setitem__(key, value)
+
+
+_set_cdata = vars(CFFICDataWrapper)["_cdata"].__set__
+
+
+def _install_fields(cls, ctype):
+    """
+    Adds a :class:`_Field` to ``cls`` for each field of the struct or
+    union ``ctype`` describes, or points to, unless ``cls`` already has
+    an attribute with the same name.
+    """
+    if ctype.kind == "pointer":
+        ctype = ctype.item
+
+    if ctype.kind not in ("struct", "union") or ctype.fields is None:
+        return
+
+    for name, _ in ctype.fields:
+        if name and not hasattr(cls, name):
+            setattr(cls, name, _Field(name))
@@ -0,0 +1,343 @@
+"""
+Values
+------
+
+The values the Windows headers define for the constants declared in
+``constants.h``.  The headers only declare the names of the constants so
+these are used where the values can't be read from the compiled library,
+by :mod:`pywincffi.constants` in a source checkout and by
+:mod:`pywincffi.core.simulated`.
+"""
+
+CONSTANTS = {
+    "MAX_PATH": 260,
+    "STD_INPUT_HANDLE": 0xFFFFFFF6,
+    "STD_OUTPUT_HANDLE": 0xFFFFFFF5,
+    "STD_ERROR_HANDLE": 0xFFFFFFF4,
+    "PROCESS_CREATE_PROCESS": 0x0080,
+    "PROCESS_CREATE_THREAD": 0x0002,
+    "PROCESS_DUP_HANDLE": 0x0040,
+    "PROCESS_QUERY_INFORMATION": 0x0400,
+    "PROCESS_QUERY_LIMITED_INFORMATION": 0x1000,
+    "PROCESS_SET_INFORMATION": 0x0200,
+    "PROCESS_SET_QUOTA": 0x0100,
+    "PROCESS_SUSPEND_RESUME": 0x0800,
+    "PROCESS_TERMINATE": 0x0001,
+    "PROCESS_VM_OPERATION": 0x0008,
+    "PROCESS_VM_READ": 0x0010,
+    "PROCESS_VM_WRITE": 0x0020,
+    "STILL_ACTIVE": 259,
+    "TH32CS_INHERIT": 0x80000000,
+    "TH32CS_SNAPALL": 0x0000000F,
+    "TH32CS_SNAPHEAPLIST": 0x00000001,
+    "TH32CS_SNAPMODULE": 0x00000008,
+    "TH32CS_SNAPMODULE32": 0x00000010,
+    "TH32CS_SNAPPROCESS": 0x00000002,
+    "TH32CS_SNAPTHREAD": 0x00000004,
+    "CREATE_BREAKAWAY_FROM_JOB": 0x01000000,
+    "CREATE_DEFAULT_ERROR_MODE": 0x04000000,
+    "CREATE_NEW_CONSOLE": 0x00000010,
+    "CREATE_NEW_PROCESS_GROUP": 0x00000200,
+    "CREATE_NO_WINDOW": 0x08000000,
+    "CREATE_PROTECTED_PROCESS": 0x00040000,
+    "CREATE_PRESERVE_CODE_AUTHZ_LEVEL": 0x02000000,
+    "CREATE_SEPARATE_WOW_VDM": 0x00000800,
+    "CREATE_SHARED_WOW_VDM": 0x00001000,
+    "CREATE_SUSPENDED": 0x00000004,
+    "CREATE_UNICODE_ENVIRONMENT": 0x00000400,
+    "DEBUG_ONLY_THIS_PROCESS": 0x00000002,
+    "DEBUG_PROCESS": 0x00000001,
+    "DETACHED_PROCESS": 0x00000008,
+    "EXTENDED_STARTUPINFO_PRESENT": 0x00080000,
+    "INHERIT_PARENT_AFFINITY": 0x00010000,
+    "ABOVE_NORMAL_PRIORITY_CLASS": 0x00008000,
+    "BELOW_NORMAL_PRIORITY_CLASS": 0x00004000,
+    "HIGH_PRIORITY_CLASS": 0x00000080,
+    "IDLE_PRIORITY_CLASS": 0x00000040,
+    "NORMAL_PRIORITY_CLASS": 0x00000020,
+    "REALTIME_PRIORITY_CLASS": 0x00000100,
+    "WAIT_ABANDONED": 0x00000080,
+    "WAIT_ABANDONED_0": 0x00000080,
+    "WAIT_OBJECT_0": 0x00000000,
+    "WAIT_TIMEOUT": 0x00000102,
+    "WAIT_FAILED": 0xFFFFFFFF,
+    "INFINITE": 0xFFFFFFFF,
+    "SYNCHRONIZE": 0x00100000,
+    "FILE_GENERIC_READ": 0x00120089,
+    "FILE_GENERIC_WRITE": 0x00120116,
+    "FILE_GENERIC_EXECUTE": 0x001200A0,
+    "FILE_ADD_FILE": 0x0002,
+    "FILE_ADD_SUBDIRECTORY": 0x0004,
+    "FILE_ALL_ACCESS": 0x001F01FF,
+    "FILE_APPEND_DATA": 0x0004,
+    "FILE_CREATE_PIPE_INSTANCE": 0x0004,
+    "FILE_DELETE_CHILD": 0x0040,
+    "FILE_EXECUTE": 0x0020,
+    "FILE_LIST_DIRECTORY": 0x0001,
+    "FILE_READ_ATTRIBUTES": 0x0080,
+    "FILE_READ_DATA": 0x0001,
+    "FILE_READ_EA": 0x0008,
+    "FILE_TRAVERSE": 0x0020,
+    "FILE_WRITE_ATTRIBUTES": 0x0100,
+    "FILE_WRITE_DATA": 0x0002,
+    "FILE_WRITE_EA": 0x0010,
+    "FILE_SHARE_DELETE": 0x00000004,
+    "FILE_SHARE_READ": 0x00000001,
+    "FILE_SHARE_WRITE": 0x00000002,
+    "FILE_ATTRIBUTE_ARCHIVE": 0x00000020,
+    "FILE_ATTRIBUTE_ENCRYPTED": 0x00004000,
+    "FILE_ATTRIBUTE_HIDDEN": 0x00000002,
+    "FILE_ATTRIBUTE_NORMAL": 0x00000080,
+    "FILE_ATTRIBUTE_OFFLINE": 0x00001000,
+    "FILE_ATTRIBUTE_READONLY": 0x00000001,
+    "FILE_ATTRIBUTE_SYSTEM": 0x00000004,
+    "FILE_ATTRIBUTE_TEMPORARY": 0x00000100,
+    "FILE_FLAG_BACKUP_SEMANTICS": 0x02000000,
+    "FILE_FLAG_DELETE_ON_CLOSE": 0x04000000,
+    "FILE_FLAG_NO_BUFFERING": 0x20000000,
+    "FILE_FLAG_OPEN_NO_RECALL": 0x00100000,
+    "FILE_FLAG_OPEN_REPARSE_POINT": 0x00200000,
+    "FILE_FLAG_OVERLAPPED": 0x40000000,
+    "FILE_FLAG_POSIX_SEMANTICS": 0x01000000,
+    "FILE_FLAG_RANDOM_ACCESS": 0x10000000,
+    "FILE_FLAG_SESSION_AWARE": 0x00800000,
+    "FILE_FLAG_SEQUENTIAL_SCAN": 0x08000000,
+    "FILE_FLAG_WRITE_THROUGH": 0x80000000,
+    "CREATE_ALWAYS": 2,
+    "CREATE_NEW": 1,
+    "OPEN_ALWAYS": 4,
+    "OPEN_EXISTING": 3,
+    "TRUNCATE_EXISTING": 5,
+    "FILE_BEGIN": 0,
+    "FILE_CURRENT": 1,
+    "FILE_END": 2,
+    "PIPE_TYPE_MESSAGE": 0x00000004,
+    "PIPE_READMODE_BYTE": 0x00000000,
+    "PIPE_READMODE_MESSAGE": 0x00000002,
+    "PIPE_WAIT": 0x00000000,
+    "PIPE_NOWAIT": 0x00000001,
+    "PIPE_CLIENT_END": 0x00000000,
+    "PIPE_SERVER_END": 0x00000001,
+    "PIPE_TYPE_BYTE": 0x00000000,
+    "HANDLE_FLAG_INHERIT": 0x00000001,
+    "HANDLE_FLAG_PROTECT_FROM_CLOSE": 0x00000002,
+    "DUPLICATE_CLOSE_SOURCE": 0x00000001,
+    "DUPLICATE_SAME_ACCESS": 0x00000002,
+    "MOVEFILE_COPY_ALLOWED": 0x00000002,
+    "MOVEFILE_CREATE_HARDLINK": 0x00000010,
+    "MOVEFILE_DELAY_UNTIL_REBOOT": 0x00000004,
+    "MOVEFILE_FAIL_IF_NOT_TRACKABLE": 0x00000020,
+    "MOVEFILE_REPLACE_EXISTING": 0x00000001,
+    "MOVEFILE_WRITE_THROUGH": 0x00000008,
+    "LOCKFILE_EXCLUSIVE_LOCK": 0x00000002,
+    "LOCKFILE_FAIL_IMMEDIATELY": 0x00000001,
+    "SECURITY_ANONYMOUS": 0x00000000,
+    "SECURITY_CONTEXT_TRACKING": 0x00040000,
+    "SECURITY_DELEGATION": 0x00030000,
+    "SECURITY_EFFECTIVE_ONLY": 0x00080000,
+    "SECURITY_IDENTIFICATION": 0x00010000,
+    "SECURITY_IMPERSONATION": 0x00020000,
+    "STANDARD_RIGHTS_READ": 0x00020000,
+    "STANDARD_RIGHTS_WRITE": 0x00020000,
+    "GENERIC_ALL": 0x10000000,
+    "GENERIC_READ": 0x80000000,
+    "GENERIC_WRITE": 0x40000000,
+    "ERROR_INVALID_HANDLE": 6,
+    "ERROR_INVALID_PARAMETER": 87,
+    "ERROR_ACCESS_DENIED": 5,
+    "ERROR_ALREADY_EXISTS": 183,
+    "ERROR_NOT_SAME_DEVICE": 17,
+    "ERROR_SHARING_VIOLATION": 32,
+    "ERROR_FILE_EXISTS": 80,
+    "ERROR_FILE_NOT_FOUND": 2,
+    "ERROR_PATH_NOT_FOUND": 3,
+    "ERROR_IO_PENDING": 997,
+    "ERROR_BAD_EXE_FORMAT": 193,
+    "DELETE": 0x00010000,
+    "READ_CONTROL": 0x00020000,
+    "WRITE_DAC": 0x00040000,
+    "WRITE_OWNER": 0x00080000,
+    "EVENT_ALL_ACCESS": 0x001F0003,
+    "EVENT_MODIFY_STATE": 0x00000002,
+    "MUTEX_ALL_ACCESS": 0x001F0001,
+    "MUTEX_MODIFY_STATE": 0x00000001,
+    "SEMAPHORE_ALL_ACCESS": 0x001F0003,
+    "SEMAPHORE_MODIFY_STATE": 0x00000002,
+    "TIMER_ALL_ACCESS": 0x001F0003,
+    "TIMER_MODIFY_STATE": 0x00000002,
+    "TIMER_QUERY_STATE": 0x00000001,
+    "PAGE_READONLY": 0x02,
+    "PAGE_READWRITE": 0x04,
+    "PAGE_WRITECOPY": 0x08,
+    "PAGE_EXECUTE_READ": 0x20,
+    "PAGE_EXECUTE_READWRITE": 0x40,
+    "PAGE_EXECUTE_WRITECOPY": 0x80,
+    "FILE_MAP_ALL_ACCESS": 0x000F001F,
+    "FILE_MAP_COPY": 0x00000001,
+    "FILE_MAP_EXECUTE": 0x00000020,
+    "FILE_MAP_READ": 0x00000004,
+    "FILE_MAP_WRITE": 0x00000002,
+    "STARTF_FORCEONFEEDBACK": 0x00000040,
+    "STARTF_FORCEOFFFEEDBACK": 0x00000080,
+    "STARTF_PREVENTPINNING": 0x00002000,
+    "STARTF_RUNFULLSCREEN": 0x00000020,
+    "STARTF_TITLEISAPPID": 0x00001000,
+    "STARTF_TITLEISLINKNAME": 0x00000800,
+    "STARTF_UNTRUSTEDSOURCE": 0x00008000,
+    "STARTF_USECOUNTCHARS": 0x00000008,
+    "STARTF_USEFILLATTRIBUTE": 0x00000010,
+    "STARTF_USEHOTKEY": 0x00000200,
+    "STARTF_USEPOSITION": 0x00000004,
+    "STARTF_USESHOWWINDOW": 0x00000001,
+    "STARTF_USESIZE": 0x00000002,
+    "STARTF_USESTDHANDLES": 0x00000100,
+    "CE_BREAK": 0x0010,
+    "CE_FRAME": 0x0008,
+    "CE_OVERRUN": 0x0002,
+    "CE_RXOVER": 0x0001,
+    "CE_RXPARITY": 0x0004,
+    "CE_DNS": 0x0800,
+    "CE_IOE": 0x0400,
+    "CE_MODE": 0x8000,
+    "CE_OOP": 0x1000,
+    "CE_PTO": 0x0200,
+    "CE_TXFULL": 0x0100,
+    "MAXIMUM_WAIT_OBJECTS": 64,
+    "QS_ALLEVENTS": 0x04BF,
+    "QS_ALLINPUT": 0x04FF,
+    "QS_ALLPOSTMESSAGE": 0x0100,
+    "QS_HOTKEY": 0x0080,
+    "QS_INPUT": 0x0407,
+    "QS_KEY": 0x0001,
+    "QS_MOUSE": 0x0006,
+    "QS_MOUSEBUTTON": 0x0004,
+    "QS_MOUSEMOVE": 0x0002,
+    "QS_PAINT": 0x0020,
+    "QS_POSTMESSAGE": 0x0008,
+    "QS_RAWINPUT": 0x0400,
+    "QS_SENDMESSAGE": 0x0040,
+    "QS_TIMER": 0x0010,
+    "SOCKET_ERROR": -1,
+    "FD_READ": 0x0001,
+    "FD_WRITE": 0x0002,
+    "FD_OOB": 0x0004,
+    "FD_ACCEPT": 0x0008,
+    "FD_CONNECT": 0x0010,
+    "FD_CLOSE": 0x0020,
+    "FD_QOS": 0x0040,
+    "FD_GROUP_QOS": 0x0080,
+    "FD_ROUTING_INTERFACE_CHANGE": 0x0100,
+    "FD_ADDRESS_LIST_CHANGE": 0x0200,
+    "FD_MAX_EVENTS": 10,
+    "WSA_INVALID_HANDLE": 6,
+    "WSA_NOT_ENOUGH_MEMORY": 8,
+    "WSA_INVALID_PARAMETER": 87,
+    "WSA_OPERATION_ABORTED": 995,
+    "WSA_IO_INCOMPLETE": 996,
+    "WSA_IO_PENDING": 997,
+    "WSAEINTR": 10004,
+    "WSAEBADF": 10009,
+    "WSAEACCES": 10013,
+    "WSAEFAULT": 10014,
+    "WSAEINVAL": 10022,
+    "WSAEMFILE": 10024,
+    "WSAEWOULDBLOCK": 10035,
+    "WSAEINPROGRESS": 10036,
+    "WSAEALREADY": 10037,
+    "WSAENOTSOCK": 10038,
+    "WSAEDESTADDRREQ": 10039,
+    "WSAEMSGSIZE": 10040,
+    "WSAEPROTOTYPE": 10041,
+    "WSAENOPROTOOPT": 10042,
+    "WSAEPROTONOSUPPORT": 10043,
+    "WSAESOCKTNOSUPPORT": 10044,
+    "WSAEOPNOTSUPP": 10045,
+    "WSAEPFNOSUPPORT": 10046,
+    "WSAEAFNOSUPPORT": 10047,
+    "WSAEADDRINUSE": 10048,
+    "WSAEADDRNOTAVAIL": 10049,
+    "WSAENETDOWN": 10050,
+    "WSAENETUNREACH": 10051,
+    "WSAENETRESET": 10052,
+    "WSAECONNABORTED": 10053,
+    "WSAECONNRESET": 10054,
+    "WSAENOBUFS": 10055,
+    "WSAEISCONN": 10056,
+    "WSAENOTCONN": 10057,
+    "WSAESHUTDOWN": 10058,
+    "WSAETOOMANYREFS": 10059,
+    "WSAETIMEDOUT": 10060,
+    "WSAECONNREFUSED": 10061,
+    "WSAELOOP": 10062,
+    "WSAENAMETOOLONG": 10063,
+    "WSAEHOSTDOWN": 10064,
+    "WSAEHOSTUNREACH": 10065,
+    "WSAENOTEMPTY": 10066,
+    "WSAEPROCLIM": 10067,
+    "WSAEUSERS": 10068,
+    "WSAEDQUOT": 10069,
+    "WSAESTALE": 10070,
+    "WSAEREMOTE": 10071,
+    "WSASYSNOTREADY": 10091,
+    "WSAVERNOTSUPPORTED": 10092,
+    "WSANOTINITIALISED": 10093,
+    "WSAEDISCON": 10101,
+    "WSAENOMORE": 10102,
+    "WSAECANCELLED": 10103,
+    "WSAEINVALIDPROCTABLE": 10104,
+    "WSAEINVALIDPROVIDER": 10105,
+    "WSAEPROVIDERFAILEDINIT": 10106,
+    "WSASYSCALLFAILURE": 10107,
+    "WSASERVICE_NOT_FOUND": 10108,
+    "WSATYPE_NOT_FOUND": 10109,
+    "WSA_E_NO_MORE": 10110,
+    "WSA_E_CANCELLED": 10111,
+    "WSAEREFUSED": 10112,
+    "WSAHOST_NOT_FOUND": 11001,
+    "WSATRY_AGAIN": 11002,
+    "WSANO_RECOVERY": 11003,
+    "WSANO_DATA": 11004,
+    "WSA_QOS_RECEIVERS": 11005,
+    "WSA_QOS_SENDERS": 11006,
+    "WSA_QOS_NO_SENDERS": 11007,
+    "WSA_QOS_NO_RECEIVERS": 11008,
+    "WSA_QOS_REQUEST_CONFIRMED": 11009,
+    "WSA_QOS_ADMISSION_FAILURE": 11010,
+    "WSA_QOS_POLICY_FAILURE": 11011,
+    "WSA_QOS_BAD_STYLE": 11012,
+    "WSA_QOS_BAD_OBJECT": 11013,
+    "WSA_QOS_TRAFFIC_CTRL_ERROR": 11014,
+    "WSA_QOS_GENERIC_ERROR": 11015,
+    "WSA_QOS_ESERVICETYPE": 11016,
+    "WSA_QOS_EFLOWSPEC": 11017,
+    "WSA_QOS_EPROVSPECBUF": 11018,
+    "WSA_QOS_EFILTERSTYLE": 11019,
+    "WSA_QOS_EFILTERTYPE": 11020,
+    "WSA_QOS_EFILTERCOUNT": 11021,
+    "WSA_QOS_EOBJLENGTH": 11022,
+    "WSA_QOS_EFLOWCOUNT": 11023,
+    "WSA_QOS_EUNKOWNPSOBJ": 11024,
+    "WSA_QOS_EPOLICYOBJ": 11025,
+    "WSA_QOS_EFLOWDESC": 11026,
+    "WSA_QOS_EPSFLOWSPEC": 11027,
+    "WSA_QOS_EPSFILTERSPEC": 11028,
+    "WSA_QOS_ESDMODEOBJ": 11029,
+    "WSA_QOS_ESHAPERATEOBJ": 11030,
+    "WSA_QOS_RESERVED_PETYPE": 11031,
+    "CONSOLE_TEXTMODE_BUFFER": 1,
+    "FOREGROUND_RED": 0x0004,
+    "FOREGROUND_GREEN": 0x0002,
+    "FOREGROUND_BLUE": 0x0001,
+    "BACKGROUND_RED": 0x0040,
+    "BACKGROUND_GREEN": 0x0020,
+    "BACKGROUND_BLUE": 0x0010,
+    "FOREGROUND_INTENSITY": 0x0008,
+    "BACKGROUND_INTENSITY": 0x0080,
+    "COMMON_LVB_LEADING_BYTE": 0x0100,
+    "COMMON_LVB_TRAILING_BYTE": 0x0200,
+    "COMMON_LVB_GRID_HORIZONTAL": 0x0400,
+    "COMMON_LVB_GRID_LVERTICAL": 0x0800,
+    "COMMON_LVB_GRID_RVERTICAL": 0x1000,
+    "COMMON_LVB_REVERSE_VIDEO": 0x4000,
+    "COMMON_LVB_UNDERSCORE": 0x8000
+}
@@ -0,0 +1,303 @@
+"""
+Code Generation
+===============
+
+Generates wrapper functions from the SAL annotations in the headers.  The
+annotations describe how each parameter is used so the generator can work
+out which parameters a wrapper should accept, which ones are outputs that
+must be allocated before the call and what the wrapper should return:
+
+    >>> from pywincffi.dev.codegen import parse, generate, build
+    >>> functions = parse(join(HEADERS_DIR, "kernel32.h"))
+    >>> source = generate(functions, ("ReadFile", "WriteFile"))
+    >>> wrappers = build(source, ffi, library)
+    >>> data = wrappers["ReadFile"](handle, 12)
+
+The generated wrappers validate all of their inputs with a single boolean
+expression and only fall back on :func:`pywincffi.core.checks.input_check`
+to produce an error once that expression fails.  The cffi types of the
+output parameters, and the functions from the library, are looked up once
+when the wrappers are bound rather than on every call.
+"""
+
+import re
+from collections import namedtuple
+from os.path import basename
+
+import six
+
+from pywincffi.core import dist
+from pywincffi.exceptions import PyWinCFFINotImplementedError
+
+REGEX_DECLARATION = re.compile(r"(\w+)\s+WINAPI\s+(\w+)\s*\(([^)]*)\)\s*;")
+REGEX_PARAMETER = re.compile(
+    r"^_(In|Out|Inout|Reserved)_(opt_)?\s+(\w+)\s+(\w+)$")
+
+Function = namedtuple("Function", ("name", "restype", "parameters"))
+Parameter = namedtuple(
+    "Parameter", ("name", "ctype", "annotation", "optional"))
+
+# Hints for parameters which can't be generated from the annotations alone.
+# A Length is an input which defaults to the length of another input.  A
+# Buffer is an output allocated using the size given by another input, it's
+# returned truncated to the length written to another output.
+Length = namedtuple("Length", ("of", ))
+Buffer = namedtuple("Buffer", ("size", "length"))
+
+HINTS = {
+    "ReadFile": {
+        "lpBuffer": Buffer("nNumberOfBytesToRead", "lpNumberOfBytesRead")},
+    "WriteFile": {
+        "nNumberOfBytesToWrite": Length("lpBuffer")}
+}
+
+# Maps the type of an input parameter to the Python type the wrapper
+# accepts and the expression which converts it to cdata.
+INPUT_TYPES = {
+    "BOOL": ("bool", "{0}"),
+    "DWORD": ("integer_types", "{0}"),
+    "UINT": ("integer_types", "{0}"),
+    "HANDLE": ("HANDLE", "{0}._as_parameter_"),
+    "LPCVOID": ("binary_type", "{0}"),
+    "LPCTSTR": ("text_type", "{0}"),
+    "LPOVERLAPPED": ("OVERLAPPED", "{0}._cdata"),
+    "LPSECURITY_ATTRIBUTES": ("SECURITY_ATTRIBUTES", "{0}._cdata")
+}
+
+# Maps the type of an output parameter to the expression which converts
+# it to the value returned by the wrapper.
+OUTPUT_TYPES = {
+    "LPDWORD": "{0}[0]",
+    "LPHANDLE": "HANDLE({0}[0])",
+    "PHANDLE": "HANDLE({0}[0])"
+}
+
+HEADER = '''"""
+Generated by pywincffi.dev.codegen from %(header)s, do not edit.
+"""
+
+# pylint: skip-file
+
+from six import binary_type, integer_types, text_type
+
+from pywincffi.core.checks import NON_ZERO, NoneType, error_check, input_check
+from pywincffi.wintypes import HANDLE, OVERLAPPED, SECURITY_ATTRIBUTES
+
+
+def bind(ffi, library):
+    """
+    Returns a dictionary of the generated wrappers bound
+    to ``ffi`` and ``library``.
+    """
+    NULL = ffi.NULL
+    new = ffi.new
+    unpack = ffi.unpack
+'''
+
+
+def parse(path):
+    """
+    Parses the header at ``path`` and returns a list of
+    :class:`Function` instances, one for each function declared.
+    """
+    with open(path, "r") as file_:
+        header = dist.REGEX_COMMENT.sub("", file_.read())
+
+    functions = []
+    for restype, name, arguments in REGEX_DECLARATION.findall(header):
+        parameters = []
+        for argument in arguments.split(","):
+            argument = " ".join(argument.split())
+            if argument in ("", "void"):
+                continue
+
+            match = REGEX_PARAMETER.match(argument)
+            if match is None:
+                annotation, optional = None, False
+                ctype, parameter = argument.rsplit(" ", 1)
+            else:
+                annotation, optional, ctype, parameter = match.groups()
+                annotation = annotation.lower()
+                optional = optional is not None
+
+            parameters.append(
+                Parameter(parameter, ctype, annotation, optional))
+        functions.append(Function(name, restype, tuple(parameters)))
+
+    return functions
+
+
+def _unsupported(function, reason):
+    """Raises an exception because ``function`` can't be generated"""
+    raise PyWinCFFINotImplementedError(
+        "Can't generate a wrapper for %s: %s" % (function.name, reason))
+
+
+def _wrapper(  # pylint: disable=too-many-locals,too-many-branches
+        function, hints):
+    """
+    Returns a tuple containing the lines which make up the wrapper for
+    ``function`` and the set of output types the wrapper allocates.
+    """
+    if function.restype != "BOOL":
+        _unsupported(function, "return type %s" % function.restype)
+
+    required, optional, checks, errors, prepare = [], [], [], [], []
+    arguments, outputs, ctypes = [], [], set()
+    overlapped = None
+
+    for parameter in function.parameters:
+        name, ctype = parameter.name, parameter.ctype
+        hint = hints.get(name)
+
+        if parameter.annotation == "reserved":
+            arguments.append("NULL" if ctype.startswith(("LP", "P")) else "0")
+
+        elif parameter.annotation in ("in", "inout"):
+            try:
+                allowed, convert = INPUT_TYPES[ctype]
+            except KeyError:
+                _unsupported(function, "input type %s" % ctype)
+
+            is_optional = parameter.optional or isinstance(hint, Length)
+            check = "isinstance(%s, %s)" % (name, allowed)
+            if is_optional:
+                optional.append(name)
+                check = "(%s is None or %s)" % (name, check)
+                allowed = "(NoneType, %s)" % allowed
+                if isinstance(hint, Length):
+                    prepare.extend([
+                        "if %s is None:" % name,
+                        "    %s = len(%s)" % (name, hint.of)])
+                elif convert != "{0}":
+                    convert = "NULL if {0} is None else " + convert
+            else:
+                required.append(name)
+
+            checks.append(check)
+            errors.append(
+                "input_check(%r, %s, %s)" % (str(name), name, allowed))
+            arguments.append(convert.format(name))
+            if ctype == "LPOVERLAPPED":
+                overlapped = name
+
+        elif parameter.annotation == "out":
+            if isinstance(hint, Buffer):
+                prepare.append(
+                    "%s = new(_char_array, %s)" % (name, hint.size))
+                outputs.append(
+                    "unpack(%s, %s[0])" % (name, hint.length))
+            elif ctype in OUTPUT_TYPES:
+                ctypes.add(ctype)
+                prepare.append("%s = new(_%s)" % (name, ctype))
+                outputs.append(OUTPUT_TYPES[ctype].format(name))
+            else:
+                _unsupported(function, "output type %s" % ctype)
+            arguments.append(name)
+
+        else:
+            _unsupported(function, "%s is not annotated" % name)
+
+    # Outputs which are only used to truncate a buffer are not returned.
+    for hint in hints.values():
+        if isinstance(hint, Buffer):
+            outputs.remove("%s[0]" % hint.length)
+
+    signature = required + ["%s=None" % name for name in optional]
+    lines = [
+        "_%s = library.%s" % (function.name, function.name),
+        "",
+        "def %s(%s):" % (function.name, ", ".join(signature)),
+        '    """Generated wrapper for ``%s``"""' % function.name]
+
+    if checks:
+        lines.append("    if not (%s" % checks[0])
+        lines.extend("            and %s" % check for check in checks[1:])
+        lines[-1] += "):"
+        lines.extend("        " + error for error in errors)
+
+    lines.extend("    " + line for line in prepare)
+    lines.append("    code = _%s(" % function.name)
+    lines.extend("        %s," % argument for argument in arguments)
+    lines[-1] = lines[-1].rstrip(",") + ")"
+
+    condition = "not code"
+    if overlapped is not None:
+        # Overlapped operations may return before completing so
+        # there's no error to check for.
+        condition += " and %s is None" % overlapped
+    lines.extend([
+        "    if %s:" % condition,
+        "        error_check(%r, code=code, expected=NON_ZERO)" % (
+            str(function.name))])
+
+    if len(outputs) == 1:
+        lines.append("    return %s" % outputs[0])
+    elif outputs:
+        lines.append("    return %s" % ", ".join(outputs))
+
+    if any(isinstance(hint, Buffer) for hint in hints.values()):
+        ctypes.add("char_array")
+
+    return lines, ctypes
+
+
+def generate(functions, names, header="headers", hints=None):
+    """
+    Generates the source code for a module containing a wrapper for each
+    function in ``names``.  The module provides a ``bind(ffi, library)``
+    function which returns the wrappers, see :func:`build`.
+
+    :param list functions:
+        The functions returned by :func:`parse`.
+
+    :param tuple names:
+        The names of the functions to generate wrappers for.
+
+    :keyword str header:
+        The header ``functions`` were parsed from, this is only used
+        in the generated module's docstring.
+
+    :keyword dict hints:
+        A dictionary mapping function names to the hints for their
+        parameters.  Defaults to :data:`HINTS`.
+
+    :raises pywincffi.exceptions.PyWinCFFINotImplementedError:
+        Raised if a wrapper can't be generated for one of the
+        functions in ``names``.
+
+    :returns:
+        Returns the source code of the module as a string.
+    """
+    if hints is None:
+        hints = HINTS
+
+    by_name = dict((function.name, function) for function in functions)
+    body, ctypes = [], set()
+    for name in names:
+        lines, wrapper_ctypes = _wrapper(by_name[name], hints.get(name, {}))
+        body.extend(lines + [""])
+        ctypes |= wrapper_ctypes
+
+    declarations = []
+    for ctype in sorted(ctypes):
+        cdecl = "char[]" if ctype == "char_array" else ctype
+        declarations.append("_%s = ffi.typeof(%r)" % (ctype, cdecl))
+
+    lines = declarations + [""] + body
+    lines.append("return {%s}" % ", ".join(
+        "%r: %s" % (str(name), name) for name in names))
+
+    source = HEADER % dict(header=basename(header))
+    source += "\n".join(("    " + line).rstrip() for line in lines)
+    return source + "\n"
+
+
+def build(source, ffi, library):
+    """
+    Executes ``source``, as returned by :func:`generate`, and returns
+    a dictionary of the wrappers bound to ``ffi`` and ``library``.
+    """
+    namespace = {}
+    six.exec_(compile(source, "<pywincffi.dev.codegen>", "exec"), namespace)
+    return namespace["bind"](ffi, library)
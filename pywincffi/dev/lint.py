@@ -27,6 +27,10 @@ SOURCES_DIR = join(
     dirname(dirname(abspath(__file__))), "core", "cdefs", "sources")
 CONSTANTS_HEADER = join(HEADERS_DIR, "constants.h")
 FUNCTIONS_HEADER = join(HEADERS_DIR, "functions.h")
+LIBRARY_HEADERS = (
+    join(HEADERS_DIR, "kernel32.h"),
+    join(HEADERS_DIR, "user32.h"),
+    join(HEADERS_DIR, "ws2_32.h"))
 SOURCE_MAIN = join(SOURCES_DIR, "main.c")
 REGEX_FUNCTION = re.compile(r"^[A-Z]+ (.*)\(.*$")
 REGEX_CONSTANT = re.compile(r"^#define ([A-Z]*[_]*[A-Z]*[_]*[A-Z]*) ...$")
@@ -78,8 +82,16 @@ def register(_):  # pragma: no cover
     """
     functions = \
         functions_in_file(FUNCTIONS_HEADER) | functions_in_file(SOURCE_MAIN)
+    for path in LIBRARY_HEADERS:
+        functions |= functions_in_file(path)
     constants = constants_in_file(CONSTANTS_HEADER)
     MANAGER.register_transform(
         scoped_nodes.Class,
         partial(transform, constants=constants, functions=functions),
         predicate=lambda node: node.name == "FFILibrary")
+
+    # pywincffi.constants populates its globals at runtime
+    MANAGER.register_transform(
+        scoped_nodes.Module,
+        partial(transform, constants=constants, functions=set()),
+        predicate=lambda node: node.name == "pywincffi.constants")
@@ -65,9 +65,13 @@ def mock_library(**attributes):
     returns.  Useful for replacing part of the compiled library as part
     of the test.
     """
-    ffi, library = dist.load()
-    return patch.object(
-        dist, "load", lambda: [ffi, LibraryWrapper(library, attributes)])
+    original_load = dist.load
+
+    def load(library=None):
+        ffi, wrapped = original_load(library)
+        return [ffi, LibraryWrapper(wrapped, attributes)]
+
+    return patch.object(dist, "load", load)
 
 
 class SharedState(object):  # pylint: disable=too-few-public-methods
@@ -63,15 +63,25 @@ class InputError(PyWinCFFIError):
                 "Please provide `allowed_types`, `allowed_values` or "
                 "`message`")
 
+        super(InputError, self).__init__(name, value)
         self.name = name
         self.value = value
         self.allowed_types = allowed_types
         self.allowed_values = allowed_values
-        self.message = message
-
-        if self.message is None and self.allowed_types is not None:
+        self._ffi = ffi
+        self._message = message
+
+    @property
+    def message(self):
+        """
+        The error message.  Unless a custom message was provided this is
+        only built the first time it's requested so code which catches
+        the error doesn't pay the cost of formatting it.
+        """
+        if self._message is None and self.allowed_types is not None:
+            ffi = self._ffi
             if ffi is None:
-                typeof = repr(type(value))
+                typeof = repr(type(self.value))
             else:
                 try:
                     ffi_exceptions = (TypeError, CDefError, ffi.error)
@@ -79,27 +89,31 @@ class InputError(PyWinCFFIError):
                     ffi_exceptions = (TypeError, CDefError)
 
                 try:
-                    typeof = ffi.typeof(value)
+                    typeof = ffi.typeof(self.value)
                 except ffi_exceptions:
-                    typeof = repr(type(value))
+                    typeof = repr(type(self.value))
                 else:
                     typeof = "{classname}(kind={kind}, cname={cname})".format(
-                        classname=value.__class__.__name__,
+                        classname=self.value.__class__.__name__,
                         kind=repr(typeof.kind), cname=repr(typeof.cname))
 
-            self.message = \
+            self._message = \
                 "Expected type(s) {expected} for {name}. Type of {name} " \
                 "is {typeof}.".format(
-                    expected=repr(allowed_types), name=repr(name),
+                    expected=repr(self.allowed_types), name=repr(self.name),
                     typeof=typeof)
 
-        elif self.message is None and self.allowed_values is not None:
-            self.message = \
+        elif self._message is None and self.allowed_values is not None:
+            self._message = \
                 "Expected the value of {name} to be in {values}. Value of " \
                 "{name} is {value}.".format(
-                    name=repr(name), values=allowed_values, value=repr(value))
+                    name=repr(self.name), values=self.allowed_values,
+                    value=repr(self.value))
+
+        return self._message
 
-        super(InputError, self).__init__(self.message)
+    def __str__(self):
+        return self.message
 
 
 class WindowsAPIError(PyWinCFFIError):
@@ -127,19 +141,39 @@ class WindowsAPIError(PyWinCFFIError):
     # pylint: disable=too-many-arguments
     def __init__(self, function, error, errno,
                  return_code=None, expected_return_code=None):
+        super(WindowsAPIError, self).__init__(function, error, errno)
         self.function = function
         self.error = error
         self.errno = errno
         self.return_code = return_code
         self.expected_return_code = expected_return_code
+        self._message = None
+
+        # Generic implementation which we should probably handle
+        # better so throw a warning.
+        if (return_code is None) != (expected_return_code is None):
+            warnings.warn(Warning(), "Pre-formatting not available")
 
-        if return_code is None and expected_return_code is None:
-            self.message = \
+    @property
+    def message(self):
+        """
+        The error message.  This is only built the first time it's
+        requested so code which catches the error, for example to
+        handle an expected error code, doesn't pay the cost of
+        formatting it.
+        """
+        if self._message is not None:
+            return self._message
+
+        if self.return_code is None and self.expected_return_code is None:
+            self._message = \
                 "Error when calling {0}. Message from Windows API was " \
-                "{1!r} (errno: {2}).".format(self.function, self.error, errno)
+                "{1!r} (errno: {2}).".format(
+                    self.function, self.error, self.errno)
 
-        elif return_code is not None and expected_return_code is not None:
-            self.message = (
+        elif self.return_code is not None and \
+                self.expected_return_code is not None:
+            self._message = (
                 "Error when calling {0}.  Expected to receive {1!r} from {2} "
                 "but got {3!r} instead. (error: {4!r})".format(
                     self.function, self.return_code, self.function,
@@ -147,11 +181,8 @@ class WindowsAPIError(PyWinCFFIError):
                 )
             )
 
-        # Generic implementation which we should probably handle
-        # better so throw a warning.
         else:  # pragma: no cover
-            warnings.warn(Warning(), "Pre-formatting not available")
-            self.message = (
+            self._message = (
                 "Error when calling {0}. (error: {1}, errno: {2}, "
                 "return_code: {3!r}, expected_return_code: {4!r})".format(
                     self.function, self.error, self.errno, self.return_code,
@@ -159,7 +190,10 @@ class WindowsAPIError(PyWinCFFIError):
                 )
             )
 
-        super(WindowsAPIError, self).__init__(self.message)
+        return self._message
+
+    def __str__(self):
+        return self.message
 
     def __repr__(self):
         return (
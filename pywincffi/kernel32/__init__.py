@@ -6,25 +6,39 @@ Provides functions, constants and utilities that wrap functions provided by
 ``kernel32.dll``.
 """
 
+from pywincffi.core.lazy import lazy_exports
+
 # Our kernel32 package is broken into several submodules.  The functions
-# we're wrapping are imported here so it's easier to access and because
-# it's close to the way Windows would present them (as a single module)
-from pywincffi.kernel32.file import (
-    ReadFile, WriteFile, FlushFileBuffers, MoveFileEx, CreateFile, LockFileEx,
-    UnlockFileEx, GetTempPath)
-from pywincffi.kernel32.handle import (
-    CloseHandle, GetStdHandle, GetHandleInformation, SetHandleInformation,
-    DuplicateHandle)
-from pywincffi.kernel32.pipe import (
-    CreatePipe, PeekNamedPipe, PeekNamedPipeResult, SetNamedPipeHandleState)
-from pywincffi.kernel32.process import (
-    GetProcessId, GetCurrentProcess, OpenProcess, GetExitCodeProcess,
-    TerminateProcess, CreateToolhelp32Snapshot, CreateProcess, pid_exists)
-from pywincffi.kernel32.events import (
-    CreateEvent, OpenEvent, ResetEvent, SetEvent)
-from pywincffi.kernel32.comms import ClearCommError
-from pywincffi.kernel32.console import (
-    SetConsoleTextAttribute, GetConsoleScreenBufferInfo,
-    CreateConsoleScreenBuffer)
-from pywincffi.kernel32.synchronization import WaitForSingleObject
-from pywincffi.kernel32.overlapped import GetOverlappedResult
+# we're wrapping are exported here so it's easier to access and because
+# it's close to the way Windows would present them (as a single module).
+# Each submodule is only imported the first time one of its functions
+# is accessed.
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    "pywincffi.kernel32.file": (
+        "ReadFile", "ReadFileInto", "WriteFile", "FlushFileBuffers",
+        "MoveFileEx", "CreateFile", "LockFileEx", "UnlockFileEx",
+        "GetTempPath", "SetFilePointerEx", "SetEndOfFile", "GetFileSizeEx",
+        "iter_chunks", "WinFile"),
+    "pywincffi.kernel32.handle": (
+        "CloseHandle", "GetStdHandle", "GetHandleInformation",
+        "SetHandleInformation", "DuplicateHandle"),
+    "pywincffi.kernel32.pipe": (
+        "CreatePipe", "PeekNamedPipe", "PeekNamedPipeResult",
+        "SetNamedPipeHandleState"),
+    "pywincffi.kernel32.process": (
+        "GetProcessId", "GetCurrentProcess", "OpenProcess",
+        "GetExitCodeProcess", "TerminateProcess", "CreateToolhelp32Snapshot",
+        "CreateProcess", "pid_exists"),
+    "pywincffi.kernel32.events": (
+        "CreateEvent", "OpenEvent", "ResetEvent", "SetEvent"),
+    "pywincffi.kernel32.memory": (
+        "CreateFileMapping", "OpenFileMapping", "MapViewOfFile",
+        "MapViewOfFileEx", "FlushViewOfFile", "UnmapViewOfFile",
+        "MappedView"),
+    "pywincffi.kernel32.comms": ("ClearCommError", ),
+    "pywincffi.kernel32.console": (
+        "SetConsoleTextAttribute", "GetConsoleScreenBufferInfo",
+        "CreateConsoleScreenBuffer"),
+    "pywincffi.kernel32.synchronization": ("WaitForSingleObject", ),
+    "pywincffi.kernel32.overlapped": ("GetOverlappedResult", "OverlappedPool")
+})
@@ -34,7 +34,7 @@ def ClearCommError(hFile):
     """
     input_check("hFile", hFile, HANDLE)
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     lpErrors = ffi.new("LPDWORD")
     lpStat = ffi.new("LPCOMSTAT")
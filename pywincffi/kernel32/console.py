@@ -31,7 +31,7 @@ def SetConsoleTextAttribute(hConsoleOutput, wAttributes):
     """
     input_check("hConsoleOutput", hConsoleOutput, HANDLE)
     input_check("wAttributes", wAttributes, integer_types)
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
     # raise Exception(type(wAttributes))
     # info = ffi.new("PCHAR_INFO")
     code = library.SetConsoleTextAttribute(
@@ -58,7 +58,7 @@ def GetConsoleScreenBufferInfo(hConsoleOutput):
         the fields on the ``PCONSOLE_SCREEN_BUFFER_INFO`` struct.
     """
     input_check("hConsoleOutput", hConsoleOutput, HANDLE)
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
     info = ffi.new("PCONSOLE_SCREEN_BUFFER_INFO")
     code = library.GetConsoleScreenBufferInfo(
         wintype_to_cdata(hConsoleOutput), info)
@@ -102,7 +102,7 @@ def CreateConsoleScreenBuffer(
         :func:`pywincffi.kernel32.CloseHandle` should be called on the handle
         when you are done with it.
     """
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     if dwDesiredAccess is None:
         dwDesiredAccess = ffi.NULL
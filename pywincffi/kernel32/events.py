@@ -52,7 +52,7 @@ def CreateEvent(
     input_check("bManualReset", bManualReset, bool)
     input_check("bInitialState", bInitialState, bool)
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     if lpName is None:
         lpName = ffi.NULL
@@ -102,7 +102,7 @@ def OpenEvent(dwDesiredAccess, bInheritHandle, lpName):
     input_check("bInheritHandle", bInheritHandle, bool)
     input_check("lpName", lpName, text_type)
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     handle = library.OpenEvent(
         ffi.cast("DWORD", dwDesiredAccess),
@@ -127,7 +127,7 @@ def ResetEvent(hEvent):
     """
     input_check("hEvent", hEvent, HANDLE)
 
-    _, library = dist.load()
+    _, library = dist.load("kernel32")
     code = library.ResetEvent(wintype_to_cdata(hEvent))
     error_check("ResetEvent", code=code, expected=NON_ZERO)
 
@@ -146,6 +146,6 @@ def SetEvent(hEvent):
     """
     input_check("hEvent", hEvent, HANDLE)
 
-    _, library = dist.load()
+    _, library = dist.load("kernel32")
     code = library.SetEvent(wintype_to_cdata(hEvent))
     error_check("SetEvent", code=code, expected=NON_ZERO)
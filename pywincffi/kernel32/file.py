@@ -5,15 +5,84 @@ Files
 A module containing common Windows file functions for working with files.
 """
 
-from six import integer_types, text_type, binary_type
+import io
+
+from six import integer_types, string_types, text_type, binary_type
 
 from pywincffi.core import dist
-from pywincffi.core.checks import NON_ZERO, input_check, error_check, NoneType
-from pywincffi.exceptions import WindowsAPIError
+from pywincffi.core.checks import (
+    NON_ZERO, Argument, Constants, NoneType, Schema, error_check,
+    input_check)
+from pywincffi.exceptions import InputError, WindowsAPIError
+from pywincffi.kernel32.handle import CloseHandle
 from pywincffi.wintypes import (
     SECURITY_ATTRIBUTES, OVERLAPPED, HANDLE, wintype_to_cdata
 )
 
+_CREATE_FILE = Schema("CreateFile", (
+    Argument("lpFileName", text_type),
+    Argument("dwDesiredAccess", integer_types),
+    Argument("dwShareMode", integer_types),
+    Argument("lpSecurityAttributes", (NoneType, SECURITY_ATTRIBUTES)),
+    Argument("dwCreationDisposition", allowed_values=Constants(
+        "CREATE_ALWAYS", "CREATE_NEW", "OPEN_ALWAYS", "OPEN_EXISTING",
+        "TRUNCATE_EXISTING")),
+    Argument("dwFlagsAndAttributes", integer_types),
+    Argument("hTemplateFile", (NoneType, HANDLE))))
+
+_WRITE_FILE = Schema("WriteFile", (
+    Argument("hFile", HANDLE),
+    Argument("lpOverlapped", (NoneType, OVERLAPPED)),
+    Argument("nNumberOfBytesToWrite", integer_types, optional=True)))
+
+_FLUSH_FILE_BUFFERS = Schema("FlushFileBuffers", (
+    Argument("hFile", HANDLE), ))
+
+_READ_FILE = Schema("ReadFile", (
+    Argument("hFile", HANDLE),
+    Argument("nNumberOfBytesToRead", integer_types),
+    Argument("lpOverlapped", (NoneType, OVERLAPPED))))
+
+_READ_FILE_INTO = Schema("ReadFileInto", (
+    Argument("hFile", HANDLE),
+    Argument("lpOverlapped", (NoneType, OVERLAPPED))))
+
+_SET_FILE_POINTER_EX = Schema("SetFilePointerEx", (
+    Argument("hFile", HANDLE),
+    Argument("liDistanceToMove", integer_types),
+    Argument("dwMoveMethod", allowed_values=Constants(
+        "FILE_BEGIN", "FILE_CURRENT", "FILE_END"))))
+
+_SET_END_OF_FILE = Schema("SetEndOfFile", (
+    Argument("hFile", HANDLE), ))
+
+_GET_FILE_SIZE_EX = Schema("GetFileSizeEx", (
+    Argument("hFile", HANDLE), ))
+
+_ITER_CHUNKS = Schema("iter_chunks", (
+    Argument("hFile", HANDLE),
+    Argument("chunk_size", integer_types),
+    Argument("start", integer_types),
+    Argument("end", integer_types, optional=True)))
+
+_MOVE_FILE_EX = Schema("MoveFileEx", (
+    Argument("lpExistingFileName", text_type),
+    Argument("dwFlags", integer_types),
+    Argument("lpNewFileName", text_type, optional=True)))
+
+_LOCK_FILE_EX = Schema("LockFileEx", (
+    Argument("hFile", HANDLE),
+    Argument("dwFlags", integer_types),
+    Argument("nNumberOfBytesToLockLow", integer_types),
+    Argument("nNumberOfBytesToLockHigh", integer_types),
+    Argument("lpOverlapped", OVERLAPPED, optional=True)))
+
+_UNLOCK_FILE_EX = Schema("UnlockFileEx", (
+    Argument("hFile", HANDLE),
+    Argument("nNumberOfBytesToUnlockLow", integer_types),
+    Argument("nNumberOfBytesToUnlockHigh", integer_types),
+    Argument("lpOverlapped", OVERLAPPED, optional=True)))
+
 
 def CreateFile(  # pylint: disable=too-many-arguments
         lpFileName, dwDesiredAccess, dwShareMode=None,
@@ -48,7 +117,9 @@ def CreateFile(  # pylint: disable=too-many-arguments
     :keyword int dwCreationDisposition:
         Action to take when the file or device does not exist.  If not
         provided with an explicit value, ``CREATE_ALWAYS`` will be used
-        which means existing files will be overwritten.
+        which means existing files will be overwritten.  Windows sets
+        ``ERROR_ALREADY_EXISTS`` when ``CREATE_ALWAYS`` or ``OPEN_ALWAYS``
+        opens an existing file, this is not treated as an error.
 
     :keyword int dwFlagsAndAttributes:
         The file or device attributes and flags.  If not provided an explict
@@ -63,7 +134,7 @@ def CreateFile(  # pylint: disable=too-many-arguments
     :return:
         The file :class:`pywincffi.wintypes.HANDLE` created by ``CreateFile``.
     """
-    _, library = dist.load()
+    _, library = dist.load("kernel32")
 
     if dwShareMode is None:
         dwShareMode = library.FILE_SHARE_READ
@@ -74,25 +145,9 @@ def CreateFile(  # pylint: disable=too-many-arguments
     if dwFlagsAndAttributes is None:
         dwFlagsAndAttributes = library.FILE_ATTRIBUTE_NORMAL
 
-    input_check("lpFileName", lpFileName, text_type)
-    input_check("dwDesiredAccess", dwDesiredAccess, integer_types)
-    input_check("dwShareMode", dwShareMode, integer_types)
-    input_check(
-        "lpSecurityAttributes", lpSecurityAttributes,
-        allowed_types=(NoneType, SECURITY_ATTRIBUTES)
-    )
-    input_check(
-        "dwCreationDisposition", dwCreationDisposition,
-        allowed_values=(
-            library.CREATE_ALWAYS,
-            library.CREATE_NEW,
-            library.OPEN_ALWAYS,
-            library.OPEN_EXISTING,
-            library.TRUNCATE_EXISTING
-        )
-    )
-    input_check("dwFlagsAndAttributes", dwFlagsAndAttributes, integer_types)
-    input_check("hTemplateFile", hTemplateFile, (NoneType, HANDLE))
+    _CREATE_FILE.validate(
+        lpFileName, dwDesiredAccess, dwShareMode, lpSecurityAttributes,
+        dwCreationDisposition, dwFlagsAndAttributes, hTemplateFile)
 
     handle = library.CreateFile(
         lpFileName, dwDesiredAccess, dwShareMode,
@@ -105,7 +160,8 @@ def CreateFile(  # pylint: disable=too-many-arguments
     except WindowsAPIError as error:
         # ERROR_ALREADY_EXISTS may be a normal condition depending
         # on the creation disposition.
-        if (dwCreationDisposition == library.CREATE_ALWAYS and
+        if (dwCreationDisposition in (
+                library.CREATE_ALWAYS, library.OPEN_ALWAYS) and
                 error.errno == library.ERROR_ALREADY_EXISTS):
             return HANDLE(handle)
         raise
@@ -124,13 +180,17 @@ def WriteFile(hFile, lpBuffer, nNumberOfBytesToWrite=None, lpOverlapped=None):
     :param pywincffi.wintypes.HANDLE hFile:
         The handle to write to.
 
-    :type lpBuffer: str/bytes
     :param lpBuffer:
-        Type is ``str`` on Python 2, ``bytes`` on Python 3.
-        The data to be written to the file or device.
+        The data to be written to the file or device.  This may be
+        ``str`` on Python 2, ``bytes`` on Python 3 or any other contiguous
+        object supporting the buffer protocol such as a :class:`bytearray`,
+        :class:`memoryview` or :class:`mmap.mmap`.  The data is passed to
+        the API without being copied so slicing a :class:`memoryview` is
+        the cheapest way to write part of a larger buffer.
 
     :keyword int nNumberOfBytesToWrite:
-        The number of bytes to be written.  Defaults to len(lpBuffer).
+        The number of bytes to be written.  Defaults to the size of
+        ``lpBuffer`` in bytes.
 
     :keyword pywincffi.wintypes.OVERLAPPED lpOverlapped:
         See Microsoft's documentation for intended usage and below for
@@ -143,27 +203,43 @@ def WriteFile(hFile, lpBuffer, nNumberOfBytesToWrite=None, lpOverlapped=None):
         >>> lpOverlapped = OVERLAPPED()
         >>> lpOverlapped.hEvent = hEvent
         >>> bytes_written = WriteFile(
-        ...     hFile, "Hello world", lpOverlapped=lpOverlapped)
+        ...     hFile, b"Hello world", lpOverlapped=lpOverlapped)
+
+        ``lpBuffer`` must not be modified or released until the operation
+        has completed.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``lpBuffer`` is not a contiguous object supporting the
+        buffer protocol or if ``nNumberOfBytesToWrite`` is larger than
+        ``lpBuffer``.
 
     :returns:
         Returns the number of bytes written.
     """
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
-    input_check("hFile", hFile, HANDLE)
-    input_check("lpBuffer", lpBuffer, binary_type)
-    input_check(
-        "lpOverlapped", lpOverlapped,
-        allowed_types=(NoneType, OVERLAPPED)
-    )
+    _WRITE_FILE.validate(hFile, lpOverlapped, nNumberOfBytesToWrite)
+
+    # cffi passes bytes to char * without copying them so only other
+    # buffers need ffi.from_buffer(), which costs more than the check.
+    if not isinstance(lpBuffer, binary_type):
+        try:
+            lpBuffer = ffi.from_buffer(lpBuffer)
+        except (TypeError, ValueError, BufferError):
+            raise InputError(
+                "lpBuffer", lpBuffer, allowed_types=None,
+                message="Expected a contiguous object supporting the buffer "
+                        "protocol for `lpBuffer`")
 
     if nNumberOfBytesToWrite is None:
         nNumberOfBytesToWrite = len(lpBuffer)
-    else:
-        input_check(
+
+    elif nNumberOfBytesToWrite > len(lpBuffer):
+        raise InputError(
             "nNumberOfBytesToWrite", nNumberOfBytesToWrite,
-            integer_types
-        )
+            allowed_types=None,
+            message="`nNumberOfBytesToWrite` is larger than `lpBuffer` "
+                    "(%d bytes)" % len(lpBuffer))
 
     bytes_written = ffi.new("LPDWORD")
     code = library.WriteFile(
@@ -187,8 +263,8 @@ def FlushFileBuffers(hFile):
     :param pywincffi.wintypes.HANDLE hFile:
         The handle to flush to disk.
     """
-    input_check("hFile", hFile, HANDLE)
-    _, library = dist.load()
+    _FLUSH_FILE_BUFFERS.validate(hFile)
+    _, library = dist.load("kernel32")
     code = library.FlushFileBuffers(wintype_to_cdata(hFile))
     error_check("FlushFileBuffers", code=code, expected=NON_ZERO)
 
@@ -224,14 +300,9 @@ def ReadFile(hFile, nNumberOfBytesToRead, lpOverlapped=None):
         Returns the binary data read from ``hFile``
         Type is ``str`` on Python 2, ``bytes`` on Python 3.
     """
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
-    input_check("hFile", hFile, HANDLE)
-    input_check("nNumberOfBytesToRead", nNumberOfBytesToRead, integer_types)
-    input_check(
-        "lpOverlapped", lpOverlapped,
-        allowed_types=(NoneType, OVERLAPPED)
-    )
+    _READ_FILE.validate(hFile, nNumberOfBytesToRead, lpOverlapped)
 
     lpBuffer = ffi.new("char []", nNumberOfBytesToRead)
     bytes_read = ffi.new("LPDWORD")
@@ -243,6 +314,157 @@ def ReadFile(hFile, nNumberOfBytesToRead, lpOverlapped=None):
     return ffi.unpack(lpBuffer, bytes_read[0])
 
 
+def ReadFileInto(hFile, lpBuffer, lpOverlapped=None):
+    """
+    Reads from ``hFile`` directly into ``lpBuffer``, filling it in place,
+    rather than returning a new bytes object like :func:`ReadFile`:
+
+    >>> from pywincffi.kernel32 import ReadFileInto
+    >>> chunk = bytearray(1024 * 1024)
+    >>> view = memoryview(chunk)
+    >>> while True:
+    ...     bytes_read = ReadFileInto(hFile, chunk)
+    ...     if not bytes_read:
+    ...         break
+    ...     process(view[:bytes_read])
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa365467
+
+    :param pywincffi.wintypes.HANDLE hFile:
+        The handle to read from.
+
+    :param lpBuffer:
+        A writable object supporting the buffer protocol, such as a
+        :class:`bytearray`, :class:`memoryview`, :class:`mmap.mmap` or
+        numpy array.  Up to ``len(lpBuffer)`` bytes will be read, pass a
+        slice of a :class:`memoryview` to read less.
+
+    :keyword pywincffi.wintypes.OVERLAPPED lpOverlapped:
+        See :func:`ReadFile`.  ``lpBuffer`` must not be modified or
+        released until the operation has completed.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``lpBuffer`` does not support the buffer protocol, is
+        read only or is not contiguous.
+
+    :returns:
+        Returns the number of bytes read into ``lpBuffer``.
+    """
+    ffi, library = dist.load("kernel32")
+
+    _READ_FILE_INTO.validate(hFile, lpOverlapped)
+
+    try:
+        readonly = memoryview(lpBuffer).readonly
+    except TypeError:
+        readonly = None
+
+    message = "Expected a writable contiguous object supporting the " \
+              "buffer protocol for `lpBuffer`"
+    if readonly is not False:
+        raise InputError(
+            "lpBuffer", lpBuffer, allowed_types=None, message=message)
+
+    try:
+        lpBuffer = ffi.from_buffer(lpBuffer)
+    except (TypeError, ValueError, BufferError):
+        raise InputError(
+            "lpBuffer", lpBuffer, allowed_types=None, message=message)
+
+    bytes_read = ffi.new("LPDWORD")
+    code = library.ReadFile(
+        wintype_to_cdata(hFile), lpBuffer, len(lpBuffer), bytes_read,
+        wintype_to_cdata(lpOverlapped)
+    )
+    error_check("ReadFile", code=code, expected=NON_ZERO)
+    return bytes_read[0]
+
+
+def SetFilePointerEx(hFile, liDistanceToMove, dwMoveMethod=None):
+    """
+    Moves the file pointer of ``hFile``.
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa365542
+
+    :param pywincffi.wintypes.HANDLE hFile:
+        The handle to the file.  This must have been created with the
+        ``GENERIC_READ`` or ``GENERIC_WRITE`` access right.
+
+    :param int liDistanceToMove:
+        The number of bytes to move the file pointer.  A negative value
+        moves the file pointer backwards.
+
+    :keyword int dwMoveMethod:
+        The starting point for the move, ``FILE_BEGIN``, ``FILE_CURRENT``
+        or ``FILE_END``.  Defaults to ``FILE_BEGIN``.
+
+    :returns:
+        Returns the new position of the file pointer.
+    """
+    ffi, library = dist.load("kernel32")
+
+    if dwMoveMethod is None:
+        dwMoveMethod = library.FILE_BEGIN
+
+    _SET_FILE_POINTER_EX.validate(hFile, liDistanceToMove, dwMoveMethod)
+
+    # SetFilePointerEx() takes a LARGE_INTEGER by value which cffi can't
+    # pass in every mode, set_file_pointer_ex() takes a LONGLONG instead.
+    lpNewFilePointer = ffi.new("PLONGLONG")
+    code = library.set_file_pointer_ex(
+        wintype_to_cdata(hFile), liDistanceToMove, lpNewFilePointer,
+        dwMoveMethod)
+    error_check("SetFilePointerEx", code=code, expected=NON_ZERO)
+    return lpNewFilePointer[0]
+
+
+def SetEndOfFile(hFile):
+    """
+    Sets the end of ``hFile`` to the current position of its file
+    pointer, truncating or extending the file.
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa365531
+
+    :param pywincffi.wintypes.HANDLE hFile:
+        The handle to the file.  This must have been created with the
+        ``GENERIC_WRITE`` access right.
+    """
+    _SET_END_OF_FILE.validate(hFile)
+    _, library = dist.load("kernel32")
+    code = library.SetEndOfFile(wintype_to_cdata(hFile))
+    error_check("SetEndOfFile", code=code, expected=NON_ZERO)
+
+
+def GetFileSizeEx(hFile):
+    """
+    Returns the size of ``hFile`` in bytes, including files larger
+    than 4 GiB.
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa364957
+
+    :param pywincffi.wintypes.HANDLE hFile:
+        The handle to the file.  This must have been created with the
+        ``GENERIC_READ`` or ``GENERIC_WRITE`` access right.
+    """
+    _GET_FILE_SIZE_EX.validate(hFile)
+    ffi, library = dist.load("kernel32")
+
+    # GetFileSizeEx() takes a PLARGE_INTEGER, get_file_size_ex() takes
+    # a PLONGLONG for the same reason set_file_pointer_ex() does.
+    lpFileSize = ffi.new("PLONGLONG")
+    code = library.get_file_size_ex(wintype_to_cdata(hFile), lpFileSize)
+    error_check("GetFileSizeEx", code=code, expected=NON_ZERO)
+    return lpFileSize[0]
+
+
 def MoveFileEx(lpExistingFileName, lpNewFileName, dwFlags=None):
     """
     Moves an existing file or directory, including its children,
@@ -266,18 +488,15 @@ def MoveFileEx(lpExistingFileName, lpNewFileName, dwFlags=None):
         the MSDN documentation for full details.  By default
         ``MOVEFILE_REPLACE_EXISTING | MOVEFILE_WRITE_THROUGH`` is used.
     """
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     if dwFlags is None:
         dwFlags = \
             library.MOVEFILE_REPLACE_EXISTING | library.MOVEFILE_WRITE_THROUGH
 
-    input_check("lpExistingFileName", lpExistingFileName, text_type)
-    input_check("dwFlags", dwFlags, integer_types)
+    _MOVE_FILE_EX.validate(lpExistingFileName, dwFlags, lpNewFileName)
 
-    if lpNewFileName is not None:
-        input_check("lpNewFileName", lpNewFileName, text_type)
-    else:
+    if lpNewFileName is None:
         lpNewFileName = ffi.NULL
 
     code = library.MoveFileEx(
@@ -322,20 +541,15 @@ def LockFileEx(
         provided, a throw-away zero-filled instance will be created to
         support such call. See Microsoft's documentation for intended usage.
     """
-    input_check("hFile", hFile, HANDLE)
-    input_check("dwFlags", dwFlags, integer_types)
-    input_check(
-        "nNumberOfBytesToLockLow", nNumberOfBytesToLockLow, integer_types)
-    input_check(
-        "nNumberOfBytesToLockHigh", nNumberOfBytesToLockHigh, integer_types)
+    _LOCK_FILE_EX.validate(
+        hFile, dwFlags, nNumberOfBytesToLockLow, nNumberOfBytesToLockHigh,
+        lpOverlapped)
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     if lpOverlapped is None:
         # Required by Windows API, create a throw-away zero-filled instance.
         lpOverlapped = OVERLAPPED()
-    else:
-        input_check("lpOverlapped", lpOverlapped, allowed_types=OVERLAPPED)
 
     code = library.LockFileEx(
         wintype_to_cdata(hFile),
@@ -375,21 +589,15 @@ def UnlockFileEx(
         provided, a throw-away zero-filled instance will be created to
         support such call. See Microsoft's documentation for intended usage.
     """
-    input_check("hFile", hFile, HANDLE)
-    input_check(
-        "nNumberOfBytesToUnlockLow",
-        nNumberOfBytesToUnlockLow, integer_types)
-    input_check(
-        "nNumberOfBytesToUnlockHigh",
-        nNumberOfBytesToUnlockHigh, integer_types)
+    _UNLOCK_FILE_EX.validate(
+        hFile, nNumberOfBytesToUnlockLow, nNumberOfBytesToUnlockHigh,
+        lpOverlapped)
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     if lpOverlapped is None:
         # Required by Windows API, create a throw-away zero-filled instance.
         lpOverlapped = OVERLAPPED()
-    else:
-        input_check("lpOverlapped", lpOverlapped, allowed_types=OVERLAPPED)
 
     code = library.UnlockFileEx(
         wintype_to_cdata(hFile),
@@ -413,8 +621,286 @@ def GetTempPath():
         Returns a string containing the value produced by the underlying
         C function.
     """
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
     lpBuffer = ffi.new("TCHAR[{}]".format(library.MAX_PATH + 1))
     code = library.GetTempPath(library.MAX_PATH + 1, lpBuffer)
     error_check("GetTempPath", code=code, expected=NON_ZERO)
     return ffi.string(lpBuffer)
+
+
+def iter_chunks(hFile, chunk_size, start=0, end=None):
+    """
+    Returns an iterator which reads ``hFile`` from ``start`` to ``end``, or
+    the end of the file, ``chunk_size`` bytes at a time:
+
+    >>> from pywincffi.kernel32 import iter_chunks
+    >>> for chunk in iter_chunks(hFile, 1024 * 1024, start=5 * 1024 ** 3):
+    ...     digest.update(chunk)
+
+    Every chunk is read into the same buffer by :func:`ReadFileInto` so
+    only ``chunk_size`` bytes are held in memory no matter how large the
+    file is.  The arguments are checked when this function is called,
+    the file isn't touched until iteration begins.
+
+    :param pywincffi.wintypes.HANDLE hFile:
+        The handle to read from.  The file pointer is moved to ``start``
+        when iteration begins and should not be moved by anything else
+        until iteration ends.
+
+    :param int chunk_size:
+        The maximum number of bytes in each chunk, at most ``0xFFFFFFFF``.
+
+    :keyword int start:
+        The offset to start reading from.
+
+    :keyword int end:
+        The offset to stop reading at.  If not provided the file is read
+        until :func:`ReadFileInto` reaches the end of the file.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``chunk_size`` is not positive or larger than
+        ``0xFFFFFFFF``, ``start`` is negative or ``end`` is before
+        ``start``.
+
+    :returns:
+        Yields a :class:`memoryview` of each chunk.  The memoryview is
+        overwritten by the next chunk, copy it with :func:`bytes` to
+        keep it.
+    """
+    _ITER_CHUNKS.validate(hFile, chunk_size, start, end)
+
+    if not 0 < chunk_size <= 0xFFFFFFFF:
+        raise InputError(
+            "chunk_size", chunk_size, allowed_types=None,
+            message="`chunk_size` must be between 1 and 0xFFFFFFFF")
+    if start < 0:
+        raise InputError(
+            "start", start, allowed_types=None,
+            message="`start` must not be negative")
+    if end is not None and end < start:
+        raise InputError(
+            "end", end, allowed_types=None,
+            message="`end` must not be less than `start`")
+
+    return _iter_chunks(hFile, chunk_size, start, end)
+
+
+def _iter_chunks(hFile, chunk_size, start, end):
+    """The generator returned by :func:`iter_chunks`"""
+    buffer_ = memoryview(bytearray(chunk_size))
+    position = SetFilePointerEx(hFile, start)
+    while end is None or position < end:
+        if end is None or end - position >= chunk_size:
+            bytes_read = ReadFileInto(hFile, buffer_)
+        else:
+            bytes_read = ReadFileInto(hFile, buffer_[:end - position])
+
+        if not bytes_read:
+            break
+
+        position += bytes_read
+        yield buffer_[:bytes_read]
+
+
+class WinFile(io.RawIOBase):
+    """
+    A raw, unbuffered, file object built on :func:`ReadFileInto`,
+    :func:`WriteFile`, :func:`SetFilePointerEx` and :func:`SetEndOfFile`.
+    Like :class:`io.FileIO` it can be wrapped in :class:`io.BufferedReader`,
+    :class:`io.BufferedWriter`, :class:`io.BufferedRandom` or
+    :class:`io.TextIOWrapper`:
+
+    >>> import io
+    >>> from pywincffi.kernel32 import WinFile
+    >>> with io.BufferedReader(WinFile(u"data.bin"), 1024 * 1024) as file_:
+    ...     header = file_.read(16)
+
+    :param file_:
+        The path of the file to open, ``unicode`` on Python 2 and ``str``
+        on Python 3, or an existing :class:`pywincffi.wintypes.HANDLE`.
+        Paths are opened with :func:`CreateFile` and shared for reading
+        and writing.
+
+    :keyword str mode:
+        ``r``, ``w``, ``x`` or ``a`` to read, write, create or append with
+        an optional ``+`` to open for both reading and writing, the same
+        as :class:`io.FileIO`.  ``b`` is allowed but ignored.  When
+        ``file_`` is a handle the mode only controls which operations are
+        allowed.
+
+    :keyword bool closefd:
+        If False and ``file_`` is a handle it will not be closed when the
+        file is closed.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``file_`` or ``mode`` are not valid.
+
+    :raises pywincffi.exceptions.WindowsAPIError:
+        Raised if opening the file fails.  Operations on the file raise
+        the same exceptions as the functions they're built on.
+    """
+    def __init__(self, file_, mode="r", closefd=True):
+        # Set before anything can fail because close() is
+        # called when the object is deleted.
+        self._handle = None
+        self._closefd = True
+        super(WinFile, self).__init__()
+
+        input_check("mode", mode, string_types)
+        if (sorted(set(mode)) != sorted(mode) or
+                len(set(mode) & set("rwxa")) != 1 or
+                not set(mode) <= set("rwxab+")):
+            raise InputError(
+                "mode", mode, allowed_types=None,
+                message="`mode` must contain exactly one of r, w, x or a "
+                        "and at most one +")
+
+        _, library = dist.load("kernel32")
+        primary = (set(mode) & set("rwxa")).pop()
+        self._readable = primary == "r" or "+" in mode
+        self._writable = primary != "r" or "+" in mode
+        self._append = primary == "a"
+        self._seekable = None
+        self.mode = primary + "b" + ("+" if "+" in mode else "")
+
+        if isinstance(file_, HANDLE):
+            self._closefd = closefd
+            self._handle = file_
+
+        elif isinstance(file_, text_type):
+            if not closefd:
+                raise InputError(
+                    "closefd", closefd, allowed_types=None,
+                    message="`closefd` must be True unless `file_` "
+                            "is a handle")
+
+            access = 0
+            if self._readable:
+                access |= library.GENERIC_READ
+            if self._writable:
+                access |= library.GENERIC_WRITE
+
+            self._handle = CreateFile(
+                file_, access,
+                dwShareMode=library.FILE_SHARE_READ | library.FILE_SHARE_WRITE,
+                dwCreationDisposition={
+                    "r": library.OPEN_EXISTING,
+                    "w": library.CREATE_ALWAYS,
+                    "x": library.CREATE_NEW,
+                    "a": library.OPEN_ALWAYS}[self.mode[0]])
+
+        else:
+            raise InputError("file_", file_, (text_type, HANDLE))
+
+        self.name = file_
+        if self._append:
+            self.seek(0, io.SEEK_END)
+
+    def __repr__(self):
+        return "<%s name=%r mode=%r closefd=%r>" % (
+            self.__class__.__name__, self.name, self.mode, self._closefd)
+
+    @property
+    def handle(self):
+        """The :class:`pywincffi.wintypes.HANDLE` being read or written"""
+        return self._handle
+
+    def _check(self, readable=False, writable=False):
+        """Raises an exception if the file is closed or not readable"""
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        if readable and not self._readable:
+            raise io.UnsupportedOperation("File not open for reading")
+        if writable and not self._writable:
+            raise io.UnsupportedOperation("File not open for writing")
+
+    def readable(self):
+        self._check()
+        return self._readable
+
+    def writable(self):
+        self._check()
+        return self._writable
+
+    def seekable(self):
+        self._check()
+        if self._seekable is None:
+            try:
+                self.tell()
+            except WindowsAPIError:
+                self._seekable = False
+            else:
+                self._seekable = True
+        return self._seekable
+
+    def readinto(self, b):  # pylint: disable=invalid-name
+        """
+        Reads up to ``len(b)`` bytes into ``b``, a writable object
+        supporting the buffer protocol, and returns the number of bytes
+        read.  Returns 0 at the end of the file.
+        """
+        self._check(readable=True)
+        return ReadFileInto(self._handle, b)
+
+    def write(self, b):  # pylint: disable=invalid-name
+        """
+        Writes ``b``, any contiguous object supporting the buffer protocol,
+        and returns the number of bytes written.
+        """
+        self._check(writable=True)
+        if self._append:
+            self.seek(0, io.SEEK_END)
+        return WriteFile(self._handle, b)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """
+        Moves the file position to ``offset`` relative to ``whence`` and
+        returns the new position.
+        """
+        self._check()
+        _, library = dist.load("kernel32")
+        try:
+            dwMoveMethod = {
+                io.SEEK_SET: library.FILE_BEGIN,
+                io.SEEK_CUR: library.FILE_CURRENT,
+                io.SEEK_END: library.FILE_END}[whence]
+        except KeyError:
+            raise InputError(
+                "whence", whence, allowed_values=(
+                    io.SEEK_SET, io.SEEK_CUR, io.SEEK_END))
+        return SetFilePointerEx(self._handle, offset, dwMoveMethod)
+
+    def tell(self):
+        """Returns the current file position"""
+        return self.seek(0, io.SEEK_CUR)
+
+    def truncate(self, size=None):
+        """
+        Resizes the file to ``size`` bytes, the current position by default,
+        and returns the new size.  The file position is not changed.
+        """
+        self._check(writable=True)
+        position = self.tell()
+        if size is None:
+            size = position
+
+        self.seek(size)
+        try:
+            SetEndOfFile(self._handle)
+        finally:
+            self.seek(position)
+        return size
+
+    def close(self):
+        """
+        Closes the file, and the handle unless ``closefd`` was False.
+        Calling this more than once has no effect.
+        """
+        if self.closed:
+            return
+
+        try:
+            super(WinFile, self).close()
+        finally:
+            if self._closefd and self._handle is not None:
+                CloseHandle(self._handle)
@@ -30,7 +30,7 @@ def GetStdHandle(nStdHandle):
     :return:
         Returns a handle to the standard device retrieved.
     """
-    _, library = dist.load()
+    _, library = dist.load("kernel32")
     input_check("nStdHandle", nStdHandle,
                 allowed_values=(library.STD_INPUT_HANDLE,
                                 library.STD_OUTPUT_HANDLE,
@@ -59,7 +59,7 @@ def CloseHandle(hObject):
         The handle object to close.
     """
     input_check("hObject", hObject, (HANDLE, SOCKET))
-    _, library = dist.load()
+    _, library = dist.load("kernel32")
 
     code = library.CloseHandle(wintype_to_cdata(hObject))
     error_check("CloseHandle", code=code, expected=NON_ZERO)
@@ -81,7 +81,7 @@ def GetHandleInformation(hObject):
         Returns the set of bit flags that specify properties of ``hObject``.
     """
     input_check("hObject", hObject, HANDLE)
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     lpdwFlags = ffi.new("LPDWORD")
     code = library.GetHandleInformation(wintype_to_cdata(hObject), lpdwFlags)
@@ -110,7 +110,7 @@ def SetHandleInformation(hObject, dwMask, dwFlags):
     input_check("hObject", hObject, HANDLE)
     input_check("dwMask", dwMask, integer_types)
     input_check("dwFlags", dwFlags, integer_types)
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     code = library.SetHandleInformation(
         wintype_to_cdata(hObject),
@@ -159,7 +159,7 @@ def DuplicateHandle(  # pylint: disable=too-many-arguments
     :return:
         Returns the duplicated handle.
     """
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
     input_check("hSourceProcessHandle", hSourceProcessHandle, HANDLE)
     input_check("hSourceHandle", hSourceHandle, HANDLE)
     input_check("hTargetProcessHandle", hTargetProcessHandle, HANDLE)
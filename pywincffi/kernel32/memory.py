@@ -0,0 +1,452 @@
+"""
+Memory
+------
+
+A module containing Windows functions for mapping files into memory.
+"""
+
+import mmap
+
+from six import integer_types, text_type
+
+from pywincffi.core import dist
+from pywincffi.core.checks import (
+    NON_ZERO, Argument, Constants, NoneType, Schema, error_check,
+    input_check)
+from pywincffi.exceptions import InputError
+from pywincffi.wintypes import HANDLE, SECURITY_ATTRIBUTES, wintype_to_cdata
+
+_CREATE_FILE_MAPPING = Schema("CreateFileMapping", (
+    Argument("hFile", (NoneType, HANDLE)),
+    Argument("lpFileMappingAttributes", (NoneType, SECURITY_ATTRIBUTES)),
+    Argument("flProtect", allowed_values=Constants(
+        "PAGE_READONLY", "PAGE_READWRITE", "PAGE_WRITECOPY",
+        "PAGE_EXECUTE_READ", "PAGE_EXECUTE_READWRITE",
+        "PAGE_EXECUTE_WRITECOPY")),
+    Argument("dwMaximumSizeHigh", integer_types),
+    Argument("dwMaximumSizeLow", integer_types),
+    Argument("lpName", (NoneType, text_type))))
+
+_OPEN_FILE_MAPPING = Schema("OpenFileMapping", (
+    Argument("dwDesiredAccess", integer_types),
+    Argument("bInheritHandle", bool),
+    Argument("lpName", text_type)))
+
+_MAP_VIEW_OF_FILE = Schema("MapViewOfFile", (
+    Argument("hFileMappingObject", HANDLE),
+    Argument("dwDesiredAccess", integer_types),
+    Argument("dwFileOffsetHigh", integer_types),
+    Argument("dwFileOffsetLow", integer_types),
+    Argument("dwNumberOfBytesToMap", integer_types)))
+
+_MAPPED_VIEW = Schema("MappedView", (
+    Argument("hFileMappingObject", HANDLE),
+    Argument("offset", integer_types),
+    Argument("size", integer_types),
+    Argument("dwDesiredAccess", integer_types)))
+
+
+def CreateFileMapping(  # pylint: disable=too-many-arguments
+        hFile=None, lpFileMappingAttributes=None, flProtect=None,
+        dwMaximumSizeHigh=0, dwMaximumSizeLow=0, lpName=None):
+    """
+    Creates or opens a named or unnamed file mapping object for ``hFile``.
+    Use :func:`MapViewOfFile` or :class:`MappedView` to map the file into
+    memory.
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa366537
+
+    :keyword pywincffi.wintypes.HANDLE hFile:
+        The file to create the mapping for.  The access rights of the
+        handle must be compatible with ``flProtect``.  If not provided
+        the mapping is backed by the paging file and a size must be given.
+
+    :keyword pywincffi.wintypes.SECURITY_ATTRIBUTES lpFileMappingAttributes:
+        If not provided then, by default, the handle cannot be inherited
+        by a subprocess.
+
+    :keyword int flProtect:
+        The page protection of the mapping such as ``PAGE_READONLY`` or
+        ``PAGE_READWRITE``.  Defaults to ``PAGE_READWRITE``.
+
+    :keyword int dwMaximumSizeHigh:
+        The high order ``DWORD`` of the maximum size of the mapping.
+
+    :keyword int dwMaximumSizeLow:
+        The low order ``DWORD`` of the maximum size of the mapping.  If
+        both are zero the maximum size is the current size of ``hFile``.
+        A file smaller than the maximum size is extended.
+
+    :keyword str lpName:
+        Type is ``unicode`` on Python 2, ``str`` on Python 3.
+        The optional name of the mapping.
+
+    :returns:
+        Returns a :class:`pywincffi.wintypes.HANDLE` to the mapping.  If
+        a mapping by the given name already exists then it will be
+        returned instead of creating a new mapping.
+    """
+    ffi, library = dist.load("kernel32")
+
+    if flProtect is None:
+        flProtect = library.PAGE_READWRITE
+
+    _CREATE_FILE_MAPPING.validate(
+        hFile, lpFileMappingAttributes, flProtect, dwMaximumSizeHigh,
+        dwMaximumSizeLow, lpName)
+
+    handle = library.CreateFileMapping(
+        ffi.cast("HANDLE", -1) if hFile is None else wintype_to_cdata(hFile),
+        wintype_to_cdata(lpFileMappingAttributes), flProtect,
+        dwMaximumSizeHigh, dwMaximumSizeLow,
+        ffi.NULL if lpName is None else lpName)
+
+    if handle == ffi.NULL:
+        error_check("CreateFileMapping", code=0, expected=NON_ZERO)
+
+    return HANDLE(handle)
+
+
+def OpenFileMapping(dwDesiredAccess, bInheritHandle, lpName):
+    """
+    Opens an existing named file mapping object.
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa366791
+
+    :param int dwDesiredAccess:
+        The access desired for the mapping such as ``FILE_MAP_READ``.
+
+    :param bool bInheritHandle:
+    :param str lpName:
+        Type is ``unicode`` on Python 2, ``str`` on Python 3.
+
+    :return:
+        Returns a :class:`pywincffi.wintypes.HANDLE` to the mapping.
+    """
+    _OPEN_FILE_MAPPING.validate(dwDesiredAccess, bInheritHandle, lpName)
+    ffi, library = dist.load("kernel32")
+
+    handle = library.OpenFileMapping(
+        dwDesiredAccess, ffi.cast("BOOL", bInheritHandle), lpName)
+
+    if handle == ffi.NULL:
+        error_check("OpenFileMapping", code=0, expected=NON_ZERO)
+
+    return HANDLE(handle)
+
+
+def MapViewOfFile(
+        hFileMappingObject, dwDesiredAccess, dwFileOffsetHigh=0,
+        dwFileOffsetLow=0, dwNumberOfBytesToMap=0):
+    """
+    Maps a view of a file mapping into memory.
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa366761
+
+    :param pywincffi.wintypes.HANDLE hFileMappingObject:
+        A handle returned by :func:`CreateFileMapping` or
+        :func:`OpenFileMapping`.
+
+    :param int dwDesiredAccess:
+        The access to the view such as ``FILE_MAP_READ``, ``FILE_MAP_WRITE``
+        or ``FILE_MAP_COPY``.
+
+    :keyword int dwFileOffsetHigh:
+        The high order ``DWORD`` of the offset where the view begins.
+
+    :keyword int dwFileOffsetLow:
+        The low order ``DWORD`` of the offset where the view begins.  The
+        offset must be a multiple of the allocation granularity,
+        :data:`mmap.ALLOCATIONGRANULARITY`.
+
+    :keyword int dwNumberOfBytesToMap:
+        The size of the view.  If zero the view extends to the end of the
+        mapping.
+
+    :returns:
+        Returns a cdata pointer to the start of the view which must be
+        passed to :func:`UnmapViewOfFile` when the view is no longer
+        needed.
+    """
+    return MapViewOfFileEx(
+        hFileMappingObject, dwDesiredAccess,
+        dwFileOffsetHigh=dwFileOffsetHigh, dwFileOffsetLow=dwFileOffsetLow,
+        dwNumberOfBytesToMap=dwNumberOfBytesToMap)
+
+
+def MapViewOfFileEx(  # pylint: disable=too-many-arguments
+        hFileMappingObject, dwDesiredAccess, dwFileOffsetHigh=0,
+        dwFileOffsetLow=0, dwNumberOfBytesToMap=0, lpBaseAddress=None):
+    """
+    Maps a view of a file mapping into memory, optionally at a specific
+    address.
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa366763
+
+    :keyword lpBaseAddress:
+        A cdata pointer to the address to map the view at.  If not
+        provided the system chooses the address.
+
+    The other arguments and the return value are the same as
+    :func:`MapViewOfFile`.
+    """
+    _MAP_VIEW_OF_FILE.validate(
+        hFileMappingObject, dwDesiredAccess, dwFileOffsetHigh,
+        dwFileOffsetLow, dwNumberOfBytesToMap)
+    ffi, library = dist.load("kernel32")
+
+    if lpBaseAddress is None:
+        lpBaseAddress = ffi.NULL
+    else:
+        input_check("lpBaseAddress", lpBaseAddress, ffi.CData)
+
+    address = library.MapViewOfFileEx(
+        wintype_to_cdata(hFileMappingObject), dwDesiredAccess,
+        dwFileOffsetHigh, dwFileOffsetLow, dwNumberOfBytesToMap,
+        lpBaseAddress)
+
+    if address == ffi.NULL:
+        error_check("MapViewOfFileEx", code=0, expected=NON_ZERO)
+
+    return address
+
+
+def FlushViewOfFile(lpBaseAddress, dwNumberOfBytesToFlush=0):
+    """
+    Writes the modified pages of a view to the file on disk.
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa366563
+
+    :param lpBaseAddress:
+        A cdata pointer into a view returned by :func:`MapViewOfFile`.
+
+    :keyword int dwNumberOfBytesToFlush:
+        The number of bytes to flush.  If zero the view is flushed from
+        ``lpBaseAddress`` to its end.
+    """
+    ffi, library = dist.load("kernel32")
+    input_check("lpBaseAddress", lpBaseAddress, ffi.CData)
+    input_check(
+        "dwNumberOfBytesToFlush", dwNumberOfBytesToFlush, integer_types)
+
+    code = library.FlushViewOfFile(lpBaseAddress, dwNumberOfBytesToFlush)
+    error_check("FlushViewOfFile", code=code, expected=NON_ZERO)
+
+
+def UnmapViewOfFile(lpBaseAddress):
+    """
+    Unmaps a view returned by :func:`MapViewOfFile`.  The view must not be
+    accessed afterwards.
+
+    .. seealso::
+
+        https://msdn.microsoft.com/en-us/library/aa366882
+
+    :param lpBaseAddress:
+        The cdata pointer returned by :func:`MapViewOfFile`.
+    """
+    ffi, library = dist.load("kernel32")
+    input_check("lpBaseAddress", lpBaseAddress, ffi.CData)
+
+    code = library.UnmapViewOfFile(lpBaseAddress)
+    error_check("UnmapViewOfFile", code=code, expected=NON_ZERO)
+
+
+def _unmap_view(library, lpBaseAddress):
+    """
+    Unmaps a view which was garbage collected without being closed.  This
+    is called by a cffi destructor so errors are ignored rather than
+    raised.
+    """
+    library.UnmapViewOfFile(lpBaseAddress)
+
+
+def _view_destructor(library, mapped):
+    """
+    Returns the destructor for a view's address which unmaps it unless
+    ``mapped[0]`` has been set to False by :meth:`MappedView.close`.
+    """
+    def destructor(lpBaseAddress):
+        if mapped[0]:
+            mapped[0] = False
+            _unmap_view(library, lpBaseAddress)
+    return destructor
+
+
+class MappedView(object):
+    """
+    Maps ``size`` bytes of a file mapping, starting at ``offset``, and
+    exposes them as a :class:`memoryview`.  The view is unmapped when
+    :meth:`close` is called or the ``with`` statement exits:
+
+    >>> from pywincffi.kernel32 import (
+    ...     CloseHandle, CreateFileMapping, MappedView)
+    >>> mapping = CreateFileMapping(hFile)
+    >>> with MappedView(mapping, 5 * 1024 ** 3, 4096) as view:
+    ...     header = bytes(view.buffer[:16])
+    ...     view.buffer[16:20] = b"\\x00" * 4
+    >>> CloseHandle(mapping)
+
+    Unlike :func:`MapViewOfFile`, ``offset`` does not need to be aligned.
+    The view is mapped from the closest multiple of
+    :data:`mmap.ALLOCATIONGRANULARITY` below ``offset`` and
+    :attr:`buffer` starts at ``offset``.
+
+    If the view is garbage collected without being closed it's unmapped
+    once nothing uses :attr:`buffer`, including slices of it or numpy
+    arrays created from it.  :meth:`close` unmaps the view immediately
+    though and, unlike :class:`mmap.mmap`, the view doesn't know about
+    those objects so they point at unmapped memory afterwards.  Using
+    them after that may crash the interpreter.
+
+    :param pywincffi.wintypes.HANDLE hFileMappingObject:
+        A handle returned by :func:`CreateFileMapping` or
+        :func:`OpenFileMapping`.  It may be closed while the view is open.
+
+    :param int offset:
+        The offset into the mapping where the view begins, which may be
+        larger than 4 GiB.
+
+    :param int size:
+        The number of bytes to map.
+
+    :keyword int dwDesiredAccess:
+        The access to the view, see :func:`MapViewOfFile`.  Defaults to
+        ``FILE_MAP_WRITE``.  :attr:`buffer` is read only, on Python 3.8 and
+        later, unless the access includes ``FILE_MAP_WRITE`` or
+        ``FILE_MAP_COPY``.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``offset`` is negative or ``size`` is not positive.
+
+    :raises pywincffi.exceptions.WindowsAPIError:
+        Raised if the view could not be mapped, for example because it
+        extends past the end of the mapping.
+    """
+    def __init__(self, hFileMappingObject, offset, size, dwDesiredAccess=None):
+        self._address = None
+        self._buffer = None
+        self._mapped = [False]
+        ffi, library = dist.load("kernel32")
+
+        if dwDesiredAccess is None:
+            dwDesiredAccess = library.FILE_MAP_WRITE
+
+        _MAPPED_VIEW.validate(
+            hFileMappingObject, offset, size, dwDesiredAccess)
+
+        if offset < 0:
+            raise InputError(
+                "offset", offset, allowed_types=None,
+                message="`offset` must not be negative")
+        if size <= 0:
+            raise InputError(
+                "size", size, allowed_types=None,
+                message="`size` must be greater than zero")
+
+        # MapViewOfFile() only accepts offsets which are a multiple of the
+        # allocation granularity so the view starts below `offset` and
+        # the buffer is offset into the view.
+        base = offset - offset % mmap.ALLOCATIONGRANULARITY
+        delta = offset - base
+        address = MapViewOfFile(
+            hFileMappingObject, dwDesiredAccess,
+            dwFileOffsetHigh=base >> 32,
+            dwFileOffsetLow=base & 0xFFFFFFFF,
+            dwNumberOfBytesToMap=delta + size)
+
+        try:
+            # The buffer, and anything created from it, keeps the address
+            # alive so the view is only unmapped by the destructor once
+            # nothing can access it.
+            self._mapped[0] = True
+            self._address = ffi.gc(
+                address, _view_destructor(library, self._mapped))
+            self._buffer = memoryview(
+                ffi.buffer(self._address, delta + size))[delta:]
+            writable = library.FILE_MAP_WRITE | library.FILE_MAP_COPY
+            if (not dwDesiredAccess & writable and
+                    hasattr(self._buffer, "toreadonly")):
+                self._buffer = self._buffer.toreadonly()
+        except Exception:
+            self._mapped[0] = False
+            self._buffer = None
+            UnmapViewOfFile(address)
+            raise
+
+        self.offset = offset
+        self.size = size
+
+    def __repr__(self):
+        return "<%s offset=%d size=%d closed=%r>" % (
+            self.__class__.__name__, self.offset, self.size, self.closed)
+
+    def __len__(self):
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def closed(self):
+        """True if the view has been unmapped"""
+        return self._buffer is None
+
+    @property
+    def buffer(self):
+        """
+        A :class:`memoryview` of the view.  It, and any object created
+        from it, keep the view mapped until :meth:`close` is called and
+        must not be used afterwards.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed view")
+        return self._buffer
+
+    @property
+    def address(self):
+        """The cdata pointer to the start of the mapped view"""
+        return self._address
+
+    def flush(self):
+        """Writes the modified pages of the view to the file on disk"""
+        if self.closed:
+            raise ValueError("I/O operation on closed view")
+        FlushViewOfFile(self._address)
+
+    def close(self):
+        """
+        Unmaps the view immediately.  Calling this more than once has no
+        effect.  Slices of :attr:`buffer`, and other objects created from
+        it, are not tracked and must not be used afterwards.
+
+        :raises BufferError:
+            Raised on Python 3, and the view is left open, if an object
+            which holds a buffer exported directly by :attr:`buffer`, such
+            as the result of ``ffi.from_buffer(view.buffer)``, still exists.
+        """
+        if self.closed:
+            return
+
+        # Release the memoryview so using :attr:`buffer` itself after the
+        # view has been unmapped raises ValueError.  Slices of it and
+        # numpy arrays share the underlying buffer, not the memoryview,
+        # so they aren't affected.  Python 2 can't release memoryviews.
+        if hasattr(self._buffer, "release"):
+            self._buffer.release()
+        self._buffer = None
+        self._mapped[0] = False
+        UnmapViewOfFile(self._address)
@@ -5,8 +5,13 @@ Overlapped
 A module containing Windows functions for working with OVERLAPPED objects.
 """
 
+from six import integer_types
+
 from pywincffi.core import dist
 from pywincffi.core.checks import NON_ZERO, input_check, error_check
+from pywincffi.exceptions import InputError
+from pywincffi.kernel32.events import CreateEvent, ResetEvent
+from pywincffi.kernel32.handle import CloseHandle
 from pywincffi.wintypes import HANDLE, OVERLAPPED, wintype_to_cdata
 
 
@@ -50,7 +55,7 @@ def GetOverlappedResult(hFile, lpOverlapped, bWait):
     input_check("lpOverlapped", lpOverlapped, OVERLAPPED)
     input_check("bWait", bWait, allowed_values=(True, False))
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     lpNumberOfBytesTransferred = ffi.new("DWORD[1]")
 
@@ -64,3 +69,144 @@ def GetOverlappedResult(hFile, lpOverlapped, bWait):
     error_check("GetOverlappedResult", result, NON_ZERO)
 
     return int(lpNumberOfBytesTransferred[0])
+
+
+class OverlappedPool(object):
+    """
+    A pool of :class:`pywincffi.wintypes.OVERLAPPED` objects which can be
+    reused for overlapped operations instead of creating a new structure
+    for every operation:
+
+    >>> from pywincffi.kernel32 import OverlappedPool, ReadFile
+    >>> pool = OverlappedPool(events=True)
+    >>> overlapped = pool.acquire()
+    >>> ReadFile(handle, 4096, lpOverlapped=overlapped)
+    >>> # ... wait for the operation to complete ...
+    >>> pool.release(overlapped)
+
+    Structures returned by :meth:`acquire` are zeroed, apart from
+    ``hEvent`` when ``events`` is True.  When the pool is empty
+    :meth:`acquire` creates a new structure so the number of structures
+    in use is not limited, only the number kept for reuse.  Structures
+    must not be released while an operation using them is still pending.
+    Only structures returned by :meth:`acquire`, which haven't been
+    released since, can be released.  The pool keeps a reference to each
+    of them until it's released.
+
+    :keyword int capacity:
+        The maximum number of released structures the pool will keep.
+        Structures released to a full pool are discarded.
+
+    :keyword bool events:
+        If True each structure is given its own manual reset event, created
+        by :func:`pywincffi.kernel32.CreateEvent`, in ``hEvent``.  The event
+        is reset when the structure is released and closed when it's
+        discarded or the pool is closed.
+
+    :ivar int hits:
+        The number of times :meth:`acquire` reused a structure.
+
+    :ivar int misses:
+        The number of times :meth:`acquire` had to create a structure
+        because the pool was empty.
+
+    :ivar int discarded:
+        The number of structures which were released to a full pool.
+    """
+    def __init__(self, capacity=64, events=False):
+        input_check("capacity", capacity, integer_types)
+        input_check("events", events, bool)
+
+        if capacity < 1:
+            raise InputError(
+                "capacity", capacity, allowed_types=None,
+                message="`capacity` must be at least 1")
+
+        self.capacity = capacity
+        self.events = events
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self._free = []
+
+        # Maps the ids of the structures returned by acquire(), which
+        # haven't been released yet, to the structures.  Holding on to
+        # them means an id can't be reused by another object.
+        self._in_use = {}
+
+    def __len__(self):
+        return len(self._free)
+
+    def __repr__(self):
+        return "<%s capacity=%d free=%d hits=%d misses=%d discarded=%d>" % (
+            self.__class__.__name__, self.capacity, len(self._free),
+            self.hits, self.misses, self.discarded)
+
+    def acquire(self):
+        """
+        Returns a zeroed :class:`pywincffi.wintypes.OVERLAPPED` from the
+        pool, or a new one if the pool is empty.
+        """
+        try:
+            overlapped = self._free.pop()
+        except IndexError:
+            self.misses += 1
+            overlapped = OVERLAPPED()
+            if self.events:
+                overlapped.hEvent = CreateEvent(
+                    bManualReset=True, bInitialState=False)
+        else:
+            self.hits += 1
+
+        self._in_use[id(overlapped)] = overlapped
+        return overlapped
+
+    def release(self, overlapped):
+        """
+        Returns ``overlapped``, which should have come from :meth:`acquire`,
+        to the pool.  Its fields are zeroed, including ``hEvent`` unless the
+        pool creates events in which case the event is reset instead.
+
+        :raises pywincffi.exceptions.InputError:
+            Raised if ``overlapped`` was not returned by :meth:`acquire` or
+            has already been released.
+        """
+        input_check("overlapped", overlapped, OVERLAPPED)
+
+        if self._in_use.get(id(overlapped)) is not overlapped:
+            raise InputError(
+                "overlapped", overlapped, allowed_types=None,
+                message="`overlapped` was not acquired from this pool or "
+                        "has already been released")
+        del self._in_use[id(overlapped)]
+
+        if len(self._free) >= self.capacity:
+            self.discarded += 1
+            if self.events:
+                CloseHandle(overlapped.hEvent)
+            return
+
+        # pylint: disable=protected-access
+        cdata = overlapped._cdata
+        cdata.Internal = 0
+        cdata.InternalHigh = 0
+        cdata.Offset = 0
+        cdata.OffsetHigh = 0
+        if self.events:
+            ResetEvent(overlapped.hEvent)
+        else:
+            ffi, _ = dist.load("kernel32")
+            cdata.hEvent = ffi.NULL
+
+        self._free.append(overlapped)
+
+    def close(self):
+        """
+        Empties the pool, closing the events of the structures in it if
+        the pool creates events.  Structures which are currently acquired
+        are not affected.
+        """
+        free, self._free = self._free, []
+        if self.events:
+            for overlapped in free:
+                CloseHandle(overlapped.hEvent)
@@ -58,7 +58,7 @@ def CreatePipe(lpPipeAttributes=None, nSize=0):
     )
     lpPipeAttributes = wintype_to_cdata(lpPipeAttributes)
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     hReadPipe = ffi.new("PHANDLE")
     hWritePipe = ffi.new("PHANDLE")
@@ -101,7 +101,7 @@ def SetNamedPipeHandleState(
         remote named pipe transfers information
     """
     input_check("hNamedPipe", hNamedPipe, HANDLE)
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     if lpMode is None:
         lpMode = ffi.NULL
@@ -154,7 +154,7 @@ def PeekNamedPipe(hNamedPipe, nBufferSize):
     """
     input_check("hNamedPipe", hNamedPipe, HANDLE)
     input_check("nBufferSize", nBufferSize, integer_types)
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     # Outputs
     lpBuffer = ffi.new("LPVOID[%d]" % nBufferSize)
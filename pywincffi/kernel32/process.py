@@ -15,15 +15,13 @@ documentation for the constant names and their purpose:
     Not all constants may be defined
 """
 
-from io import StringIO
-from token import STRING
 from collections import namedtuple
-from tokenize import generate_tokens
 
 from six import integer_types, text_type
 
 from pywincffi.core import dist
-from pywincffi.core.checks import NON_ZERO, input_check, error_check, NoneType
+from pywincffi.core.checks import (
+    NON_ZERO, Argument, NoneType, Schema, input_check, error_check)
 from pywincffi.exceptions import (
     WindowsAPIError, PyWinCFFINotImplementedError, InputError)
 from pywincffi.kernel32.handle import CloseHandle
@@ -34,6 +32,15 @@ from pywincffi.wintypes import (
 
 RESERVED_PIDS = set([0, 4])
 
+_CREATE_PROCESS = Schema("CreateProcess", (
+    Argument("lpApplicationName", (text_type, ), optional=True),
+    Argument("lpProcessAttributes", (SECURITY_ATTRIBUTES, NoneType)),
+    Argument("lpThreadAttributes", (SECURITY_ATTRIBUTES, NoneType)),
+    Argument("bInheritHandles", allowed_values=(True, False)),
+    Argument("dwCreationFlags", (integer_types, )),
+    Argument("lpCurrentDirectory", (text_type, ), optional=True),
+    Argument("lpStartupInfo", (STARTUPINFO, ), optional=True)))
+
 
 def _environment_to_string(environment):
     """
@@ -110,7 +117,7 @@ def _text_to_wchar(text):
             "text", text,
             message="Expected {0!r} for `text`".format(text_type))
 
-    ffi, _ = dist.load()
+    ffi, _ = dist.load("kernel32")
     return ffi.new("wchar_t[{0}]".format(len(text)), text)
 
 
@@ -133,6 +140,12 @@ def module_name(path):
     :raises TypeError:
         Raised if ``path`` is not a text type.
     """
+    # The tokenize module is relatively expensive to import and is only
+    # needed here so it's imported when this function is first called.
+    from io import StringIO
+    from token import STRING
+    from tokenize import generate_tokens
+
     # Try to tokenize the input.  In the case of properly quoted strings
     # the module name should be the first entry.
     for type_, string, _, _, line in generate_tokens(StringIO(path).readline):
@@ -180,7 +193,7 @@ def pid_exists(pid, wait=0):
     if pid in RESERVED_PIDS:
         return True
 
-    _, library = dist.load()
+    _, library = dist.load("kernel32")
 
     try:
         hProcess = OpenProcess(
@@ -266,7 +279,7 @@ def GetExitCodeProcess(hProcess):
     """
     input_check("hProcess", hProcess, HANDLE)
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
     lpExitCode = ffi.new("LPDWORD")
     code = library.GetExitCodeProcess(wintype_to_cdata(hProcess), lpExitCode)
     error_check("GetExitCodeProcess", code=code, expected=NON_ZERO)
@@ -298,7 +311,7 @@ def OpenProcess(dwDesiredAccess, bInheritHandle, dwProcessId):
     input_check("dwDesiredAccess", dwDesiredAccess, integer_types)
     input_check("bInheritHandle", bInheritHandle, bool)
     input_check("dwProcessId", dwProcessId, integer_types)
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     handle = library.OpenProcess(
         ffi.cast("DWORD", dwDesiredAccess),
@@ -325,7 +338,7 @@ def GetCurrentProcess():
     :returns:
         The :class:`pywincffi.wintypes.HANDLE` to the current process.
     """
-    _, library = dist.load()
+    _, library = dist.load("kernel32")
     return HANDLE(library.GetCurrentProcess())
 
 
@@ -345,7 +358,7 @@ def GetProcessId(Process):  # pylint: disable=invalid-name
         process handle.
     """
     input_check("Process", Process, HANDLE)
-    _, library = dist.load()
+    _, library = dist.load("kernel32")
     pid = library.GetProcessId(wintype_to_cdata(Process))
     error_check("GetProcessId")
     return pid
@@ -368,7 +381,7 @@ def TerminateProcess(hProcess, uExitCode):
     """
     input_check("hProcess", hProcess, HANDLE)
     input_check("uExitCode", uExitCode, integer_types)
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
     code = library.TerminateProcess(
         wintype_to_cdata(hProcess),
         ffi.cast("UINT", uExitCode)
@@ -399,7 +412,7 @@ def CreateToolhelp32Snapshot(dwFlags, th32ProcessID):
     """
     input_check("dwFlags", dwFlags, integer_types)
     input_check("th32ProcessID", th32ProcessID, integer_types)
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
     process_list = library.CreateToolhelp32Snapshot(
         ffi.cast("DWORD", dwFlags),
         ffi.cast("DWORD", th32ProcessID)
@@ -518,7 +531,7 @@ def CreateProcess(  # pylint: disable=too-many-arguments,too-many-branches
             message="lpCommandLine in call to CreateProcess() may not be "
                     "None.")
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
 
     if len(lpCommandLine) > library.MAX_COMMAND_LINE:
         raise InputError(
@@ -526,6 +539,14 @@ def CreateProcess(  # pylint: disable=too-many-arguments,too-many-branches
             message="lpCommandLine's length "
                     "cannot exceed {0}".format(library.MAX_COMMAND_LINE))
 
+    if dwCreationFlags is None:
+        dwCreationFlags = \
+            library.NORMAL_PRIORITY_CLASS | library.CREATE_UNICODE_ENVIRONMENT
+
+    _CREATE_PROCESS.validate(
+        lpApplicationName, lpProcessAttributes, lpThreadAttributes,
+        bInheritHandles, dwCreationFlags, lpCurrentDirectory, lpStartupInfo)
+
     if lpApplicationName is None:
         lpApplicationName = ffi.NULL
 
@@ -541,48 +562,21 @@ def CreateProcess(  # pylint: disable=too-many-arguments,too-many-branches
                         "exceed {0} if `lpApplicationName` "
                         "is not set. Module name was {1!r}".format(
                             library.MAX_PATH, module))
-    else:
-        input_check(
-            "lpApplicationName", lpApplicationName, allowed_types=(text_type,))
 
-    input_check(
-        "lpProcessAttributes", lpProcessAttributes,
-        allowed_types=(SECURITY_ATTRIBUTES, NoneType))
     lpProcessAttributes = wintype_to_cdata(lpProcessAttributes)
-
-    input_check(
-        "lpThreadAttributes", lpThreadAttributes,
-        allowed_types=(SECURITY_ATTRIBUTES, NoneType))
     lpThreadAttributes = wintype_to_cdata(lpThreadAttributes)
 
-    input_check(
-        "bInheritHandles", bInheritHandles, allowed_values=(True, False))
-
-    if dwCreationFlags is None:
-        dwCreationFlags = \
-            library.NORMAL_PRIORITY_CLASS | library.CREATE_UNICODE_ENVIRONMENT
-
-    input_check(
-        "dwCreationFlags", dwCreationFlags, allowed_types=(integer_types, ))
-
     if lpEnvironment is not None:
         lpEnvironment = _text_to_wchar(_environment_to_string(lpEnvironment))
         dwCreationFlags = dwCreationFlags | library.CREATE_UNICODE_ENVIRONMENT
     else:
         lpEnvironment = ffi.NULL
 
-    if lpCurrentDirectory is not None:
-        input_check(
-            "lpCurrentDirectory", lpCurrentDirectory,
-            allowed_types=(text_type, ))
-    else:
+    if lpCurrentDirectory is None:
         lpCurrentDirectory = ffi.NULL
 
-    if lpStartupInfo is not None:
+    if lpStartupInfo is None:
         # TODO need to add support for STARTUPINFOEX (undocumented)
-        input_check(
-            "lpStartupInfo", lpStartupInfo, allowed_types=(STARTUPINFO, ))
-    else:
         lpStartupInfo = STARTUPINFO()
 
     lpProcessInformation = PROCESS_INFORMATION()
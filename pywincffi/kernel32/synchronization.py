@@ -37,7 +37,7 @@ def WaitForSingleObject(hHandle, dwMilliseconds):
     input_check("hHandle", hHandle, HANDLE)
     input_check("dwMilliseconds", dwMilliseconds, integer_types)
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("kernel32")
     result = library.WaitForSingleObject(
         wintype_to_cdata(hHandle), ffi.cast("DWORD", dwMilliseconds)
     )
@@ -0,0 +1,132 @@
+"""
+Unchecked
+---------
+
+Versions of :func:`pywincffi.kernel32.ReadFile`,
+:func:`pywincffi.kernel32.WriteFile` and
+:func:`pywincffi.kernel32.GetOverlappedResult` which don't check the
+types of their inputs.  They're intended for tight loops where the
+inputs are already known to be valid, for example:
+
+    >>> from pywincffi.kernel32 import unchecked
+    >>> while True:
+    ...     data = unchecked.ReadFile(handle, 4096)
+
+The functions accept the same arguments and return the same results as
+their checked counterparts.  Errors from Windows are still checked and
+raise :class:`pywincffi.exceptions.WindowsAPIError` but invalid inputs
+are passed straight to cffi which may raise :class:`TypeError` or
+:class:`OverflowError` instead of
+:class:`pywincffi.exceptions.InputError`.  The one exception is the
+size passed to :func:`WriteFile` which is always checked against the
+size of the buffer so Windows never reads past the end of it.
+"""
+
+from six import binary_type
+
+from pywincffi.core import dist
+from pywincffi.core.checks import NON_ZERO, error_check
+from pywincffi.exceptions import InputError
+
+
+def ReadFile(hFile, nNumberOfBytesToRead, lpOverlapped=None):
+    """
+    Unchecked version of :func:`pywincffi.kernel32.ReadFile`
+
+    :param pywincffi.wintypes.HANDLE hFile:
+        The handle to read from.
+
+    :param int nNumberOfBytesToRead:
+        The number of bytes to read from ``hFile``
+
+    :keyword pywincffi.wintypes.OVERLAPPED lpOverlapped:
+        See :func:`pywincffi.kernel32.ReadFile`.
+
+    :returns:
+        Returns the binary data read from ``hFile``
+    """
+    ffi, library = dist.load("kernel32")
+    lpBuffer = ffi.new("char []", nNumberOfBytesToRead)
+    bytes_read = ffi.new("LPDWORD")
+    code = library.ReadFile(
+        hFile._as_parameter_, lpBuffer, nNumberOfBytesToRead,
+        bytes_read, ffi.NULL if lpOverlapped is None else lpOverlapped._cdata)
+    error_check("ReadFile", code=code, expected=NON_ZERO)
+    return ffi.unpack(lpBuffer, bytes_read[0])
+
+
+def WriteFile(hFile, lpBuffer, nNumberOfBytesToWrite=None, lpOverlapped=None):
+    """
+    Unchecked version of :func:`pywincffi.kernel32.WriteFile`
+
+    :param pywincffi.wintypes.HANDLE hFile:
+        The handle to write to.
+
+    :param lpBuffer:
+        The data to be written to the file or device, any contiguous object
+        supporting the buffer protocol.
+
+    :keyword int nNumberOfBytesToWrite:
+        The number of bytes to be written.  Defaults to the size of
+        ``lpBuffer`` in bytes.
+
+    :keyword pywincffi.wintypes.OVERLAPPED lpOverlapped:
+        See :func:`pywincffi.kernel32.WriteFile`.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``nNumberOfBytesToWrite`` is larger than ``lpBuffer``.
+
+    :returns:
+        Returns the number of bytes written.
+    """
+    ffi, library = dist.load("kernel32")
+    if not isinstance(lpBuffer, binary_type):
+        lpBuffer = ffi.from_buffer(lpBuffer)
+    if nNumberOfBytesToWrite is None:
+        nNumberOfBytesToWrite = len(lpBuffer)
+
+    elif nNumberOfBytesToWrite > len(lpBuffer):
+        raise InputError(
+            "nNumberOfBytesToWrite", nNumberOfBytesToWrite,
+            allowed_types=None,
+            message="`nNumberOfBytesToWrite` is larger than `lpBuffer` "
+                    "(%d bytes)" % len(lpBuffer))
+
+    bytes_written = ffi.new("LPDWORD")
+    if lpOverlapped is None:
+        code = library.WriteFile(
+            hFile._as_parameter_, lpBuffer, nNumberOfBytesToWrite,
+            bytes_written, ffi.NULL)
+        error_check("WriteFile", code=code, expected=NON_ZERO)
+    else:
+        code = library.WriteFile(
+            hFile._as_parameter_, lpBuffer, nNumberOfBytesToWrite,
+            bytes_written, lpOverlapped._cdata)
+        error_check("WriteFile", code=code, expected=0)
+    return bytes_written[0]
+
+
+def GetOverlappedResult(hFile, lpOverlapped, bWait):
+    """
+    Unchecked version of :func:`pywincffi.kernel32.GetOverlappedResult`
+
+    :param pywincffi.wintypes.HANDLE hFile:
+        A handle to the file, named pipe, or communications device.
+
+    :param pywincffi.wintypes.OVERLAPPED lpOverlapped:
+        The OVERLAPPED object that was specified when the overlapped
+        operation was started.
+
+    :param bool bWait:
+        If True wait for the operation to complete.
+
+    :returns:
+        The number of bytes that were actually transferred.
+    """
+    ffi, library = dist.load("kernel32")
+    lpNumberOfBytesTransferred = ffi.new("DWORD[1]")
+    result = library.GetOverlappedResult(
+        hFile._as_parameter_, lpOverlapped._cdata,
+        lpNumberOfBytesTransferred, bWait)
+    error_check("GetOverlappedResult", result, NON_ZERO)
+    return int(lpNumberOfBytesTransferred[0])
@@ -6,4 +6,8 @@ Provides functions, constants and utilities that wrap functions provided by
 ``user32.dll``.
 """
 
-from pywincffi.user32.synchronization import MsgWaitForMultipleObjects
+from pywincffi.core.lazy import lazy_exports
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    "pywincffi.user32.synchronization": ("MsgWaitForMultipleObjects", )
+})
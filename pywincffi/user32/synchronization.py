@@ -15,8 +15,8 @@ from six import integer_types
 
 from pywincffi.core import dist
 from pywincffi.core.checks import input_check
-from pywincffi.exceptions import WindowsAPIError
-from pywincffi.wintypes import HANDLE, wintype_to_cdata
+from pywincffi.exceptions import InputError, WindowsAPIError
+from pywincffi.wintypes import HANDLE, HandleArray, wintype_to_cdata
 
 
 def MsgWaitForMultipleObjects(
@@ -32,7 +32,9 @@ def MsgWaitForMultipleObjects(
     :param list pHandles:
         A list or tuple of :class:`pywincffi.wintypes.HANDLE` to wait on.
         See Microsoft's documentation for more information about the contents
-        of this argument.
+        of this argument.  A :class:`pywincffi.wintypes.HandleArray` may be
+        provided instead, it's passed to Windows as-is rather than being
+        converted and checked on every call.
 
     :param bool bWaitAll:
         If True then this function will return when the states of all
@@ -49,6 +51,12 @@ def MsgWaitForMultipleObjects(
     :keyword int nCount:
         The number of object handles in ``pHandles``.  By default this will
         be determined by checking the length of the input to ``pHandles``.
+        This can't be larger than the length of ``pHandles``.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``nCount`` is larger than the length of ``pHandles`` or,
+        for a :class:`pywincffi.wintypes.HandleArray`, larger than
+        ``MAXIMUM_WAIT_OBJECTS - 1``.
 
     :raises WindowsAPIError:
         Raised if the underlying Windows function returns ``WAIT_FAILED``.
@@ -59,7 +67,7 @@ def MsgWaitForMultipleObjects(
         return.  See Microsoft's documentation for full details on what
         this could be.
     """
-    input_check("pHandles", pHandles, (list, tuple))
+    input_check("pHandles", pHandles, (list, tuple, HandleArray))
 
     if nCount is None:
         nCount = len(pHandles)
@@ -69,14 +77,32 @@ def MsgWaitForMultipleObjects(
     input_check("dwWakeMask", dwWakeMask, integer_types)
     input_check("nCount", nCount, integer_types)
 
-    ffi, library = dist.load()
-
-    # Verify input types and build a <cdata HANDLE> array out of the
-    # input Python HANDLE list/tuple to be passed to the underlying API.
-    pHandles_cdata = ffi.new("HANDLE[]", nCount)
-    for i, handle in enumerate(pHandles):
-        input_check("pHandles[%d]" % i, handle, HANDLE)
-        pHandles_cdata[i] = wintype_to_cdata(handle)
+    ffi, library = dist.load("user32")
+
+    if nCount > len(pHandles):
+        raise InputError(
+            "nCount", nCount, allowed_types=None,
+            message="`nCount` can't be larger than the number of handles "
+                    "in `pHandles` (%d)" % len(pHandles))
+
+    if isinstance(pHandles, HandleArray):
+        # The handles were checked when they were added to the array but
+        # the array may hold MAXIMUM_WAIT_OBJECTS handles which is one
+        # more than this function can wait on.
+        if nCount > library.MAXIMUM_WAIT_OBJECTS - 1:
+            raise InputError(
+                "nCount", nCount, allowed_types=None,
+                message="`nCount` can't be larger than "
+                        "MAXIMUM_WAIT_OBJECTS - 1 (%d)" % (
+                            library.MAXIMUM_WAIT_OBJECTS - 1))
+        pHandles_cdata = wintype_to_cdata(pHandles)
+    else:
+        # Verify input types and build a <cdata HANDLE> array out of the
+        # input Python HANDLE list/tuple to be passed to the underlying API.
+        pHandles_cdata = ffi.new("HANDLE[]", nCount)
+        for i, handle in enumerate(pHandles):
+            input_check("pHandles[%d]" % i, handle, HANDLE)
+            pHandles_cdata[i] = wintype_to_cdata(handle)
 
     code = library.MsgWaitForMultipleObjects(
         nCount,
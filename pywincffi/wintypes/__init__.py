@@ -5,9 +5,16 @@ Provides user accessible types corresponding to the respective Windows types
 used across the exposed APIs.
 """
 
-from pywincffi.wintypes.functions import (
-    wintype_to_cdata, handle_from_file, socket_from_object)
-from pywincffi.wintypes.objects import WrappedObject, HANDLE, WSAEVENT, SOCKET
-from pywincffi.wintypes.structures import (
-    SECURITY_ATTRIBUTES, OVERLAPPED, FILETIME, LPWSANETWORKEVENTS,
-    PROCESS_INFORMATION, STARTUPINFO)
+from pywincffi.core.lazy import lazy_exports
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    "pywincffi.wintypes.functions": (
+        "wintype_to_cdata", "handle_from_file", "socket_from_object",
+        "filetimes_to_datetime64", "datetime64_to_filetimes"),
+    "pywincffi.wintypes.objects": (
+        "WrappedObject", "HANDLE", "WSAEVENT", "SOCKET", "HandleArray"),
+    "pywincffi.wintypes.structures": (
+        "SECURITY_ATTRIBUTES", "OVERLAPPED", "FILETIME", "LPWSANETWORKEVENTS",
+        "PROCESS_INFORMATION", "STARTUPINFO"),
+    "pywincffi.wintypes.views": ("structure_from_buffer", "StructureArray")
+})
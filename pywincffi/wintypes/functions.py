@@ -10,7 +10,17 @@ import socket
 
 from pywincffi.core import dist
 from pywincffi.exceptions import InputError
-from pywincffi.wintypes.objects import HANDLE, SOCKET, WSAEVENT
+from pywincffi.wintypes.objects import HANDLE, SOCKET
+from pywincffi.wintypes.structures import FILETIME, FILETIME_EPOCH
+from pywincffi.wintypes.views import StructureArray
+
+# The layout of FILETIME as a numpy dtype.
+_FILETIME_DTYPE = [("dwLowDateTime", "<u4"), ("dwHighDateTime", "<u4")]
+
+# The range of FILETIME values which can be stored as datetime64[ns].  The
+# smallest int64 value is not included since numpy uses it for NaT.
+_MIN_DATETIME64 = FILETIME_EPOCH - (2 ** 63 - 1) // 100
+_MAX_DATETIME64 = FILETIME_EPOCH + (2 ** 63 - 1) // 100
 
 
 # pylint: disable=protected-access
@@ -23,7 +33,7 @@ def wintype_to_cdata(wintype):
     >>> from pywincffi.core import dist
     >>> from pywincffi.kernel32 import CreateEvent
     >>> from pywincffi.wintypes import wintype_to_cdata
-    >>> ffi, lib = dist.load()
+    >>> ffi, lib = dist.load("core")
     >>> # Get an event HANDLE, using the wrapper: it's a Python HANDLE object.
     >>> hEvent = CreateEvent(bManualReset=False, bInitialState=False)
     >>> # Call ResetEvent directly without going through the wrapper:
@@ -36,14 +46,10 @@ def wintype_to_cdata(wintype):
     :return:
         The underlying CFFI <cdata> object, or ffi.NULL if wintype is None.
     """
-    ffi, _ = dist.load()
     if wintype is None:
+        ffi, _ = dist.load("core")
         return ffi.NULL
-
-    if isinstance(wintype, (SOCKET, HANDLE, WSAEVENT)):
-        return wintype._cdata[0]
-
-    return wintype._cdata
+    return wintype._as_parameter_
 
 
 def handle_from_file(file_):
@@ -75,7 +81,7 @@ def handle_from_file(file_):
             "file_", file_, allowed_types=None,
             message="Expected an open file like object for `file_`")
     else:
-        _, library = dist.load()
+        _, library = dist.load("core")
         return HANDLE(library.handle_from_fd(fileno))
 
 
@@ -111,7 +117,138 @@ def socket_from_object(sock):
             "sock", sock,
             message="Invalid socket object (error: %s)" % error)
     else:
-        ffi, _ = dist.load()
+        ffi, _ = dist.load("core")
         sock = SOCKET()
         sock._cdata[0] = ffi.cast("SOCKET", fileno)
         return sock
+
+
+def filetimes_to_datetime64(filetimes, dwHighDateTime=None):
+    """
+    Converts several FILETIME values to a numpy ``datetime64[ns]`` array
+    in a single step:
+
+    >>> from pywincffi.wintypes import filetimes_to_datetime64
+    >>> with open(path, "rb") as file_:
+    ...     times = filetimes_to_datetime64(file_.read())
+
+    The results are identical to calling
+    :meth:`pywincffi.wintypes.FILETIME.to_nanoseconds` on each value.  This
+    function requires numpy.
+
+    :param filetimes:
+        Either an object supporting the buffer protocol which contains
+        FILETIME structures, a :class:`pywincffi.wintypes.StructureArray`
+        of :class:`pywincffi.wintypes.FILETIME` or, if ``dwHighDateTime``
+        is provided, an array of the ``dwLowDateTime`` values.
+
+    :keyword dwHighDateTime:
+        An array of the ``dwHighDateTime`` values, the same length as
+        ``filetimes``.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if any of the values are outside of the range of
+        ``datetime64[ns]``, roughly the years 1678 to 2261, or if
+        ``filetimes`` is not a buffer whose size is a multiple of the
+        size of a FILETIME.
+
+    :rtype: numpy.ndarray
+    """
+    import numpy  # pylint: disable=import-error
+
+    if dwHighDateTime is not None:
+        intervals = numpy.asarray(filetimes, dtype=numpy.uint64) | (
+            numpy.asarray(dwHighDateTime, dtype=numpy.uint64) <<
+            numpy.uint64(32))
+    elif isinstance(filetimes, StructureArray):
+        if not issubclass(filetimes._wintype, FILETIME):
+            raise InputError(
+                "filetimes", filetimes, allowed_types=None,
+                message="Expected a StructureArray of FILETIME for "
+                        "`filetimes`")
+        ffi, _ = dist.load("core")
+        intervals = numpy.frombuffer(
+            ffi.buffer(
+                filetimes._as_parameter_,
+                len(filetimes) * ffi.sizeof("FILETIME")),
+            dtype="<u8")
+    else:
+        try:
+            intervals = numpy.frombuffer(filetimes, dtype="<u8")
+        except (TypeError, ValueError):
+            raise InputError(
+                "filetimes", filetimes, allowed_types=None,
+                message="Expected an object supporting the buffer protocol "
+                        "which contains FILETIME structures for "
+                        "`filetimes`")
+
+    if intervals.size and (
+            intervals.min() < numpy.uint64(_MIN_DATETIME64) or
+            intervals.max() > numpy.uint64(_MAX_DATETIME64)):
+        raise InputError(
+            "filetimes", filetimes, allowed_types=None,
+            message="`filetimes` contains values outside of the range of "
+                    "datetime64[ns]")
+
+    nanoseconds = (
+        intervals.astype(numpy.int64) - numpy.int64(FILETIME_EPOCH)) * 100
+    return nanoseconds.view("datetime64[ns]")
+
+
+def datetime64_to_filetimes(values):
+    """
+    The reverse of :func:`filetimes_to_datetime64`, converts ``values`` to
+    FILETIME in a single step.  The result is a numpy array with the same
+    layout as an array of FILETIME structures so it can be written to a
+    file, passed to :class:`pywincffi.wintypes.StructureArray` or have its
+    ``dwLowDateTime`` and ``dwHighDateTime`` fields accessed directly:
+
+    >>> from pywincffi.wintypes import datetime64_to_filetimes
+    >>> filetimes = datetime64_to_filetimes(times)
+    >>> filetimes["dwHighDateTime"]
+
+    Times are rounded down to a multiple of 100 nanoseconds, like
+    :meth:`pywincffi.wintypes.FILETIME.from_nanoseconds`.  This function
+    requires numpy.
+
+    :param values:
+        An array, or anything numpy can convert to an array, of
+        ``datetime64`` values.  Naive values are assumed to be in UTC.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``values`` contains NaT or times outside of the range of
+        ``datetime64[ns]``, roughly the years 1678 to 2261.  This includes
+        every time before 1601 which a FILETIME can't represent.
+
+    :rtype: numpy.ndarray
+    """
+    import numpy  # pylint: disable=import-error
+
+    values = numpy.asarray(values)
+    if values.dtype.kind in "SU":
+        # Parse strings using their own units, parsing them straight
+        # to nanoseconds silently overflows.
+        values = values.astype("datetime64")
+
+    nanoseconds = values.astype("datetime64[ns]")
+    if numpy.isnat(nanoseconds).any():
+        raise InputError(
+            "values", values, allowed_types=None,
+            message="`values` can't contain NaT")
+
+    # numpy doesn't check for overflow when converting to nanoseconds,
+    # values which were out of range don't survive the round trip.
+    if (values.dtype.kind == "M" and
+            numpy.datetime_data(values.dtype)[0] not in ("ps", "fs", "as") and
+            (nanoseconds.astype(values.dtype) != values).any()):
+        raise InputError(
+            "values", values, allowed_types=None,
+            message="`values` contains values outside of the range of "
+                    "datetime64[ns]")
+
+    intervals = (
+        nanoseconds.view(numpy.int64) // 100 + numpy.int64(FILETIME_EPOCH))
+    filetimes = numpy.empty(nanoseconds.shape, dtype=_FILETIME_DTYPE)
+    filetimes["dwLowDateTime"] = intervals & 0xFFFFFFFF
+    filetimes["dwHighDateTime"] = intervals >> 32
+    return filetimes
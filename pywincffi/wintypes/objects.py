@@ -21,7 +21,7 @@ class WrappedObject(CFFICDataWrapper):
     C_TYPE = None
 
     def __init__(self, data=None):
-        ffi, _ = dist.load()
+        ffi, _ = dist.load("core")
 
         if self.C_TYPE is None:
             raise NotImplementedError("`C_TYPE` has not been declared")
@@ -35,7 +35,7 @@ class WrappedObject(CFFICDataWrapper):
             self._cdata[0] = data
 
     def __repr__(self):
-        ffi, _ = dist.load()
+        ffi, _ = dist.load("core")
         return "<%s 0x%x at 0x%x>" % (
             self.__class__.__name__,
             int(ffi.cast("intptr_t", self._cdata[0])),
@@ -44,21 +44,78 @@ class WrappedObject(CFFICDataWrapper):
 
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
-            raise TypeError(
-                "%r must be a %s object" % (other, self.__class__.__name__))
+            return NotImplemented
 
         # pylint: disable=protected-access
         return self._cdata[0] == other._cdata[0]
 
+    @property
+    def _as_parameter_(self):
+        """The wrapped object, ``self._cdata`` is an array of one object"""
+        return self._cdata[0]
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
 
 class HANDLE(WrappedObject):
     """
+    A handle only stores the ``<cdata 'HANDLE'>`` value which is passed to
+    the library, ``_as_parameter_``, rather than an array allocated for
+    each handle.  Handles compare and hash by the value of the pointer so
+    they can be used as dictionary keys and set members.
+
     .. seealso::
 
         https://msdn.microsoft.com/en-us/library/aa383751
     """
+    __slots__ = ("_as_parameter_", )
     C_TYPE = "HANDLE[1]"
 
+    # The class, ffi instance, type and NULL value used
+    # by the last handle which was created.
+    _ctype = (None, None, None, None)
+
+    def __init__(self, data=None):  # pylint: disable=super-init-not-called
+        ffi, _ = dist.load("core")
+        cls = self.__class__
+        cached_cls, cached_ffi, ctype, null = cls._ctype
+        if cached_cls is not cls or cached_ffi is not ffi:
+            ctype = ffi.typeof(self.C_TYPE).item
+            null = ffi.cast(ctype, 0)
+            cls._ctype = (cls, ffi, ctype, null)
+
+        # Initialize from a <cdata handle> object as returned by some
+        # Windows API library calls: Python AND FFI types must be equal.
+        if isinstance(data, ffi.CData) and ffi.typeof(data) == ctype:
+            self._as_parameter_ = data
+        else:
+            self._as_parameter_ = null
+
+    def __getattr__(self, name):
+        # There's no ``HANDLE[1]`` array behind a handle so fail rather than
+        # handing out a copy which would silently drop any writes to it.
+        if name == "_cdata":
+            raise AttributeError(
+                "%s objects don't have `_cdata`, use `_as_parameter_` "
+                "instead" % self.__class__.__name__)
+        raise AttributeError(name)
+
+    def __repr__(self):
+        ffi, _ = dist.load("core")
+        return "<%s 0x%x at 0x%x>" % (
+            self.__class__.__name__,
+            int(ffi.cast("intptr_t", self._as_parameter_)), id(self))
+
+    def __eq__(self, other):
+        if not isinstance(other, HANDLE):
+            return NotImplemented
+        return self._as_parameter_ == other._as_parameter_
+
+    def __hash__(self):
+        return hash(self._as_parameter_)
+
 
 class WSAEVENT(HANDLE):
     """
@@ -74,3 +131,109 @@ class WSAEVENT(HANDLE):
 class SOCKET(WrappedObject):
     """Handles interaction with a SOCKET object via its cdata"""
     C_TYPE = "SOCKET[1]"
+
+
+class HandleArray(CFFICDataWrapper):
+    """
+    A contiguous array of :class:`HANDLE` objects which can be passed to
+    functions that wait on several objects, such as
+    :func:`pywincffi.user32.MsgWaitForMultipleObjects`, without being
+    rebuilt and checked on every call.  Handles are checked when they're
+    added and the first ``len(array)`` elements of the underlying
+    ``HANDLE[]`` always contain the handles in the array:
+
+    >>> from pywincffi.wintypes import HandleArray
+    >>> handles = HandleArray([event1, event2])
+    >>> handles.append(event3)
+    >>> handles.remove(event1)
+    >>> list(handles)
+    [event3, event2]
+
+    Removing a handle moves the last handle into its place, so the order
+    of the handles is not preserved.
+
+    :keyword handles:
+        An iterable of :class:`HANDLE` objects to populate the array with.
+
+    :keyword int capacity:
+        The maximum number of handles the array can hold.  Defaults to
+        ``MAXIMUM_WAIT_OBJECTS``.
+    """
+    __slots__ = ("_handles", )
+
+    def __init__(self, handles=(), capacity=None):
+        ffi, library = dist.load("core")
+        if capacity is None:
+            capacity = library.MAXIMUM_WAIT_OBJECTS
+
+        super(HandleArray, self).__init__("HANDLE[%d]" % capacity, ffi)
+        self._handles = []
+        for handle in handles:
+            self.append(handle)
+
+    @property
+    def capacity(self):
+        """The maximum number of handles this array can hold"""
+        return len(self._cdata)
+
+    def append(self, handle):
+        """
+        Adds ``handle`` to the end of the array.
+
+        :raises TypeError:
+            Raised if ``handle`` is not a :class:`HANDLE` object.
+
+        :raises IndexError:
+            Raised if the array is already full.
+        """
+        if not isinstance(handle, HANDLE):
+            raise TypeError("%r must be a HANDLE object" % handle)
+
+        count = len(self._handles)
+        if count == len(self._cdata):
+            raise IndexError(
+                "HandleArray can't hold more than %d handles" % count)
+
+        self._cdata[count] = handle._as_parameter_
+        self._handles.append(handle)
+
+    def remove(self, handle):
+        """
+        Removes ``handle`` from the array, the last handle in the array
+        takes its place.
+
+        :raises ValueError:
+            Raised if ``handle`` is not in the array.
+        """
+        index = self._handles.index(handle)
+        last = self._handles.pop()
+        count = len(self._handles)
+        if index != count:
+            self._handles[index] = last
+            self._cdata[index] = self._cdata[count]
+
+        ffi, _ = dist.load("core")
+        self._cdata[count] = ffi.NULL
+
+    def __len__(self):
+        return len(self._handles)
+
+    def __iter__(self):
+        return iter(self._handles)
+
+    def __contains__(self, handle):
+        return handle in self._handles
+
+    def __getitem__(self, index):
+        return self._handles[index]
+
+    def __setitem__(self, index, handle):
+        if not isinstance(handle, HANDLE):
+            raise TypeError("%r must be a HANDLE object" % handle)
+
+        self._handles[index] = handle
+        self._cdata[index % len(self._handles)] = handle._as_parameter_
+
+    def __repr__(self):
+        return "<%s %r at 0x%x>" % (
+            self.__class__.__name__, self._handles, id(self))
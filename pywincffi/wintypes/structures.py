@@ -6,10 +6,21 @@ This module provides wrappers for structures produced or required by the
 Windows APIs.
 """
 
+from datetime import datetime, timedelta
+
+from six import integer_types
+
 from pywincffi.core import dist
+from pywincffi.core.checks import input_check
 from pywincffi.core.typesbase import CFFICDataWrapper
+from pywincffi.exceptions import InputError
 from pywincffi.wintypes.objects import HANDLE
 
+# The number of 100 nanosecond intervals between the start of 1601, which
+# is when FILETIME starts counting, and the Unix epoch.
+FILETIME_EPOCH = 116444736000000000
+_FILETIME_START = datetime(1601, 1, 1)
+
 
 # pylint: disable=too-few-public-methods,invalid-name
 class SECURITY_ATTRIBUTES(CFFICDataWrapper):
@@ -18,9 +29,11 @@ class SECURITY_ATTRIBUTES(CFFICDataWrapper):
 
         https://msdn.microsoft.com/en-us/library/aa379560
     """
+    C_TYPE = "SECURITY_ATTRIBUTES *"
+
     def __init__(self):
-        ffi, _ = dist.load()
-        super(SECURITY_ATTRIBUTES, self).__init__("SECURITY_ATTRIBUTES *", ffi)
+        ffi, _ = dist.load("core")
+        super(SECURITY_ATTRIBUTES, self).__init__(self.C_TYPE, ffi)
         self._cdata.nLength = ffi.sizeof(self._cdata)
         self.lpSecurityDescriptor = ffi.NULL
 
@@ -44,9 +57,11 @@ class OVERLAPPED(CFFICDataWrapper):
 
         https://msdn.microsoft.com/en-us/library/ms684342
     """
+    C_TYPE = "OVERLAPPED *"
+
     def __init__(self):
-        ffi, _ = dist.load()
-        super(OVERLAPPED, self).__init__("OVERLAPPED *", ffi)
+        ffi, _ = dist.load("core")
+        super(OVERLAPPED, self).__init__(self.C_TYPE, ffi)
 
     # pylint: disable=missing-docstring
     @property
@@ -58,19 +73,93 @@ class OVERLAPPED(CFFICDataWrapper):
     def hEvent(self, handle):
         if not isinstance(handle, HANDLE):
             raise TypeError("%r must be a HANDLE object" % handle)
-        self._cdata.hEvent = handle._cdata[0]
+        self._cdata.hEvent = handle._as_parameter_
 
 
-# pylint: disable=too-few-public-methods
 class FILETIME(CFFICDataWrapper):
     """
+    The number of 100 nanosecond intervals since January 1, 1601 (UTC).
+    Use :meth:`to_datetime` and :meth:`to_nanoseconds`, or
+    :meth:`from_datetime` and :meth:`from_nanoseconds`, to convert to and
+    from Python values.  See
+    :func:`pywincffi.wintypes.filetimes_to_datetime64` for converting many
+    values at once.
+
     .. seealso::
 
         https://msdn.microsoft.com/en-us/library/ms724284
     """
+    C_TYPE = "FILETIME *"
+
     def __init__(self):
-        ffi, _ = dist.load()
-        super(FILETIME, self).__init__("FILETIME *", ffi)
+        ffi, _ = dist.load("core")
+        super(FILETIME, self).__init__(self.C_TYPE, ffi)
+
+    @classmethod
+    def from_nanoseconds(cls, nanoseconds):
+        """
+        Returns a :class:`FILETIME` for ``nanoseconds`` since the Unix
+        epoch.  Times are rounded down to a multiple of 100 nanoseconds.
+
+        :raises pywincffi.exceptions.InputError:
+            Raised if ``nanoseconds`` is not an integer or can't be
+            represented by a :class:`FILETIME`.
+        """
+        input_check("nanoseconds", nanoseconds, integer_types)
+
+        intervals = nanoseconds // 100 + FILETIME_EPOCH
+        if not 0 <= intervals <= 0xFFFFFFFFFFFFFFFF:
+            raise InputError(
+                "nanoseconds", nanoseconds, allowed_types=None,
+                message="`nanoseconds` is outside of the range of a "
+                        "FILETIME")
+
+        filetime = cls()
+        filetime._cdata.dwLowDateTime = intervals & 0xFFFFFFFF
+        filetime._cdata.dwHighDateTime = intervals >> 32
+        return filetime
+
+    @classmethod
+    def from_datetime(cls, value):
+        """
+        Returns a :class:`FILETIME` for the :class:`datetime.datetime`
+        ``value``.  Naive values are assumed to be in UTC.
+
+        :raises pywincffi.exceptions.InputError:
+            Raised if ``value`` is not a :class:`datetime.datetime`.
+        """
+        input_check("value", value, datetime)
+
+        if value.tzinfo is not None:
+            value = value.replace(tzinfo=None) - value.utcoffset()
+
+        delta = value - _FILETIME_START
+        return cls.from_nanoseconds(
+            ((delta.days * 86400 + delta.seconds) * 1000000 +
+             delta.microseconds) * 1000 - FILETIME_EPOCH * 100)
+
+    def to_nanoseconds(self):
+        """
+        Returns the time as an integer number of nanoseconds since the
+        Unix epoch.
+        """
+        intervals = (
+            self._cdata.dwHighDateTime << 32 | self._cdata.dwLowDateTime)
+        return (intervals - FILETIME_EPOCH) * 100
+
+    def to_datetime(self):
+        """
+        Returns the time as a naive :class:`datetime.datetime` in UTC.
+        Times are rounded down to a whole number of microseconds.
+
+        :raises OverflowError:
+            Raised if the time is after the year 9999, the largest year
+            :class:`datetime.datetime` supports.  Use
+            :meth:`to_nanoseconds` for these values instead.
+        """
+        intervals = (
+            self._cdata.dwHighDateTime << 32 | self._cdata.dwLowDateTime)
+        return _FILETIME_START + timedelta(microseconds=intervals // 10)
 
 
 class LPWSANETWORKEVENTS(CFFICDataWrapper):
@@ -79,9 +168,11 @@ class LPWSANETWORKEVENTS(CFFICDataWrapper):
 
          https://msdn.microsoft.com/en-us/ms741653
     """
+    C_TYPE = "LPWSANETWORKEVENTS"
+
     def __init__(self):
-        ffi, _ = dist.load()
-        super(LPWSANETWORKEVENTS, self).__init__("LPWSANETWORKEVENTS", ffi)
+        ffi, _ = dist.load("core")
+        super(LPWSANETWORKEVENTS, self).__init__(self.C_TYPE, ffi)
 
     @property
     def iErrorCode(self):
@@ -95,9 +186,11 @@ class PROCESS_INFORMATION(CFFICDataWrapper):
     .. seealso::
         https://msdn.microsoft.com/en-us/library/ms684873
     """
+    C_TYPE = "PROCESS_INFORMATION *"
+
     def __init__(self):
-        ffi, _ = dist.load()
-        super(PROCESS_INFORMATION, self).__init__("PROCESS_INFORMATION *", ffi)
+        ffi, _ = dist.load("core")
+        super(PROCESS_INFORMATION, self).__init__(self.C_TYPE, ffi)
 
     @property
     def hProcess(self):
@@ -122,9 +215,11 @@ class STARTUPINFO(CFFICDataWrapper):
     .. seealso::
         https://msdn.microsoft.com/en-us/library/ms686331
     """
+    C_TYPE = "STARTUPINFO *"
+
     def __init__(self):
-        ffi, _ = dist.load()
-        super(STARTUPINFO, self).__init__("STARTUPINFO *", ffi)
+        ffi, _ = dist.load("core")
+        super(STARTUPINFO, self).__init__(self.C_TYPE, ffi)
 
     @property
     def hStdInput(self):
@@ -139,7 +234,7 @@ class STARTUPINFO(CFFICDataWrapper):
     def hStdInput(self, handle):
         if not isinstance(handle, HANDLE):
             raise TypeError("%r must be a HANDLE object" % handle)
-        self._cdata.hStdInput = handle._cdata[0]
+        self._cdata.hStdInput = handle._as_parameter_
 
     @property
     def hStdOutput(self):
@@ -154,7 +249,7 @@ class STARTUPINFO(CFFICDataWrapper):
     def hStdOutput(self, handle):
         if not isinstance(handle, HANDLE):
             raise TypeError("%r must be a HANDLE object" % handle)
-        self._cdata.hStdOutput = handle._cdata[0]
+        self._cdata.hStdOutput = handle._as_parameter_
 
     @property
     def hStdError(self):
@@ -169,4 +264,4 @@ class STARTUPINFO(CFFICDataWrapper):
     def hStdError(self, handle):
         if not isinstance(handle, HANDLE):
             raise TypeError("%r must be a HANDLE object" % handle)
-        self._cdata.hStdError = handle._cdata[0]
+        self._cdata.hStdError = handle._as_parameter_
@@ -0,0 +1,217 @@
+"""
+Views
+-----
+
+Provides structures which are stored in an existing buffer, such as a
+:class:`bytearray`, :class:`mmap.mmap` or data read from a file, rather
+than in memory allocated for each structure.  Nothing is copied so
+modifying a view modifies the buffer and vice versa.
+"""
+
+from six import binary_type, integer_types
+
+from pywincffi.core import dist
+from pywincffi.core.checks import input_check
+from pywincffi.exceptions import InputError
+
+# Maps structure classes to their read only versions
+_READ_ONLY_TYPES = {}
+
+
+def _read_only_type(wintype):
+    """
+    Returns a sub-class of ``wintype`` whose fields can't be set, used for
+    structures stored in a read only buffer.
+    """
+    try:
+        return _READ_ONLY_TYPES[wintype]
+    except KeyError:
+        pass
+
+    def read_only(self, *_):
+        raise TypeError(
+            "cannot modify a %s stored in read only memory" %
+            self.__class__.__name__)
+
+    read_only_type = type(wintype)(
+        wintype.__name__, (wintype, ), {
+            "__slots__": (),
+            "__setattr__": read_only,
+            "__setitem__": read_only,
+            "__module__": wintype.__module__,
+            "__doc__": wintype.__doc__})
+    _READ_ONLY_TYPES[wintype] = read_only_type
+    return read_only_type
+
+
+def _is_read_only(buffer_):
+    """Returns True if ``buffer_`` can't be written to"""
+    try:
+        return memoryview(buffer_).readonly
+    except TypeError:  # pragma: no cover
+        # Python 2 objects which only support the old buffer protocol.
+        return isinstance(buffer_, binary_type)
+
+
+def _from_buffer(wintype, buffer_, offset, count):
+    """
+    Returns a pointer to ``count`` ``wintype`` structures starting at
+    ``offset`` in ``buffer_``, the number of structures, the cdata object
+    which keeps ``buffer_`` alive and the class to wrap each structure in
+    which is read only if ``buffer_`` is.
+    """
+    input_check("offset", offset, integer_types)
+    if count is not None:
+        input_check("count", count, integer_types)
+
+    ffi, _ = dist.load("core")
+    pointer_type = getattr(wintype, "C_TYPE", None)
+    if pointer_type is not None:
+        pointer_type = ffi.typeof(pointer_type)
+
+    if (pointer_type is None or pointer_type.kind != "pointer" or
+            pointer_type.item.kind not in ("struct", "union")):
+        raise InputError(
+            "wintype", wintype, allowed_types=None,
+            message="Expected a structure from pywincffi.wintypes for "
+                    "`wintype`")
+
+    try:
+        data = ffi.from_buffer(buffer_, require_writable=True)
+        read_only = False
+    except (TypeError, ValueError, BufferError):
+        # buffer_ is read only, isn't a contiguous buffer or this version
+        # of cffi doesn't support `require_writable`.
+        try:
+            data = ffi.from_buffer(buffer_)
+        except (TypeError, ValueError, BufferError):
+            raise InputError(
+                "buffer_", buffer_, allowed_types=None,
+                message="Expected a contiguous object supporting the buffer "
+                        "protocol for `buffer_`")
+        read_only = _is_read_only(buffer_)
+
+    if not 0 <= offset <= len(data):
+        raise InputError(
+            "offset", offset, allowed_types=None,
+            message="`offset` must be between 0 and %d" % len(data))
+
+    available = (len(data) - offset) // ffi.sizeof(pointer_type.item)
+    if count is None:
+        count = available
+
+    elif not 0 <= count <= available:
+        raise InputError(
+            "buffer_", buffer_, allowed_types=None,
+            message="`buffer_` only has room for %d %s structure(s) after "
+                    "`offset`, %d are required" % (
+                        available, wintype.__name__, count))
+
+    if read_only:
+        wintype = _read_only_type(wintype)
+
+    return ffi.cast(pointer_type, data + offset), count, data, wintype
+
+
+def structure_from_buffer(wintype, buffer_, offset=0):
+    """
+    Returns an instance of the structure ``wintype`` which is stored at
+    ``offset`` in ``buffer_``:
+
+    >>> from pywincffi.wintypes import FILETIME, structure_from_buffer
+    >>> data = bytearray(16)
+    >>> filetime = structure_from_buffer(FILETIME, data, offset=8)
+    >>> filetime.dwHighDateTime = 1
+
+    The returned object keeps ``buffer_`` alive.  If ``buffer_`` is read
+    only, :class:`bytes` for example, so is the returned structure and
+    setting its fields raises :class:`TypeError`.  Windows isn't aware of
+    this so the structure should not be passed to a function which
+    writes to it.
+
+    :param type wintype:
+        The structure class, :class:`pywincffi.wintypes.FILETIME` for
+        example.
+
+    :param buffer_:
+        An object which supports the buffer protocol.
+
+    :keyword int offset:
+        The offset, in bytes, of the structure in ``buffer_``.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``wintype`` is not a structure, ``buffer_`` doesn't
+        support the buffer protocol or the structure would extend past
+        the end of ``buffer_``.
+    """
+    pointer, _, data, wintype = _from_buffer(wintype, buffer_, offset, 1)
+    return wintype.from_cdata(pointer, data)
+
+
+class StructureArray(object):
+    """
+    A sequence of structures stored one after another in ``buffer_``,
+    starting at ``offset``:
+
+    >>> from pywincffi.wintypes import FILETIME, StructureArray
+    >>> with open(path, "rb") as file_:
+    ...     times = StructureArray(FILETIME, file_.read())
+    >>> [time.dwLowDateTime for time in times]
+
+    Each structure returned by indexing or iterating is a view into
+    ``buffer_`` as returned by :func:`structure_from_buffer`, so the
+    structures are read only if ``buffer_`` is.  The array
+    itself can be passed to functions which expect a pointer to the first
+    structure.
+
+    :param type wintype:
+        The structure class, :class:`pywincffi.wintypes.FILETIME` for
+        example.
+
+    :param buffer_:
+        An object which supports the buffer protocol.
+
+    :keyword int offset:
+        The offset, in bytes, of the first structure in ``buffer_``.
+
+    :keyword int count:
+        The number of structures in the array.  By default this is as many
+        structures as fit between ``offset`` and the end of ``buffer_``.
+
+    :raises pywincffi.exceptions.InputError:
+        Raised if ``wintype`` is not a structure, ``buffer_`` doesn't
+        support the buffer protocol or the array would extend past the end
+        of ``buffer_``.
+    """
+    __slots__ = ("_wintype", "_as_parameter_", "_count", "_data")
+
+    def __init__(self, wintype, buffer_, offset=0, count=None):
+        self._as_parameter_, self._count, self._data, self._wintype = \
+            _from_buffer(wintype, buffer_, offset, count)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if not isinstance(index, integer_types):
+            raise TypeError(
+                "%s indices must be integers" % self.__class__.__name__)
+
+        if index < 0:
+            index += self._count
+
+        if not 0 <= index < self._count:
+            raise IndexError("%s index out of range" % self.__class__.__name__)
+
+        return self._wintype.from_cdata(
+            self._as_parameter_ + index, self._data)
+
+    def __iter__(self):
+        pointer, wintype, data = self._as_parameter_, self._wintype, self._data
+        for index in range(self._count):
+            yield wintype.from_cdata(pointer + index, data)
+
+    def __repr__(self):
+        return "<%s of %d %s at 0x%x>" % (
+            self.__class__.__name__, self._count, self._wintype.__name__,
+            id(self))
@@ -6,5 +6,10 @@ Provides functions, constants and utilities that wrap functions provided by
 ``ws3_32.dll``.
 """
 
-from pywincffi.ws2_32.events import (
-    WSAEventSelect, WSACreateEvent, WSAGetLastError, WSAEnumNetworkEvents)
+from pywincffi.core.lazy import lazy_exports
+
+__all__, __getattr__, __dir__ = lazy_exports(__name__, {
+    "pywincffi.ws2_32.events": (
+        "WSAEventSelect", "WSACreateEvent", "WSAGetLastError",
+        "WSAEnumNetworkEvents")
+})
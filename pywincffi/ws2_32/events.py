@@ -38,7 +38,7 @@ def WSAEventSelect(socket, hEventObject, lNetworkEvents):
     input_check("hEventObject", hEventObject, allowed_types=(HANDLE, ))
     input_check("lNetworkEvents", lNetworkEvents, integer_types)
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("ws2_32")
 
     code = library.WSAEventSelect(
         wintype_to_cdata(socket),
@@ -66,7 +66,7 @@ def WSACreateEvent():
     :returns:
         Returns a handle to a new event object.
     """
-    _, library = dist.load()
+    _, library = dist.load("ws2_32")
     event = library.WSACreateEvent()
 
     if library.wsa_invalid_event(event):
@@ -85,7 +85,7 @@ def WSAGetLastError():
 
         https://msdn.microsoft.com/en-us/library/ms741580
     """
-    _, library = dist.load()
+    _, library = dist.load("ws2_32")
     return library.WSAGetLastError()
 
 
@@ -109,7 +109,7 @@ def WSAEnumNetworkEvents(socket, hEventObject=None):
     """
     input_check("socket", socket, allowed_types=(SOCKET, ))
 
-    ffi, library = dist.load()
+    ffi, library = dist.load("ws2_32")
     if hEventObject is not None:
         input_check("hEventObject", hEventObject, allowed_types=(WSAEVENT, ))
         hEventObject = wintype_to_cdata(hEventObject)
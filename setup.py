@@ -6,6 +6,7 @@ from errno import ENOENT
 from os.path import dirname, abspath, join, isdir
 
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 from distutils.command.upload import upload
 
 from pywincffi import __version__
@@ -85,10 +86,62 @@ class AppVeyorArtifactUpload(upload):
                 self.upload_file(command, pyversion, filename)
 
 
+class BuildPy(build_py):
+    """
+    A subclass of the normal build_py command which also writes the
+    normalized cdefs into the build so they don't have to be produced
+    from the headers at runtime.  On Windows the ABI mode modules and
+    the constants are written too which requires compiling the API mode
+    modules first.
+    """
+    def run(self):
+        build_py.run(self)
+
+        if not self.dry_run:
+            from pywincffi.core import dist
+            directory = join(
+                self.build_lib, "pywincffi", "core", "cdefs", "generated")
+            dist._write_cdefs(directory)
+
+            if os.name == "nt":
+                self.write_abi_modules(dist, directory)
+
+    def write_abi_modules(self, dist, directory):
+        """
+        Compiles the API mode modules into the build directory, rather
+        than the user's cache, and writes the ABI mode modules and the
+        constants produced from them to ``directory``.  The environment
+        and the loader's cache are restored afterwards so later commands
+        run by this process aren't affected.
+        """
+        variables = (
+            dist.MODE_ENVIRONMENT_VARIABLE,
+            dist.CACHE_DIRECTORY_ENVIRONMENT_VARIABLE)
+        environment = dict(
+            (name, os.environ.get(name)) for name in variables)
+        loader_cache = dict(dist.Loader.cache)
+        os.environ[dist.MODE_ENVIRONMENT_VARIABLE] = "api"
+        os.environ[dist.CACHE_DIRECTORY_ENVIRONMENT_VARIABLE] = join(
+            self.get_finalized_command("build").build_temp, "pywincffi")
+        try:
+            table = dist._resolve_abi_table()
+            dist._write_abi_modules(table, directory=directory)
+            dist._write_constants(table["constants"], directory=directory)
+        finally:
+            for name, value in environment.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            dist.Loader.cache.clear()
+            dist.Loader.cache.update(loader_cache)
+
+
 setup_keywords = dict(
     name="pywincffi",
     version=".".join(map(str, __version__)),
     cmdclass={
+      "build_py": BuildPy,
       "upload_from_appveyor": AppVeyorArtifactUpload
     },
     packages=find_packages(
@@ -122,7 +175,11 @@ setup_keywords = dict(
 # not work.
 if os.name == "nt":
     setup_keywords.update(
-        cffi_modules=["pywincffi/core/dist.py:_ffi"]
+        cffi_modules=[
+            "pywincffi/core/dist.py:_ffi",
+            "pywincffi/core/dist.py:_kernel32_ffi",
+            "pywincffi/core/dist.py:_user32_ffi",
+            "pywincffi/core/dist.py:_ws2_32_ffi"]
     )
 
 setup(**setup_keywords)
@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+import tempfile
+from importlib import import_module
+
+from mock import patch
+
+from pywincffi.core import dist, values
+from pywincffi.dev.testutil import TestCase
+
+CONSTANTS = {
+    "MAX_PATH": 260,
+    "FILE_FLAG_OVERLAPPED": 0x40000000,
+    "FILE_FLAG_WRITE_THROUGH": 0x80000000,
+    "PROCESS_TERMINATE": 0x0001,
+    "PROCESS_VM_READ": 0x0010,
+    "WAIT_ABANDONED": 0x80,
+    "WAIT_OBJECT_0": 0,
+    "WAIT_FAILED": 0xFFFFFFFF
+}
+
+
+class TestImport(TestCase):
+    """Tests for importing :mod:`pywincffi.constants`"""
+    def test_import_without_library(self):
+        # Neither the generated module or a library are available, like a
+        # source checkout on a platform other than Windows.
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        for mock in (
+                patch.dict(sys.modules),
+                patch.object(dist, "GENERATED_DIRECTORY", directory),
+                patch.object(dist, "load", side_effect=AssertionError)):
+            mock.start()
+            self.addCleanup(mock.stop)
+
+        sys.modules.pop("pywincffi.constants", None)
+        constants = import_module("pywincffi.constants")
+        self.assertEqual(constants.MAX_PATH, 260)
+        self.assertEqual(
+            set(constants.__all__) - set(constants._GROUPS),
+            set(values.CONSTANTS))
+
+    def test_import_in_new_interpreter(self):
+        environment = os.environ.copy()
+        environment.pop(dist.MODE_ENVIRONMENT_VARIABLE, None)
+        environment["PYTHONPATH"] = os.pathsep.join(sys.path)
+        output = subprocess.check_output(
+            [sys.executable, "-c",
+             "from pywincffi.constants import MAX_PATH; print(MAX_PATH)"],
+            env=environment)
+        self.assertEqual(output.strip(), b"260")
+
+
+class TestConstants(TestCase):
+    """Tests for :mod:`pywincffi.constants`"""
+    def setUp(self):
+        super(TestConstants, self).setUp()
+        for mock in (
+                patch.dict(sys.modules),
+                patch.object(dist, "_constants", return_value=CONSTANTS)):
+            mock.start()
+            self.addCleanup(mock.stop)
+
+        sys.modules.pop("pywincffi.constants", None)
+        self.constants = import_module("pywincffi.constants")
+
+    def test_constants(self):
+        for name, value in CONSTANTS.items():
+            self.assertEqual(getattr(self.constants, name), value)
+
+    def test_all(self):
+        self.assertEqual(
+            set(self.constants.__all__),
+            set(CONSTANTS) | set(self.constants._GROUPS))
+
+    def test_flags(self):
+        if self.constants.IntFlag is None:
+            self.skipTest("enum.IntFlag is not available")
+
+        flags = self.constants.FileFlag.OVERLAPPED | \
+            self.constants.FileFlag.WRITE_THROUGH
+        self.assertEqual(flags, 0xC0000000)
+        self.assertIn(self.constants.FileFlag.OVERLAPPED, flags)
+        self.assertEqual(
+            self.constants.ProcessAccess(0x0011),
+            self.constants.ProcessAccess.TERMINATE |
+            self.constants.ProcessAccess.VM_READ)
+
+    def test_enum(self):
+        if self.constants.IntEnum is None:
+            self.skipTest("enum.IntEnum is not available")
+
+        self.assertIs(
+            self.constants.WaitResult(0xFFFFFFFF),
+            self.constants.WaitResult.FAILED)
+        self.assertEqual(self.constants.WaitResult.OBJECT_0, 0)
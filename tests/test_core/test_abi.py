@@ -0,0 +1,226 @@
+import ctypes
+import os
+import tempfile
+
+from cffi import FFI
+from mock import patch
+
+from pywincffi.core.abi import (
+    TYPE_TABLE_VERSION, AbiLibrary, new_type_table, functions, resolve,
+    abi_cdef)
+from pywincffi.dev.testutil import TestCase
+from pywincffi.exceptions import InternalError
+
+CDEF = """#define FOO ...
+#define BAR ...
+typedef int... SOCKET;
+typedef struct _EVENTS {
+long lNetworkEvents;
+int iErrorCode[...];
+} EVENTS, *LPEVENTS;
+HANDLE WINAPI CreateFile(
+LPCTSTR lpFileName
+);
+BOOL WINAPI CloseHandle(
+HANDLE hObject
+);
+int *pointers(void);
+"""
+
+
+class Library(object):  # pylint: disable=too-few-public-methods
+    """A stand in for a compiled library."""
+    FOO = 1
+    BAR = 0xFFFFFFFF
+
+
+class TestFunctions(TestCase):
+    """Tests for :func:`pywincffi.core.abi.functions`"""
+    def test_functions(self):
+        self.assertEqual(
+            functions(CDEF), ["CreateFile", "CloseHandle", "pointers"])
+
+
+class TestResolve(TestCase):
+    """Tests for :func:`pywincffi.core.abi.resolve`"""
+    def setUp(self):
+        super(TestResolve, self).setUp()
+        self.compiled = FFI()
+        self.compiled.cdef(
+            "typedef unsigned short SOCKET;"
+            "typedef struct _EVENTS {long lNetworkEvents; int iErrorCode[3];}"
+            " EVENTS;")
+
+    def test_new_table(self):
+        table = resolve(self.compiled, Library, CDEF)
+        self.assertEqual(table["version"], TYPE_TABLE_VERSION)
+
+    def test_constants(self):
+        table = resolve(self.compiled, Library, CDEF)
+        self.assertEqual(table["constants"], {"FOO": 1, "BAR": 0xFFFFFFFF})
+
+    def test_typedefs(self):
+        table = resolve(self.compiled, Library, CDEF)
+        self.assertEqual(table["typedefs"], {"SOCKET": "unsigned short"})
+
+    def test_arrays(self):
+        table = resolve(self.compiled, Library, CDEF)
+        self.assertEqual(table["arrays"], {"_EVENTS.iErrorCode": 3})
+
+    def test_functions_without_exports(self):
+        table = resolve(self.compiled, Library, CDEF)
+        self.assertEqual(table["functions"], {})
+
+    def test_functions_wide_character(self):
+        exports = set(["CreateFileW", "CreateFileA", "CloseHandle"])
+        table = resolve(
+            self.compiled, Library, CDEF, exports=exports.__contains__)
+        self.assertEqual(table["functions"], {"CreateFile": "CreateFileW"})
+
+    def test_updates_table(self):
+        table = new_type_table()
+        table["constants"]["BAZ"] = 2
+        self.assertIs(
+            resolve(self.compiled, Library, CDEF, table=table), table)
+        self.assertEqual(
+            table["constants"], {"FOO": 1, "BAR": 0xFFFFFFFF, "BAZ": 2})
+
+    def test_array_outside_of_struct(self):
+        with self.assertRaises(InternalError):
+            resolve(self.compiled, Library, "int values[...];\n")
+
+
+class TestAbiCdef(TestCase):
+    """Tests for :func:`pywincffi.core.abi.abi_cdef`"""
+    def setUp(self):
+        super(TestAbiCdef, self).setUp()
+        self.table = new_type_table()
+        self.table["constants"].update(FOO=1, BAR=0xFFFFFFFF)
+        self.table["typedefs"]["SOCKET"] = "unsigned short"
+        self.table["arrays"]["_EVENTS.iErrorCode"] = 3
+        self.table["functions"]["CreateFile"] = "CreateFileW"
+
+    def test_cdef(self):
+        self.assertEqual(
+            abi_cdef(CDEF, self.table).splitlines()[0:10], [
+                "#define FOO 1",
+                "#define BAR 4294967295",
+                "typedef unsigned short SOCKET;",
+                "typedef struct _EVENTS {",
+                "long lNetworkEvents;",
+                "int iErrorCode[3];",
+                "} EVENTS, *LPEVENTS;",
+                "HANDLE WINAPI CreateFileW(",
+                "LPCTSTR lpFileName",
+                ");"])
+
+    def test_cdef_is_usable_in_abi_mode(self):
+        cdef = abi_cdef(CDEF, self.table)
+        cdef = cdef.replace("WINAPI ", "").replace("LPCTSTR", "char *")
+        ffi = FFI()
+        ffi.cdef("typedef void *HANDLE; typedef int BOOL;\n" + cdef)
+        ffi.set_source("_pywincffi_abi_test", None)
+        self.assertEqual(len(ffi.new("EVENTS *").iErrorCode), 3)
+        self.assertEqual(ffi.dlopen(None).BAR, 0xFFFFFFFF)
+
+    def test_missing_constant(self):
+        del self.table["constants"]["FOO"]
+        with self.assertRaises(InternalError):
+            abi_cdef(CDEF, self.table)
+
+    def test_missing_typedef(self):
+        del self.table["typedefs"]["SOCKET"]
+        with self.assertRaises(InternalError):
+            abi_cdef(CDEF, self.table)
+
+    def test_missing_array(self):
+        del self.table["arrays"]["_EVENTS.iErrorCode"]
+        with self.assertRaises(InternalError):
+            abi_cdef(CDEF, self.table)
+
+
+class TestAbiLibrary(TestCase):
+    """Tests for :class:`pywincffi.core.abi.AbiLibrary`"""
+    def setUp(self):
+        super(TestAbiLibrary, self).setUp()
+        self.abi_ffi = FFI()
+        self.abi_ffi.cdef(
+            "typedef void *HANDLE; typedef HANDLE WSAEVENT;\n"
+            "#define FOO 42\n"
+            "int abs(int); long labs(long); int missing_function(int);")
+        self.library = AbiLibrary(
+            self.abi_ffi, self.abi_ffi.dlopen(None),
+            aliases={"absolute": "abs"})
+
+    def test_alias(self):
+        self.assertEqual(self.library.absolute(-1), 1)
+
+    def test_no_alias(self):
+        self.assertEqual(self.library.labs(-1), 1)
+        self.assertEqual(self.library.FOO, 42)
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.library.FOOBAR  # pylint: disable=pointless-statement
+
+    def test_dir_uses_aliases(self):
+        self.assertIn("absolute", dir(self.library))
+        self.assertNotIn("abs", dir(self.library))
+
+    def test_dict_skips_missing_functions(self):
+        attributes = self.library.__dict__
+        self.assertEqual(attributes["FOO"], 42)
+        self.assertIn("absolute", attributes)
+        self.assertNotIn("missing_function", attributes)
+
+    def test_wsa_invalid_event(self):
+        self.assertTrue(self.library.wsa_invalid_event(self.abi_ffi.NULL))
+        self.assertFalse(self.library.wsa_invalid_event(
+            self.abi_ffi.cast("WSAEVENT", 1)))
+
+    def test_handle_from_fd(self):
+        if os.name != "nt":
+            self.skipTest("msvcrt is only available on Windows")
+
+        handle = self.library.handle_from_fd(-1)
+        self.assertEqual(int(self.abi_ffi.cast("intptr_t", handle)), -1)
+
+    def test_kernel32_function_looked_up_once(self):
+        with patch.object(
+                ctypes, "WinDLL", create=True,
+                return_value=ctypes.pythonapi) as windll:
+            first = self.library._kernel32_function(
+                "Py_IsInitialized", "int (*)(void)")
+            second = self.library._kernel32_function(
+                "Py_IsInitialized", "int (*)(void)")
+
+        windll.assert_called_once_with("kernel32")
+        self.assertIs(first, second)
+        self.assertEqual(first(), 1)
+
+    def test_set_file_pointer_ex(self):
+        if os.name != "nt":
+            self.skipTest("kernel32 is only available on Windows")
+
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        self.addCleanup(os.close, fd)
+        os.write(fd, b"hello world")
+        position = self.abi_ffi.new("LONGLONG *")
+        self.assertTrue(self.library.set_file_pointer_ex(
+            self.library.handle_from_fd(fd), -5, position, 2))
+        self.assertEqual(position[0], 6)
+        self.assertEqual(os.read(fd, 5), b"world")
+
+    def test_get_file_size_ex(self):
+        if os.name != "nt":
+            self.skipTest("kernel32 is only available on Windows")
+
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        self.addCleanup(os.close, fd)
+        os.write(fd, b"hello world")
+        size = self.abi_ffi.new("LONGLONG *")
+        self.assertTrue(self.library.get_file_size_ex(
+            self.library.handle_from_fd(fd), size))
+        self.assertEqual(size[0], 11)
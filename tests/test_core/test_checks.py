@@ -1,6 +1,11 @@
-from pywincffi.core.checks import input_check
+from cffi import FFI
+from mock import patch
+
+from pywincffi.core import dist
+from pywincffi.core.checks import (
+    NON_ZERO, Argument, Constants, NoneType, Schema, error_check, input_check)
 from pywincffi.dev.testutil import TestCase
-from pywincffi.exceptions import InputError
+from pywincffi.exceptions import InputError, WindowsAPIError
 
 
 class TestInputCheck(TestCase):
@@ -26,3 +31,97 @@ class TestInputCheck(TestCase):
     def test_allowed_values_failure(self):
         with self.assertRaises(InputError):
             input_check("", 1, allowed_values=(2, ))
+
+
+class TestErrorCheck(TestCase):
+    """
+    Tests for :func:`pywincffi.core.checks.error_check`
+    """
+    def setUp(self):
+        super(TestErrorCheck, self).setUp()
+        self.stand_in_ffi = FFI()
+        self.stand_in_ffi.getwinerror = lambda: (5, "Access is denied.")
+        mock = patch.dict(
+            dist.Loader.cache, {"core": (self.stand_in_ffi, None)})
+        mock.start()
+        self.addCleanup(mock.stop)
+
+    def test_success_does_not_load(self):
+        with patch.object(dist, "load") as load:
+            error_check("Foo", code=1, expected=NON_ZERO)
+            error_check("Foo", code=0, expected=0)
+        self.assertFalse(load.called)
+
+    def test_non_zero_failure(self):
+        with self.assertRaises(WindowsAPIError) as error:
+            error_check("Foo", code=0, expected=NON_ZERO)
+        self.assertEqual(error.exception.errno, 5)
+        self.assertEqual(error.exception.error, "Access is denied.")
+        self.assertEqual(error.exception.return_code, 0)
+
+    def test_no_code_failure(self):
+        with self.assertRaises(WindowsAPIError) as error:
+            error_check("Foo")
+        self.assertEqual(error.exception.errno, 5)
+
+    def test_no_code_success(self):
+        self.stand_in_ffi.getwinerror = lambda: (0, "")
+        error_check("Foo")
+
+
+class Library(object):  # pylint: disable=too-few-public-methods
+    """A stand in for the library the schema resolves constants from"""
+    FOO = 1
+    BAR = 2
+
+
+class TestSchema(TestCase):
+    """
+    Tests for :class:`pywincffi.core.checks.Schema`
+    """
+    def setUp(self):
+        super(TestSchema, self).setUp()
+        mock = patch.dict(dist.Loader.cache, {"core": (FFI(), Library())})
+        mock.start()
+        self.addCleanup(mock.stop)
+        self.schema = Schema("Foo", (
+            Argument("dwValue", int),
+            Argument("dwFlag", allowed_values=Constants("FOO", "BAR")),
+            Argument("lpName", str, optional=True),
+            Argument("lpOther", (NoneType, str))))
+
+    def assertSameError(self, values, name, value, **kwargs):
+        with self.assertRaises(InputError) as expected:
+            input_check(name, value, **kwargs)
+        with self.assertRaises(InputError) as error:
+            self.schema.validate(*values)
+        self.assertEqual(str(error.exception), str(expected.exception))
+
+    def test_valid(self):
+        self.schema.validate(1, 2, None, None)
+        self.schema.validate(1, 1, "", "")
+
+    def test_compiled_once(self):
+        self.schema.validate(1, 2, None, None)
+        validate = self.schema.validate
+        self.schema.validate(1, 2, None, None)
+        self.assertIs(self.schema.validate, validate)
+
+    def test_invalid_type(self):
+        self.assertSameError(
+            ("1", 2, None, None), "dwValue", "1", allowed_types=int)
+
+    def test_invalid_value(self):
+        self.assertSameError(
+            (1, 3, None, None), "dwFlag", 3, allowed_values=(1, 2))
+
+    def test_invalid_optional(self):
+        self.assertSameError((1, 2, 1, None), "lpName", 1, allowed_types=str)
+
+    def test_first_invalid_raised(self):
+        self.assertSameError(
+            (1, 3, 1, 1), "dwFlag", 3, allowed_values=(1, 2))
+
+    def test_allowed_values_not_tuple(self):
+        with self.assertRaises(TypeError):
+            Argument("dwFlag", allowed_values=[1, 2])
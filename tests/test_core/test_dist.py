@@ -1,20 +1,31 @@
 from __future__ import print_function
 
+import hashlib
+import json
 import os
 import shutil
 import sys
 import tempfile
-from os.path import isfile, dirname
+import time
+from ctypes.util import find_library
+from os.path import isfile, isdir, dirname, getmtime, join
 
 from cffi import FFI
 from mock import patch
 
-from pywincffi.core import dist
+from pywincffi.core import dist, simulated, values
 from pywincffi.core.dist import (
-    MODULE_NAME, HEADER_FILES, SOURCE_FILES, LIBRARIES, LibraryWrapper, Loader,
-    _import_path, _ffi, _compile, _read, load)
+    MODULE_NAME, HEADER_FILES, SOURCE_FILES, LIBRARIES, MODULES,
+    LIBRARY_ORDER, CACHE_DIRECTORY_ENVIRONMENT_VARIABLE, LibraryWrapper,
+    Loader, CacheLock, _import_path, _ffi, _compile, _compile_cached,
+    _cache_key, _cache_directory, _extension_suffix, _interpreter_abi,
+    _module_inputs, _read, _normalize, _write_cdefs, _generated_cdef, _cdef,
+    GENERATED_MANIFEST_VERSION, MODE_ENVIRONMENT_VARIABLE, ABI_MODULE_NAME,
+    ABI_TYPE_TABLE, _select_mode, _write_abi_modules, _load_abi, load)
+from pywincffi.core.abi import new_type_table
 from pywincffi.dev.testutil import TestCase
-from pywincffi.exceptions import ResourceNotFoundError, InternalError
+from pywincffi.exceptions import (
+    InputError, ResourceNotFoundError, InternalError, ConfigurationError)
 
 
 class TestDistConstants(TestCase):
@@ -29,6 +40,20 @@ class TestDistConstants(TestCase):
         for path in SOURCE_FILES:
             self.assertTrue(isfile(path))
 
+    def test_module_files_exist(self):
+        for definition in MODULES.values():
+            for path in definition.headers + definition.sources:
+                self.assertTrue(isfile(path))
+
+    def test_module_includes_exist(self):
+        for definition in MODULES.values():
+            for include in definition.includes:
+                self.assertIn(include, MODULES)
+
+    def test_library_order(self):
+        self.assertEqual(set(LIBRARY_ORDER), set(MODULES))
+        self.assertEqual(LIBRARY_ORDER[0], "core")
+
 
 class TestLibraryWrapper(TestCase):
     """
@@ -72,20 +97,76 @@ class TestLibraryWrapper(TestCase):
             self.wrapper.FOOBAR  # pylint: disable=pointless-statement
 
 
+class Library(object):  # pylint: disable=too-few-public-methods
+    """A stand in for a compiled library."""
+
+
+class TestLibraryWrapperMultipleLibraries(TestCase):
+    """
+    Tests for :class:`pywincffi.core.dist.LibraryWrapper` when
+    wrapping more than one library.
+    """
+    def setUp(self):
+        super(TestLibraryWrapperMultipleLibraries, self).setUp()
+
+        first, second = Library(), Library()
+        first.a, first.b = 1, 2
+        second.b, second.c = 3, 4
+        self.wrapper = LibraryWrapper(first, second)
+
+    def test_getattr_searches_in_order(self):
+        self.assertEqual(self.wrapper.a, 1)
+        self.assertEqual(self.wrapper.b, 2)
+        self.assertEqual(self.wrapper.c, 4)
+
+    def test_getattr_failure(self):
+        with self.assertRaises(AttributeError):
+            self.wrapper.FOOBAR  # pylint: disable=pointless-statement
+
+    def test_dir(self):
+        for attribute in ("a", "b", "c", "INVALID_HANDLE_VALUE"):
+            self.assertIn(attribute, dir(self.wrapper))
+
+    def test_dict(self):
+        library_dict = self.wrapper.__dict__
+        self.assertEqual(library_dict["b"], 2)
+        self.assertEqual(library_dict["c"], 4)
+        self.assertEqual(library_dict["INVALID_HANDLE_VALUE"], -1)
+
+    def test_attributes_resolved_up_front(self):
+        # The lookup should not have to go through __getattr__ so
+        # the attributes should be directly on the instance.
+        self.assertNotIn("__getattr__", vars(LibraryWrapper))
+        self.assertEqual(vars(self.wrapper)["a"], 1)
+
+    def test_library_overrides_runtime_constant(self):
+        library = Library()
+        library.MAX_COMMAND_LINE = 1
+        self.assertEqual(LibraryWrapper(library).MAX_COMMAND_LINE, 1)
+
+    def test_skips_special_attributes(self):
+        class lib(object):  # pylint: disable=too-few-public-methods
+            a = 1
+
+        wrapper = LibraryWrapper(lib)
+        self.assertEqual(wrapper.a, 1)
+        self.assertNotIn("__module__", wrapper.__dict__)
+
+
 class TestLoader(TestCase):
     """
     Tests for :class:`pywincffi.core.dist.Loader`
     """
     def setUp(self):
         super(TestLoader, self).setUp()
-        mock = patch.object(Loader, "cache", None)
+        mock = patch.object(Loader, "cache", {})
         mock.start()
         self.addCleanup(mock.stop)
 
     def test_set(self):
         a, b = self.random_string(6), self.random_string(6)
         Loader.set(a, b)
-        self.assertEqual(Loader.cache, (a, b))
+        self.assertEqual(Loader.cache, {None: (a, b)})
 
     def test_set_works_once(self):
         a, b = self.random_string(6), self.random_string(6)
@@ -95,7 +176,15 @@ class TestLoader(TestCase):
         with self.assertRaises(InternalError):
             Loader.set(c, d)
 
-        self.assertEqual(Loader.cache, (a, b))
+        self.assertEqual(Loader.cache, {None: (a, b)})
+
+    def test_set_per_name(self):
+        a, b = self.random_string(6), self.random_string(6)
+        c, d = self.random_string(6), self.random_string(6)
+        Loader.set(a, b, name="kernel32")
+        Loader.set(c, d, name="user32")
+        self.assertEqual(Loader.get("kernel32"), (a, b))
+        self.assertEqual(Loader.get("user32"), (c, d))
 
     def test_get(self):
         a, b = self.random_string(6), self.random_string(6)
@@ -106,6 +195,11 @@ class TestLoader(TestCase):
         with self.assertRaises(InternalError):
             Loader.get()
 
+    def test_get_fails_for_other_name(self):
+        Loader.set(self.random_string(6), self.random_string(6))
+        with self.assertRaises(InternalError):
+            Loader.get("kernel32")
+
 
 class TestImportPath(TestCase):
     """Tests for :func:`pywincffi.core.dist._import_path`"""
@@ -190,6 +284,25 @@ class TestFFI(TestCase):
         mocked_set_source.assert_called_once_with(
             self.module_name, _read(*[path]), libraries=LIBRARIES)
 
+    def test_includes(self):
+        fd, base_header = tempfile.mkstemp(suffix=".h")
+        self.addCleanup(os.remove, base_header)
+        with os.fdopen(fd, "w") as file_:
+            file_.write("typedef int FOOBAR;")
+
+        fd, header = tempfile.mkstemp(suffix=".h")
+        self.addCleanup(os.remove, header)
+        with os.fdopen(fd, "w") as file_:
+            file_.write("FOOBAR foobar(FOOBAR);")
+
+        base = _ffi(
+            module_name=self.random_string(16), sources=[],
+            headers=[base_header])
+        included = _ffi(
+            module_name=self.module_name, sources=[], headers=[header],
+            includes=(base, ))
+        self.assertIs(included.typeof("FOOBAR"), base.typeof("FOOBAR"))
+
 
 class TestCompile(TestCase):
     """Tests for :func:`pywincffi.core.dist._compile`"""
@@ -244,23 +357,27 @@ class TestLoad(TestCase):
     """Tests for :func:`pywincffi.core.dist.load`"""
     def setUp(self):
         super(TestLoad, self).setUp()
-        mock = patch.object(Loader, "cache", None)
+        mock = patch.object(Loader, "cache", {})
         mock.start()
         self.addCleanup(sys.modules.pop, MODULE_NAME, None)
         self.addCleanup(mock.stop)
 
-    def test_prebuilt(self):
+    def fake_module(self):
         class FakeModule(object):
             ffi = None
 
             class lib(object):
                 a, b = self.random_string(6), self.random_string(6)
 
-        sys.modules[MODULE_NAME] = FakeModule
-        _, library = load()
+        return FakeModule
 
-        self.assertEqual(library.a, FakeModule.lib.a)
-        self.assertEqual(library.b, FakeModule.lib.b)
+    def test_prebuilt(self):
+        module = self.fake_module()
+        sys.modules[MODULE_NAME] = module
+        _, library = load("core")
+
+        self.assertEqual(library.a, module.lib.a)
+        self.assertEqual(library.b, module.lib.b)
 
     def test_compiled(self):
         # Python 3.5 changes the behavior of None in sys.modules. So
@@ -274,7 +391,709 @@ class TestLoad(TestCase):
         # compile the module.
         sys.modules[MODULE_NAME] = None
 
-        with patch.object(dist, "_compile") as mocked:
-            load()
+        with patch.object(dist, "_load_cached") as mocked:
+            load("core")
 
         mocked.assert_called_once()
+
+    def test_library_loads_core_first(self):
+        modules = dict(
+            (name, self.fake_module()) for name in ("core", "kernel32"))
+        loaded = []
+
+        def load_module(name):
+            loaded.append(name)
+            return modules[name]
+
+        with patch.object(dist, "_load_module", side_effect=load_module):
+            _, library = load("kernel32")
+
+        self.assertEqual(loaded, ["kernel32", "core"])
+        self.assertEqual(library.a, modules["kernel32"].lib.a)
+        self.assertIs(library._libraries[1], modules["core"].lib)
+
+    def test_library_does_not_load_others(self):
+        modules = dict((name, self.fake_module()) for name in MODULES)
+
+        with patch.object(
+                dist, "_load_module", side_effect=modules.get) as mocked:
+            load("user32")
+
+        self.assertEqual(
+            set(call[0][0] for call in mocked.call_args_list),
+            set(["user32", "core"]))
+
+    def test_no_library_loads_everything(self):
+        modules = dict((name, self.fake_module()) for name in MODULES)
+
+        with patch.object(dist, "_load_module", side_effect=modules.get):
+            _, library = load()
+
+        self.assertEqual(
+            library._libraries,
+            tuple(modules[name].lib for name in LIBRARY_ORDER))
+
+    def test_unknown_library(self):
+        with self.assertRaises(InputError):
+            load("foobar")
+
+    def test_cached(self):
+        Loader.set(None, Library(), name="kernel32")
+        with patch.object(dist, "_load_module") as mocked:
+            self.assertIs(load("kernel32"), Loader.cache["kernel32"])
+        self.assertFalse(mocked.called)
+
+    def test_cached_per_library(self):
+        modules = dict((name, self.fake_module()) for name in MODULES)
+
+        with patch.object(
+                dist, "_load_module", side_effect=modules.get) as mocked:
+            first = load("ws2_32")
+            second = load("ws2_32")
+
+        self.assertIs(first, second)
+        self.assertEqual(mocked.call_count, 2)
+
+
+class TestModuleInputs(TestCase):
+    """Tests for :func:`pywincffi.core.dist._module_inputs`"""
+    def test_core(self):
+        self.assertEqual(
+            _module_inputs("core"), (HEADER_FILES, SOURCE_FILES))
+
+    def test_includes_core(self):
+        headers, sources = _module_inputs("kernel32")
+        self.assertEqual(
+            headers, HEADER_FILES + MODULES["kernel32"].headers)
+        self.assertEqual(
+            sources, SOURCE_FILES + MODULES["kernel32"].sources)
+
+
+class CacheTestCase(TestCase):
+    """
+    Base class for tests which need to build small modules
+    using the module cache.
+    """
+    def setUp(self):
+        super(CacheTestCase, self).setUp()
+        self.module_name = self.random_string(16)
+        self.addCleanup(sys.modules.pop, self.module_name, None)
+        self.cache_dir = tempfile.mkdtemp(prefix="pywincffi-tests-")
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self.header = self.create_file("int add(int, int);", suffix=".h")
+        self.source = self.create_file(
+            "int add(int a, int b) {return a + b;}", suffix=".c")
+
+    def create_file(self, contents, suffix=None):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "w") as file_:
+            file_.write(contents)
+        return path
+
+    def build_ffi(self):
+        return _ffi(
+            module_name=self.module_name, sources=[self.source],
+            headers=[self.header], libraries=[])
+
+    def cache_key(self, **kwargs):
+        kwargs.setdefault("module_name", self.module_name)
+        kwargs.setdefault("headers", [self.header])
+        kwargs.setdefault("sources", [self.source])
+        kwargs.setdefault("libraries", [])
+        return _cache_key(**kwargs)
+
+
+class TestCacheKey(CacheTestCase):
+    """Tests for :func:`pywincffi.core.dist._cache_key`"""
+    def test_stable(self):
+        self.assertEqual(self.cache_key(), self.cache_key())
+
+    def test_default_inputs(self):
+        self.assertEqual(_cache_key(), _cache_key(
+            module_name=MODULE_NAME, headers=HEADER_FILES,
+            sources=SOURCE_FILES, libraries=LIBRARIES))
+
+    def test_header_change(self):
+        key = self.cache_key()
+        with open(self.header, "a") as file_:
+            file_.write("int subtract(int, int);")
+        self.assertNotEqual(key, self.cache_key())
+
+    def test_source_change(self):
+        key = self.cache_key()
+        with open(self.source, "a") as file_:
+            file_.write("\n")
+        self.assertNotEqual(key, self.cache_key())
+
+    def test_libraries_change(self):
+        self.assertNotEqual(
+            self.cache_key(), self.cache_key(libraries=["kernel32"]))
+
+    def test_module_name_change(self):
+        self.assertNotEqual(
+            self.cache_key(), self.cache_key(module_name="foobar"))
+
+    def test_cffi_version_change(self):
+        key = self.cache_key()
+        with patch.object(dist.cffi, "__version__", "0.0.0"):
+            self.assertNotEqual(key, self.cache_key())
+
+    def test_interpreter_abi_change(self):
+        key = self.cache_key()
+        with patch.object(dist, "_interpreter_abi", return_value="foobar"):
+            self.assertNotEqual(key, self.cache_key())
+
+    def test_interpreter_abi_includes_extension_suffix(self):
+        self.assertTrue(_interpreter_abi().endswith(_extension_suffix()))
+
+    def test_missing_header(self):
+        with self.assertRaises(ResourceNotFoundError):
+            self.cache_key(headers=[self.header + ".missing"])
+
+
+class TestCacheDirectory(TestCase):
+    """Tests for :func:`pywincffi.core.dist._cache_directory`"""
+    def test_environment_override(self):
+        path = self.random_string(12)
+        with patch.dict(
+                os.environ, {CACHE_DIRECTORY_ENVIRONMENT_VARIABLE: path}):
+            self.assertEqual(_cache_directory(), path)
+
+    def test_default_is_per_user(self):
+        environment = os.environ.copy()
+        environment.pop(CACHE_DIRECTORY_ENVIRONMENT_VARIABLE, None)
+        with patch.dict(os.environ, environment, clear=True):
+            path = _cache_directory()
+
+        self.assertIn("pywincffi", path)
+        self.assertTrue(os.path.isabs(path))
+
+
+class TestCacheLock(CacheTestCase):
+    """Tests for :class:`pywincffi.core.dist.CacheLock`"""
+    def setUp(self):
+        super(TestCacheLock, self).setUp()
+        self.path = join(self.cache_dir, "test.lock")
+
+    def test_acquire_and_release(self):
+        lock = CacheLock(self.path)
+        lock.acquire()
+        self.assertTrue(isfile(self.path))
+        lock.release()
+        self.assertFalse(isfile(self.path))
+
+    def test_context_manager(self):
+        with CacheLock(self.path) as lock:
+            self.assertTrue(lock.acquired)
+            self.assertTrue(isfile(self.path))
+        self.assertFalse(isfile(self.path))
+
+    def test_release_without_acquire(self):
+        held = CacheLock(self.path)
+        held.acquire()
+        self.addCleanup(held.release)
+
+        # Releasing a lock we never acquired must not remove
+        # the lock another process holds.
+        CacheLock(self.path).release()
+        self.assertTrue(isfile(self.path))
+
+    def test_waits_for_lock(self):
+        held = CacheLock(self.path)
+        held.acquire()
+        start = time.time()
+
+        # The lock is considered abandoned once it's older than the
+        # timeout so the second lock should wait then take over.
+        lock = CacheLock(self.path, timeout=0.3)
+        lock.acquire()
+        self.assertTrue(lock.acquired)
+        self.assertGreaterEqual(time.time() - start, 0.3)
+        lock.release()
+
+    def test_removes_stale_lock(self):
+        with open(self.path, "w"):
+            pass
+        stale = time.time() - 60
+        os.utime(self.path, (stale, stale))
+
+        lock = CacheLock(self.path, timeout=30)
+        lock.acquire()
+        self.assertTrue(lock.acquired)
+        lock.release()
+
+    def test_does_not_remove_replaced_lock(self):
+        # Another process removes the stale lock and acquires its own
+        # after this one decided the lock was stale.
+        held = CacheLock(self.path)
+        held.acquire()
+        self.addCleanup(held.release)
+
+        lock = CacheLock(self.path, timeout=30)
+        lock._remove_stale(getmtime(self.path) - 60)
+        self.assertTrue(isfile(self.path))
+        self.assertEqual(os.listdir(self.cache_dir), ["test.lock"])
+
+    def test_remove_stale_lock_already_removed(self):
+        lock = CacheLock(self.path, timeout=30)
+        lock._remove_stale(time.time() - 60)
+        self.assertFalse(isfile(self.path))
+
+
+class TestCompileCached(CacheTestCase):
+    """Tests for :func:`pywincffi.core.dist._compile_cached`"""
+    def test_compiles_into_cache(self):
+        key = self.cache_key()
+        module = _compile_cached(
+            self.build_ffi(), key, module_name=self.module_name,
+            cache_dir=self.cache_dir)
+        self.assertEqual(module.lib.add(1, 2), 3)
+        self.assertEqual(dirname(module.__file__), join(self.cache_dir, key))
+
+        # Only the published module and its directory should remain,
+        # temporary build directories and the lock are removed.
+        self.assertEqual(os.listdir(self.cache_dir), [key])
+
+    def test_reuses_cached_module(self):
+        key = self.cache_key()
+        _compile_cached(
+            self.build_ffi(), key, module_name=self.module_name,
+            cache_dir=self.cache_dir)
+        sys.modules.pop(self.module_name)
+
+        ffi = self.build_ffi()
+        with patch.object(ffi, "compile") as mocked_compile:
+            module = _compile_cached(
+                ffi, key, module_name=self.module_name,
+                cache_dir=self.cache_dir)
+
+        self.assertFalse(mocked_compile.called)
+        self.assertEqual(module.lib.add(2, 2), 4)
+
+    def test_header_change_invalidates(self):
+        first = self.cache_key()
+        _compile_cached(
+            self.build_ffi(), first, module_name=self.module_name,
+            cache_dir=self.cache_dir)
+        sys.modules.pop(self.module_name)
+
+        with open(self.header, "a") as file_:
+            file_.write("\n// changed\n")
+
+        second = self.cache_key()
+        self.assertNotEqual(first, second)
+        module = _compile_cached(
+            self.build_ffi(), second, module_name=self.module_name,
+            cache_dir=self.cache_dir)
+        self.assertEqual(
+            dirname(module.__file__), join(self.cache_dir, second))
+
+    def test_creates_cache_directory(self):
+        cache_dir = join(self.cache_dir, "a", "b")
+        _compile_cached(
+            self.build_ffi(), self.cache_key(), module_name=self.module_name,
+            cache_dir=cache_dir)
+        self.assertTrue(isdir(cache_dir))
+
+    def test_module_published_while_waiting(self):
+        # Simulate another process publishing the module while this
+        # process was waiting on the lock.
+        key = self.cache_key()
+        other_cache = tempfile.mkdtemp(prefix="pywincffi-tests-")
+        self.addCleanup(shutil.rmtree, other_cache, ignore_errors=True)
+        _compile_cached(
+            self.build_ffi(), key, module_name=self.module_name,
+            cache_dir=other_cache)
+        sys.modules.pop(self.module_name)
+
+        def publish(_):
+            shutil.copytree(join(other_cache, key), join(self.cache_dir, key))
+
+        ffi = self.build_ffi()
+        with patch.object(CacheLock, "acquire", publish):
+            with patch.object(ffi, "compile") as mocked_compile:
+                module = _compile_cached(
+                    ffi, key, module_name=self.module_name,
+                    cache_dir=self.cache_dir)
+
+        self.assertFalse(mocked_compile.called)
+        self.assertEqual(module.lib.add(3, 3), 6)
+
+    def test_rename_conflict_uses_existing_module(self):
+        # If the lock timed out, two processes may compile at the same
+        # time.  The one which loses the rename should use the module
+        # the other process published.
+        key = self.cache_key()
+        real_rename = os.rename
+
+        def rename(source, destination):
+            real_rename(source, destination)
+            if destination == join(self.cache_dir, key):
+                raise OSError("destination exists")
+
+        with patch.object(os, "rename", rename):
+            module = _compile_cached(
+                self.build_ffi(), key, module_name=self.module_name,
+                cache_dir=self.cache_dir)
+
+        self.assertEqual(module.lib.add(1, 1), 2)
+        self.assertEqual(os.listdir(self.cache_dir), [key])
+
+
+class TestNormalize(TestCase):
+    """Tests for :func:`pywincffi.core.dist._normalize`"""
+    def test_strips_sal_annotations(self):
+        self.assertEqual(
+            _normalize("BOOL Foo(_In_ HANDLE a, _Out_opt_ LPDWORD b);"),
+            "BOOL Foo( HANDLE a, LPDWORD b);\n")
+
+    def test_strips_comments(self):
+        self.assertEqual(
+            _normalize(
+                "// comment\n#define FOO ... // FOO\n/* a\nb */int x;"),
+            "#define FOO ...\nint x;\n")
+
+    def test_strips_blank_lines_and_whitespace(self):
+        self.assertEqual(
+            _normalize("\n\n  int   x;  \n\n\tint y;\n"), "int x;\nint y;\n")
+
+
+class GeneratedCdefTestCase(TestCase):
+    """
+    Base class for tests of the cdefs which are generated
+    by :func:`pywincffi.core.dist._write_cdefs`.
+    """
+    def setUp(self):
+        super(GeneratedCdefTestCase, self).setUp()
+        self.headers_directory = tempfile.mkdtemp(prefix="pywincffi-tests-")
+        self.addCleanup(
+            shutil.rmtree, self.headers_directory, ignore_errors=True)
+        self.directory = join(self.headers_directory, "generated")
+
+        self.first = self.create_header("first.h", "int first(_In_ int);")
+        self.second = self.create_header("second.h", "// a\nint second(int);")
+        modules = {
+            "a": dist.ModuleDefinition(
+                "a", (self.first, self.second), (), (), ()),
+            "b": dist.ModuleDefinition("b", (self.second, ), (), (), ())
+        }
+
+        for mock in (
+                patch.object(dist, "MODULES", modules),
+                patch.object(
+                    dist, "HEADERS_DIRECTORY", self.headers_directory)):
+            mock.start()
+            self.addCleanup(mock.stop)
+
+    def create_header(self, name, contents):
+        path = join(self.headers_directory, name)
+        with open(path, "w") as file_:
+            file_.write(contents)
+
+        # Make sure the header looks older than anything
+        # generated during the test.
+        os.utime(path, (time.time() - 60, time.time() - 60))
+        return path
+
+
+class TestWriteCdefs(GeneratedCdefTestCase):
+    """Tests for :func:`pywincffi.core.dist._write_cdefs`"""
+    def test_creates_directory(self):
+        _write_cdefs(self.directory)
+        self.assertTrue(isdir(self.directory))
+
+    def test_writes_normalized_cdefs(self):
+        _write_cdefs(self.directory)
+
+        with open(join(self.directory, "a.h")) as file_:
+            self.assertEqual(
+                file_.read(), "int first( int);\nint second(int);\n")
+
+        with open(join(self.directory, "b.h")) as file_:
+            self.assertEqual(file_.read(), "int second(int);\n")
+
+    def test_manifest(self):
+        path = _write_cdefs(self.directory)
+
+        with open(path) as file_:
+            manifest = json.load(file_)
+
+        self.assertEqual(manifest["version"], GENERATED_MANIFEST_VERSION)
+        self.assertEqual(
+            manifest["modules"]["a"]["headers"], ["first.h", "second.h"])
+        self.assertEqual(
+            manifest["modules"]["b"]["sha256"],
+            hashlib.sha256(b"int second(int);\n").hexdigest())
+
+
+class TestGeneratedCdef(GeneratedCdefTestCase):
+    """Tests for :func:`pywincffi.core.dist._generated_cdef`"""
+    def test_missing_manifest(self):
+        self.assertIsNone(
+            _generated_cdef((self.second, ), directory=self.directory))
+
+    def test_returns_cdef(self):
+        _write_cdefs(self.directory)
+        self.assertEqual(
+            _generated_cdef((self.second, ), directory=self.directory),
+            "int second(int);\n")
+
+    def test_unknown_headers(self):
+        _write_cdefs(self.directory)
+        self.assertIsNone(
+            _generated_cdef((self.first, ), directory=self.directory))
+
+    def test_headers_in_another_directory(self):
+        _write_cdefs(self.directory)
+        fd, path = tempfile.mkstemp(suffix="second.h")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.assertIsNone(_generated_cdef((path, ), directory=self.directory))
+
+    def test_header_modified(self):
+        _write_cdefs(self.directory)
+        os.utime(self.second, (time.time() + 60, time.time() + 60))
+        self.assertIsNone(
+            _generated_cdef((self.second, ), directory=self.directory))
+
+    def test_cdef_modified(self):
+        _write_cdefs(self.directory)
+        with open(join(self.directory, "b.h"), "w") as file_:
+            file_.write("int foobar(int);\n")
+
+        self.assertIsNone(
+            _generated_cdef((self.second, ), directory=self.directory))
+
+    def test_manifest_version_changed(self):
+        path = _write_cdefs(self.directory)
+        with open(path) as file_:
+            manifest = json.load(file_)
+
+        manifest["version"] = GENERATED_MANIFEST_VERSION + 1
+        with open(path, "w") as file_:
+            json.dump(manifest, file_)
+
+        self.assertIsNone(
+            _generated_cdef((self.second, ), directory=self.directory))
+
+
+class TestCdef(GeneratedCdefTestCase):
+    """Tests for :func:`pywincffi.core.dist._cdef`"""
+    def test_uses_generated_cdef(self):
+        with patch.object(
+                dist, "_generated_cdef", return_value="int foo;\n"):
+            self.assertEqual(_cdef(self.second), "int foo;\n")
+
+    def test_falls_back_to_headers(self):
+        with patch.object(dist, "_generated_cdef", return_value=None):
+            self.assertEqual(
+                _cdef(self.first, self.second),
+                "int first( int);\nint second(int);\n")
+
+    def test_missing_header(self):
+        with self.assertRaises(ResourceNotFoundError):
+            _cdef(join(self.headers_directory, "missing.h"))
+
+
+class TestSelectMode(TestCase):
+    """Tests for :func:`pywincffi.core.dist._select_mode`"""
+    def setUp(self):
+        super(TestSelectMode, self).setUp()
+        self.generated_directory = tempfile.mkdtemp(prefix="pywincffi-tests-")
+        self.addCleanup(
+            shutil.rmtree, self.generated_directory, ignore_errors=True)
+
+        for mock in (
+                patch.dict(os.environ),
+                patch.dict(sys.modules),
+                patch.object(
+                    dist, "GENERATED_DIRECTORY", self.generated_directory)):
+            mock.start()
+            self.addCleanup(mock.stop)
+
+        os.environ.pop(MODE_ENVIRONMENT_VARIABLE, None)
+        sys.modules.pop(ABI_MODULE_NAME, None)
+
+    def write_type_table(self):
+        path = join(self.generated_directory, ABI_TYPE_TABLE)
+        with open(path, "w") as file_:
+            json.dump(new_type_table(), file_)
+
+    def test_explicit_mode(self):
+        for mode in ("api", "abi", "simulated"):
+            os.environ[MODE_ENVIRONMENT_VARIABLE] = mode
+            self.assertEqual(_select_mode(), mode)
+
+    def test_empty_is_auto(self):
+        os.environ[MODE_ENVIRONMENT_VARIABLE] = ""
+        sys.modules[MODULE_NAME] = object()
+        self.assertEqual(_select_mode(), "api")
+
+    def test_invalid_mode(self):
+        os.environ[MODE_ENVIRONMENT_VARIABLE] = "foobar"
+        with self.assertRaises(ConfigurationError):
+            _select_mode()
+
+    def test_auto_prefers_api_module(self):
+        self.write_type_table()
+        sys.modules[MODULE_NAME] = object()
+        self.assertEqual(_select_mode(), "api")
+
+    def test_auto_uses_abi_without_api_module(self):
+        self.write_type_table()
+        sys.modules[MODULE_NAME] = None
+        self.assertEqual(_select_mode(), "abi")
+
+    def test_auto_compiles_without_abi_modules(self):
+        sys.modules[MODULE_NAME] = None
+        self.assertEqual(_select_mode(), "api")
+
+    def test_auto_stays_in_abi_mode(self):
+        sys.modules[ABI_MODULE_NAME] = object()
+        sys.modules[MODULE_NAME] = object()
+        self.assertEqual(_select_mode(), "abi")
+
+    def test_load_module_abi(self):
+        os.environ[MODE_ENVIRONMENT_VARIABLE] = "abi"
+        with patch.object(dist, "_load_abi") as mocked:
+            dist._load_module("kernel32")
+        mocked.assert_called_once_with("kernel32")
+
+    def test_load_module_simulated(self):
+        os.environ[MODE_ENVIRONMENT_VARIABLE] = "simulated"
+        with patch.object(simulated, "load") as mocked:
+            dist._load_module("kernel32")
+        mocked.assert_called_once_with("kernel32")
+
+
+class TestAbiModules(TestCase):
+    """
+    Tests for :func:`pywincffi.core.dist._write_abi_modules` and
+    :func:`pywincffi.core.dist._load_abi`.
+    """
+    def setUp(self):
+        super(TestAbiModules, self).setUp()
+        self.directory = tempfile.mkdtemp(prefix="pywincffi-tests-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+        core_header = join(self.directory, "core.h")
+        with open(core_header, "w") as file_:
+            file_.write(
+                "#define FOO ...\n"
+                "typedef int... SOCKET;\n"
+                "typedef struct _EVENTS {\n"
+                "  int iErrorCode[...];\n"
+                "} EVENTS;\n")
+
+        library_header = join(self.directory, "library.h")
+        with open(library_header, "w") as file_:
+            file_.write("int absolute(_In_ int);\n")
+
+        suffix = self.random_string(6)
+        modules = {
+            "core": dist.ModuleDefinition(
+                MODULE_NAME + suffix, (core_header, ), (), (), ()),
+            "library": dist.ModuleDefinition(
+                MODULE_NAME + suffix + "_library", (library_header, ), (),
+                (find_library("c") or "msvcrt", ), ("core", ))
+        }
+        for mock in (
+                patch.object(dist, "MODULES", modules),
+                patch.dict(sys.modules)):
+            mock.start()
+            self.addCleanup(mock.stop)
+
+        self.table = new_type_table()
+        self.table["constants"]["FOO"] = 0xFFFFFFFF
+        self.table["typedefs"]["SOCKET"] = "unsigned short"
+        self.table["arrays"]["_EVENTS.iErrorCode"] = 10
+        self.table["functions"]["absolute"] = "abs"
+
+    def test_abi_module_name(self):
+        self.assertEqual(
+            dist._abi_module_name("library"),
+            dist.MODULES["library"].module_name.replace(
+                MODULE_NAME, ABI_MODULE_NAME))
+
+    def test_writes_modules_and_type_table(self):
+        path = _write_abi_modules(self.table, directory=self.directory)
+        self.assertEqual(path, join(self.directory, ABI_TYPE_TABLE))
+
+        for name in ("core", "library"):
+            self.assertTrue(isfile(
+                join(self.directory, dist._abi_module_name(name) + ".py")))
+
+        with open(path) as file_:
+            self.assertEqual(json.load(file_), self.table)
+
+    def test_load(self):
+        _write_abi_modules(self.table, directory=self.directory)
+        module = _load_abi("library", directory=self.directory)
+
+        self.assertEqual(module.lib.absolute(-5), 5)
+        self.assertEqual(module.lib.FOO, 0xFFFFFFFF)
+        self.assertEqual(module.ffi.sizeof("SOCKET"), 2)
+        self.assertEqual(len(module.ffi.new("EVENTS *").iErrorCode), 10)
+
+    def test_load_imports_included_module(self):
+        _write_abi_modules(self.table, directory=self.directory)
+        _load_abi("library", directory=self.directory)
+        self.assertIn(dist._abi_module_name("core"), sys.modules)
+
+    def test_load_without_type_table(self):
+        with self.assertRaises(ResourceNotFoundError):
+            _load_abi("library", directory=self.directory)
+
+    def test_load_type_table_version_mismatch(self):
+        self.table["version"] = -1
+        _write_abi_modules(self.table, directory=self.directory)
+        with self.assertRaises(ResourceNotFoundError):
+            _load_abi("library", directory=self.directory)
+
+
+class TestWriteConstants(TestCase):
+    """
+    Tests for :func:`pywincffi.core.dist._write_constants` and
+    :func:`pywincffi.core.dist._constants`.
+    """
+    def setUp(self):
+        super(TestWriteConstants, self).setUp()
+        self.directory = tempfile.mkdtemp(prefix="pywincffi-tests-")
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        mock = patch.dict(sys.modules)
+        mock.start()
+        self.addCleanup(mock.stop)
+        sys.modules.pop(dist.CONSTANTS_MODULE_NAME, None)
+        self.constants = {"MAX_PATH": 260, "WAIT_FAILED": 0xFFFFFFFF}
+
+    def test_returns_path(self):
+        path = dist._write_constants(self.constants, directory=self.directory)
+        self.assertEqual(
+            path, join(self.directory, dist.CONSTANTS_MODULE_NAME + ".py"))
+        self.assertTrue(isfile(path))
+
+    def test_creates_directory(self):
+        directory = join(self.directory, "generated")
+        dist._write_constants(self.constants, directory=directory)
+        self.assertTrue(isdir(directory))
+
+    def test_constants(self):
+        dist._write_constants(self.constants, directory=self.directory)
+        self.assertEqual(
+            dist._constants(directory=self.directory), self.constants)
+
+    def test_constants_are_integers(self):
+        dist._write_constants(self.constants, directory=self.directory)
+        for value in dist._constants(directory=self.directory).values():
+            self.assertIsInstance(value, int)
+
+    def test_does_not_load_library(self):
+        dist._write_constants(self.constants, directory=self.directory)
+        with patch.object(dist, "load", side_effect=AssertionError):
+            dist._constants(directory=self.directory)
+
+    def test_falls_back_to_values(self):
+        with patch.object(dist, "load", side_effect=AssertionError):
+            self.assertEqual(
+                dist._constants(directory=self.directory), values.CONSTANTS)
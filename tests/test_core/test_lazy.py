@@ -0,0 +1,110 @@
+import subprocess
+import sys
+import types
+
+from pywincffi.core.lazy import lazy_exports
+from pywincffi.dev.testutil import TestCase
+
+# Run in a new process by TestImportTime.  Loading the library is
+# replaced so the import fails if it tries to load the library.
+IMPORT_TIME_SCRIPT = """
+from pywincffi.core import dist
+
+def load(library=None):
+    raise AssertionError("load(%r) called during import" % library)
+
+dist.load = load
+from pywincffi.kernel32 import CreateFile
+"""
+
+
+class LazyExportsTestCase(TestCase):
+    """Creates a module named ``lazy_exports_test`` for each test"""
+    def setUp(self):
+        super(LazyExportsTestCase, self).setUp()
+        self.module = types.ModuleType("lazy_exports_test")
+        sys.modules[self.module.__name__] = self.module
+        self.addCleanup(sys.modules.pop, self.module.__name__)
+        self.all, self.getattr, self.dir = lazy_exports(
+            self.module.__name__, {"os.path": ("join", "split")})
+
+
+class TestLazyExports(LazyExportsTestCase):
+    """Tests for :func:`pywincffi.core.lazy.lazy_exports`"""
+    def test_all(self):
+        self.assertEqual(self.all, ("join", "split"))
+
+    def test_getattr(self):
+        from os.path import join
+        self.assertIs(self.getattr("join"), join)
+
+    def test_getattr_stores_value_on_module(self):
+        value = self.getattr("split")
+        self.assertIs(self.module.split, value)
+
+    def test_getattr_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            self.getattr("foobar")
+
+    def test_dir(self):
+        self.module.foo = 1
+        self.assertEqual(
+            [name for name in self.dir() if not name.startswith("__")],
+            ["foo", "join", "split"])
+
+
+class TestPackageExports(TestCase):
+    """
+    Tests the sub-packages which use
+    :func:`pywincffi.core.lazy.lazy_exports`
+    """
+    def test_all_exports_exist(self):
+        from pywincffi import kernel32, user32, ws2_32, wintypes
+        for package in (kernel32, user32, ws2_32, wintypes):
+            for name in package.__all__:
+                self.assertIn(name, dir(package))
+                self.assertIsNotNone(getattr(package, name))
+
+    def test_from_import(self):
+        from pywincffi.kernel32 import CreateFile
+        from pywincffi.kernel32.file import CreateFile as CreateFileFromFile
+        self.assertIs(CreateFile, CreateFileFromFile)
+
+
+class TestImportTime(TestCase):
+    """
+    Uses ``python -X importtime`` to check which modules are imported by
+    ``from pywincffi.kernel32 import CreateFile``.
+    """
+    def setUp(self):
+        super(TestImportTime, self).setUp()
+        if sys.version_info[0:2] < (3, 7):
+            self.skipTest("-X importtime requires Python 3.7+")
+
+    def imported(self):
+        process = subprocess.Popen(
+            [sys.executable, "-X", "importtime", "-c", IMPORT_TIME_SCRIPT],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        _, stderr = process.communicate()
+        self.assertEqual(process.returncode, 0, stderr.decode("utf-8"))
+
+        # Each line looks like:
+        #   import time:       123 |        456 |   pywincffi.kernel32.file
+        modules = set()
+        for line in stderr.decode("utf-8").splitlines():
+            if line.startswith("import time:") and "|" in line:
+                modules.add(line.rsplit("|", 1)[-1].strip())
+        return modules
+
+    def test_imports_file(self):
+        self.assertIn("pywincffi.kernel32.file", self.imported())
+
+    def test_does_not_import_other_submodules(self):
+        imported = self.imported()
+        for name in ("pywincffi.kernel32.process", "pywincffi.kernel32.pipe",
+                     "pywincffi.kernel32.console", "pywincffi.user32",
+                     "pywincffi.ws2_32"):
+            self.assertNotIn(name, imported)
+
+    def test_does_not_import_pkg_resources(self):
+        self.assertNotIn("pkg_resources", self.imported())
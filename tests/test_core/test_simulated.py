@@ -0,0 +1,452 @@
+import os
+import threading
+from os.path import isfile, join
+
+from mock import patch
+
+from pywincffi.core import dist
+from pywincffi.core.abi import AbiModule
+from pywincffi.core.simulated import (
+    CONSTANTS, ERROR_BROKEN_PIPE, ERROR_INVALID_ADDRESS, ERROR_LOCK_VIOLATION,
+    ERROR_MAPPED_ALIGNMENT, ERROR_NEGATIVE_SEEK, Simulation, load)
+from pywincffi.dev.testutil import TestCase
+from pywincffi.exceptions import WindowsAPIError
+from pywincffi.kernel32 import (
+    CloseHandle, CreateEvent, CreateFile, CreateFileMapping, CreatePipe,
+    CreateProcess, DuplicateHandle, GetCurrentProcess, GetExitCodeProcess,
+    GetFileSizeEx, GetHandleInformation, GetTempPath, LockFileEx,
+    MapViewOfFile, MoveFileEx, OpenEvent, OpenFileMapping, PeekNamedPipe,
+    ReadFile, SetEndOfFile, SetEvent, SetFilePointerEx, SetHandleInformation,
+    SetNamedPipeHandleState, TerminateProcess, UnlockFileEx, UnmapViewOfFile,
+    WaitForSingleObject, WriteFile, iter_chunks, pid_exists)
+from pywincffi.user32 import MsgWaitForMultipleObjects
+from pywincffi.wintypes import OVERLAPPED, SOCKET
+from pywincffi.ws2_32 import (
+    WSACreateEvent, WSAEnumNetworkEvents, WSAEventSelect)
+
+
+class SimulationTestCase(TestCase):
+    """
+    Replaces the libraries :func:`dist.load` returns with those from
+    a new :class:`Simulation` for the duration of each test.
+    """
+    def setUp(self):
+        super(SimulationTestCase, self).setUp()
+        self.simulation = Simulation()
+        self.addCleanup(self.simulation.close)
+
+        mock = patch.dict(
+            dist.Loader.cache, self.simulation.loader_cache(), clear=True)
+        mock.start()
+        self.addCleanup(mock.stop)
+        self.ffi, self.library = dist.load()
+
+    def create_file(self, access=None, disposition=None, share=None):
+        if access is None:
+            access = CONSTANTS["GENERIC_READ"] | CONSTANTS["GENERIC_WRITE"]
+        return CreateFile(
+            join(GetTempPath(), u"file"), access, dwShareMode=share,
+            dwCreationDisposition=disposition)
+
+
+class TestLibrary(SimulationTestCase):
+    """Tests for :meth:`Simulation.library`"""
+    def test_constants(self):
+        for name, value in CONSTANTS.items():
+            self.assertEqual(getattr(self.library, name), value)
+
+    def test_functions(self):
+        for name in ("core", "kernel32", "user32", "ws2_32"):
+            for function in ("handle_from_fd", "CreateFile"):
+                self.assertEqual(
+                    function in dist.load(name)[1].__dict__,
+                    function == "handle_from_fd" or name == "kernel32")
+
+    def test_cached(self):
+        self.assertIs(
+            self.simulation.library("kernel32"),
+            self.simulation.library("kernel32"))
+
+    def test_type_sizes(self):
+        self.assertEqual(self.ffi.sizeof("DWORD"), 4)
+        self.assertEqual(self.ffi.sizeof("TCHAR"), self.ffi.sizeof("wchar_t"))
+
+    def test_invalid_argument_type(self):
+        with self.assertRaises(TypeError):
+            self.library.CloseHandle("foo")
+
+
+class TestLoad(TestCase):
+    """Tests for :func:`pywincffi.core.simulated.load`"""
+    def test_load(self):
+        simulation = Simulation()
+        self.addCleanup(simulation.close)
+        with patch(
+                "pywincffi.core.simulated.simulation",
+                return_value=simulation):
+            module = load("kernel32")
+        self.assertIsInstance(module, AbiModule)
+        self.assertIs(module.ffi, simulation.ffi)
+        self.assertIs(module.lib, simulation.library("kernel32"))
+
+
+class TestLastError(SimulationTestCase):
+    """Tests for the last error and ``getwinerror``"""
+    def test_getwinerror(self):
+        self.library.SetLastError(CONSTANTS["ERROR_INVALID_HANDLE"])
+        self.assertEqual(
+            self.ffi.getwinerror(),
+            (CONSTANTS["ERROR_INVALID_HANDLE"], "The handle is invalid."))
+
+    def test_getwinerror_code(self):
+        self.assertEqual(self.ffi.getwinerror(0)[0], 0)
+
+    def test_reset_by_calls(self):
+        self.library.SetLastError(CONSTANTS["ERROR_INVALID_HANDLE"])
+        self.library.GetCurrentProcess()
+        self.assertEqual(self.ffi.getwinerror()[0], 0)
+
+    def test_per_thread(self):
+        self.library.SetLastError(CONSTANTS["ERROR_INVALID_HANDLE"])
+        errors = []
+        thread = threading.Thread(
+            target=lambda: errors.append(self.library.WSAGetLastError()))
+        thread.start()
+        thread.join()
+        self.assertEqual(errors, [0])
+        self.assertEqual(
+            self.library.WSAGetLastError(), CONSTANTS["ERROR_INVALID_HANDLE"])
+
+    def test_error_raised_by_wrapper(self):
+        handle = self.create_file()
+        CloseHandle(handle)
+        with self.assertRaises(WindowsAPIError) as error:
+            CloseHandle(handle)
+        self.assertEqual(
+            error.exception.errno, CONSTANTS["ERROR_INVALID_HANDLE"])
+
+
+class TestHandles(SimulationTestCase):
+    """Tests for the handle table"""
+    def test_duplicate(self):
+        event = CreateEvent()
+        duplicate = DuplicateHandle(
+            GetCurrentProcess(), event, GetCurrentProcess(), 0, False,
+            CONSTANTS["DUPLICATE_SAME_ACCESS"])
+        self.assertNotEqual(duplicate, event)
+
+        # Closing one handle leaves the object open.
+        CloseHandle(event)
+        SetEvent(duplicate)
+        self.assertEqual(WaitForSingleObject(duplicate, 0), 0)
+
+    def test_duplicate_close_source(self):
+        event = CreateEvent()
+        DuplicateHandle(
+            GetCurrentProcess(), event, GetCurrentProcess(), 0, False,
+            CONSTANTS["DUPLICATE_CLOSE_SOURCE"])
+        with self.assertRaises(WindowsAPIError):
+            CloseHandle(event)
+
+    def test_handle_information(self):
+        event = CreateEvent()
+        self.assertEqual(GetHandleInformation(event), 0)
+        SetHandleInformation(
+            event, CONSTANTS["HANDLE_FLAG_INHERIT"],
+            CONSTANTS["HANDLE_FLAG_INHERIT"])
+        self.assertEqual(
+            GetHandleInformation(event), CONSTANTS["HANDLE_FLAG_INHERIT"])
+
+    def test_close_releases_files(self):
+        handle = self.create_file()
+        CloseHandle(handle)
+        self.assertEqual(self.simulation._files, [])
+
+
+class TestEvents(SimulationTestCase):
+    """Tests for the simulated events"""
+    def test_manual_reset(self):
+        event = CreateEvent(bManualReset=True)
+        self.assertEqual(
+            WaitForSingleObject(event, 0), CONSTANTS["WAIT_TIMEOUT"])
+        SetEvent(event)
+        self.assertEqual(WaitForSingleObject(event, 0), 0)
+        self.assertEqual(WaitForSingleObject(event, 0), 0)
+
+    def test_auto_reset(self):
+        event = CreateEvent(bManualReset=False, bInitialState=True)
+        self.assertEqual(WaitForSingleObject(event, 0), 0)
+        self.assertEqual(
+            WaitForSingleObject(event, 0), CONSTANTS["WAIT_TIMEOUT"])
+
+    def test_named(self):
+        event = CreateEvent(lpName=u"pywincffi-event")
+        self.assertEqual(
+            WaitForSingleObject(event, 0), CONSTANTS["WAIT_TIMEOUT"])
+        SetEvent(OpenEvent(CONSTANTS["EVENT_ALL_ACCESS"], False,
+                           u"pywincffi-event"))
+        self.assertEqual(WaitForSingleObject(event, 0), 0)
+
+    def test_open_missing(self):
+        with self.assertRaises(WindowsAPIError) as error:
+            OpenEvent(CONSTANTS["EVENT_ALL_ACCESS"], False, u"missing")
+        self.assertEqual(
+            error.exception.errno, CONSTANTS["ERROR_FILE_NOT_FOUND"])
+
+    def test_set_from_thread(self):
+        event = CreateEvent()
+        timer = threading.Timer(0.05, SetEvent, args=(event, ))
+        timer.start()
+        self.addCleanup(timer.join)
+        self.assertEqual(WaitForSingleObject(event, 5000), 0)
+
+    def test_msg_wait_for_multiple_objects(self):
+        events = [CreateEvent(), CreateEvent()]
+        SetEvent(events[1])
+        self.assertEqual(
+            MsgWaitForMultipleObjects(
+                events, False, 0, CONSTANTS["QS_ALLINPUT"]), 1)
+
+
+class TestPipes(SimulationTestCase):
+    """Tests for the simulated pipes"""
+    def test_read_write(self):
+        reader, writer = CreatePipe()
+        self.assertEqual(WriteFile(writer, b"hello world"), 11)
+        self.assertEqual(PeekNamedPipe(reader, 0).lpTotalBytesAvail, 11)
+        self.assertEqual(ReadFile(reader, 5), b"hello")
+        self.assertEqual(ReadFile(reader, 100), b" world")
+
+    def test_read_blocks_until_written(self):
+        reader, writer = CreatePipe()
+        timer = threading.Timer(0.05, WriteFile, args=(writer, b"foo"))
+        timer.start()
+        self.addCleanup(timer.join)
+        self.assertEqual(ReadFile(reader, 3), b"foo")
+
+    def test_broken_pipe(self):
+        reader, writer = CreatePipe()
+        WriteFile(writer, b"foo")
+        CloseHandle(writer)
+        self.assertEqual(ReadFile(reader, 3), b"foo")
+        with self.assertRaises(WindowsAPIError) as error:
+            ReadFile(reader, 3)
+        self.assertEqual(error.exception.errno, ERROR_BROKEN_PIPE)
+
+    def test_read_from_write_end(self):
+        _, writer = CreatePipe()
+        with self.assertRaises(WindowsAPIError) as error:
+            ReadFile(writer, 3)
+        self.assertEqual(
+            error.exception.errno, CONSTANTS["ERROR_ACCESS_DENIED"])
+
+    def test_message_mode(self):
+        reader, _ = CreatePipe()
+        with self.assertRaises(WindowsAPIError) as error:
+            SetNamedPipeHandleState(
+                reader, lpMode=CONSTANTS["PIPE_READMODE_MESSAGE"])
+        self.assertEqual(
+            error.exception.errno, CONSTANTS["ERROR_INVALID_PARAMETER"])
+
+
+class TestFiles(SimulationTestCase):
+    """Tests for the simulated files"""
+    def test_temp_path(self):
+        self.assertEqual(GetTempPath(), join(self.simulation.directory, ""))
+
+    def test_read_write(self):
+        handle = self.create_file()
+        WriteFile(handle, b"hello")
+        CloseHandle(handle)
+
+        handle = self.create_file(disposition=CONSTANTS["OPEN_EXISTING"])
+        self.assertEqual(ReadFile(handle, 10), b"hello")
+
+    def test_open_missing(self):
+        with self.assertRaises(WindowsAPIError) as error:
+            self.create_file(disposition=CONSTANTS["OPEN_EXISTING"])
+        self.assertEqual(
+            error.exception.errno, CONSTANTS["ERROR_FILE_NOT_FOUND"])
+
+    def test_sharing_violation(self):
+        self.create_file(share=0)
+        with self.assertRaises(WindowsAPIError) as error:
+            self.create_file(disposition=CONSTANTS["OPEN_EXISTING"])
+        self.assertEqual(
+            error.exception.errno, CONSTANTS["ERROR_SHARING_VIOLATION"])
+
+    def test_overlapped(self):
+        handle = self.create_file()
+        WriteFile(handle, b"hello world")
+        overlapped = OVERLAPPED()
+        overlapped.Offset = 6
+        overlapped.hEvent = CreateEvent()
+        self.assertEqual(
+            ReadFile(handle, 5, lpOverlapped=overlapped), b"world")
+        self.assertEqual(overlapped.InternalHigh, 5)
+        self.assertEqual(WaitForSingleObject(overlapped.hEvent, 0), 0)
+
+    def test_file_pointer(self):
+        handle = self.create_file()
+        WriteFile(handle, b"hello world")
+        self.assertEqual(
+            SetFilePointerEx(handle, -5, CONSTANTS["FILE_END"]), 6)
+        self.assertEqual(ReadFile(handle, 10), b"world")
+        with self.assertRaises(WindowsAPIError) as error:
+            SetFilePointerEx(handle, -1)
+        self.assertEqual(error.exception.errno, ERROR_NEGATIVE_SEEK)
+
+    def test_large_file(self):
+        # The file is sparse so it doesn't use 4 GiB of disk space.
+        handle = self.create_file()
+        SetFilePointerEx(handle, 2 ** 32)
+        WriteFile(handle, b"hello world")
+        self.assertEqual(GetFileSizeEx(handle), 2 ** 32 + 11)
+        self.assertEqual(
+            [bytes(chunk) for chunk in iter_chunks(
+                handle, 8, start=2 ** 32 - 2, end=2 ** 32 + 10)],
+            [b"\x00\x00hello ", b"worl"])
+
+        SetFilePointerEx(handle, 5)
+        SetEndOfFile(handle)
+        self.assertEqual(GetFileSizeEx(handle), 5)
+
+    def test_move(self):
+        CloseHandle(self.create_file())
+        source = join(GetTempPath(), u"file")
+        MoveFileEx(source, source + u".moved")
+        self.assertFalse(isfile(source))
+        self.assertTrue(isfile(source + u".moved"))
+
+    def test_lock(self):
+        share = CONSTANTS["FILE_SHARE_READ"] | CONSTANTS["FILE_SHARE_WRITE"]
+        first = self.create_file(share=share)
+        second = self.create_file(
+            share=share, disposition=CONSTANTS["OPEN_EXISTING"])
+        flags = CONSTANTS["LOCKFILE_EXCLUSIVE_LOCK"] | \
+            CONSTANTS["LOCKFILE_FAIL_IMMEDIATELY"]
+        LockFileEx(first, flags, 10, 0)
+        with self.assertRaises(WindowsAPIError) as error:
+            LockFileEx(second, flags, 10, 0)
+        self.assertEqual(error.exception.errno, ERROR_LOCK_VIOLATION)
+
+        UnlockFileEx(first, 10, 0)
+        LockFileEx(second, flags, 10, 0)
+
+    def test_delete_on_close(self):
+        handle = CreateFile(
+            join(GetTempPath(), u"file"), CONSTANTS["GENERIC_WRITE"],
+            dwFlagsAndAttributes=CONSTANTS["FILE_FLAG_DELETE_ON_CLOSE"])
+        self.assertTrue(isfile(join(GetTempPath(), u"file")))
+        CloseHandle(handle)
+        self.assertFalse(isfile(join(GetTempPath(), u"file")))
+
+
+class TestMappings(SimulationTestCase):
+    """Tests for the simulated file mappings"""
+    def test_file_mapping(self):
+        handle = self.create_file()
+        WriteFile(handle, b"hello world")
+        mapping = CreateFileMapping(handle)
+        address = MapViewOfFile(mapping, CONSTANTS["FILE_MAP_WRITE"])
+        self.ffi.buffer(address, 5)[:] = b"HELLO"
+        UnmapViewOfFile(address)
+        SetFilePointerEx(handle, 0)
+        self.assertEqual(ReadFile(handle, 11), b"HELLO world")
+
+        with self.assertRaises(WindowsAPIError) as error:
+            MapViewOfFile(
+                mapping, CONSTANTS["FILE_MAP_READ"], dwFileOffsetLow=1)
+        self.assertEqual(error.exception.errno, ERROR_MAPPED_ALIGNMENT)
+        with self.assertRaises(WindowsAPIError) as error:
+            UnmapViewOfFile(address)
+        self.assertEqual(error.exception.errno, ERROR_INVALID_ADDRESS)
+
+    def test_named_mapping(self):
+        mapping = CreateFileMapping(
+            dwMaximumSizeLow=4096, lpName=u"pywincffi-mapping")
+        opened = OpenFileMapping(
+            CONSTANTS["FILE_MAP_READ"], False, u"pywincffi-mapping")
+        address = MapViewOfFile(mapping, CONSTANTS["FILE_MAP_WRITE"])
+        self.ffi.buffer(address, 5)[:] = b"hello"
+        self.assertEqual(
+            self.ffi.buffer(
+                MapViewOfFile(opened, CONSTANTS["FILE_MAP_READ"]), 5)[:],
+            b"hello")
+
+        CloseHandle(mapping)
+        CloseHandle(opened)
+        with self.assertRaises(WindowsAPIError) as error:
+            OpenFileMapping(
+                CONSTANTS["FILE_MAP_READ"], False, u"pywincffi-mapping")
+        self.assertEqual(
+            error.exception.errno, CONSTANTS["ERROR_FILE_NOT_FOUND"])
+
+    def test_close_unmaps_views(self):
+        mapping = CreateFileMapping(dwMaximumSizeLow=4096)
+        MapViewOfFile(mapping, CONSTANTS["FILE_MAP_READ"])
+        self.simulation.close()
+        self.assertEqual(self.simulation._views, {})
+
+
+class TestProcesses(SimulationTestCase):
+    """Tests for the simulated process table"""
+    def test_current_process(self):
+        self.assertTrue(pid_exists(os.getpid()))
+
+    def test_create_and_terminate(self):
+        result = CreateProcess(None, u"program.exe --flag")
+        process = result.lpProcessInformation
+        self.assertEqual(
+            self.simulation.processes[process.dwProcessId].command_line,
+            u"program.exe --flag")
+        self.assertTrue(pid_exists(process.dwProcessId))
+        self.assertEqual(
+            GetExitCodeProcess(process.hProcess), CONSTANTS["STILL_ACTIVE"])
+
+        TerminateProcess(process.hProcess, 3)
+        self.assertEqual(GetExitCodeProcess(process.hProcess), 3)
+        self.assertEqual(WaitForSingleObject(process.hThread, 0), 0)
+        self.assertFalse(pid_exists(process.dwProcessId))
+
+    def test_unknown_pid(self):
+        self.assertFalse(pid_exists(0xFFFF0))
+
+    def test_process_lifetime(self):
+        simulation = Simulation(process_lifetime=0.1)
+        self.addCleanup(simulation.close)
+        with patch.dict(dist.Loader.cache, simulation.loader_cache()):
+            process = CreateProcess(
+                None, u"program.exe").lpProcessInformation
+            self.assertEqual(
+                WaitForSingleObject(process.hProcess, 5000),
+                CONSTANTS["WAIT_OBJECT_0"])
+            self.assertEqual(GetExitCodeProcess(process.hProcess), 0)
+
+    def test_no_process_lifetime(self):
+        simulation = Simulation(process_lifetime=None)
+        self.addCleanup(simulation.close)
+        with patch.dict(dist.Loader.cache, simulation.loader_cache()):
+            process = CreateProcess(
+                None, u"program.exe").lpProcessInformation
+            self.assertEqual(
+                WaitForSingleObject(process.hProcess, 200),
+                CONSTANTS["WAIT_TIMEOUT"])
+
+
+class TestSockets(SimulationTestCase):
+    """Tests for the simulated network events"""
+    def test_network_events(self):
+        socket = SOCKET()
+        socket._cdata[0] = 42
+        event = WSACreateEvent()
+        WSAEventSelect(socket, event, CONSTANTS["FD_READ"])
+        self.assertEqual(
+            WaitForSingleObject(event, 0), CONSTANTS["WAIT_TIMEOUT"])
+
+        self.simulation.network_event(42, CONSTANTS["FD_READ"])
+        self.assertEqual(WaitForSingleObject(event, 0), 0)
+        events = WSAEnumNetworkEvents(socket, event)
+        self.assertEqual(events.lNetworkEvents, CONSTANTS["FD_READ"])
+        self.assertEqual(
+            WaitForSingleObject(event, 0), CONSTANTS["WAIT_TIMEOUT"])
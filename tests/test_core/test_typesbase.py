@@ -226,6 +226,59 @@ class TestDerivedStructTypes(TestCase):
         with self.assertRaises(ValueError):
             c.radius = -4.4
 
+    def test_derived_circle_slots(self):
+        class _PyWinCFFICircle(typesbase.CFFICDataWrapper):
+            __module__ = "pywincffi.wintypes.structures"
+
+        circle = _PyWinCFFICircle("circle_t *", _ffi_with_circle_t)
+        self.assertFalse(hasattr(circle, "__dict__"))
+
+    def test_derived_circle_outside_pywincffi_has_dict(self):
+        c = _Circle()
+        object.__setattr__(c, "name", "circle")
+        self.assertEqual(c.name, "circle")
+
+    def test_derived_circle_fields_are_descriptors(self):
+        _CircleWithProperties()
+        for name in ("x", "y"):
+            self.assertIsInstance(
+                getattr(_CircleWithProperties, name), typesbase._Field)
+
+        # Properties defined by the class are not replaced.
+        self.assertNotIsInstance(
+            _CircleWithProperties.radius, typesbase._Field)
+
+    def test_derived_circle_read_only_property(self):
+        class _CircleWithReadOnlyProperty(_Circle):
+            @property
+            def radius(self):
+                return self._cdata.radius * 2
+
+        c = _CircleWithReadOnlyProperty()
+        c.radius = 1.5  # Set on the cdata, there's no setter
+        self.assertAlmostEqual(c._cdata.radius, 1.5, places=2)
+        self.assertAlmostEqual(c.radius, 3.0, places=2)
+
+    def test_derived_circle_as_parameter(self):
+        c = _Circle()
+        self.assertIs(c._as_parameter_, c._cdata)
+
+    def test_derived_circle_from_cdata(self):
+        cdata = _ffi_with_circle_t.new("circle_t *")
+        c = _CircleWithProperties.from_cdata(cdata)
+        self.assertIs(type(c), _CircleWithProperties)
+        self.assertIs(c._cdata, cdata)
+        c.radius = 2.5
+        self.assertAlmostEqual(cdata.radius, 2.5, places=2)
+
+    def test_derived_circle_from_cdata_with_owner(self):
+        owner = _ffi_with_circle_t.new("circle_t[2]")
+        c = _Circle.from_cdata(owner + 1, owner)
+        self.assertIsInstance(c, _Circle)
+        self.assertIs(c._owner, owner)
+        c.x = 4
+        self.assertEqual(owner[1].x, 4)
+
 
 class _CircleArray(typesbase.CFFICDataWrapper):
     """
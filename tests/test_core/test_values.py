@@ -0,0 +1,29 @@
+import os
+import re
+from os.path import join
+
+from pywincffi.core import dist
+from pywincffi.core.values import CONSTANTS
+from pywincffi.dev.testutil import TestCase
+
+REGEX_DEFINE = re.compile(r"^#define (\w+) \.\.\.$", re.MULTILINE)
+
+
+class TestConstants(TestCase):
+    """Tests for :data:`pywincffi.core.values.CONSTANTS`"""
+    def test_matches_header(self):
+        with open(join(dist.HEADERS_DIRECTORY, "constants.h")) as file_:
+            names = REGEX_DEFINE.findall(file_.read())
+
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(set(CONSTANTS), set(names))
+
+    def test_matches_library(self):
+        if os.name != "nt":
+            self.skipTest("The compiled library is only available on Windows")
+
+        _, library = dist.load()
+        for name, value in CONSTANTS.items():
+            self.assertEqual(
+                int(getattr(library, name)) & 0xFFFFFFFF, value & 0xFFFFFFFF,
+                msg=name)
@@ -0,0 +1,197 @@
+import shutil
+import tempfile
+from os.path import join
+
+from cffi import FFI
+from mock import patch
+
+from pywincffi.core import dist
+from pywincffi.dev.codegen import (
+    Function, Parameter, Length, parse, generate, build)
+from pywincffi.dev.testutil import TestCase
+from pywincffi.exceptions import (
+    InputError, WindowsAPIError, PyWinCFFINotImplementedError)
+from pywincffi.wintypes import HANDLE
+
+HEADER = """
+// A comment which is not a declaration
+BOOL WINAPI ReadFile(
+  _In_        HANDLE       hFile,
+  _Out_       LPVOID       lpBuffer,
+  _In_        DWORD        nNumberOfBytesToRead,
+  _Out_opt_   LPDWORD      lpNumberOfBytesRead,
+  _Inout_opt_ LPOVERLAPPED lpOverlapped
+);
+
+HANDLE WINAPI GetCurrentProcess(void);
+
+BOOL WINAPI Unannotated(HANDLE hObject);
+"""
+
+# Enough of the Windows types for the generated wrappers to
+# be used on any platform.
+CDEF = """
+typedef void *HANDLE;
+typedef HANDLE *LPHANDLE;
+typedef unsigned long DWORD;
+typedef DWORD *LPDWORD;
+typedef int BOOL;
+typedef struct _OVERLAPPED { HANDLE hEvent; } OVERLAPPED, *LPOVERLAPPED;
+"""
+
+
+class Library(object):
+    """A stand in for the library the wrappers are bound to"""
+    def __init__(self, code=1):
+        self.code = code
+        self.calls = []
+
+    def ReadFile(  # pylint: disable=invalid-name,too-many-arguments
+            self, hFile, lpBuffer, nNumberOfBytesToRead, lpNumberOfBytesRead,
+            lpOverlapped):
+        self.calls.append((hFile, nNumberOfBytesToRead, lpOverlapped))
+        lpBuffer[0:3] = b"abc"
+        lpNumberOfBytesRead[0] = 3
+        return self.code
+
+    def WriteFile(  # pylint: disable=invalid-name,too-many-arguments
+            self, hFile, lpBuffer, nNumberOfBytesToWrite,
+            lpNumberOfBytesWritten, lpOverlapped):
+        self.calls.append((hFile, lpBuffer, nNumberOfBytesToWrite))
+        lpNumberOfBytesWritten[0] = nNumberOfBytesToWrite
+        return self.code
+
+
+class ParseTestCase(TestCase):
+    """Writes :data:`HEADER` to disk so it can be parsed"""
+    def setUp(self):
+        super(ParseTestCase, self).setUp()
+        directory = tempfile.mkdtemp(prefix="pywincffi-tests-")
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.header = join(directory, "header.h")
+        with open(self.header, "w") as file_:
+            file_.write(HEADER)
+        self.functions = dict(
+            (function.name, function) for function in parse(self.header))
+
+
+class TestParse(ParseTestCase):
+    """Tests for :func:`pywincffi.dev.codegen.parse`"""
+    def test_functions(self):
+        self.assertEqual(
+            sorted(self.functions),
+            ["GetCurrentProcess", "ReadFile", "Unannotated"])
+
+    def test_parameters(self):
+        self.assertEqual(
+            self.functions["ReadFile"],
+            Function("ReadFile", "BOOL", (
+                Parameter("hFile", "HANDLE", "in", False),
+                Parameter("lpBuffer", "LPVOID", "out", False),
+                Parameter("nNumberOfBytesToRead", "DWORD", "in", False),
+                Parameter("lpNumberOfBytesRead", "LPDWORD", "out", True),
+                Parameter("lpOverlapped", "LPOVERLAPPED", "inout", True))))
+
+    def test_void(self):
+        self.assertEqual(self.functions["GetCurrentProcess"].parameters, ())
+
+    def test_unannotated(self):
+        self.assertEqual(
+            self.functions["Unannotated"].parameters,
+            (Parameter("hObject", "HANDLE", None, False), ))
+
+    def test_library_headers(self):
+        for definition in dist.MODULES.values():
+            for header in definition.headers:
+                parse(header)
+
+
+class TestGenerate(ParseTestCase):
+    """Tests for :func:`pywincffi.dev.codegen.generate`"""
+    def test_compiles(self):
+        source = generate(
+            list(self.functions.values()), ("ReadFile", ), header=self.header)
+        compile(source, "<generated>", "exec")
+        self.assertIn("from header.h", source)
+
+    def test_kernel32(self):
+        functions = parse(dist.MODULES["kernel32"].headers[0])
+        source = generate(
+            functions, ("ReadFile", "WriteFile", "DuplicateHandle"))
+        compile(source, "<generated>", "exec")
+
+    def test_unsupported_return_type(self):
+        with self.assertRaises(PyWinCFFINotImplementedError):
+            generate(list(self.functions.values()), ("GetCurrentProcess", ))
+
+    def test_unannotated(self):
+        with self.assertRaises(PyWinCFFINotImplementedError):
+            generate(list(self.functions.values()), ("Unannotated", ))
+
+    def test_unsupported_input_type(self):
+        function = Function("Foo", "BOOL", (
+            Parameter("lpFoo", "LPFOO", "in", False), ))
+        with self.assertRaises(PyWinCFFINotImplementedError):
+            generate([function], ("Foo", ))
+
+    def test_signature(self):
+        function = Function("Foo", "BOOL", (
+            Parameter("hOptional", "HANDLE", "in", True),
+            Parameter("dwRequired", "DWORD", "in", False),
+            Parameter("dwLength", "DWORD", "in", False),
+            Parameter("lpBuffer", "LPCVOID", "in", False),
+            Parameter("dwReserved", "DWORD", "reserved", False)))
+        source = generate(
+            [function], ("Foo", ),
+            hints={"Foo": {"dwLength": Length("lpBuffer")}})
+        self.assertIn(
+            "def Foo(dwRequired, lpBuffer, hOptional=None, dwLength=None):",
+            source)
+
+
+class TestBuild(TestCase):
+    """Tests the wrappers returned by :func:`pywincffi.dev.codegen.build`"""
+    def setUp(self):
+        super(TestBuild, self).setUp()
+        self.stand_in_ffi = FFI()
+        self.stand_in_ffi.cdef(CDEF)
+
+        # The generated wrappers, and the types they use, load
+        # the library themselves when an error is raised.
+        self.stand_in_library = Library()
+        mock = patch.dict(
+            dist.Loader.cache,
+            {"core": (self.stand_in_ffi, self.stand_in_library)})
+        mock.start()
+        self.addCleanup(mock.stop)
+
+        functions = parse(dist.MODULES["kernel32"].headers[0])
+        source = generate(functions, ("ReadFile", "WriteFile"))
+        self.wrappers = build(
+            source, self.stand_in_ffi, self.stand_in_library)
+        self.handle = HANDLE(self.stand_in_ffi.cast("HANDLE", 42))
+
+    def test_read_file(self):
+        self.assertEqual(self.wrappers["ReadFile"](self.handle, 10), b"abc")
+        hFile, size, overlapped = self.stand_in_library.calls[0]
+        self.assertEqual(int(self.stand_in_ffi.cast("intptr_t", hFile)), 42)
+        self.assertEqual(size, 10)
+        self.assertEqual(overlapped, self.stand_in_ffi.NULL)
+
+    def test_write_file_length(self):
+        self.assertEqual(self.wrappers["WriteFile"](self.handle, b"foo"), 3)
+        self.assertEqual(self.stand_in_library.calls[0][1:], (b"foo", 3))
+
+    def test_write_file_explicit_length(self):
+        self.assertEqual(
+            self.wrappers["WriteFile"](self.handle, b"foo", 2), 2)
+
+    def test_input_error(self):
+        with self.assertRaises(InputError):
+            self.wrappers["ReadFile"](self.handle, "10")
+
+    def test_error(self):
+        self.stand_in_library.code = 0
+        self.stand_in_ffi.getwinerror = lambda: (6, "The handle is invalid.")
+        with self.assertRaises(WindowsAPIError):
+            self.wrappers["ReadFile"](self.handle, 10)
@@ -7,6 +7,16 @@ from pywincffi.exceptions import (
     PyWinCFFINotImplementedError, ResourceNotFoundError, ConfigurationError)
 
 
+class Value(object):  # pylint: disable=too-few-public-methods
+    """Counts the number of times it's converted to a string"""
+    def __init__(self):
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return "Value()"
+
+
 class TestBaseClasses(TestCase):
     """
     Tests the base classes of our custom exceptions
@@ -90,6 +100,22 @@ class TestInputError(TestCase):
             "Expected type(s) (<%s 'int'>,) for ''. Type of '' is "
             "CDataOwn(kind='array', cname='wchar_t[0]')." % name)
 
+    def test_message_built_on_demand(self):
+        value = Value()
+        error = InputError("", value, allowed_values=(1, ))
+        self.assertEqual(value.calls, 0)
+        self.assertEqual(
+            str(error),
+            "Expected the value of '' to be in (1,). Value of '' is "
+            "Value().")
+        self.assertEqual(error.message, str(error))
+        self.assertEqual(value.calls, 1)
+
+    def test_args(self):
+        error = InputError("foo", 1, message="bar")
+        self.assertEqual(error.args, ("foo", 1))
+        self.assertEqual(repr(error), "InputError('foo', 1)")
+
 
 class TestWindowsAPIError(TestCase):
     """
@@ -124,6 +150,20 @@ class TestWindowsAPIError(TestCase):
             "Error when calling function. Message from Windows API was 'there "
             "was a problem' (errno: 1).")
 
+    def test_message_built_on_demand(self):
+        error = WindowsAPIError("function", Value(), 1)
+        self.assertEqual(error.error.calls, 0)
+        self.assertEqual(
+            str(error),
+            "Error when calling function. Message from Windows API was "
+            "Value() (errno: 1).")
+        self.assertEqual(error.message, str(error))
+        self.assertEqual(error.error.calls, 1)
+
+    def test_args(self):
+        error = WindowsAPIError("function", "there was a problem", 1)
+        self.assertEqual(error.args, ("function", "there was a problem", 1))
+
     def test_repr(self):
         error = WindowsAPIError(
             "function", "there was a problem", 1, return_code=0,
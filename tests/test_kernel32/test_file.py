@@ -1,5 +1,7 @@
+import io
 import os
 import ctypes
+import mmap
 import tempfile
 import subprocess
 import sys
@@ -11,14 +13,21 @@ from six import text_type
 
 from pywincffi.core import dist
 from pywincffi.dev.testutil import TestCase
-from pywincffi.exceptions import WindowsAPIError
+from pywincffi.exceptions import InputError, WindowsAPIError
 
 from pywincffi.kernel32 import file as _file  # used for mocks
 from pywincffi.kernel32 import (
-    CreateFile, CloseHandle, MoveFileEx, WriteFile, FlushFileBuffers,
-    LockFileEx, UnlockFileEx, ReadFile, GetTempPath)
+    CreateFile, CloseHandle, CreatePipe, MoveFileEx, WriteFile,
+    FlushFileBuffers, LockFileEx, UnlockFileEx, ReadFile, ReadFileInto,
+    GetTempPath, SetEndOfFile, SetFilePointerEx, GetFileSizeEx, WinFile,
+    iter_chunks)
 from pywincffi.wintypes import handle_from_file
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 class TestWriteFile(TestCase):
     """
@@ -46,11 +55,60 @@ class TestWriteFile(TestCase):
         with open(path, "rb") as file_:
             self.assertEqual(file_.read(), b"hello")
 
+    def test_write_bytearray(self):
+        handle, path = self.create_handle()
+        self.assertEqual(WriteFile(handle, bytearray(b"hello world")), 11)
+        FlushFileBuffers(handle)
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"hello world")
 
-class TestReadFile(TestCase):
-    """
-    Tests for :func:`pywincffi.kernel32.ReadFile`
-    """
+    def test_write_memoryview_slice(self):
+        handle, path = self.create_handle()
+        view = memoryview(b"hello world")
+        self.assertEqual(WriteFile(handle, view[6:]), 5)
+        self.assertEqual(WriteFile(handle, view[:5], 3), 3)
+        FlushFileBuffers(handle)
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"worldhel")
+
+    def test_write_mmap(self):
+        handle, path = self.create_handle()
+        data = mmap.mmap(-1, 4)
+        self.addCleanup(data.close)
+        data[:] = b"abcd"
+        self.assertEqual(WriteFile(handle, data), 4)
+        FlushFileBuffers(handle)
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"abcd")
+
+    def test_write_numpy_array(self):
+        if numpy is None:
+            self.skipTest("numpy is not installed")
+
+        handle, path = self.create_handle()
+        array = numpy.arange(4, dtype=numpy.uint16)
+        self.assertEqual(WriteFile(handle, array), 8)
+        FlushFileBuffers(handle)
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), array.tobytes())
+
+    def test_text_is_not_a_buffer(self):
+        handle, _ = self.create_handle()
+        with self.assertRaises(InputError):
+            WriteFile(handle, text_type("hello world"))
+
+    def test_not_contiguous(self):
+        handle, _ = self.create_handle()
+        with self.assertRaises(InputError):
+            WriteFile(handle, memoryview(bytearray(b"hello world"))[::2])
+
+    def test_too_many_bytes(self):
+        handle, _ = self.create_handle()
+        with self.assertRaises(InputError):
+            WriteFile(handle, b"hello", nNumberOfBytesToWrite=6)
+
+
+class ReadFileCase(TestCase):
     def _create_file(self, contents):
         fd, path = tempfile.mkstemp()
         self.addCleanup(os.remove, path)
@@ -69,6 +127,11 @@ class TestReadFile(TestCase):
         self.addCleanup(CloseHandle, hFile)
         return hFile
 
+
+class TestReadFile(ReadFileCase):
+    """
+    Tests for :func:`pywincffi.kernel32.ReadFile`
+    """
     def test_write_then_read_bytes_ascii(self):
         path = self._create_file(b"test_write_then_read_bytes_ascii")
         hFile = self._handle_to_read_file(path)
@@ -88,6 +151,319 @@ class TestReadFile(TestCase):
         self.assertEqual(contents, b"test")
 
 
+class TestReadFileInto(ReadFileCase):
+    """
+    Tests for :func:`pywincffi.kernel32.ReadFileInto`
+    """
+    def test_bytearray(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello\x00world"))
+        buffer_ = bytearray(1024)
+        self.assertEqual(ReadFileInto(hFile, buffer_), 11)
+        self.assertEqual(buffer_[:11], b"hello\x00world")
+
+    def test_memoryview_slice(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello world"))
+        buffer_ = bytearray(b"-" * 8)
+        self.assertEqual(ReadFileInto(hFile, memoryview(buffer_)[2:6]), 4)
+        self.assertEqual(buffer_, b"--hell--")
+
+    def test_mmap(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello world"))
+        buffer_ = mmap.mmap(-1, 16)
+        self.addCleanup(buffer_.close)
+        self.assertEqual(ReadFileInto(hFile, buffer_), 11)
+        self.assertEqual(buffer_[:11], b"hello world")
+
+    def test_numpy(self):
+        if numpy is None:  # pragma: no cover
+            self.skipTest("numpy is not installed")
+
+        hFile = self._handle_to_read_file(self._create_file(b"\x01\x02\x03"))
+        buffer_ = numpy.zeros(4, dtype=numpy.uint8)
+        self.assertEqual(ReadFileInto(hFile, buffer_), 3)
+        self.assertEqual(buffer_.tolist(), [1, 2, 3, 0])
+
+    def test_end_of_file(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello"))
+        buffer_ = bytearray(8)
+        self.assertEqual(ReadFileInto(hFile, buffer_), 5)
+        self.assertEqual(ReadFileInto(hFile, buffer_), 0)
+
+    def test_read_only_buffer(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello"))
+        with self.assertRaises(InputError):
+            ReadFileInto(hFile, b"12345")
+
+    def test_not_a_buffer(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello"))
+        with self.assertRaises(InputError):
+            ReadFileInto(hFile, 5)
+
+    def test_not_contiguous(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello"))
+        buffers = [memoryview(bytearray(8))[::2]]
+        if numpy is not None:
+            buffers.append(numpy.zeros(8, dtype=numpy.uint8)[::2])
+
+        for buffer_ in buffers:
+            with self.assertRaises(InputError):
+                ReadFileInto(hFile, buffer_)
+
+
+class FilePointerCase(ReadFileCase):
+    def _handle_to_write_file(self, path):
+        _, library = dist.load()
+        hFile = CreateFile(
+            path,
+            dwDesiredAccess=library.GENERIC_READ | library.GENERIC_WRITE,
+            dwCreationDisposition=library.OPEN_EXISTING,
+        )
+        self.addCleanup(CloseHandle, hFile)
+        return hFile
+
+
+class TestSetFilePointerEx(FilePointerCase):
+    """
+    Tests for :func:`pywincffi.kernel32.SetFilePointerEx`
+    """
+    def test_default_move_method(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello world"))
+        self.assertEqual(SetFilePointerEx(hFile, 6), 6)
+        self.assertEqual(ReadFile(hFile, 5), b"world")
+
+    def test_move_methods(self):
+        _, library = dist.load()
+        hFile = self._handle_to_read_file(self._create_file(b"hello world"))
+        self.assertEqual(SetFilePointerEx(hFile, -5, library.FILE_END), 6)
+        self.assertEqual(SetFilePointerEx(hFile, -6, library.FILE_CURRENT), 0)
+        self.assertEqual(SetFilePointerEx(hFile, 0, library.FILE_CURRENT), 0)
+        self.assertEqual(ReadFile(hFile, 5), b"hello")
+
+    def test_past_end_of_file(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello"))
+        self.assertEqual(SetFilePointerEx(hFile, 2 ** 33), 2 ** 33)
+        self.assertEqual(ReadFile(hFile, 5), b"")
+
+    def test_negative_position(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello"))
+        with self.assertRaises(WindowsAPIError):
+            SetFilePointerEx(hFile, -1)
+
+    def test_invalid_move_method(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello"))
+        with self.assertRaises(InputError):
+            SetFilePointerEx(hFile, 0, 42)
+
+
+class TestSetEndOfFile(FilePointerCase):
+    """
+    Tests for :func:`pywincffi.kernel32.SetEndOfFile`
+    """
+    def test_truncate(self):
+        path = self._create_file(b"hello world")
+        hFile = self._handle_to_write_file(path)
+        SetFilePointerEx(hFile, 5)
+        SetEndOfFile(hFile)
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"hello")
+
+    def test_extend(self):
+        path = self._create_file(b"hello")
+        hFile = self._handle_to_write_file(path)
+        SetFilePointerEx(hFile, 8)
+        SetEndOfFile(hFile)
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"hello\x00\x00\x00")
+
+    def test_read_only(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello"))
+        with self.assertRaises(WindowsAPIError):
+            SetEndOfFile(hFile)
+
+
+class TestGetFileSizeEx(FilePointerCase):
+    """
+    Tests for :func:`pywincffi.kernel32.GetFileSizeEx`
+    """
+    def test_size(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello world"))
+        self.assertEqual(GetFileSizeEx(hFile), 11)
+
+    def test_size_after_extending(self):
+        hFile = self._handle_to_write_file(self._create_file(b"hello"))
+        SetFilePointerEx(hFile, 4096)
+        SetEndOfFile(hFile)
+        self.assertEqual(GetFileSizeEx(hFile), 4096)
+
+    def test_pipe(self):
+        reader, writer = CreatePipe()
+        self.addCleanup(CloseHandle, reader)
+        self.addCleanup(CloseHandle, writer)
+        with self.assertRaises(WindowsAPIError):
+            GetFileSizeEx(reader)
+
+
+class TestIterChunks(FilePointerCase):
+    """
+    Tests for :func:`pywincffi.kernel32.iter_chunks`
+    """
+    def _chunks(self, contents, *args, **kwargs):
+        hFile = self._handle_to_read_file(self._create_file(contents))
+        return [bytes(chunk) for chunk in iter_chunks(hFile, *args, **kwargs)]
+
+    def test_whole_file(self):
+        self.assertEqual(
+            self._chunks(b"hello world", 4), [b"hell", b"o wo", b"rld"])
+
+    def test_start_and_end(self):
+        self.assertEqual(
+            self._chunks(b"hello world", 4, start=2, end=9),
+            [b"llo ", b"wor"])
+
+    def test_end_past_end_of_file(self):
+        self.assertEqual(
+            self._chunks(b"hello world", 8, start=6, end=100), [b"world"])
+
+    def test_empty_range(self):
+        self.assertEqual(self._chunks(b"hello world", 4, start=5, end=5), [])
+
+    def test_reuses_buffer(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello world"))
+        chunks = iter_chunks(hFile, 5)
+        first = next(chunks)
+        self.assertIsInstance(first, memoryview)
+        self.assertEqual(first.tobytes(), b"hello")
+        next(chunks)
+        self.assertEqual(first.tobytes(), b" worl")
+
+    def test_invalid_arguments(self):
+        hFile = self._handle_to_read_file(self._create_file(b"hello world"))
+        for args, kwargs in (
+                ((0, ), {}), ((0x100000000, ), {}), ((4, ), {"start": -1}),
+                ((4, ), {"start": 5, "end": 4}), ((4, ), {"end": 1.0})):
+            with self.assertRaises(InputError):
+                iter_chunks(hFile, *args, **kwargs)
+
+
+class TestWinFile(FilePointerCase):
+    """
+    Tests for :class:`pywincffi.kernel32.WinFile`
+    """
+    def _open(self, path, mode="r"):
+        file_ = WinFile(path, mode)
+        self.addCleanup(file_.close)
+        return file_
+
+    def test_read(self):
+        file_ = self._open(self._create_file(b"hello world"))
+        self.assertEqual(file_.mode, "rb")
+        self.assertTrue(file_.readable())
+        self.assertFalse(file_.writable())
+        self.assertTrue(file_.seekable())
+        self.assertEqual(file_.read(5), b"hello")
+        self.assertEqual(file_.read(), b" world")
+        self.assertEqual(file_.read(), b"")
+
+    def test_write(self):
+        path = self._create_file(b"hello world")
+        with WinFile(path, "wb") as file_:
+            self.assertEqual(file_.write(b"foo"), 3)
+            self.assertEqual(file_.write(bytearray(b"bar")), 3)
+
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"foobar")
+
+    def test_append(self):
+        path = self._create_file(b"hello")
+        with WinFile(path, "a+") as file_:
+            self.assertEqual(file_.tell(), 5)
+            file_.seek(0)
+            self.assertEqual(file_.read(), b"hello")
+            file_.seek(0)
+            file_.write(b" world")
+
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"hello world")
+
+    def test_exclusive_create(self):
+        path = self._create_file(b"")
+        with self.assertRaises(WindowsAPIError):
+            WinFile(path, "x")
+
+    def test_seek_tell_truncate(self):
+        path = self._create_file(b"hello world")
+        file_ = self._open(path, "r+")
+        self.assertEqual(file_.seek(-5, io.SEEK_END), 6)
+        self.assertEqual(file_.tell(), 6)
+        self.assertEqual(file_.truncate(5), 5)
+        self.assertEqual(file_.tell(), 6)
+        self.assertEqual(file_.seek(0), 0)
+        self.assertEqual(file_.read(), b"hello")
+        file_.seek(2)
+        self.assertEqual(file_.truncate(), 2)
+        file_.close()
+
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"he")
+
+    def test_buffered(self):
+        path = self._create_file(b"")
+        chunks = [str(index).encode("ascii") for index in range(100)]
+        with io.BufferedWriter(WinFile(path, "w"), 4) as file_:
+            for chunk in chunks:
+                file_.write(chunk)
+
+        with io.BufferedReader(WinFile(path), 7) as file_:
+            self.assertEqual(file_.read(), b"".join(chunks))
+
+    def test_text(self):
+        path = self._create_file(b"")
+        with io.TextIOWrapper(
+                io.BufferedRandom(WinFile(path, "w+")),
+                encoding="utf-8") as file_:
+            file_.write(u"hello\nw\xf6rld\n")
+            file_.seek(0)
+            self.assertEqual(file_.readlines(), [u"hello\n", u"w\xf6rld\n"])
+
+    def test_handle(self):
+        path = self._create_file(b"hello")
+        hFile = self._handle_to_read_file(path)
+        with WinFile(hFile, closefd=False) as file_:
+            self.assertIs(file_.handle, hFile)
+            self.assertEqual(file_.read(), b"hello")
+
+        # The handle is still open
+        SetFilePointerEx(hFile, 0)
+        self.assertEqual(ReadFile(hFile, 5), b"hello")
+
+    def test_closed(self):
+        file_ = WinFile(self._create_file(b"hello"))
+        file_.close()
+        file_.close()
+        self.assertTrue(file_.closed)
+        with self.assertRaises(ValueError):
+            file_.read()
+        with self.assertRaises(ValueError):
+            file_.seek(0)
+
+    def test_unsupported_operation(self):
+        file_ = self._open(self._create_file(b"hello"))
+        with self.assertRaises(io.UnsupportedOperation):
+            file_.write(b"foo")
+        with self.assertRaises(io.UnsupportedOperation):
+            file_.truncate()
+
+    def test_invalid_mode(self):
+        path = self._create_file(b"hello")
+        for mode in ("", "rw", "r++", "q", "rr"):
+            with self.assertRaises(InputError):
+                WinFile(path, mode)
+
+    def test_invalid_file(self):
+        with self.assertRaises(InputError):
+            WinFile(42)
+
+
 class TestMoveFileEx(TestCase):
     """
     Tests for :func:`pywincffi.kernel32.MoveFileEx`
@@ -216,6 +592,39 @@ class TestCreateFile(TestCase):
 
         # If we've made it this far, the exception was ignored by CreateFile
 
+    def test_ignores_error_already_existed_open_always(self):
+        _, library = dist.load()
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as file_:
+            file_.write(b"hello")
+
+        def raise_(*_):
+            raise WindowsAPIError("", "", library.ERROR_ALREADY_EXISTS)
+
+        path = text_type(path)
+        self.addCleanup(os.remove, path)
+        with patch.object(_file, "error_check", side_effect=raise_):
+            handle = CreateFile(
+                path, library.GENERIC_READ,
+                dwCreationDisposition=library.OPEN_ALWAYS)
+            self.addCleanup(CloseHandle, handle)
+
+        self.assertEqual(ReadFile(handle, 5), b"hello")
+
+    def test_open_always_existing_file(self):
+        _, library = dist.load()
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as file_:
+            file_.write(b"hello")
+
+        path = text_type(path)
+        handle = CreateFile(
+            path, library.GENERIC_READ,
+            dwCreationDisposition=library.OPEN_ALWAYS)
+        self.addCleanup(os.remove, path)
+        self.addCleanup(CloseHandle, handle)
+        self.assertEqual(ReadFile(handle, 5), b"hello")
+
     def test_raises_other_errors_for_create_always(self):
         _, library = dist.load()
 
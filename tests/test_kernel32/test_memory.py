@@ -0,0 +1,312 @@
+import gc
+import mmap
+import os
+import sys
+import tempfile
+
+from mock import patch
+from six import text_type
+
+from pywincffi.core import dist
+from pywincffi.dev.testutil import TestCase
+from pywincffi.exceptions import InputError, WindowsAPIError
+from pywincffi.kernel32 import memory  # used for mocks
+from pywincffi.kernel32 import (
+    CloseHandle, CreateFile, CreateFileMapping, FlushViewOfFile,
+    MapViewOfFile, MapViewOfFileEx, MappedView, OpenFileMapping,
+    UnmapViewOfFile)
+
+
+class MappingCase(TestCase):
+    def _create_file(self, contents):
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "wb") as file_:
+            file_.write(contents)
+        return text_type(path)
+
+    def _create_mapping(self, path, writable=True, **kwargs):
+        _, library = dist.load()
+        access = library.GENERIC_READ
+        if writable:
+            access |= library.GENERIC_WRITE
+
+        hFile = CreateFile(
+            path, access, dwCreationDisposition=library.OPEN_EXISTING)
+        self.addCleanup(CloseHandle, hFile)
+
+        if not writable:
+            kwargs.setdefault("flProtect", library.PAGE_READONLY)
+        mapping = CreateFileMapping(hFile, **kwargs)
+        self.addCleanup(CloseHandle, mapping)
+        return mapping
+
+    def _map(self, mapping, access, size=0):
+        address = MapViewOfFile(mapping, access, dwNumberOfBytesToMap=size)
+        self.addCleanup(UnmapViewOfFile, address)
+        return address
+
+
+class TestCreateFileMapping(MappingCase):
+    """
+    Tests for :func:`pywincffi.kernel32.CreateFileMapping`
+    """
+    def test_paging_file(self):
+        ffi, library = dist.load()
+        mapping = CreateFileMapping(dwMaximumSizeLow=4096)
+        self.addCleanup(CloseHandle, mapping)
+        address = self._map(mapping, library.FILE_MAP_WRITE)
+        ffi.buffer(address, 5)[:] = b"hello"
+        self.assertEqual(ffi.buffer(address, 5)[:], b"hello")
+
+    def test_named_mapping_already_exists(self):
+        ffi, library = dist.load()
+        name = u"pywincffi-%s" % self.random_string(5)
+        mapping1 = CreateFileMapping(dwMaximumSizeLow=4096, lpName=name)
+        self.addCleanup(CloseHandle, mapping1)
+        mapping2 = CreateFileMapping(dwMaximumSizeLow=4096, lpName=name)
+        self.addCleanup(CloseHandle, mapping2)
+
+        address1 = self._map(mapping1, library.FILE_MAP_WRITE)
+        address2 = self._map(mapping2, library.FILE_MAP_READ)
+        ffi.buffer(address1, 5)[:] = b"hello"
+        self.assertEqual(ffi.buffer(address2, 5)[:], b"hello")
+
+    def test_extends_file(self):
+        path = self._create_file(b"hello")
+        self._create_mapping(path, dwMaximumSizeLow=4096)
+        self.assertEqual(os.path.getsize(path), 4096)
+
+    def test_empty_file(self):
+        path = self._create_file(b"")
+        with self.assertRaises(WindowsAPIError):
+            self._create_mapping(path)
+
+    def test_invalid_protection(self):
+        with self.assertRaises(InputError):
+            CreateFileMapping(flProtect=42, dwMaximumSizeLow=4096)
+
+
+class TestOpenFileMapping(MappingCase):
+    """
+    Tests for :func:`pywincffi.kernel32.OpenFileMapping`
+    """
+    def test_open_named_mapping(self):
+        ffi, library = dist.load()
+        name = u"pywincffi-%s" % self.random_string(5)
+        mapping = CreateFileMapping(dwMaximumSizeLow=4096, lpName=name)
+        self.addCleanup(CloseHandle, mapping)
+        ffi.buffer(self._map(mapping, library.FILE_MAP_WRITE), 5)[:] = \
+            b"hello"
+
+        opened = OpenFileMapping(library.FILE_MAP_READ, False, name)
+        self.addCleanup(CloseHandle, opened)
+        address = self._map(opened, library.FILE_MAP_READ)
+        self.assertEqual(ffi.buffer(address, 5)[:], b"hello")
+
+    def test_missing(self):
+        _, library = dist.load()
+        with self.assertRaises(WindowsAPIError):
+            OpenFileMapping(
+                library.FILE_MAP_READ, False,
+                u"pywincffi-%s" % self.random_string(5))
+
+
+class TestMapViewOfFile(MappingCase):
+    """
+    Tests for :func:`pywincffi.kernel32.MapViewOfFile`,
+    :func:`pywincffi.kernel32.FlushViewOfFile` and
+    :func:`pywincffi.kernel32.UnmapViewOfFile`
+    """
+    def test_read(self):
+        ffi, library = dist.load()
+        mapping = self._create_mapping(
+            self._create_file(b"hello world"), writable=False)
+        address = self._map(mapping, library.FILE_MAP_READ)
+        self.assertEqual(ffi.buffer(address, 11)[:], b"hello world")
+
+    def test_write_and_flush(self):
+        ffi, library = dist.load()
+        path = self._create_file(b"hello world")
+        mapping = self._create_mapping(path)
+        address = MapViewOfFile(mapping, library.FILE_MAP_WRITE)
+        ffi.buffer(address, 5)[:] = b"HELLO"
+        FlushViewOfFile(address)
+        UnmapViewOfFile(address)
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"HELLO world")
+
+    def test_copy_on_write(self):
+        ffi, library = dist.load()
+        path = self._create_file(b"hello world")
+        mapping = self._create_mapping(path)
+        address = self._map(mapping, library.FILE_MAP_COPY)
+        ffi.buffer(address, 5)[:] = b"HELLO"
+        self.assertEqual(ffi.buffer(address, 11)[:], b"HELLO world")
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"hello world")
+
+    def test_write_to_read_only_mapping(self):
+        _, library = dist.load()
+        mapping = self._create_mapping(
+            self._create_file(b"hello world"), writable=False)
+        with self.assertRaises(WindowsAPIError):
+            MapViewOfFile(mapping, library.FILE_MAP_WRITE)
+
+    def test_unaligned_offset(self):
+        _, library = dist.load()
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        with self.assertRaises(WindowsAPIError):
+            MapViewOfFile(mapping, library.FILE_MAP_READ, dwFileOffsetLow=1)
+
+    def test_map_view_of_file_ex(self):
+        ffi, library = dist.load()
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        address = MapViewOfFileEx(mapping, library.FILE_MAP_READ)
+        self.addCleanup(UnmapViewOfFile, address)
+        self.assertEqual(ffi.buffer(address, 5)[:], b"hello")
+
+    def test_unmap_invalid_address(self):
+        with self.assertRaises(InputError):
+            UnmapViewOfFile(0)
+
+
+class TestMappedView(MappingCase):
+    """
+    Tests for :class:`pywincffi.kernel32.MappedView`
+    """
+    def test_read_write(self):
+        path = self._create_file(b"hello world")
+        mapping = self._create_mapping(path)
+        with MappedView(mapping, 0, 11) as view:
+            self.assertEqual(len(view), 11)
+            self.assertEqual(view.buffer.tobytes(), b"hello world")
+            view.buffer[0:5] = b"HELLO"
+            view.flush()
+        with open(path, "rb") as file_:
+            self.assertEqual(file_.read(), b"HELLO world")
+
+    def test_unaligned_offset(self):
+        contents = os.urandom(mmap.ALLOCATIONGRANULARITY * 2)
+        mapping = self._create_mapping(self._create_file(contents))
+        offset = mmap.ALLOCATIONGRANULARITY + 10
+        with MappedView(mapping, offset, 100) as view:
+            self.assertEqual(view.offset, offset)
+            self.assertEqual(
+                view.buffer.tobytes(), contents[offset:offset + 100])
+
+    def test_large_offset(self):
+        _, library = dist.load()
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        offset = 2 ** 32 + mmap.ALLOCATIONGRANULARITY + 10
+
+        with patch.object(
+                memory, "MapViewOfFile",
+                side_effect=WindowsAPIError("MapViewOfFile", "", -1)) as mock:
+            with self.assertRaises(WindowsAPIError):
+                MappedView(mapping, offset, 100)
+
+        mock.assert_called_once_with(
+            mapping, library.FILE_MAP_WRITE, dwFileOffsetHigh=1,
+            dwFileOffsetLow=mmap.ALLOCATIONGRANULARITY,
+            dwNumberOfBytesToMap=110)
+
+    def test_past_end_of_mapping(self):
+        mapping = self._create_mapping(
+            self._create_file(b"hello world"), writable=False)
+        with self.assertRaises(WindowsAPIError):
+            MappedView(mapping, 0, mmap.ALLOCATIONGRANULARITY * 2)
+
+    def test_read_only(self):
+        if sys.version_info < (3, 8):
+            self.skipTest("memoryview.toreadonly() requires Python 3.8")
+
+        _, library = dist.load()
+        mapping = self._create_mapping(
+            self._create_file(b"hello world"), writable=False)
+        with MappedView(mapping, 6, 5, library.FILE_MAP_READ) as view:
+            self.assertTrue(view.buffer.readonly)
+            self.assertEqual(view.buffer.tobytes(), b"world")
+
+    def test_close(self):
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        view = MappedView(mapping, 0, 11)
+        self.assertFalse(view.closed)
+        view.close()
+        view.close()
+        self.assertTrue(view.closed)
+        with self.assertRaises(ValueError):
+            view.buffer  # pylint: disable=pointless-statement
+        with self.assertRaises(ValueError):
+            view.flush()
+
+    def test_close_releases_buffer(self):
+        if sys.version_info[0] < 3:
+            self.skipTest("memoryview.release() requires Python 3")
+
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        view = MappedView(mapping, 0, 11)
+        buffer_ = view.buffer
+        view.close()
+        with self.assertRaises(ValueError):
+            buffer_.tobytes()
+
+    def test_unmapped_when_collected(self):
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        with patch.object(
+                memory, "_unmap_view", wraps=memory._unmap_view) as mock:
+            view = MappedView(mapping, 0, 11)
+            buffer_ = view.buffer[6:]
+            del view
+            gc.collect()
+
+            # The slice keeps the view mapped.
+            self.assertFalse(mock.called)
+            self.assertEqual(buffer_.tobytes(), b"world")
+
+            del buffer_
+            gc.collect()
+            self.assertEqual(mock.call_count, 1)
+
+    def test_not_unmapped_again_when_collected(self):
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        with patch.object(
+                memory, "_unmap_view", wraps=memory._unmap_view) as mock:
+            view = MappedView(mapping, 0, 11)
+            view.close()
+            del view
+            gc.collect()
+            self.assertFalse(mock.called)
+
+    def test_unmapped_if_init_fails(self):
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        with patch.object(
+                memory, "UnmapViewOfFile",
+                wraps=memory.UnmapViewOfFile) as unmap, \
+                patch.object(
+                    memory, "memoryview", create=True,
+                    side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                MappedView(mapping, 0, 11)
+        self.assertEqual(unmap.call_count, 1)
+
+    def test_close_with_exported_buffer(self):
+        if sys.version_info[0] < 3:
+            self.skipTest("memoryview.release() requires Python 3")
+
+        ffi, _ = dist.load()
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        view = MappedView(mapping, 0, 11)
+        self.addCleanup(view.close)
+        exported = ffi.from_buffer(view.buffer)
+        with self.assertRaises(BufferError):
+            view.close()
+        self.assertFalse(view.closed)
+        del exported
+
+    def test_invalid_size(self):
+        mapping = self._create_mapping(self._create_file(b"hello world"))
+        with self.assertRaises(InputError):
+            MappedView(mapping, 0, 0)
+        with self.assertRaises(InputError):
+            MappedView(mapping, -1, 1)
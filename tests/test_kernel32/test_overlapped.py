@@ -8,8 +8,10 @@ from pywincffi.dev.testutil import TestCase
 
 from pywincffi.core import dist
 
+from pywincffi.exceptions import InputError, WindowsAPIError
 from pywincffi.kernel32 import (
-    CreateFile, WriteFile, CloseHandle, CreateEvent, GetOverlappedResult)
+    CreateFile, WriteFile, CloseHandle, CreateEvent, GetOverlappedResult,
+    OverlappedPool, SetEvent, WaitForSingleObject)
 from pywincffi.wintypes import OVERLAPPED
 
 
@@ -64,3 +66,143 @@ class TestOverlappedWriteFile(TestCase):
         self.assertEqual(num_bytes_written, len(file_contents))
 
         CloseHandle(handle)
+
+
+class TestOverlappedPool(TestCase):
+    """
+    Tests for :class:`pywincffi.kernel32.OverlappedPool`
+    """
+    def create_pool(self, **kwargs):
+        pool = OverlappedPool(**kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def assert_zeroed(self, overlapped):
+        self.assertEqual(overlapped.Internal, 0)
+        self.assertEqual(overlapped.InternalHigh, 0)
+        self.assertEqual(overlapped.Offset, 0)
+        self.assertEqual(overlapped.OffsetHigh, 0)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(InputError):
+            OverlappedPool(capacity=0)
+
+    def test_release_wrong_type(self):
+        pool = self.create_pool()
+        with self.assertRaises(InputError):
+            pool.release(None)
+
+    def test_acquire_empty_pool(self):
+        pool = self.create_pool()
+        overlapped = pool.acquire()
+        self.assertIsInstance(overlapped, OVERLAPPED)
+        self.assert_zeroed(overlapped)
+        self.assertEqual((pool.hits, pool.misses), (0, 1))
+
+    def test_release_and_reuse(self):
+        pool = self.create_pool()
+        overlapped = pool.acquire()
+        overlapped.Internal = 1
+        overlapped.InternalHigh = 2
+        overlapped.Offset = 3
+        overlapped.OffsetHigh = 4
+        pool.release(overlapped)
+        self.assertEqual(len(pool), 1)
+
+        self.assertIs(pool.acquire(), overlapped)
+        self.assert_zeroed(overlapped)
+        self.assertEqual((pool.hits, pool.misses), (1, 1))
+        self.assertEqual(len(pool), 0)
+
+    def test_events(self):
+        _, library = dist.load()
+        pool = self.create_pool(events=True)
+        overlapped = pool.acquire()
+        event = overlapped.hEvent
+        SetEvent(event)
+        pool.release(overlapped)
+
+        overlapped = pool.acquire()
+        self.assertEqual(overlapped.hEvent, event)
+        self.assertEqual(
+            WaitForSingleObject(overlapped.hEvent, 0), library.WAIT_TIMEOUT)
+        pool.release(overlapped)
+
+    def test_without_events(self):
+        pool = self.create_pool()
+        overlapped = pool.acquire()
+        self.assertEqual(overlapped.hEvent, OVERLAPPED().hEvent)
+
+    def test_without_events_clears_event(self):
+        pool = self.create_pool()
+        overlapped = pool.acquire()
+        overlapped.hEvent = CreateEvent(bManualReset=True)
+        self.addCleanup(CloseHandle, overlapped.hEvent)
+        pool.release(overlapped)
+        self.assertEqual(pool.acquire().hEvent, OVERLAPPED().hEvent)
+
+    def test_double_release(self):
+        pool = self.create_pool()
+        overlapped = pool.acquire()
+        pool.release(overlapped)
+        with self.assertRaises(InputError):
+            pool.release(overlapped)
+        self.assertEqual(len(pool), 1)
+        self.assertIsNot(pool.acquire(), pool.acquire())
+
+        # Once acquired again it can be released again.
+        pool.release(overlapped)
+        self.assertEqual(len(pool), 1)
+
+    def test_release_foreign_structure(self):
+        pool = self.create_pool(events=True)
+        overlapped = OVERLAPPED()
+        event = CreateEvent(bManualReset=True, bInitialState=True)
+        self.addCleanup(CloseHandle, event)
+        overlapped.hEvent = event
+        with self.assertRaises(InputError):
+            pool.release(overlapped)
+        self.assertEqual(len(pool), 0)
+
+        # The caller's event was neither reset nor closed.
+        pool.close()
+        self.assertEqual(WaitForSingleObject(event, 0), 0)
+
+    def test_exhausted(self):
+        pool = self.create_pool(capacity=2)
+        acquired = [pool.acquire() for _ in range(3)]
+        self.assertEqual(len(set(map(id, acquired))), 3)
+        self.assertEqual((pool.hits, pool.misses), (0, 3))
+
+        for overlapped in acquired:
+            pool.release(overlapped)
+
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.discarded, 1)
+
+        reused = [pool.acquire() for _ in range(3)]
+        self.assertEqual((pool.hits, pool.misses), (2, 4))
+        self.assertIsNot(reused[-1], acquired[-1])
+
+    def test_exhausted_closes_discarded_event(self):
+        pool = self.create_pool(capacity=1, events=True)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+
+        with self.assertRaises(WindowsAPIError):
+            CloseHandle(second.hEvent)
+
+        self.SetLastError(0)
+
+    def test_close(self):
+        pool = self.create_pool(events=True)
+        overlapped = pool.acquire()
+        pool.release(overlapped)
+        pool.close()
+        self.assertEqual(len(pool), 0)
+
+        with self.assertRaises(WindowsAPIError):
+            CloseHandle(overlapped.hEvent)
+
+        self.SetLastError(0)
@@ -0,0 +1,118 @@
+from os.path import join
+
+from mock import patch
+
+from pywincffi.core import dist
+from pywincffi.core.simulated import Simulation
+from pywincffi.dev.testutil import TestCase
+from pywincffi.exceptions import InputError, WindowsAPIError
+from pywincffi.kernel32 import (
+    CloseHandle, CreateEvent, CreateFile, CreatePipe, GetOverlappedResult,
+    GetTempPath, ReadFile, WriteFile, unchecked)
+from pywincffi.wintypes import OVERLAPPED
+
+
+class UncheckedTestCase(TestCase):
+    """
+    Runs the checked and unchecked functions against the
+    simulated library so their results can be compared.
+    """
+    def setUp(self):
+        super(UncheckedTestCase, self).setUp()
+        simulation = Simulation()
+        self.addCleanup(simulation.close)
+        mock = patch.dict(
+            dist.Loader.cache, simulation.loader_cache(), clear=True)
+        mock.start()
+        self.addCleanup(mock.stop)
+        _, self.library = dist.load("kernel32")
+
+    def overlapped_file(self, name):
+        handle = CreateFile(
+            join(GetTempPath(), name),
+            self.library.GENERIC_READ | self.library.GENERIC_WRITE,
+            dwFlagsAndAttributes=self.library.FILE_FLAG_OVERLAPPED)
+        self.addCleanup(CloseHandle, handle)
+        overlapped = OVERLAPPED()
+        overlapped.hEvent = CreateEvent()
+        self.addCleanup(CloseHandle, overlapped.hEvent)
+        return handle, overlapped
+
+    def assertSameError(self, checked, unchecked_):
+        with self.assertRaises(WindowsAPIError) as expected:
+            checked()
+        with self.assertRaises(WindowsAPIError) as error:
+            unchecked_()
+        self.assertEqual(repr(error.exception), repr(expected.exception))
+
+
+class TestReadWriteFile(UncheckedTestCase):
+    """
+    Tests for :func:`pywincffi.kernel32.unchecked.ReadFile` and
+    :func:`pywincffi.kernel32.unchecked.WriteFile`
+    """
+    def test_pipe(self):
+        reader, writer = CreatePipe()
+        self.assertEqual(
+            unchecked.WriteFile(writer, b"hello world"),
+            WriteFile(writer, b"hello world"))
+        self.assertEqual(
+            unchecked.WriteFile(writer, b"hello world", 5),
+            WriteFile(writer, b"hello world", 5))
+        self.assertEqual(ReadFile(reader, 11), unchecked.ReadFile(reader, 11))
+        self.assertEqual(ReadFile(reader, 5), unchecked.ReadFile(reader, 5))
+
+    def test_pipe_buffer(self):
+        reader, writer = CreatePipe()
+        view = memoryview(bytearray(b"hello world"))
+        self.assertEqual(
+            unchecked.WriteFile(writer, view[6:]), WriteFile(writer, view[6:]))
+        self.assertEqual(ReadFile(reader, 10), b"worldworld")
+
+    def test_overlapped(self):
+        functions = (
+            (WriteFile, ReadFile), (unchecked.WriteFile, unchecked.ReadFile))
+        for index, (write, read) in enumerate(functions):
+            handle, overlapped = self.overlapped_file(u"file%d" % index)
+            self.assertEqual(
+                write(handle, b"hello", lpOverlapped=overlapped), 5)
+            self.assertEqual(
+                read(handle, 5, lpOverlapped=overlapped), b"hello")
+
+    def test_errors(self):
+        reader, writer = CreatePipe()
+        CloseHandle(reader)
+        CloseHandle(writer)
+        self.assertSameError(
+            lambda: WriteFile(writer, b"foo"),
+            lambda: unchecked.WriteFile(writer, b"foo"))
+        self.assertSameError(
+            lambda: ReadFile(reader, 3),
+            lambda: unchecked.ReadFile(reader, 3))
+
+    def test_write_larger_than_buffer(self):
+        _, writer = CreatePipe()
+        for write in (WriteFile, unchecked.WriteFile):
+            with self.assertRaises(InputError):
+                write(writer, b"foo", 4)
+            with self.assertRaises(InputError):
+                write(writer, memoryview(bytearray(b"foobar"))[3:], 4)
+
+
+class TestGetOverlappedResult(UncheckedTestCase):
+    """Tests for :func:`pywincffi.kernel32.unchecked.GetOverlappedResult`"""
+    def test_result(self):
+        handle, overlapped = self.overlapped_file(u"file")
+        WriteFile(handle, b"hello", lpOverlapped=overlapped)
+        self.assertEqual(
+            unchecked.GetOverlappedResult(handle, overlapped, True),
+            GetOverlappedResult(handle, overlapped, True))
+
+    def test_error(self):
+        _, overlapped = self.overlapped_file(u"file")
+        handle, writer = CreatePipe()
+        CloseHandle(handle)
+        CloseHandle(writer)
+        self.assertSameError(
+            lambda: GetOverlappedResult(handle, overlapped, True),
+            lambda: unchecked.GetOverlappedResult(handle, overlapped, True))
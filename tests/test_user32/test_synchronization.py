@@ -3,6 +3,7 @@ from pywincffi.dev.testutil import TestCase
 from pywincffi.exceptions import InputError, WindowsAPIError
 from pywincffi.kernel32 import CreateEvent, CloseHandle
 from pywincffi.user32 import MsgWaitForMultipleObjects
+from pywincffi.wintypes import HandleArray
 
 
 class TestMsgWaitForMultipleObjects(TestCase):
@@ -64,3 +65,61 @@ class TestMsgWaitForMultipleObjects(TestCase):
         self.assertEqual(
             error.exception.errno, library.ERROR_INVALID_PARAMETER)
         self.SetLastError(0)
+
+    def test_handle_array(self):
+        _, library = dist.load()
+        e1 = CreateEvent(bManualReset=True, bInitialState=False)
+        self.addCleanup(CloseHandle, e1)
+        e2 = CreateEvent(bManualReset=False, bInitialState=True)
+        self.addCleanup(CloseHandle, e2)
+        handles = HandleArray([e1, e2])
+
+        result = MsgWaitForMultipleObjects(
+            handles, False, 0, library.QS_ALLEVENTS)
+        self.assertEqual(handles[result], e2)
+
+        # e2 is an auto reset event so waiting again should time out.
+        result = MsgWaitForMultipleObjects(
+            handles, False, 0, library.QS_ALLEVENTS)
+        self.assertEqual(result, library.WAIT_TIMEOUT)
+
+    def test_handle_array_after_remove(self):
+        _, library = dist.load()
+        e1 = CreateEvent(bManualReset=True, bInitialState=True)
+        self.addCleanup(CloseHandle, e1)
+        e2 = CreateEvent(bManualReset=True, bInitialState=False)
+        self.addCleanup(CloseHandle, e2)
+        handles = HandleArray([e1, e2])
+        handles.remove(e1)
+
+        result = MsgWaitForMultipleObjects(
+            handles, False, 0, library.QS_ALLEVENTS)
+        self.assertEqual(result, library.WAIT_TIMEOUT)
+
+    def test_nCount_larger_than_pHandles(self):
+        _, library = dist.load()
+        e1 = CreateEvent(bManualReset=False, bInitialState=True)
+        self.addCleanup(CloseHandle, e1)
+
+        for handles in ([e1], HandleArray([e1], capacity=1),
+                        HandleArray([e1])):
+            with self.assertRaises(InputError):
+                MsgWaitForMultipleObjects(
+                    handles, False, 0, library.QS_ALLEVENTS, nCount=2)
+
+    def test_handle_array_too_many_handles(self):
+        _, library = dist.load()
+        handles = HandleArray()
+        for _ in range(library.MAXIMUM_WAIT_OBJECTS):
+            event = CreateEvent(bManualReset=False, bInitialState=True)
+            self.addCleanup(CloseHandle, event)
+            handles.append(event)
+
+        with self.assertRaises(InputError):
+            MsgWaitForMultipleObjects(
+                handles, False, 0, library.QS_ALLEVENTS)
+
+        result = MsgWaitForMultipleObjects(
+            handles, False, 0, library.QS_ALLEVENTS,
+            nCount=library.MAXIMUM_WAIT_OBJECTS - 1)
+        self.assertEqual(result, 0)
@@ -8,7 +8,14 @@ from pywincffi.dev.testutil import TestCase
 from pywincffi.exceptions import InputError
 from pywincffi.kernel32 import CloseHandle
 from pywincffi.wintypes import (
-    SOCKET, handle_from_file, socket_from_object)
+    FILETIME, HANDLE, OVERLAPPED, SOCKET, WSAEVENT, StructureArray,
+    datetime64_to_filetimes, filetimes_to_datetime64, handle_from_file,
+    socket_from_object, wintype_to_cdata)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
 
 try:
     WindowsError
@@ -16,6 +23,34 @@ except NameError:  # pragma: no cover
     WindowsError = OSError  # pylint: disable=redefined-builtin
 
 
+class TestWintypeToCdata(TestCase):
+    """
+    Tests for :func:`pywincffi.wintypes.wintype_to_cdata`
+    """
+    def test_none(self):
+        ffi, _ = dist.load()
+        self.assertEqual(wintype_to_cdata(None), ffi.NULL)
+
+    def test_handle(self):
+        for wintype in (HANDLE, WSAEVENT):
+            handle = wintype()
+            self.assertIs(wintype_to_cdata(handle), handle._as_parameter_)
+
+    def test_socket(self):
+        ffi, _ = dist.load()
+        sock = SOCKET()
+        sock._cdata[0] = ffi.cast("SOCKET", 42)
+        self.assertEqual(wintype_to_cdata(sock), 42)
+
+    def test_structure(self):
+        overlapped = OVERLAPPED()
+        self.assertIs(wintype_to_cdata(overlapped), overlapped._cdata)
+
+    def test_unsupported_type(self):
+        with self.assertRaises(AttributeError):
+            wintype_to_cdata(object())
+
+
 class TestGetHandleFromFile(TestCase):
     """
     Tests for :func:`pywincffi.wintypes.handle_from_file`
@@ -98,3 +133,105 @@ class TestSocketFromObject(TestCase):
         self.assertEqual(library.closesocket(sock._cdata[0]), -1)
 
         self.assert_last_error(library.WSAENOTSOCK)
+
+
+class TestFiletimesToDatetime64(TestCase):
+    """
+    Tests for :func:`pywincffi.wintypes.filetimes_to_datetime64` and
+    :func:`pywincffi.wintypes.datetime64_to_filetimes`
+    """
+    NANOSECONDS = (
+        0, 100, -100, 1500000000123456700, -8520336000000000000,
+        9223372036854775800, -9223372036854775800)
+
+    def setUp(self):
+        super(TestFiletimesToDatetime64, self).setUp()
+        if numpy is None:  # pragma: no cover
+            self.skipTest("numpy is not installed")
+
+        ffi, _ = dist.load()
+        self.filetimes = [
+            FILETIME.from_nanoseconds(value) for value in self.NANOSECONDS]
+        self.data = b"".join(
+            ffi.buffer(filetime._cdata)[:] for filetime in self.filetimes)
+
+    def assert_matches_scalar(self, values):
+        self.assertEqual(values.dtype, numpy.dtype("datetime64[ns]"))
+        self.assertEqual(
+            values.view(numpy.int64).tolist(),
+            [filetime.to_nanoseconds() for filetime in self.filetimes])
+
+    def test_buffer(self):
+        self.assert_matches_scalar(filetimes_to_datetime64(self.data))
+
+    def test_structure_array(self):
+        self.assert_matches_scalar(
+            filetimes_to_datetime64(StructureArray(FILETIME, self.data)))
+
+    def test_structure_array_wrong_type(self):
+        with self.assertRaises(InputError):
+            filetimes_to_datetime64(StructureArray(OVERLAPPED, self.data))
+
+    def test_low_and_high(self):
+        self.assert_matches_scalar(filetimes_to_datetime64(
+            [filetime.dwLowDateTime for filetime in self.filetimes],
+            [filetime.dwHighDateTime for filetime in self.filetimes]))
+
+    def test_out_of_range(self):
+        # A FILETIME of zero, 1601, is before the start of datetime64[ns].
+        with self.assertRaises(InputError):
+            filetimes_to_datetime64(bytes(bytearray(8)))
+
+    def test_empty(self):
+        self.assertEqual(len(filetimes_to_datetime64(b"")), 0)
+
+    def test_partial_filetime(self):
+        with self.assertRaises(InputError):
+            filetimes_to_datetime64(self.data[:-1])
+
+    def test_not_a_buffer(self):
+        with self.assertRaises(InputError):
+            filetimes_to_datetime64(1)
+
+    def test_reverse(self):
+        values = numpy.array(self.NANOSECONDS).view("datetime64[ns]")
+        filetimes = datetime64_to_filetimes(values)
+        self.assertEqual(filetimes.tobytes(), self.data)
+        self.assertEqual(
+            filetimes["dwHighDateTime"].tolist(),
+            [filetime.dwHighDateTime for filetime in self.filetimes])
+
+    def test_reverse_rounds_down(self):
+        values = numpy.array([199, -199]).view("datetime64[ns]")
+        self.assertEqual(
+            filetimes_to_datetime64(datetime64_to_filetimes(values))
+            .view(numpy.int64).tolist(),
+            [FILETIME.from_nanoseconds(199).to_nanoseconds(),
+             FILETIME.from_nanoseconds(-199).to_nanoseconds()])
+
+    def test_reverse_other_units(self):
+        values = numpy.array(["2017-07-14T02:40:00"], dtype="datetime64[s]")
+        self.assertEqual(
+            filetimes_to_datetime64(datetime64_to_filetimes(values))[0],
+            values[0])
+
+    def test_reverse_nat(self):
+        with self.assertRaises(InputError):
+            datetime64_to_filetimes(numpy.array(["NaT"], "datetime64[ns]"))
+
+    def test_reverse_before_1601(self):
+        for values in (["1600-12-31"], ["1500-01-01T00:00:00"],
+                       numpy.array(["1500-01-01"], "datetime64[s]")):
+            with self.assertRaises(InputError):
+                datetime64_to_filetimes(values)
+
+    def test_reverse_out_of_range(self):
+        with self.assertRaises(InputError):
+            datetime64_to_filetimes(
+                numpy.array(["3000-01-01"], "datetime64[s]"))
+
+    def test_reverse_strings(self):
+        self.assertEqual(
+            filetimes_to_datetime64(
+                datetime64_to_filetimes(["2017-07-14T02:40:00"]))[0],
+            numpy.datetime64("2017-07-14T02:40:00"))
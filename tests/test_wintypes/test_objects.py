@@ -1,6 +1,7 @@
 from pywincffi.core import dist
 from pywincffi.dev.testutil import TestCase
-from pywincffi.wintypes import WrappedObject, HANDLE, SOCKET, WSAEVENT
+from pywincffi.wintypes import (
+    WrappedObject, HANDLE, HandleArray, SOCKET, WSAEVENT)
 
 
 class TestWrappedObject(TestCase):
@@ -74,9 +75,8 @@ class ObjectBaseTestCase(TestCase):
 
     def test_compare_wrong_type(self):
         h = self.OBJECT_CLASS()  # pylint: disable=not-callable
-        with self.assertRaises(TypeError):
-            if h == 0:
-                pass
+        self.assertFalse(h == 0)
+        self.assertTrue(h != 0)
 
 
 class TestHANDLE(ObjectBaseTestCase):
@@ -91,6 +91,32 @@ class TestHANDLE(ObjectBaseTestCase):
         cdata[0] = ffi.cast(self.OBJECT_CLASS.__name__, int_data)
         return self.OBJECT_CLASS(cdata[0])
 
+    def test_hash(self):
+        handles = {
+            self.cast_from_value(42): "a", self.cast_from_value(43): "b"}
+        self.assertEqual(handles[self.cast_from_value(42)], "a")
+        self.assertEqual(
+            len(set([self.cast_from_value(42), self.cast_from_value(42)])), 1)
+
+    def test_as_parameter(self):
+        ffi, _ = dist.load()
+        handle = self.cast_from_value(42)
+        self.assertIs(handle._as_parameter_, handle._as_parameter_)
+        self.assertEqual(int(ffi.cast("intptr_t", handle._as_parameter_)), 42)
+
+    def test_cdata(self):
+        ffi, _ = dist.load()
+        handle = self.cast_from_value(42)
+        with self.assertRaises(AttributeError):
+            handle._cdata[0] = ffi.cast("HANDLE", 1)
+        self.assertFalse(hasattr(handle, "_cdata"))
+        self.assertEqual(int(ffi.cast("intptr_t", handle._as_parameter_)), 42)
+
+    def test_null(self):
+        ffi, _ = dist.load()
+        self.assertEqual(HANDLE()._as_parameter_, ffi.NULL)
+        self.assertEqual(HANDLE(), self.cast_from_value(0))
+
 
 class TestWSAEVENT(ObjectBaseTestCase):
     """
@@ -116,3 +142,76 @@ class TestSOCKET(ObjectBaseTestCase):
         s = self.OBJECT_CLASS()
         s._cdata[0] = ffi.cast("SOCKET", int_data)
         return s
+
+
+class TestHandleArray(TestCase):
+    """
+    Tests for :class:`pywincffi.wintypes.HandleArray`
+    """
+    def handle(self, value):
+        ffi, _ = dist.load()
+        return HANDLE(ffi.cast("HANDLE", value))
+
+    def assert_cdata(self, array):
+        ffi, _ = dist.load()
+        expected = [handle._as_parameter_ for handle in array]
+        expected += [ffi.NULL] * (array.capacity - len(array))
+        self.assertEqual(list(array._cdata), expected)
+
+    def test_default_capacity(self):
+        _, library = dist.load()
+        array = HandleArray()
+        self.assertEqual(array.capacity, library.MAXIMUM_WAIT_OBJECTS)
+        self.assertEqual(len(array), 0)
+        self.assert_cdata(array)
+
+    def test_initial_handles(self):
+        handles = [self.handle(4), self.handle(8)]
+        array = HandleArray(handles, capacity=4)
+        self.assertEqual(list(array), handles)
+        self.assert_cdata(array)
+
+    def test_append(self):
+        array = HandleArray(capacity=2)
+        array.append(self.handle(4))
+        array.append(self.handle(8))
+        self.assertEqual(list(array), [self.handle(4), self.handle(8)])
+        self.assertIn(self.handle(8), array)
+        self.assert_cdata(array)
+
+    def test_append_full(self):
+        array = HandleArray([self.handle(4)], capacity=1)
+        with self.assertRaises(IndexError):
+            array.append(self.handle(8))
+
+    def test_append_wrong_type(self):
+        with self.assertRaises(TypeError):
+            HandleArray().append(4)
+
+    def test_remove_swaps_with_last(self):
+        handles = [self.handle(value) for value in (4, 8, 12, 16)]
+        array = HandleArray(handles, capacity=4)
+        array.remove(handles[1])
+        self.assertEqual(list(array), [handles[0], handles[3], handles[2]])
+        self.assert_cdata(array)
+
+    def test_remove_last(self):
+        handles = [self.handle(4), self.handle(8)]
+        array = HandleArray(handles, capacity=2)
+        array.remove(handles[1])
+        self.assertEqual(list(array), [handles[0]])
+        self.assert_cdata(array)
+
+    def test_remove_missing(self):
+        with self.assertRaises(ValueError):
+            HandleArray().remove(self.handle(4))
+
+    def test_setitem(self):
+        array = HandleArray([self.handle(4), self.handle(8)], capacity=2)
+        array[-1] = self.handle(12)
+        self.assertEqual(array[1], self.handle(12))
+        self.assert_cdata(array)
+
+    def test_as_parameter(self):
+        array = HandleArray()
+        self.assertIs(array._as_parameter_, array._cdata)
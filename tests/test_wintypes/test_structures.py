@@ -1,5 +1,8 @@
+from datetime import datetime, timedelta, tzinfo
+
 from pywincffi.core import dist
 from pywincffi.dev.testutil import TestCase
+from pywincffi.exceptions import InputError
 from pywincffi.wintypes import (
     HANDLE, SECURITY_ATTRIBUTES, OVERLAPPED, FILETIME, LPWSANETWORKEVENTS,
     PROCESS_INFORMATION, STARTUPINFO)
@@ -85,6 +88,69 @@ class TestFILETIME(TestCase):
         with self.assertRaises(AttributeError):
             ft.no_such_attr = None
 
+    def test_from_nanoseconds_epoch(self):
+        ft = FILETIME.from_nanoseconds(0)
+        self.assertEqual(
+            ft.dwHighDateTime << 32 | ft.dwLowDateTime, 116444736000000000)
+
+    def test_from_nanoseconds_rounds_down(self):
+        self.assertEqual(FILETIME.from_nanoseconds(199).to_nanoseconds(), 100)
+        self.assertEqual(
+            FILETIME.from_nanoseconds(-199).to_nanoseconds(), -200)
+
+    def test_from_nanoseconds_out_of_range(self):
+        with self.assertRaises(InputError):
+            FILETIME.from_nanoseconds(-116444736000000000 * 100 - 100)
+
+        with self.assertRaises(InputError):
+            FILETIME.from_nanoseconds(2 ** 64 * 100)
+
+    def test_from_nanoseconds_type(self):
+        with self.assertRaises(InputError):
+            FILETIME.from_nanoseconds(1.0)
+
+    def test_to_nanoseconds(self):
+        ft = FILETIME()
+        ft.dwLowDateTime = 0xD53E8000
+        ft.dwHighDateTime = 0x019DB1DE
+        self.assertEqual(ft.to_nanoseconds(), 0)
+
+    def test_to_datetime(self):
+        ft = FILETIME.from_nanoseconds(1500000000123456789)
+        self.assertEqual(
+            ft.to_datetime(), datetime(2017, 7, 14, 2, 40, 0, 123456))
+
+    def test_to_datetime_start(self):
+        self.assertEqual(FILETIME().to_datetime(), datetime(1601, 1, 1))
+
+    def test_to_datetime_after_9999(self):
+        ft = FILETIME()
+        ft.dwLowDateTime = 0xFFFFFFFF
+        ft.dwHighDateTime = 0xFFFFFFFF
+        with self.assertRaises(OverflowError):
+            ft.to_datetime()
+
+    def test_from_datetime(self):
+        value = datetime(2017, 7, 14, 2, 40, 0, 123456)
+        ft = FILETIME.from_datetime(value)
+        self.assertEqual(ft.to_nanoseconds(), 1500000000123456000)
+        self.assertEqual(ft.to_datetime(), value)
+
+    def test_from_datetime_aware(self):
+        class EST(tzinfo):  # pylint: disable=missing-docstring
+            def utcoffset(self, dt):
+                return timedelta(hours=-5)
+
+            def dst(self, dt):
+                return timedelta(0)
+
+        ft = FILETIME.from_datetime(datetime(1970, 1, 1, tzinfo=EST()))
+        self.assertEqual(ft.to_nanoseconds(), 5 * 3600 * 10 ** 9)
+
+    def test_from_datetime_type(self):
+        with self.assertRaises(InputError):
+            FILETIME.from_datetime(0)
+
 
 class TestLPWSANETWORKEVENTS(TestCase):
     """
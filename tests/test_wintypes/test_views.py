@@ -0,0 +1,130 @@
+import struct
+
+from pywincffi.core import dist
+from pywincffi.dev.testutil import TestCase
+from pywincffi.exceptions import InputError
+from pywincffi.wintypes import (
+    FILETIME, HANDLE, LPWSANETWORKEVENTS, StructureArray,
+    structure_from_buffer, wintype_to_cdata)
+
+
+class TestStructureFromBuffer(TestCase):
+    """
+    Tests for :func:`pywincffi.wintypes.structure_from_buffer`
+    """
+    def test_type(self):
+        filetime = structure_from_buffer(FILETIME, bytearray(8))
+        self.assertIsInstance(filetime, FILETIME)
+
+    def test_reads_buffer(self):
+        data = bytearray(struct.pack("<III", 1, 2, 3))
+        filetime = structure_from_buffer(FILETIME, data, offset=4)
+        self.assertEqual(filetime.dwLowDateTime, 2)
+        self.assertEqual(filetime.dwHighDateTime, 3)
+
+    def test_writes_buffer(self):
+        data = bytearray(12)
+        filetime = structure_from_buffer(FILETIME, data, offset=4)
+        filetime.dwLowDateTime = 42
+        self.assertEqual(struct.unpack("<III", bytes(data)), (0, 42, 0))
+
+    def test_keeps_buffer_alive(self):
+        filetime = structure_from_buffer(
+            FILETIME, bytearray(struct.pack("<II", 1, 2)))
+        self.assertEqual(filetime.dwHighDateTime, 2)
+
+    def test_to_cdata(self):
+        ffi, _ = dist.load()
+        data = bytearray(16)
+        filetime = structure_from_buffer(FILETIME, data, offset=8)
+        self.assertEqual(
+            ffi.cast("char *", wintype_to_cdata(filetime)),
+            ffi.cast("char *", ffi.from_buffer(data)) + 8)
+
+    def test_offset_out_of_range(self):
+        with self.assertRaises(InputError):
+            structure_from_buffer(FILETIME, bytearray(8), offset=4)
+
+        with self.assertRaises(InputError):
+            structure_from_buffer(FILETIME, bytearray(8), offset=-1)
+
+    def test_read_only_buffer(self):
+        filetime = structure_from_buffer(FILETIME, struct.pack("<II", 1, 2))
+        self.assertIsInstance(filetime, FILETIME)
+        self.assertEqual(filetime.dwHighDateTime, 2)
+        with self.assertRaises(TypeError):
+            filetime.dwLowDateTime = 42
+        self.assertEqual(filetime.dwLowDateTime, 1)
+
+    def test_not_a_buffer(self):
+        with self.assertRaises(InputError):
+            structure_from_buffer(FILETIME, 1)
+
+    def test_not_contiguous(self):
+        with self.assertRaises(InputError):
+            structure_from_buffer(FILETIME, memoryview(bytearray(16))[::2])
+
+    def test_not_a_structure(self):
+        with self.assertRaises(InputError):
+            structure_from_buffer(int, bytearray(8))
+
+
+class TestStructureArray(TestCase):
+    """
+    Tests for :class:`pywincffi.wintypes.StructureArray`
+    """
+    def setUp(self):
+        super(TestStructureArray, self).setUp()
+        self.data = bytearray(struct.pack("<7I", 0, 1, 2, 3, 4, 5, 6))
+        self.array = StructureArray(FILETIME, self.data, offset=4)
+
+    def test_len(self):
+        self.assertEqual(len(self.array), 3)
+
+    def test_count(self):
+        self.assertEqual(
+            len(StructureArray(FILETIME, self.data, offset=4, count=2)), 2)
+
+    def test_count_too_large(self):
+        with self.assertRaises(InputError):
+            StructureArray(FILETIME, self.data, offset=4, count=4)
+
+    def test_getitem(self):
+        self.assertEqual(self.array[1].dwLowDateTime, 3)
+        self.assertEqual(self.array[-1].dwHighDateTime, 6)
+
+    def test_getitem_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.array[3]  # pylint: disable=pointless-statement
+
+        with self.assertRaises(IndexError):
+            self.array[-4]  # pylint: disable=pointless-statement
+
+    def test_iter(self):
+        self.assertEqual(
+            [(time.dwLowDateTime, time.dwHighDateTime)
+             for time in self.array],
+            [(1, 2), (3, 4), (5, 6)])
+
+    def test_writes_buffer(self):
+        self.array[2].dwLowDateTime = 42
+        self.assertEqual(struct.unpack_from("<I", self.data, 20), (42, ))
+
+    def test_read_only_buffer(self):
+        array = StructureArray(FILETIME, bytes(self.data), offset=4)
+        self.assertEqual(array[2].dwHighDateTime, 6)
+        for filetime in (array[0], next(iter(array))):
+            with self.assertRaises(TypeError):
+                filetime.dwHighDateTime = 42
+
+    def test_pointer_typedef(self):
+        ffi, _ = dist.load()
+        size = ffi.sizeof("WSANETWORKEVENTS")
+        array = StructureArray(LPWSANETWORKEVENTS, bytearray(size * 2))
+        self.assertEqual(len(array), 2)
+        self.assertIsInstance(array[1], LPWSANETWORKEVENTS)
+        self.assertEqual(array[1].lNetworkEvents, 0)
+
+    def test_not_a_structure(self):
+        with self.assertRaises(InputError):
+            StructureArray(HANDLE, self.data)
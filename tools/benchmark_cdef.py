@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""
+Compares how long it takes to produce the cdefs, and the :class:`FFI`
+instances built from them, when reading and normalizing the headers at
+runtime versus loading the cdefs generated at build time:
+
+    python tools/benchmark_cdef.py --number 100
+
+Constructing the :class:`FFI` instances requires the Windows types
+so that part of the benchmark is skipped on other platforms.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+from functools import partial
+from os.path import dirname, abspath
+
+from mock import patch
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+
+
+def measure(function, number):
+    """Returns the best time, in milliseconds, to call ``function``"""
+    results = timeit.repeat(function, number=number, repeat=3)
+    return min(results) / number * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=100,
+        help="The number of times to run each function per measurement.")
+    args = parser.parse_args()
+
+    tests = [("_cdef", lambda name: dist._cdef(*dist.MODULES[name].headers))]
+    if os.name == "nt":
+        tests.append(("_module_ffi", dist._module_ffi))
+    else:
+        print("Skipping _module_ffi, the Windows types are not available.")
+
+    directory = tempfile.mkdtemp(prefix="pywincffi-benchmark-")
+    try:
+        dist._write_cdefs(directory)
+
+        print("%-12s %-10s %14s %14s" % (
+            "function", "module", "headers (ms)", "generated (ms)"))
+        for label, function in tests:
+            for name in dist.LIBRARY_ORDER:
+                call = partial(function, name)
+
+                with patch.object(dist, "_generated_cdef", return_value=None):
+                    headers = measure(call, args.number)
+
+                with patch.object(dist, "GENERATED_DIRECTORY", directory):
+                    generated = measure(call, args.number)
+
+                print("%-12s %-10s %14.3f %14.3f" % (
+                    label, name, headers, generated))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
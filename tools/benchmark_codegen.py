@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+"""
+Measures the per-call overhead of the hand written ``ReadFile``,
+``WriteFile`` and ``DuplicateHandle`` wrappers compared to the wrappers
+produced by :mod:`pywincffi.dev.codegen`:
+
+    python tools/benchmark_codegen.py --number 100000
+
+Both sets of wrappers call a stand in library, which returns immediately,
+so only the overhead of the wrappers themselves is measured.  The compiled
+library is only available on Windows so on other platforms a stand in for
+the ffi instance, containing just the types the wrappers need, is
+used too.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+from cffi import FFI
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.dev import codegen
+from pywincffi.kernel32 import ReadFile, WriteFile, DuplicateHandle
+from pywincffi.wintypes import HANDLE
+
+FUNCTIONS = ("ReadFile", "WriteFile", "DuplicateHandle")
+STAND_IN_CDEF = """
+typedef void *HANDLE;
+typedef HANDLE *LPHANDLE;
+typedef unsigned long DWORD;
+typedef DWORD *LPDWORD;
+typedef int BOOL;
+typedef struct _OVERLAPPED { HANDLE hEvent; } OVERLAPPED, *LPOVERLAPPED;
+"""
+
+
+# pylint: disable=invalid-name,too-many-arguments,unused-argument
+class StandInLibrary(object):
+    """Used in place of the compiled library"""
+    DUPLICATE_CLOSE_SOURCE = 1
+    DUPLICATE_SAME_ACCESS = 2
+
+    def ReadFile(
+            self, hFile, lpBuffer, nNumberOfBytesToRead, lpNumberOfBytesRead,
+            lpOverlapped):
+        lpNumberOfBytesRead[0] = nNumberOfBytesToRead
+        return 1
+
+    def WriteFile(
+            self, hFile, lpBuffer, nNumberOfBytesToWrite,
+            lpNumberOfBytesWritten, lpOverlapped):
+        lpNumberOfBytesWritten[0] = nNumberOfBytesToWrite
+        return 1
+
+    def DuplicateHandle(
+            self, hSourceProcessHandle, hSourceHandle, hTargetProcessHandle,
+            lpTargetHandle, dwDesiredAccess, bInheritHandle, dwOptions):
+        lpTargetHandle[0] = hSourceHandle
+        return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=100000,
+        help="The number of times to call each function per measurement.")
+    args = parser.parse_args()
+
+    if os.name == "nt":
+        ffi, _ = dist.load("core")
+    else:
+        print("Using a stand in ffi instance, the compiled library is only "
+              "available on Windows.")
+        ffi = FFI()
+        ffi.cdef(STAND_IN_CDEF)
+        ffi.getwinerror = lambda: (0, "")
+
+    library = StandInLibrary()
+    for name in ("core", "kernel32"):
+        dist.Loader.cache[name] = (ffi, library)
+
+    functions = codegen.parse(dist.MODULES["kernel32"].headers[0])
+    generated = codegen.build(
+        codegen.generate(functions, FUNCTIONS), ffi, library)
+
+    handle = HANDLE(ffi.cast("HANDLE", 1))
+    calls = (
+        ("ReadFile(handle, 64)",
+         lambda: ReadFile(handle, 64),
+         lambda: generated["ReadFile"](handle, 64)),
+        ("WriteFile(handle, data)",
+         lambda: WriteFile(handle, b"data"),
+         lambda: generated["WriteFile"](handle, b"data")),
+        ("DuplicateHandle(...)",
+         lambda: DuplicateHandle(handle, handle, handle, 0, False, 2),
+         lambda: generated["DuplicateHandle"](
+             handle, handle, handle, 0, False, 2)),
+    )
+
+    print("%-26s %16s %16s" % ("call", "hand written (us)", "generated (us)"))
+    for label, hand_written, generated_call in calls:
+        results = []
+        for call in (hand_written, generated_call):
+            best = min(timeit.repeat(call, number=args.number, repeat=3))
+            results.append(best / args.number * 1e6)
+        print("%-26s %16.3f %16.3f" % (label, results[0], results[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+"""
+Measures the cost of :func:`pywincffi.core.checks.error_check` on the
+success path of ``WriteFile``, ``SetEvent`` and ``CloseHandle``:
+
+    python tools/benchmark_error_check.py --number 100000
+
+Each wrapper is timed as it is and again with ``error_check`` replaced
+by the previous implementation, which retrieved the error number and
+message before looking at the code.  On platforms other than Windows
+the library from :mod:`pywincffi.core.simulated` is used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+from mock import patch
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import checks, dist
+from pywincffi.exceptions import WindowsAPIError
+from pywincffi.kernel32 import (
+    CloseHandle, CreateEvent, CreatePipe, SetEvent, WriteFile, events,
+    file as file_, handle as handle_)
+
+
+def eager_error_check(function, code=None, expected=None):
+    """The implementation of error_check before the fast path was added"""
+    ffi, _ = dist.load("core")
+    errno, error_message = ffi.getwinerror()
+
+    if code is not None:
+        if expected == checks.NON_ZERO and code == 0:
+            raise WindowsAPIError(
+                function, error_message, errno,
+                return_code=code, expected_return_code=expected)
+        return
+
+    if errno != 0:
+        raise WindowsAPIError(
+            function, error_message, errno, return_code=code,
+            expected_return_code=expected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=100000,
+        help="The number of times to call each function per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        simulation = Simulation()
+        dist.Loader.cache.clear()
+        dist.Loader.cache.update(simulation.loader_cache())
+
+    _, writer = CreatePipe()
+    event = CreateEvent()
+
+    def close_handle():
+        CloseHandle(CreateEvent())
+
+    calls = (
+        ("WriteFile(handle, data)", lambda: WriteFile(writer, b"data")),
+        ("SetEvent(event)", lambda: SetEvent(event)),
+        ("CloseHandle(CreateEvent())", close_handle),
+        ("error_check(...)",
+         lambda: checks.error_check("SetEvent", 1, checks.NON_ZERO)),
+    )
+    modules = (checks, events, file_, handle_)
+
+    print("%-28s %12s %12s" % ("call", "eager (us)", "lazy (us)"))
+    for label, call in calls:
+        results = []
+        for implementation in (eager_error_check, checks.error_check):
+            patches = [
+                patch.object(module, "error_check", implementation)
+                for module in modules]
+            for mock in patches:
+                mock.start()
+            try:
+                best = min(timeit.repeat(call, number=args.number, repeat=3))
+            finally:
+                for mock in patches:
+                    mock.stop()
+            results.append(best / args.number * 1e6)
+        print("%-28s %12.3f %12.3f" % (label, results[0], results[1]))
+
+
+if __name__ == "__main__":
+    main()
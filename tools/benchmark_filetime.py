@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+"""
+Measures the throughput of converting FILETIME values to and from
+``datetime64[ns]`` one value at a time, using
+:meth:`pywincffi.wintypes.FILETIME.to_nanoseconds` and
+:meth:`pywincffi.wintypes.FILETIME.from_nanoseconds`, compared to
+converting them all at once with
+:func:`pywincffi.wintypes.filetimes_to_datetime64` and
+:func:`pywincffi.wintypes.datetime64_to_filetimes`:
+
+    python tools/benchmark_filetime.py --count 100000
+
+Requires numpy.  On platforms other than Windows the types come from
+:mod:`pywincffi.core.simulated`.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+import numpy
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.wintypes import (
+    FILETIME, StructureArray, datetime64_to_filetimes,
+    filetimes_to_datetime64)
+
+
+def scalar_to_datetime64(data):
+    """Converts each FILETIME in ``data`` individually"""
+    return numpy.array(
+        [filetime.to_nanoseconds()
+         for filetime in StructureArray(FILETIME, data)],
+        dtype=numpy.int64).view("datetime64[ns]")
+
+
+def scalar_to_filetimes(values):
+    """Converts each of ``values`` to a FILETIME individually"""
+    ffi, _ = dist.load("core")
+    return b"".join(
+        ffi.buffer(FILETIME.from_nanoseconds(value)._cdata)[:]
+        for value in values.view(numpy.int64).tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--count", type=int, default=100000,
+        help="The number of values to convert.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    start = numpy.datetime64("2000-01-01", "ns").astype(numpy.int64)
+    values = (start + numpy.arange(args.count, dtype=numpy.int64) *
+              numpy.int64(10 ** 9 + 100)).view("datetime64[ns]")
+    data = datetime64_to_filetimes(values).tobytes()
+    assert scalar_to_filetimes(values) == data
+    assert (scalar_to_datetime64(data) == values).all()
+    assert (filetimes_to_datetime64(data) == values).all()
+
+    print("%-28s %16s %16s" % (
+        "conversion", "scalar (/s)", "vectorized (/s)"))
+    for label, scalar, vectorized in (
+            ("FILETIME -> datetime64",
+             lambda: scalar_to_datetime64(data),
+             lambda: filetimes_to_datetime64(data)),
+            ("datetime64 -> FILETIME",
+             lambda: scalar_to_filetimes(values),
+             lambda: datetime64_to_filetimes(values))):
+        results = []
+        for call in (scalar, vectorized):
+            best = min(timeit.repeat(call, number=1, repeat=3))
+            results.append(args.count / best)
+        print("%-28s %16d %16d" % (label, results[0], results[1]))
+
+
+if __name__ == "__main__":
+    main()
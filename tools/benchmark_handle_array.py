@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""
+Measures :func:`pywincffi.user32.MsgWaitForMultipleObjects` waiting on 8,
+32 and 63 events with a list of handles, which is converted and checked on
+every call, and with a :class:`pywincffi.wintypes.HandleArray`:
+
+    python tools/benchmark_handle_array.py --number 10000
+
+None of the events are signaled and the timeout is zero so the time is
+mostly spent preparing the call.  On platforms other than Windows the
+library from :mod:`pywincffi.core.simulated` is used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.kernel32 import CloseHandle, CreateEvent
+from pywincffi.user32 import MsgWaitForMultipleObjects
+from pywincffi.wintypes import HandleArray
+
+COUNTS = (8, 32, 63)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=10000,
+        help="The number of times to wait per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    _, library = dist.load()
+    events = [CreateEvent(bManualReset=True, bInitialState=False)
+              for _ in range(max(COUNTS))]
+
+    print("%-28s %14s %14s" % ("handles", "list (us)", "array (us)"))
+    try:
+        for count in COUNTS:
+            handles = events[:count]
+            results = []
+            for value in (handles, HandleArray(handles)):
+                def call(value=value):
+                    return MsgWaitForMultipleObjects(
+                        value, False, 0, library.QS_ALLEVENTS)
+
+                assert call() == library.WAIT_TIMEOUT
+                best = min(timeit.repeat(call, number=args.number, repeat=3))
+                results.append(best / args.number * 1e6)
+            print("%-28d %14.3f %14.3f" % (count, results[0], results[1]))
+    finally:
+        for event in events:
+            CloseHandle(event)
+
+
+if __name__ == "__main__":
+    main()
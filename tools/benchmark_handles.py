@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+"""
+Measures the memory used by each :class:`pywincffi.wintypes.HANDLE`, the
+time taken to create handles and the time taken to look them up in a
+dictionary compared to the previous implementation, which allocated a
+``HANDLE[1]`` array for every handle and couldn't be hashed:
+
+    python tools/benchmark_handles.py --count 20000
+
+The previous implementation's dictionary is keyed by the integer value
+of each handle since the handles themselves can't be used as keys.  On
+platforms other than Windows the library from
+:mod:`pywincffi.core.simulated` is used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.wintypes import HANDLE, WrappedObject
+
+
+class LegacyHANDLE(WrappedObject):
+    """HANDLE as it was before it stored the handle's value"""
+    C_TYPE = "HANDLE[1]"
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            raise TypeError(
+                "%r must be a %s object" % (other, self.__class__.__name__))
+        return self._cdata[0] == other._cdata[0]
+
+    __hash__ = None
+
+
+def retained(handle):
+    """
+    Returns the number of bytes kept alive by ``handle``.  This is
+    calculated rather than measured since :mod:`tracemalloc` can't see
+    the memory cffi allocates.
+    """
+    ffi, _ = dist.load("core")
+    size = sys.getsizeof(handle)
+    if isinstance(handle, HANDLE):
+        return size + sys.getsizeof(handle._as_parameter_)
+    return size + sys.getsizeof(handle._cdata) + ffi.sizeof(handle._cdata)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--count", type=int, default=20000,
+        help="The number of handles to create.")
+    parser.add_argument(
+        "--number", type=int, default=10,
+        help="The number of times to run each operation per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    ffi, _ = dist.load("core")
+    cdata = [ffi.cast("HANDLE", value)
+             for value in range(4, 4 * (args.count + 1), 4)]
+
+    legacy = [LegacyHANDLE(value) for value in cdata]
+    legacy_table = dict(
+        (int(ffi.cast("intptr_t", handle._cdata[0])), handle)
+        for handle in legacy)
+    current = [HANDLE(value) for value in cdata]
+    current_table = dict((handle, handle) for handle in current)
+
+    def legacy_lookup():
+        for handle in legacy:
+            legacy_table[int(ffi.cast("intptr_t", handle._cdata[0]))]
+
+    def current_lookup():
+        for handle in current:
+            current_table[handle]  # pylint: disable=pointless-statement
+
+    operations = (
+        ("construct (us)",
+         lambda: [LegacyHANDLE(value) for value in cdata],
+         lambda: [HANDLE(value) for value in cdata]),
+        ("dict lookup (us)", legacy_lookup, current_lookup),
+    )
+
+    print("%-28s %14s %14s" % ("measurement", "previous", "current"))
+    print("%-28s %14d %14d" % (
+        "bytes per handle", retained(legacy[-1]), retained(current[-1])))
+    for label, before, after in operations:
+        results = []
+        for call in (before, after):
+            best = min(timeit.repeat(call, number=args.number, repeat=3))
+            results.append(best / (args.number * args.count) * 1e6)
+        print("%-28s %14.3f %14.3f" % (label, results[0], results[1]))
+
+
+if __name__ == "__main__":
+    main()
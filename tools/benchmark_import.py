@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""
+Measures how long it takes a fresh interpreter to load pywincffi's
+compiled modules.  Each scenario runs in a new process so the result
+includes importing the extension module(s) and loading the DLL(s)
+they're linked against:
+
+    python tools/benchmark_import.py --runs 20
+
+The ``all`` scenario matches the behavior of ``dist.load()`` before the
+library was split into per-DLL modules.  The other scenarios show the
+cost of loading only the module a subpackage needs.
+"""
+
+from __future__ import print_function
+
+import argparse
+import subprocess
+import sys
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Run in the child process.  The result is printed
+# in milliseconds so the parent can collect it.
+SCRIPT = """
+import sys
+import time
+timer = getattr(time, "perf_counter", time.time)
+sys.path.insert(0, %(root)r)
+start = timer()
+from pywincffi.core import dist
+dist.load(%(library)s)
+print((timer() - start) * 1000)
+"""
+
+SCENARIOS = (
+    ("all", None),
+    ("core", "core"),
+    ("kernel32", "kernel32"),
+    ("user32", "user32"),
+    ("ws2_32", "ws2_32")
+)
+
+
+def run(library):
+    """Runs one scenario in a new process, returns the time it took"""
+    output = subprocess.check_output([
+        sys.executable, "-c",
+        SCRIPT % dict(root=ROOT, library=repr(library))])
+    return float(output.decode("ascii").strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--runs", type=int, default=10,
+        help="The number of times to run each scenario.")
+    args = parser.parse_args()
+
+    # Make sure all the modules have been compiled and cached
+    # first so compile time is not included in the results.
+    run(None)
+
+    print("%-10s %10s %10s" % ("scenario", "min (ms)", "mean (ms)"))
+    for name, library in SCENARIOS:
+        results = [run(library) for _ in range(args.runs)]
+        print("%-10s %10.2f %10.2f" % (
+            name, min(results), sum(results) / len(results)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""
+Measures the throughput of streaming a file with
+:func:`pywincffi.kernel32.iter_chunks`, which reads every chunk into the
+same buffer, compared to calling :func:`pywincffi.kernel32.ReadFile`,
+which allocates a new bytes object for every chunk, using several chunk
+sizes:
+
+    python tools/benchmark_iter_chunks.py --size 64
+
+On platforms other than Windows the library from
+:mod:`pywincffi.core.simulated` is used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+from os.path import dirname, abspath, join
+
+from six import text_type
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.kernel32 import (
+    CloseHandle, CreateFile, ReadFile, SetFilePointerEx, iter_chunks)
+
+CHUNK_SIZES = (4096, 64 * 1024, 1024 * 1024)
+
+
+def read_file(hFile, chunk_size):
+    """Reads ``hFile`` using ReadFile()"""
+    SetFilePointerEx(hFile, 0)
+    total = 0
+    while True:
+        chunk = ReadFile(hFile, chunk_size)
+        if not chunk:
+            return total
+        total += len(chunk)
+
+
+def read_iter_chunks(hFile, chunk_size):
+    """Reads ``hFile`` using iter_chunks()"""
+    return sum(len(chunk) for chunk in iter_chunks(hFile, chunk_size))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--size", type=int, default=64,
+        help="The size of the file in MiB.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    _, library = dist.load("kernel32")
+    size = args.size * 1024 * 1024
+    directory = tempfile.mkdtemp(prefix="pywincffi-benchmark-")
+    try:
+        path = text_type(join(directory, "data"))
+        with open(path, "wb") as file_:
+            file_.write(os.urandom(size))
+
+        hFile = CreateFile(
+            path, library.GENERIC_READ,
+            dwCreationDisposition=library.OPEN_EXISTING)
+        try:
+            assert read_iter_chunks(hFile, CHUNK_SIZES[0]) == size
+
+            print("%-28s %14s %14s" % (
+                "chunk size", "ReadFile MiB/s", "chunks MiB/s"))
+            for chunk_size in CHUNK_SIZES:
+                results = []
+                for function in (read_file, read_iter_chunks):
+                    best = min(timeit.repeat(
+                        # pylint: disable=cell-var-from-loop
+                        lambda: function(hFile, chunk_size),
+                        number=1, repeat=3))
+                    results.append(args.size / best)
+                print("%-28s %14.1f %14.1f" % (
+                    "%d bytes" % chunk_size, results[0], results[1]))
+        finally:
+            CloseHandle(hFile)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""
+Measures the throughput of :func:`pywincffi.core.dist.load` and of looking
+up a constant or function on the library it returns.  Looking up an
+attribute on a module is measured as well for comparison:
+
+    python tools/benchmark_load.py --number 1000000
+
+The compiled library is only available on Windows so on other platforms
+a stand in library, built from the names in the headers, is used instead.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import abi, dist
+
+
+class StandInLibrary(object):  # pylint: disable=too-few-public-methods
+    """Used in place of the compiled library on platforms except Windows"""
+    def __init__(self):
+        for definition in dist.MODULES.values():
+            cdef = dist._cdef(*definition.headers)
+            for line in cdef.splitlines():
+                match = abi.REGEX_CONSTANT.match(line)
+                if match:
+                    setattr(self, match.group(1), 0)
+
+            for name in abi.functions(cdef):
+                setattr(self, name, len)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=1000000,
+        help="The number of times to run each statement per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using a stand in library, the compiled library is only "
+              "available on Windows.")
+        dist.Loader.set(
+            None, dist.LibraryWrapper(StandInLibrary()), name="kernel32")
+
+    _, library = dist.load("kernel32")
+    namespace = dict(dist=dist, library=library, os=os)
+    statements = (
+        ("os.sep", "module attribute"),
+        ("dist.load('kernel32')", "load()"),
+        ("library.GENERIC_READ", "constant"),
+        ("library.INVALID_HANDLE_VALUE", "runtime constant"),
+        ("library.CreateFile", "function"),
+        ("library.handle_from_fd", "utility function"),
+    )
+
+    print("%-20s %12s %16s" % ("lookup", "ns per call", "calls per second"))
+    for statement, label in statements:
+        best = min(timeit.repeat(
+            statement, globals=namespace, number=args.number, repeat=3))
+        per_call = best / args.number
+        print("%-20s %12.1f %16.0f" % (label, per_call * 1e9, 1 / per_call))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""
+Measures the time taken to read small records from random offsets in a
+file using :class:`pywincffi.kernel32.MappedView`, compared to calling
+:func:`pywincffi.kernel32.SetFilePointerEx` and
+:func:`pywincffi.kernel32.ReadFile` for each record:
+
+    python tools/benchmark_mapped_view.py --size 64 --record-size 64
+
+On platforms other than Windows the library from
+:mod:`pywincffi.core.simulated` is used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+from os.path import dirname, abspath, join
+
+from six import text_type
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.kernel32 import (
+    CloseHandle, CreateFile, CreateFileMapping, MappedView, ReadFile,
+    SetFilePointerEx)
+
+
+def read_file(hFile, offsets, record_size):
+    """Reads each record using SetFilePointerEx() and ReadFile()"""
+    for offset in offsets:
+        SetFilePointerEx(hFile, offset)
+        ReadFile(hFile, record_size)
+
+
+def read_view(view, offsets, record_size):
+    """Reads each record by slicing a MappedView"""
+    buffer_ = view.buffer
+    for offset in offsets:
+        buffer_[offset:offset + record_size].tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--size", type=int, default=64,
+        help="The size of the file in MiB.")
+    parser.add_argument(
+        "--record-size", type=int, default=64,
+        help="The number of bytes in each record.")
+    parser.add_argument(
+        "--records", type=int, default=100000,
+        help="The number of records read per run.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    _, library = dist.load("kernel32")
+    size = args.size * 1024 * 1024
+    offsets = [random.randrange(size - args.record_size)
+               for _ in range(args.records)]
+    directory = tempfile.mkdtemp(prefix="pywincffi-benchmark-")
+    try:
+        path = text_type(join(directory, "data"))
+        with open(path, "wb") as file_:
+            file_.write(os.urandom(size))
+
+        hFile = CreateFile(
+            path, library.GENERIC_READ,
+            dwCreationDisposition=library.OPEN_EXISTING)
+        mapping = CreateFileMapping(hFile, flProtect=library.PAGE_READONLY)
+        view = MappedView(mapping, 0, size, library.FILE_MAP_READ)
+        try:
+            print("%-28s %14s %14s" % (
+                "operation", "records/s", "MiB/s"))
+            for label, function, argument in (
+                    ("SetFilePointerEx+ReadFile", read_file, hFile),
+                    ("MappedView", read_view, view)):
+                best = min(timeit.repeat(
+                    # pylint: disable=cell-var-from-loop
+                    lambda: function(argument, offsets, args.record_size),
+                    number=1, repeat=3))
+                print("%-28s %14.1f %14.1f" % (
+                    label, args.records / best,
+                    args.records * args.record_size / best / 1024 / 1024))
+        finally:
+            view.close()
+            CloseHandle(mapping)
+            CloseHandle(hFile)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+"""
+Measures the per-call overhead of pywincffi's wrapped functions when
+pywincffi is loaded in API mode versus ABI mode.  Each mode is measured
+in a new process with ``PYWINCFFI_MODE`` set accordingly:
+
+    python tools/benchmark_modes.py --number 10000
+
+ABI mode requires the modules generated by ``setup.py build_py`` so
+this should be run against an installed copy of pywincffi.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Run in the child process.  The results are printed as
+# json, in microseconds per call, so the parent can collect them.
+SCRIPT = """
+import json
+import timeit
+from pywincffi.core import dist
+from pywincffi.kernel32 import (
+    GetCurrentProcess, GetProcessId, GetStdHandle, GetHandleInformation,
+    CreateEvent, SetEvent, ResetEvent)
+
+_, library = dist.load()
+process = GetCurrentProcess()
+stdout = GetStdHandle(library.STD_OUTPUT_HANDLE)
+event = CreateEvent(bManualReset=True)
+calls = (
+    ("GetCurrentProcess()", lambda: GetCurrentProcess()),
+    ("GetProcessId(process)", lambda: GetProcessId(process)),
+    ("GetStdHandle(STD_OUTPUT_HANDLE)",
+     lambda: GetStdHandle(library.STD_OUTPUT_HANDLE)),
+    ("GetHandleInformation(stdout)", lambda: GetHandleInformation(stdout)),
+    ("SetEvent(event)", lambda: SetEvent(event)),
+    ("ResetEvent(event)", lambda: ResetEvent(event)),
+)
+results = []
+for label, call in calls:
+    best = min(timeit.repeat(call, number=%(number)d, repeat=3))
+    results.append((label, best / %(number)d * 1e6))
+print(json.dumps(results))
+"""
+
+
+def run(mode, number):
+    """Runs the benchmark in a new process using ``mode``"""
+    environment = os.environ.copy()
+    environment["PYWINCFFI_MODE"] = mode
+    output = subprocess.check_output(
+        [sys.executable, "-c", SCRIPT % dict(number=number)],
+        env=environment)
+    return json.loads(output.decode("ascii").strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=10000,
+        help="The number of times to call each function per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("This benchmark can only be run on Windows.", file=sys.stderr)
+        sys.exit(1)
+
+    api = run("api", args.number)
+    abi = run("abi", args.number)
+
+    print("%-34s %10s %10s" % ("call", "api (us)", "abi (us)"))
+    for (label, api_time), (_, abi_time) in zip(api, abi):
+        print("%-34s %10.3f %10.3f" % (label, api_time, abi_time))
+
+
+if __name__ == "__main__":
+    main()
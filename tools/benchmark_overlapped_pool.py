@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+"""
+Measures getting an :class:`pywincffi.wintypes.OVERLAPPED` for an
+overlapped operation, and getting rid of it afterwards, by creating a new
+structure each time compared to using a
+:class:`pywincffi.kernel32.OverlappedPool`:
+
+    python tools/benchmark_overlapped_pool.py --number 100000
+
+Both are measured with and without an event in ``hEvent``.  On platforms
+other than Windows the library from :mod:`pywincffi.core.simulated` is
+used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.kernel32 import CloseHandle, CreateEvent, OverlappedPool
+from pywincffi.wintypes import OVERLAPPED
+
+
+def create():
+    """Creates an OVERLAPPED for a single operation"""
+    OVERLAPPED()
+
+
+def create_with_event():
+    """Creates an OVERLAPPED and event for a single operation"""
+    overlapped = OVERLAPPED()
+    overlapped.hEvent = CreateEvent(bManualReset=True, bInitialState=False)
+    CloseHandle(overlapped.hEvent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=100000,
+        help="The number of operations per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    pools = []
+    print("%-28s %14s %14s %8s %8s" % (
+        "operation", "create (us)", "pool (us)", "hits", "misses"))
+    for label, events, before in (
+            ("OVERLAPPED", False, create),
+            ("OVERLAPPED + event", True, create_with_event)):
+        pool = OverlappedPool(events=events)
+        pools.append(pool)
+
+        def pooled(pool=pool):
+            pool.release(pool.acquire())
+
+        results = []
+        for call in (before, pooled):
+            best = min(timeit.repeat(call, number=args.number, repeat=3))
+            results.append(best / args.number * 1e6)
+        print("%-28s %14.3f %14.3f %8d %8d" % (
+            label, results[0], results[1], pool.hits, pool.misses))
+
+    for pool in pools:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
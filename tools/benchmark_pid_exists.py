@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""
+Measures :func:`pywincffi.kernel32.pid_exists` against process ids which
+don't exist.  ``pid_exists`` handles the
+:class:`pywincffi.exceptions.WindowsAPIError` raised by ``OpenProcess``
+for these so it's timed with the exception's message built lazily, as it
+is now, and eagerly as it was before:
+
+    python tools/benchmark_pid_exists.py --number 10000
+
+On platforms other than Windows the library from
+:mod:`pywincffi.core.simulated` is used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+from mock import patch
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import checks, dist
+from pywincffi.exceptions import WindowsAPIError
+from pywincffi.kernel32 import pid_exists
+
+# Large enough that the ids should not exist.
+PIDS = tuple(range(0x7ffff000, 0x7ffff000 + 64, 4))
+
+
+class EagerWindowsAPIError(WindowsAPIError):
+    """Builds the message when constructed, like WindowsAPIError used to"""
+    def __init__(self, *args, **kwargs):
+        super(EagerWindowsAPIError, self).__init__(*args, **kwargs)
+        self.message  # pylint: disable=pointless-statement
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=10000,
+        help="The number of times to call pid_exists() per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    pids = PIDS * (args.number // len(PIDS) + 1)
+    pids = pids[:args.number]
+    assert not any(pid_exists(pid) for pid in PIDS)
+
+    def call():
+        for pid in pids:
+            pid_exists(pid)
+
+    results = []
+    for error in (EagerWindowsAPIError, WindowsAPIError):
+        with patch.object(checks, "WindowsAPIError", error):
+            best = min(timeit.repeat(call, number=1, repeat=3))
+        results.append(best / args.number * 1e6)
+
+    print("%-28s %12s %12s" % ("call", "eager (us)", "lazy (us)"))
+    print("%-28s %12.3f %12.3f" % (
+        "pid_exists(missing pid)", results[0], results[1]))
+
+
+if __name__ == "__main__":
+    main()
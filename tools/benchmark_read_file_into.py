@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+"""
+Measures the throughput of reading a file in chunks with
+:func:`pywincffi.kernel32.ReadFile`, which returns a new bytes object for
+each chunk, compared to :func:`pywincffi.kernel32.ReadFileInto`, which
+reads each chunk into the same buffer:
+
+    python tools/benchmark_read_file_into.py --size 64
+
+On platforms other than Windows the library from
+:mod:`pywincffi.core.simulated` is used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+from os.path import dirname, abspath, join
+
+from six import text_type
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.kernel32 import CloseHandle, CreateFile, ReadFile, ReadFileInto
+
+CHUNK_SIZES = (4096, 65536, 1024 * 1024)
+
+
+def open_file(path):
+    """Opens ``path`` for reading"""
+    _, library = dist.load("kernel32")
+    return CreateFile(
+        path, library.GENERIC_READ,
+        dwCreationDisposition=library.OPEN_EXISTING)
+
+
+def read(path, chunk_size):
+    """Reads ``path`` using ReadFile()"""
+    handle = open_file(path)
+    total = 0
+    while True:
+        data = ReadFile(handle, chunk_size)
+        if not data:
+            break
+        total += len(data)
+    CloseHandle(handle)
+    return total
+
+
+def read_into(path, chunk_size):
+    """Reads ``path`` using ReadFileInto()"""
+    handle = open_file(path)
+    buffer_ = bytearray(chunk_size)
+    total = 0
+    while True:
+        bytes_read = ReadFileInto(handle, buffer_)
+        if not bytes_read:
+            break
+        total += bytes_read
+    CloseHandle(handle)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--size", type=int, default=64,
+        help="The size of the file to read in MiB.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    directory = tempfile.mkdtemp(prefix="pywincffi-benchmark-")
+    try:
+        path = text_type(join(directory, "data"))
+        with open(path, "wb") as file_:
+            for _ in range(args.size):
+                file_.write(os.urandom(1024 * 1024))
+
+        size = args.size * 1024 * 1024
+        print("%-28s %14s %14s" % (
+            "chunk size", "ReadFile MiB/s", "Into MiB/s"))
+        for chunk_size in CHUNK_SIZES:
+            results = []
+            for function in (read, read_into):
+                assert function(path, chunk_size) == size
+                best = min(timeit.repeat(
+                    # pylint: disable=cell-var-from-loop
+                    lambda: function(path, chunk_size), number=1, repeat=3))
+                results.append(args.size / best)
+            print("%-28d %14.1f %14.1f" % (
+                chunk_size, results[0], results[1]))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+"""
+Measures the cost of validating the inputs to ``CreateFile`` and
+``CreateProcess`` using one :func:`pywincffi.core.checks.input_check`
+call per input compared to the compiled :class:`pywincffi.core.checks.Schema`
+the wrappers now use:
+
+    python tools/benchmark_schema.py --number 100000
+
+Only the validation is measured, the functions themselves are not called.
+On platforms other than Windows the library from
+:mod:`pywincffi.core.simulated` provides the constants and types.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+from six import integer_types, text_type
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.core.checks import NoneType, input_check
+from pywincffi.kernel32.file import _CREATE_FILE
+from pywincffi.kernel32.process import _CREATE_PROCESS
+from pywincffi.wintypes import (
+    HANDLE, SECURITY_ATTRIBUTES, STARTUPINFO)
+
+
+# pylint: disable=too-many-arguments
+def create_file_input_checks(
+        lpFileName, dwDesiredAccess, dwShareMode, lpSecurityAttributes,
+        dwCreationDisposition, dwFlagsAndAttributes, hTemplateFile, library):
+    """The checks CreateFile performed before using a schema"""
+    input_check("lpFileName", lpFileName, text_type)
+    input_check("dwDesiredAccess", dwDesiredAccess, integer_types)
+    input_check("dwShareMode", dwShareMode, integer_types)
+    input_check(
+        "lpSecurityAttributes", lpSecurityAttributes,
+        allowed_types=(NoneType, SECURITY_ATTRIBUTES)
+    )
+    input_check(
+        "dwCreationDisposition", dwCreationDisposition,
+        allowed_values=(
+            library.CREATE_ALWAYS,
+            library.CREATE_NEW,
+            library.OPEN_ALWAYS,
+            library.OPEN_EXISTING,
+            library.TRUNCATE_EXISTING
+        )
+    )
+    input_check("dwFlagsAndAttributes", dwFlagsAndAttributes, integer_types)
+    input_check("hTemplateFile", hTemplateFile, (NoneType, HANDLE))
+
+
+def create_process_input_checks(
+        lpApplicationName, lpProcessAttributes, lpThreadAttributes,
+        bInheritHandles, dwCreationFlags, lpCurrentDirectory, lpStartupInfo):
+    """The checks CreateProcess performed before using a schema"""
+    if lpApplicationName is not None:
+        input_check(
+            "lpApplicationName", lpApplicationName, allowed_types=(text_type,))
+    input_check(
+        "lpProcessAttributes", lpProcessAttributes,
+        allowed_types=(SECURITY_ATTRIBUTES, NoneType))
+    input_check(
+        "lpThreadAttributes", lpThreadAttributes,
+        allowed_types=(SECURITY_ATTRIBUTES, NoneType))
+    input_check(
+        "bInheritHandles", bInheritHandles, allowed_values=(True, False))
+    input_check(
+        "dwCreationFlags", dwCreationFlags, allowed_types=(integer_types, ))
+    if lpCurrentDirectory is not None:
+        input_check(
+            "lpCurrentDirectory", lpCurrentDirectory,
+            allowed_types=(text_type, ))
+    if lpStartupInfo is not None:
+        input_check(
+            "lpStartupInfo", lpStartupInfo, allowed_types=(STARTUPINFO, ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=100000,
+        help="The number of times to validate the inputs per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    _, library = dist.load("kernel32")
+    create_file = (
+        u"C:\\temp\\file", library.GENERIC_WRITE, library.FILE_SHARE_READ,
+        None, library.CREATE_ALWAYS, library.FILE_ATTRIBUTE_NORMAL, None)
+    create_process = (
+        u"python.exe", None, None, True, 0, u"C:\\temp", STARTUPINFO())
+    calls = (
+        ("CreateFile",
+         lambda: create_file_input_checks(*create_file, library=library),
+         lambda: _CREATE_FILE.validate(*create_file)),
+        ("CreateProcess",
+         lambda: create_process_input_checks(*create_process),
+         lambda: _CREATE_PROCESS.validate(*create_process)),
+    )
+
+    print("%-16s %18s %14s" % ("function", "input_check (us)", "schema (us)"))
+    for label, before, after in calls:
+        results = []
+        for call in (before, after):
+            best = min(timeit.repeat(call, number=args.number, repeat=3))
+            results.append(best / args.number * 1e6)
+        print("%-16s %18.3f %14.3f" % (label, results[0], results[1]))
+
+
+if __name__ == "__main__":
+    main()
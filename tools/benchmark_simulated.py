@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+"""
+Measures the throughput, allocations and concurrency of the wrappers in
+:mod:`pywincffi.kernel32` using the simulated library from
+:mod:`pywincffi.core.simulated` so it can be run on any platform:
+
+    python tools/benchmark_simulated.py --number 10000 --threads 4
+
+Because the simulated functions are implemented in Python the absolute
+numbers are not comparable with the real library.  They're intended to
+catch regressions in the wrappers themselves.
+"""
+
+from __future__ import print_function
+
+import argparse
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.core.simulated import Simulation
+from pywincffi.kernel32 import (
+    CloseHandle, CreateEvent, CreatePipe, ReadFile, ResetEvent, SetEvent,
+    WaitForSingleObject, WriteFile)
+
+
+def allocations(call, number):
+    """
+    Returns the number of blocks and bytes allocated, and
+    not freed, per call to ``call``.
+    """
+    call()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(number):
+            call()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    blocks = size = 0
+    for difference in after.compare_to(before, "filename"):
+        blocks += difference.count_diff
+        size += difference.size_diff
+    return float(blocks) / number, float(size) / number
+
+
+def concurrent(call, number, threads):
+    """
+    Calls ``call`` ``number`` times in each of ``threads`` threads
+    and returns the total number of calls per second.
+    """
+    def worker():
+        for _ in range(number):
+            call()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.time()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return number * threads / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=10000,
+        help="The number of times to call each function per measurement.")
+    parser.add_argument(
+        "--threads", type=int, default=4,
+        help="The number of threads used to measure concurrency.")
+    args = parser.parse_args()
+
+    simulation = Simulation()
+    dist.Loader.cache.clear()
+    dist.Loader.cache.update(simulation.loader_cache())
+
+    try:
+        reader, writer = CreatePipe()
+        event = CreateEvent()
+
+        def write_read():
+            WriteFile(writer, b"data")
+            ReadFile(reader, 4)
+
+        def set_wait():
+            SetEvent(event)
+            WaitForSingleObject(event, 0)
+            ResetEvent(event)
+
+        def create_close():
+            CloseHandle(CreateEvent())
+
+        calls = (
+            ("WriteFile + ReadFile", write_read),
+            ("SetEvent + Wait + Reset", set_wait),
+            ("CreateEvent + CloseHandle", create_close),
+        )
+
+        print("%-26s %10s %10s %10s %14s" % (
+            "call", "us/call", "blocks", "bytes",
+            "calls/s (%d)" % args.threads))
+        for label, call in calls:
+            best = min(timeit.repeat(call, number=args.number, repeat=3))
+            blocks, size = allocations(call, args.number)
+            rate = concurrent(call, args.number, args.threads)
+            print("%-26s %10.3f %10.3f %10.1f %14.0f" % (
+                label, best / args.number * 1e6, blocks, size, rate))
+    finally:
+        simulation.close()
+
+
+if __name__ == "__main__":
+    main()
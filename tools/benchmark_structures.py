@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+"""
+Measures constructing ``OVERLAPPED`` and ``STARTUPINFO`` and accessing
+their fields using :class:`pywincffi.core.typesbase.CFFICDataWrapper`
+compared to the previous implementation, which looked up descriptors on
+every assignment and delegated every field read through ``__getattr__``:
+
+    python tools/benchmark_structures.py --number 100000
+
+On platforms other than Windows the types come from
+:mod:`pywincffi.core.simulated`.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.wintypes import OVERLAPPED, STARTUPINFO
+
+
+# pylint: disable=too-few-public-methods
+class LegacyWrapper(object):
+    """CFFICDataWrapper as it was before the metaclass was added"""
+    def __init__(self, cdecl, ffi):
+        self._cdata = ffi.new(cdecl)
+
+    def __getattr__(self, name):
+        return getattr(self._cdata, name)
+
+    def __setattr__(self, name, value):
+        if name == "_cdata":
+            super(LegacyWrapper, self).__setattr__(name, value)
+            return
+
+        if hasattr(self.__class__, name):
+            try:
+                attr = getattr(self.__class__, name)
+                attr.__set__(self, value)
+                return
+            except AttributeError:
+                pass
+
+        setattr(self._cdata, name, value)
+
+
+class LegacyOVERLAPPED(LegacyWrapper):
+    """OVERLAPPED built on :class:`LegacyWrapper`"""
+    def __init__(self):
+        ffi, _ = dist.load("core")
+        super(LegacyOVERLAPPED, self).__init__("OVERLAPPED *", ffi)
+
+
+class LegacySTARTUPINFO(LegacyWrapper):
+    """STARTUPINFO built on :class:`LegacyWrapper`"""
+    def __init__(self):
+        ffi, _ = dist.load("core")
+        super(LegacySTARTUPINFO, self).__init__("STARTUPINFO *", ffi)
+
+
+def startupinfo(cls):
+    """Constructs ``cls`` and sets the fields commonly used"""
+    info = cls()
+    info.cb = 68
+    info.dwFlags = 0x100
+    info.wShowWindow = 0
+    return info
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=100000,
+        help="The number of times to run each operation per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    legacy, current = LegacyOVERLAPPED(), OVERLAPPED()
+    operations = (
+        ("OVERLAPPED()", LegacyOVERLAPPED, OVERLAPPED),
+        ("STARTUPINFO() + 3 fields",
+         lambda: startupinfo(LegacySTARTUPINFO),
+         lambda: startupinfo(STARTUPINFO)),
+        ("overlapped.Offset",
+         lambda: legacy.Offset, lambda: current.Offset),
+        ("overlapped.Offset = 1",
+         lambda: setattr(legacy, "Offset", 1),
+         lambda: setattr(current, "Offset", 1)),
+    )
+
+    print("%-28s %14s %14s" % ("operation", "previous (us)", "current (us)"))
+    for label, before, after in operations:
+        results = []
+        for call in (before, after):
+            best = min(timeit.repeat(call, number=args.number, repeat=3))
+            results.append(best / args.number * 1e6)
+        print("%-28s %14.3f %14.3f" % (label, results[0], results[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""
+Measures reading an array of ``FILETIME`` structures out of a buffer by
+copying each record into a new :class:`pywincffi.wintypes.FILETIME`
+compared to using :class:`pywincffi.wintypes.StructureArray`, which reads
+the records in place:
+
+    python tools/benchmark_views.py --count 10000
+
+On platforms other than Windows the types come from
+:mod:`pywincffi.core.simulated`.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import struct
+import sys
+import timeit
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.wintypes import FILETIME, StructureArray
+
+
+def copy_records(data):
+    """Copies each record in ``data`` into a new FILETIME"""
+    ffi, _ = dist.load("core")
+    size = ffi.sizeof("FILETIME")
+    total = 0
+    for offset in range(0, len(data), size):
+        filetime = FILETIME()
+        ffi.memmove(filetime._cdata, data[offset:offset + size], size)
+        total += filetime.dwLowDateTime
+    return total
+
+
+def view_records(data):
+    """Reads each record in ``data`` in place"""
+    total = 0
+    for filetime in StructureArray(FILETIME, data):
+        total += filetime.dwLowDateTime
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--count", type=int, default=10000,
+        help="The number of records in the buffer.")
+    parser.add_argument(
+        "--number", type=int, default=10,
+        help="The number of times to read the buffer per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    data = b"".join(
+        struct.pack("<II", index, 0) for index in range(args.count))
+    assert copy_records(data) == view_records(data)
+
+    print("%-28s %14s %14s" % ("operation", "copy (us)", "view (us)"))
+    results = []
+    for function in (copy_records, view_records):
+        best = min(timeit.repeat(
+            lambda: function(data),  # pylint: disable=cell-var-from-loop
+            number=args.number, repeat=3))
+        results.append(best / (args.number * args.count) * 1e6)
+    print("%-28s %14.3f %14.3f" % (
+        "read FILETIME record", results[0], results[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+"""
+Measures the throughput of reading and writing a file in small chunks
+through :class:`pywincffi.kernel32.WinFile` wrapped in
+:class:`io.BufferedReader` or :class:`io.BufferedWriter`, compared to the
+built in :func:`open`, using the default buffer size and a larger one:
+
+    python tools/benchmark_winfile.py --size 64 --chunk-size 4096
+
+On platforms other than Windows the library from
+:mod:`pywincffi.core.simulated` is used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+from os.path import dirname, abspath, join
+
+from six import text_type
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.kernel32 import WinFile
+
+BUFFER_SIZES = (
+    ("default buffer", io.DEFAULT_BUFFER_SIZE),
+    ("1 MiB buffer", 1024 * 1024))
+
+
+def read_open(path, buffer_size, chunk_size):
+    """Reads ``path`` using open()"""
+    with open(path, "rb", buffering=buffer_size) as file_:
+        return sum(len(chunk) for chunk in iter(
+            lambda: file_.read(chunk_size), b""))
+
+
+def read_winfile(path, buffer_size, chunk_size):
+    """Reads ``path`` using WinFile"""
+    with io.BufferedReader(WinFile(path), buffer_size) as file_:
+        return sum(len(chunk) for chunk in iter(
+            lambda: file_.read(chunk_size), b""))
+
+
+def write_open(path, buffer_size, chunks):
+    """Writes ``chunks`` to ``path`` using open()"""
+    with open(path, "wb", buffering=buffer_size) as file_:
+        for chunk in chunks:
+            file_.write(chunk)
+
+
+def write_winfile(path, buffer_size, chunks):
+    """Writes ``chunks`` to ``path`` using WinFile"""
+    with io.BufferedWriter(WinFile(path, "w"), buffer_size) as file_:
+        for chunk in chunks:
+            file_.write(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--size", type=int, default=64,
+        help="The size of the file in MiB.")
+    parser.add_argument(
+        "--chunk-size", type=int, default=4096,
+        help="The number of bytes read or written per call.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    data = os.urandom(args.size * 1024 * 1024)
+    chunks = [data[offset:offset + args.chunk_size]
+              for offset in range(0, len(data), args.chunk_size)]
+    directory = tempfile.mkdtemp(prefix="pywincffi-benchmark-")
+    try:
+        path = text_type(join(directory, "data"))
+        write_open(path, io.DEFAULT_BUFFER_SIZE, chunks)
+        assert read_winfile(path, io.DEFAULT_BUFFER_SIZE,
+                            args.chunk_size) == len(data)
+
+        print("%-28s %14s %14s" % (
+            "operation", "open() MiB/s", "WinFile MiB/s"))
+        for label, buffer_size in BUFFER_SIZES:
+            for operation, functions, argument in (
+                    ("read", (read_open, read_winfile), args.chunk_size),
+                    ("write", (write_open, write_winfile), chunks)):
+                results = []
+                for function in functions:
+                    best = min(timeit.repeat(
+                        # pylint: disable=cell-var-from-loop
+                        lambda: function(path, buffer_size, argument),
+                        number=1, repeat=3))
+                    results.append(args.size / best)
+                print("%-28s %14.1f %14.1f" % (
+                    "%s, %s" % (operation, label), results[0], results[1]))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
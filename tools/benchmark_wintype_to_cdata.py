@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+"""
+Measures :func:`pywincffi.wintypes.wintype_to_cdata` for each of the types
+in :mod:`pywincffi.wintypes`, and for ``None``, compared to the previous
+implementation which loaded the library and checked the type of its input
+on every call:
+
+    python tools/benchmark_wintype_to_cdata.py --number 1000000
+
+On platforms other than Windows the types come from
+:mod:`pywincffi.core.simulated`.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import timeit
+from os.path import dirname, abspath
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.wintypes import (
+    FILETIME, HANDLE, LPWSANETWORKEVENTS, OVERLAPPED, PROCESS_INFORMATION,
+    SECURITY_ATTRIBUTES, SOCKET, STARTUPINFO, WSAEVENT, wintype_to_cdata)
+
+WINTYPES = (
+    HANDLE, WSAEVENT, SOCKET, SECURITY_ATTRIBUTES, OVERLAPPED, FILETIME,
+    LPWSANETWORKEVENTS, PROCESS_INFORMATION, STARTUPINFO)
+
+
+# pylint: disable=protected-access
+def legacy_wintype_to_cdata(wintype):
+    """wintype_to_cdata() as it was before wintypes had _as_parameter_"""
+    ffi, _ = dist.load("core")
+    if wintype is None:
+        return ffi.NULL
+
+    if isinstance(wintype, HANDLE):
+        return wintype._as_parameter_
+
+    if isinstance(wintype, SOCKET):
+        return wintype._cdata[0]
+
+    return wintype._cdata
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--number", type=int, default=1000000,
+        help="The number of times to convert each type per measurement.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    values = [(wintype.__name__, wintype()) for wintype in WINTYPES]
+    values.append(("None", None))
+
+    print("%-28s %14s %14s" % ("type", "previous (us)", "current (us)"))
+    for label, value in values:
+        assert wintype_to_cdata(value) == legacy_wintype_to_cdata(value)
+        results = []
+        for function in (legacy_wintype_to_cdata, wintype_to_cdata):
+            best = min(timeit.repeat(
+                lambda: function(value),  # pylint: disable=cell-var-from-loop
+                number=args.number, repeat=3))
+            results.append(best / args.number * 1e6)
+        print("%-28s %14.3f %14.3f" % (label, results[0], results[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+"""
+Measures the throughput of writing a large buffer in chunks with
+:func:`pywincffi.kernel32.WriteFile` by copying each chunk into
+``bytes`` first, which WriteFile() used to require, compared to passing
+:class:`memoryview` slices of the buffer directly:
+
+    python tools/benchmark_write_file.py --size 64
+
+On platforms other than Windows the library from
+:mod:`pywincffi.core.simulated` is used.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+from os.path import dirname, abspath, join
+
+from six import text_type
+
+ROOT = dirname(dirname(abspath(__file__)))
+
+# Add the root of the repo to sys.path so
+# we can import pywcinffi directly.
+sys.path.insert(0, ROOT)
+
+from pywincffi.core import dist
+from pywincffi.kernel32 import CloseHandle, CreateFile, WriteFile
+
+CHUNK_SIZES = (4096, 65536, 1024 * 1024)
+
+
+def open_file(path):
+    """Opens ``path`` for writing, truncating it"""
+    _, library = dist.load("kernel32")
+    return CreateFile(
+        path, library.GENERIC_WRITE,
+        dwCreationDisposition=library.CREATE_ALWAYS)
+
+
+def write_copies(path, data, chunk_size):
+    """Writes ``data`` by copying each chunk into bytes"""
+    handle = open_file(path)
+    view = memoryview(data)
+    total = 0
+    for offset in range(0, len(data), chunk_size):
+        total += WriteFile(handle, view[offset:offset + chunk_size].tobytes())
+    CloseHandle(handle)
+    return total
+
+
+def write_slices(path, data, chunk_size):
+    """Writes ``data`` by passing memoryview slices"""
+    handle = open_file(path)
+    view = memoryview(data)
+    total = 0
+    for offset in range(0, len(data), chunk_size):
+        total += WriteFile(handle, view[offset:offset + chunk_size])
+    CloseHandle(handle)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "--size", type=int, default=64,
+        help="The size of the buffer to write in MiB.")
+    args = parser.parse_args()
+
+    if os.name != "nt":
+        print("Using the simulated library, the compiled library is only "
+              "available on Windows.")
+        from pywincffi.core.simulated import Simulation
+        dist.Loader.cache.update(Simulation().loader_cache())
+
+    data = bytearray(os.urandom(args.size * 1024 * 1024))
+    directory = tempfile.mkdtemp(prefix="pywincffi-benchmark-")
+    try:
+        path = text_type(join(directory, "data"))
+        print("%-28s %14s %14s" % (
+            "chunk size", "copies MiB/s", "slices MiB/s"))
+        for chunk_size in CHUNK_SIZES:
+            results = []
+            for function in (write_copies, write_slices):
+                assert function(path, data, chunk_size) == len(data)
+                best = min(timeit.repeat(
+                    # pylint: disable=cell-var-from-loop
+                    lambda: function(path, data, chunk_size),
+                    number=1, repeat=3))
+                results.append(args.size / best)
+            print("%-28d %14.1f %14.1f" % (
+                chunk_size, results[0], results[1]))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()